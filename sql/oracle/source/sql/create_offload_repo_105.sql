@@ -0,0 +1,34 @@
+/*
+# Copyright 2016 The GOE Authors. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+*/
+
+define goe_offload_repo_version = '1.0.5'
+define goe_offload_repo_comments = "GOE repo upgrades for &goe_offload_repo_version."
+
+PROMPT Installing GOE repository &goe_offload_repo_version....
+
+-- Table changes
+-- -----------------------------------------------------------------------------------------------
+
+-- Fingerprint of the data staged for each offload chunk, JSON
+ALTER TABLE offload_chunk ADD (staged_fingerprint CLOB);
+
+--------------------------------------------------------------------------------------------------
+@@upgrade_offload_repo_version.sql
+
+PROMPT GOE repository &goe_offload_repo_version. installed.
+
+undefine goe_offload_repo_version
+undefine goe_offload_repo_comments
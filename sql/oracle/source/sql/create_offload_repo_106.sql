@@ -0,0 +1,79 @@
+/*
+# Copyright 2016 The GOE Authors. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+*/
+
+define goe_offload_repo_version = '1.0.6'
+define goe_offload_repo_comments = "GOE repo upgrades for &goe_offload_repo_version."
+
+PROMPT Installing GOE repository &goe_offload_repo_version....
+
+-- Table changes
+-- -----------------------------------------------------------------------------------------------
+
+-- VALIDATION_FINGERPRINT
+-- -----------------------------------------------------------------------------------------------
+-- Aggregates of offloaded partition ranges that have been successfully validated, JSON
+CREATE TABLE validation_fingerprint (
+    id                 INTEGER NOT NULL,
+    frontend_object_id INTEGER NOT NULL,
+    backend_object_id  INTEGER NOT NULL,
+    fingerprint        CLOB NOT NULL,
+    create_time        TIMESTAMP NOT NULL,
+    update_time        TIMESTAMP NOT NULL
+) TABLESPACE "&goe_repo_tablespace"
+  LOB (fingerprint) STORE AS validation_fingerprint_lob
+;
+
+CREATE UNIQUE INDEX validation_fingerprint_pki ON
+    validation_fingerprint (id)
+    TABLESPACE "&goe_repo_tablespace";
+
+CREATE UNIQUE INDEX validation_fingerprint_uki ON
+    validation_fingerprint (frontend_object_id, backend_object_id)
+    TABLESPACE "&goe_repo_tablespace";
+
+CREATE INDEX validation_fingerprint_fk1i ON
+    validation_fingerprint (backend_object_id)
+    TABLESPACE "&goe_repo_tablespace";
+
+ALTER TABLE validation_fingerprint
+    ADD CONSTRAINT validation_fingerprint_pk
+        PRIMARY KEY (id)
+        USING INDEX validation_fingerprint_pki;
+
+ALTER TABLE validation_fingerprint
+    ADD CONSTRAINT validation_fingerprint_uk
+        UNIQUE (frontend_object_id, backend_object_id)
+        USING INDEX validation_fingerprint_uki;
+
+ALTER TABLE validation_fingerprint
+    ADD CONSTRAINT validation_fingerprint_fk1
+        FOREIGN KEY ( backend_object_id )
+        REFERENCES backend_object ( id );
+
+ALTER TABLE validation_fingerprint
+    ADD CONSTRAINT validation_fingerprint_fk2
+        FOREIGN KEY ( frontend_object_id )
+        REFERENCES frontend_object ( id );
+
+CREATE SEQUENCE validation_fingerprint_seq;
+
+--------------------------------------------------------------------------------------------------
+@@upgrade_offload_repo_version.sql
+
+PROMPT GOE repository &goe_offload_repo_version. installed.
+
+undefine goe_offload_repo_version
+undefine goe_offload_repo_comments
@@ -390,6 +390,10 @@ CREATE OR REPLACE PACKAGE BODY offload_repo AS
         WHERE  frontend_object_id = v_frontend_object_id;
 
         IF SQL%ROWCOUNT > 0 THEN
+            -- Validation fingerprints describe the offloaded data so are no longer relevant.
+            DELETE
+            FROM   validation_fingerprint
+            WHERE  frontend_object_id = v_frontend_object_id;
             COMMIT;
         END IF;
     END delete_offload_metadata;
@@ -613,12 +617,13 @@ CREATE OR REPLACE PACKAGE BODY offload_repo AS
     END start_offload_chunk;
 
     --------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
-    PROCEDURE end_offload_chunk ( p_offload_chunk_id IN INTEGER,
-                                  p_rows             IN INTEGER,
-                                  p_frontend_bytes   IN INTEGER,
-                                  p_transport_bytes  IN INTEGER,
-                                  p_backend_bytes    IN INTEGER,
-                                  p_status           IN VARCHAR2 ) IS
+    PROCEDURE end_offload_chunk ( p_offload_chunk_id   IN INTEGER,
+                                  p_rows               IN INTEGER,
+                                  p_frontend_bytes     IN INTEGER,
+                                  p_transport_bytes    IN INTEGER,
+                                  p_backend_bytes      IN INTEGER,
+                                  p_status             IN VARCHAR2,
+                                  p_staged_fingerprint IN CLOB DEFAULT NULL ) IS
 
         v_status_id offload_chunk.status_id%TYPE;
 
@@ -627,17 +632,105 @@ CREATE OR REPLACE PACKAGE BODY offload_repo AS
         v_status_id := get_status_id( p_status_code => p_status );
 
         UPDATE offload_chunk
-        SET    end_time        = SYSTIMESTAMP
-        ,      chunk_rows      = p_rows
-        ,      frontend_bytes  = p_frontend_bytes
-        ,      transport_bytes = p_transport_bytes
-        ,      backend_bytes   = p_backend_bytes
-        ,      status_id       = v_status_id
-        WHERE  id              = p_offload_chunk_id;
+        SET    end_time           = SYSTIMESTAMP
+        ,      chunk_rows         = p_rows
+        ,      frontend_bytes     = p_frontend_bytes
+        ,      transport_bytes    = p_transport_bytes
+        ,      backend_bytes      = p_backend_bytes
+        ,      staged_fingerprint = p_staged_fingerprint
+        ,      status_id          = v_status_id
+        WHERE  id                 = p_offload_chunk_id;
 
         COMMIT;
 
     END end_offload_chunk;
 
+    --------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+    FUNCTION get_validation_fingerprint ( p_frontend_object_owner IN VARCHAR2,
+                                          p_frontend_object_name  IN VARCHAR2,
+                                          p_backend_object_owner  IN VARCHAR2,
+                                          p_backend_object_name   IN VARCHAR2 )
+        RETURN CLOB IS
+
+        v_fingerprint validation_fingerprint.fingerprint%TYPE;
+
+    BEGIN
+
+        SELECT vf.fingerprint
+        INTO   v_fingerprint
+        FROM   validation_fingerprint vf
+               INNER JOIN
+               frontend_object fo
+               ON (fo.id = vf.frontend_object_id)
+               INNER JOIN
+               backend_object bo
+               ON (bo.id = vf.backend_object_id)
+        WHERE  fo.object_owner = p_frontend_object_owner
+        AND    fo.object_name  = p_frontend_object_name
+        AND    bo.object_owner = p_backend_object_owner
+        AND    bo.object_name  = p_backend_object_name;
+
+        RETURN v_fingerprint;
+
+    EXCEPTION
+        WHEN NO_DATA_FOUND THEN
+            RETURN NULL;
+    END get_validation_fingerprint;
+
+    --------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+    PROCEDURE save_validation_fingerprint ( p_frontend_object_owner IN VARCHAR2,
+                                            p_frontend_object_name  IN VARCHAR2,
+                                            p_backend_object_owner  IN VARCHAR2,
+                                            p_backend_object_name   IN VARCHAR2,
+                                            p_fingerprint           IN CLOB ) IS
+
+        v_frontend_object_id validation_fingerprint.frontend_object_id%TYPE;
+        v_backend_object_id  validation_fingerprint.backend_object_id%TYPE;
+
+    BEGIN
+
+        v_frontend_object_id := get_frontend_object_id( p_object_owner => p_frontend_object_owner,
+                                                        p_object_name  => p_frontend_object_name );
+
+        v_backend_object_id := get_backend_object_id( p_object_owner => p_backend_object_owner,
+                                                      p_object_name  => p_backend_object_name );
+
+        MERGE
+            INTO validation_fingerprint tgt
+            USING (
+                    SELECT v_frontend_object_id AS frontend_object_id
+                    ,      v_backend_object_id  AS backend_object_id
+                    FROM   dual
+                  ) src
+            ON (    src.frontend_object_id = tgt.frontend_object_id
+                AND src.backend_object_id  = tgt.backend_object_id)
+        WHEN MATCHED
+        THEN
+            UPDATE
+            SET    tgt.fingerprint = p_fingerprint
+            ,      tgt.update_time = SYSTIMESTAMP
+        WHEN NOT MATCHED
+        THEN
+            INSERT
+                ( id
+                , frontend_object_id
+                , backend_object_id
+                , fingerprint
+                , create_time
+                , update_time
+                )
+            VALUES
+                ( validation_fingerprint_seq.NEXTVAL
+                , src.frontend_object_id
+                , src.backend_object_id
+                , p_fingerprint
+                , SYSTIMESTAMP
+                , SYSTIMESTAMP
+                );
+
+        COMMIT;
+
+    END save_validation_fingerprint;
+
 END offload_repo;
 /
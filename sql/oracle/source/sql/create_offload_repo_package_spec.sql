@@ -64,12 +64,25 @@ CREATE OR REPLACE PACKAGE offload_repo AS
                                     p_partition_details      IN  offload_partition_ntt,
                                     p_offload_chunk_id       OUT INTEGER );
 
-    PROCEDURE end_offload_chunk ( p_offload_chunk_id IN INTEGER,
-                                  p_rows             IN INTEGER,
-                                  p_frontend_bytes   IN INTEGER,
-                                  p_transport_bytes  IN INTEGER,
-                                  p_backend_bytes    IN INTEGER,
-                                  p_status           IN VARCHAR2 );
+    PROCEDURE end_offload_chunk ( p_offload_chunk_id   IN INTEGER,
+                                  p_rows               IN INTEGER,
+                                  p_frontend_bytes     IN INTEGER,
+                                  p_transport_bytes    IN INTEGER,
+                                  p_backend_bytes      IN INTEGER,
+                                  p_status             IN VARCHAR2,
+                                  p_staged_fingerprint IN CLOB DEFAULT NULL );
+
+    FUNCTION get_validation_fingerprint ( p_frontend_object_owner IN VARCHAR2,
+                                          p_frontend_object_name  IN VARCHAR2,
+                                          p_backend_object_owner  IN VARCHAR2,
+                                          p_backend_object_name   IN VARCHAR2 )
+        RETURN CLOB;
+
+    PROCEDURE save_validation_fingerprint ( p_frontend_object_owner IN VARCHAR2,
+                                            p_frontend_object_name  IN VARCHAR2,
+                                            p_backend_object_owner  IN VARCHAR2,
+                                            p_backend_object_name   IN VARCHAR2,
+                                            p_fingerprint           IN CLOB );
 
 END offload_repo;
 /
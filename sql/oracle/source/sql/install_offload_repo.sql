@@ -22,5 +22,7 @@ alter session set current_schema = &goe_db_repo_user;
 -- Start offload repo version files...
 @@create_offload_repo_100.sql
 @@create_offload_repo_104.sql
+@@create_offload_repo_105.sql
+@@create_offload_repo_106.sql
 -- End offload repo version files.
 @@install_offload_repo_code.sql
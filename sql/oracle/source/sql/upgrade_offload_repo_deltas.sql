@@ -61,6 +61,8 @@ begin
     -- Follow this pattern for each repo version file in sequence...
     check_version(v_current_version, '1.0.0');
     check_version(v_current_version, '1.0.4');
+    check_version(v_current_version, '1.0.5');
+    check_version(v_current_version, '1.0.6');
 
 end;
 /
@@ -168,6 +168,12 @@ def normalise_hadoop_options(options, exc_cls=OrchestrationConfigException):
     options.hadoop_host = random.choice(options.hadoop_host.split(","))
     options.hdfs_host = options.hdfs_host or options.hadoop_host
 
+    options.offload_stats_parallelism = (
+        orchestration_defaults.posint_option_from_string(
+            "OFFLOAD_STATS_PARALLELISM", options.offload_stats_parallelism
+        )
+    )
+
     normalise_webhdfs(options)
 
 
@@ -363,6 +369,48 @@ def normalise_offload_transport_config(options, exc_cls=OrchestrationConfigExcep
             options.offload_transport_livy_idle_session_timeout,
         )
     )
+    options.offload_transport_livy_min_sessions = (
+        orchestration_defaults.posint_option_from_string(
+            "OFFLOAD_TRANSPORT_LIVY_MIN_SESSIONS",
+            options.offload_transport_livy_min_sessions,
+            allow_zero=True,
+        )
+    )
+    options.offload_transport_livy_max_session_statements = (
+        orchestration_defaults.posint_option_from_string(
+            "OFFLOAD_TRANSPORT_LIVY_MAX_SESSION_STATEMENTS",
+            options.offload_transport_livy_max_session_statements,
+            allow_zero=True,
+        )
+    )
+    options.offload_transport_livy_lease_timeout = (
+        orchestration_defaults.posint_option_from_string(
+            "OFFLOAD_TRANSPORT_LIVY_LEASE_TIMEOUT",
+            options.offload_transport_livy_lease_timeout,
+            allow_zero=True,
+        )
+    )
+
+    # Query Import config
+    options.offload_transport_query_import_batch_size = normalise_size_option(
+        options.offload_transport_query_import_batch_size,
+        binary_sizes=True,
+        strict_name="OFFLOAD_TRANSPORT_QUERY_IMPORT_BATCH_SIZE",
+        exc_cls=exc_cls,
+    )
+    options.offload_transport_query_import_max_batch_size = normalise_size_option(
+        options.offload_transport_query_import_max_batch_size,
+        binary_sizes=True,
+        strict_name="OFFLOAD_TRANSPORT_QUERY_IMPORT_MAX_BATCH_SIZE",
+        exc_cls=exc_cls,
+    )
+    if (
+        options.offload_transport_query_import_max_batch_size
+        < options.offload_transport_query_import_batch_size
+    ):
+        raise exc_cls(
+            "OFFLOAD_TRANSPORT_QUERY_IMPORT_MAX_BATCH_SIZE cannot be less than OFFLOAD_TRANSPORT_QUERY_IMPORT_BATCH_SIZE"
+        )
 
     # Generic transport config
     if options.offload_transport:
@@ -389,6 +437,18 @@ def normalise_offload_transport_config(options, exc_cls=OrchestrationConfigExcep
 
     if options.offload_staging_format:
         options.offload_staging_format = options.offload_staging_format.upper()
+    options.offload_staging_parquet_data_page_size = normalise_size_option(
+        options.offload_staging_parquet_data_page_size,
+        binary_sizes=True,
+        strict_name="OFFLOAD_STAGING_PARQUET_DATA_PAGE_SIZE",
+        exc_cls=exc_cls,
+    )
+    options.offload_staging_parquet_row_group_size = normalise_size_option(
+        options.offload_staging_parquet_row_group_size,
+        binary_sizes=True,
+        strict_name="OFFLOAD_STAGING_PARQUET_ROW_GROUP_SIZE",
+        exc_cls=exc_cls,
+    )
 
     # For backward compatibility
     options.offload_transport_user = (
@@ -431,6 +491,12 @@ def normalise_rdbms_oracle_options(options, exc_cls=OrchestrationConfigException
     elif not options.ora_repo_user:
         raise exc_cls("Oracle repository username required")
 
+    options.ora_connection_pool_size = orchestration_defaults.posint_option_from_string(
+        "ORA_CONNECTION_POOL_SIZE",
+        options.ora_connection_pool_size,
+        allow_zero=True,
+    )
+
     options.rdbms_app_user = options.ora_app_user
     options.rdbms_app_pass = options.ora_app_pass
     if options.oracle_adm_dsn:
@@ -26,6 +26,11 @@ DATA_SAMPLE_PARALLELISM = (
 
 RESET_BACKEND_TABLE = "Remove backend data table. Use with caution - this will delete previously offloaded data for this table!"
 
+RESUME_EXECUTION_ID = (
+    "Resume a failed Offload from the execution id of the failed command. Chunks that completed successfully are skipped "
+    "and a chunk that was fully staged but not loaded is loaded without transporting the data again"
+)
+
 REUSE_BACKEND_TABLE = (
     "Allow Offload to re-use an empty backend table when there is already Offload metadata. "
     "This may be useful if a backend table had data removed by an administrator and a re-offload is required"
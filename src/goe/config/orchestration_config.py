@@ -130,6 +130,10 @@ EXPECTED_CONFIG_ARGS = [
     "offload_fs_azure_account_domain",
     "offload_fs_azure_account_key",
     "offload_staging_format",
+    "offload_stats_parallelism",
+    "offload_staging_parquet_data_page_size",
+    "offload_staging_parquet_row_group_size",
+    "offload_staging_parquet_use_dictionary",
     "offload_transport",
     "offload_transport_auth_using_oracle_wallet",
     "offload_transport_cmd_host",
@@ -139,11 +143,18 @@ EXPECTED_CONFIG_ARGS = [
     "offload_transport_livy_api_verify_ssl",
     "offload_transport_livy_max_sessions",
     "offload_transport_livy_idle_session_timeout",
+    "offload_transport_livy_min_sessions",
+    "offload_transport_livy_max_session_statements",
+    "offload_transport_livy_lease_timeout",
+    "offload_transport_query_import_batch_size",
+    "offload_transport_query_import_max_batch_size",
+    "offload_transport_query_import_stream_to_dfs",
     "offload_transport_rdbms_session_parameters",
     "offload_transport_password_alias",
     "offload_transport_spark_files",
     "offload_transport_spark_jars",
     "offload_transport_spark_overrides",
+    "offload_transport_spark_persistent_app",
     "offload_transport_spark_queue_name",
     "offload_transport_spark_submit_executable",
     "offload_transport_spark_submit_master_url",
@@ -154,6 +165,8 @@ EXPECTED_CONFIG_ARGS = [
     "ora_adm_pass",
     "ora_app_user",
     "ora_app_pass",
+    "ora_connection_pool_size",
+    "ora_partition_metadata_cache",
     "ora_repo_user",
     "oracle_dsn",
     "oracle_adm_dsn",
@@ -282,8 +295,15 @@ class OrchestrationConfig:
     offload_fs_prefix: Optional[str]
     offload_fs_scheme: str
     offload_staging_format: str
+    offload_staging_parquet_data_page_size: int
+    offload_staging_parquet_row_group_size: int
+    offload_staging_parquet_use_dictionary: bool
     offload_transport: str
     offload_transport_cmd_host: str
+    offload_transport_query_import_batch_size: int
+    offload_transport_query_import_max_batch_size: int
+    offload_transport_query_import_stream_to_dfs: bool
+    offload_transport_spark_persistent_app: bool
     offload_transport_user: str
     offload_transport_spark_submit_executable: Optional[str]
     offload_transport_spark_thrift_host: Optional[str]
@@ -499,6 +519,22 @@ class OrchestrationConfig:
                 "offload_staging_format",
                 orchestration_defaults.offload_staging_format_default(),
             ),
+            offload_stats_parallelism=config_dict.get(
+                "offload_stats_parallelism",
+                orchestration_defaults.offload_stats_parallelism_default(),
+            ),
+            offload_staging_parquet_data_page_size=config_dict.get(
+                "offload_staging_parquet_data_page_size",
+                orchestration_defaults.offload_staging_parquet_data_page_size_default(),
+            ),
+            offload_staging_parquet_row_group_size=config_dict.get(
+                "offload_staging_parquet_row_group_size",
+                orchestration_defaults.offload_staging_parquet_row_group_size_default(),
+            ),
+            offload_staging_parquet_use_dictionary=config_dict.get(
+                "offload_staging_parquet_use_dictionary",
+                orchestration_defaults.offload_staging_parquet_use_dictionary_default(),
+            ),
             listener_host=config_dict.get(
                 "listener_host", orchestration_defaults.listener_host_default()
             ),
@@ -618,6 +654,18 @@ class OrchestrationConfig:
                 "offload_transport_livy_idle_session_timeout",
                 orchestration_defaults.offload_transport_livy_idle_session_timeout_default(),
             ),
+            offload_transport_livy_min_sessions=config_dict.get(
+                "offload_transport_livy_min_sessions",
+                orchestration_defaults.offload_transport_livy_min_sessions_default(),
+            ),
+            offload_transport_livy_max_session_statements=config_dict.get(
+                "offload_transport_livy_max_session_statements",
+                orchestration_defaults.offload_transport_livy_max_session_statements_default(),
+            ),
+            offload_transport_livy_lease_timeout=config_dict.get(
+                "offload_transport_livy_lease_timeout",
+                orchestration_defaults.offload_transport_livy_lease_timeout_default(),
+            ),
             offload_transport_livy_api_url=config_dict.get(
                 "offload_transport_livy_api_url",
                 orchestration_defaults.offload_transport_livy_api_url_default(),
@@ -626,6 +674,18 @@ class OrchestrationConfig:
                 "offload_transport_livy_api_verify_ssl",
                 orchestration_defaults.offload_transport_livy_api_verify_ssl_default(),
             ),
+            offload_transport_query_import_batch_size=config_dict.get(
+                "offload_transport_query_import_batch_size",
+                orchestration_defaults.offload_transport_query_import_batch_size_default(),
+            ),
+            offload_transport_query_import_max_batch_size=config_dict.get(
+                "offload_transport_query_import_max_batch_size",
+                orchestration_defaults.offload_transport_query_import_max_batch_size_default(),
+            ),
+            offload_transport_query_import_stream_to_dfs=config_dict.get(
+                "offload_transport_query_import_stream_to_dfs",
+                orchestration_defaults.offload_transport_query_import_stream_to_dfs_default(),
+            ),
             offload_transport_rdbms_session_parameters=config_dict.get(
                 "offload_transport_rdbms_session_parameters",
                 orchestration_defaults.offload_transport_rdbms_session_parameters_default(),
@@ -646,6 +706,10 @@ class OrchestrationConfig:
                 "offload_transport_spark_overrides",
                 orchestration_defaults.offload_transport_spark_overrides_default(),
             ),
+            offload_transport_spark_persistent_app=config_dict.get(
+                "offload_transport_spark_persistent_app",
+                orchestration_defaults.offload_transport_spark_persistent_app_default(),
+            ),
             offload_transport_spark_queue_name=config_dict.get(
                 "offload_transport_spark_queue_name",
                 orchestration_defaults.offload_transport_spark_queue_name_default(),
@@ -682,6 +746,14 @@ class OrchestrationConfig:
             ora_app_user=config_dict.get(
                 "ora_app_user", orchestration_defaults.ora_app_user_default()
             ),
+            ora_connection_pool_size=config_dict.get(
+                "ora_connection_pool_size",
+                orchestration_defaults.ora_connection_pool_size_default(),
+            ),
+            ora_partition_metadata_cache=config_dict.get(
+                "ora_partition_metadata_cache",
+                orchestration_defaults.ora_partition_metadata_cache_default(),
+            ),
             ora_repo_user=config_dict.get(
                 "ora_repo_user", orchestration_defaults.ora_repo_user_default()
             ),
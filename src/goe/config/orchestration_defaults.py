@@ -40,11 +40,15 @@ from goe.offload.offload_constants import (
     FILE_STORAGE_FORMAT_PARQUET,
     HADOOP_BASED_BACKEND_DISTRIBUTIONS,
     LIVY_IDLE_SESSION_TIMEOUT,
+    LIVY_LEASE_TIMEOUT,
     LIVY_MAX_SESSIONS,
+    LIVY_MAX_SESSION_STATEMENTS,
+    LIVY_MIN_SESSIONS,
     NOT_NULL_PROPAGATION_AUTO,
     OFFLOAD_STATS_METHOD_COPY,
     OFFLOAD_STATS_METHOD_NATIVE,
     OFFLOAD_TRANSPORT_AUTO,
+    ORA_CONNECTION_POOL_SIZE,
     PRESENT_OP_NAME,
     SORT_COLUMNS_NO_CHANGE,
 )
@@ -288,6 +292,14 @@ def max_offload_chunk_count_default():
     return os.environ.get("MAX_OFFLOAD_CHUNK_COUNT") or "100"
 
 
+def offload_chunk_pipeline_depth_default():
+    return os.environ.get("OFFLOAD_CHUNK_PIPELINE_DEPTH") or "1"
+
+
+def offload_chunk_planner_default():
+    return os.environ.get("OFFLOAD_CHUNK_PLANNER") or "GREEDY"
+
+
 def hash_distribution_threshold_default() -> str:
     return os.environ.get("HASH_DISTRIBUTION_THRESHOLD") or "1G"
 
@@ -310,6 +322,10 @@ def offload_predicate_modify_hybrid_view_default():
     return True
 
 
+def offload_stats_parallelism_default() -> str:
+    return os.environ.get("OFFLOAD_STATS_PARALLELISM") or "4"
+
+
 def offload_stats_method_default(operation_name=None):
     if (
         operation_name == PRESENT_OP_NAME
@@ -607,6 +623,15 @@ def ora_adm_pass_default():
     return os.environ.get("ORA_ADM_PASS")
 
 
+def ora_connection_pool_size_default() -> str:
+    return os.environ.get("ORA_CONNECTION_POOL_SIZE") or str(ORA_CONNECTION_POOL_SIZE)
+
+
+def ora_partition_metadata_cache_default() -> bool:
+    str_val = os.environ.get("ORA_PARTITION_METADATA_CACHE") or "false"
+    return bool_option_from_string("ORA_PARTITION_METADATA_CACHE", str_val)
+
+
 def ora_adm_user_default():
     return os.environ.get("ORA_ADM_USER")
 
@@ -762,6 +787,21 @@ def offload_transport_fetch_size_default() -> str:
     return str_val
 
 
+def offload_staging_parquet_data_page_size_default() -> str:
+    return os.environ.get("OFFLOAD_STAGING_PARQUET_DATA_PAGE_SIZE") or "1M"
+
+
+def offload_staging_parquet_row_group_size_default() -> str:
+    return os.environ.get("OFFLOAD_STAGING_PARQUET_ROW_GROUP_SIZE") or "128M"
+
+
+def offload_staging_parquet_use_dictionary_default() -> bool:
+    return bool(
+        os.environ.get("OFFLOAD_STAGING_PARQUET_USE_DICTIONARY", "true").lower()
+        == "true"
+    )
+
+
 def offload_transport_livy_max_sessions_default():
     str_val = os.environ.get("OFFLOAD_TRANSPORT_LIVY_MAX_SESSIONS") or str(
         LIVY_MAX_SESSIONS
@@ -776,6 +816,24 @@ def offload_transport_livy_idle_session_timeout_default() -> str:
     return str_val
 
 
+def offload_transport_livy_min_sessions_default() -> str:
+    return os.environ.get("OFFLOAD_TRANSPORT_LIVY_MIN_SESSIONS") or str(
+        LIVY_MIN_SESSIONS
+    )
+
+
+def offload_transport_livy_max_session_statements_default() -> str:
+    return os.environ.get("OFFLOAD_TRANSPORT_LIVY_MAX_SESSION_STATEMENTS") or str(
+        LIVY_MAX_SESSION_STATEMENTS
+    )
+
+
+def offload_transport_livy_lease_timeout_default() -> str:
+    return os.environ.get("OFFLOAD_TRANSPORT_LIVY_LEASE_TIMEOUT") or str(
+        LIVY_LEASE_TIMEOUT
+    )
+
+
 def offload_transport_livy_api_url_default():
     return os.environ.get("OFFLOAD_TRANSPORT_LIVY_API_URL")
 
@@ -805,6 +863,21 @@ def offload_transport_credential_provider_path_default() -> Optional[str]:
     return os.environ.get("OFFLOAD_TRANSPORT_CREDENTIAL_PROVIDER_PATH")
 
 
+def offload_transport_query_import_batch_size_default() -> str:
+    return os.environ.get("OFFLOAD_TRANSPORT_QUERY_IMPORT_BATCH_SIZE") or "16M"
+
+
+def offload_transport_query_import_max_batch_size_default() -> str:
+    return os.environ.get("OFFLOAD_TRANSPORT_QUERY_IMPORT_MAX_BATCH_SIZE") or "128M"
+
+
+def offload_transport_query_import_stream_to_dfs_default() -> bool:
+    str_val = os.environ.get("OFFLOAD_TRANSPORT_QUERY_IMPORT_STREAM_TO_DFS") or "false"
+    return bool_option_from_string(
+        "OFFLOAD_TRANSPORT_QUERY_IMPORT_STREAM_TO_DFS", str_val
+    )
+
+
 def offload_transport_rdbms_session_parameters_default() -> str:
     return os.environ.get("OFFLOAD_TRANSPORT_RDBMS_SESSION_PARAMETERS") or "{}"
 
@@ -830,6 +903,11 @@ def offload_transport_spark_properties_default() -> Optional[str]:
     return os.environ.get("OFFLOAD_TRANSPORT_SPARK_PROPERTIES")
 
 
+def offload_transport_spark_persistent_app_default() -> bool:
+    str_val = os.environ.get("OFFLOAD_TRANSPORT_SPARK_PERSISTENT_APP") or "false"
+    return bool_option_from_string("OFFLOAD_TRANSPORT_SPARK_PERSISTENT_APP", str_val)
+
+
 def offload_transport_spark_queue_name_default() -> Optional[str]:
     return os.environ.get("OFFLOAD_TRANSPORT_SPARK_QUEUE_NAME")
 
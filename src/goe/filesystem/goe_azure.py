@@ -17,18 +17,20 @@
 """ GOEAzure: Azure implementation of GOEDfs
 """
 
+import base64
 import logging
 from os.path import basename, exists as file_exists
 
 from azure.common import AzureMissingResourceHttpError
 from azure.core.exceptions import HttpResponseError
-from azure.storage.blob import BlobServiceClient
+from azure.storage.blob import BlobBlock, BlobServiceClient
 from google.api_core import retry
 
 from goe.filesystem.goe_dfs import (
     GOEDfs,
     GOEDfsDeleteNotComplete,
     GOEDfsException,
+    GOEDfsStreamWriter,
     gen_fs_uri,
     uri_component_split,
     OFFLOAD_FS_SCHEME_ABFS,
@@ -86,6 +88,37 @@ logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
 
 
+###############################################################################
+# GOEAzureStreamWriter
+###############################################################################
+
+
+class GOEAzureStreamWriter(GOEDfsStreamWriter):
+    """Streams to an Azure blob by staging blocks, uncommitted blocks never become visible."""
+
+    def __init__(self, blob_client, dfs_path):
+        super(GOEAzureStreamWriter, self).__init__(dfs_path)
+        self._blob_client = blob_client
+        self._block_list = []
+
+    def _upload_part(self, part_number: int, data: bytes, final: bool):
+        if final and part_number == 1:
+            self._blob_client.upload_blob(data, overwrite=True)
+            return
+        # Block ids must be base64 and all the same length within a blob.
+        block_id = base64.b64encode(b"%08d" % part_number).decode()
+        self._blob_client.stage_block(block_id, data)
+        self._block_list.append(BlobBlock(block_id=block_id))
+
+    def _complete(self):
+        if self._block_list:
+            self._blob_client.commit_block_list(self._block_list)
+
+    def _abort(self):
+        # Azure garbage collects uncommitted blocks.
+        self._block_list = []
+
+
 ###############################################################################
 # GOEAzure
 ###############################################################################
@@ -385,6 +418,21 @@ class GOEAzure(GOEDfs):
         """No mkdir on Azure block storage"""
         pass
 
+    def open_for_write(self, dfs_path, overwrite=False) -> GOEAzureStreamWriter:
+        assert dfs_path
+        assert isinstance(dfs_path, str)
+        logger.info("open_for_write(%s)" % dfs_path)
+        scheme, container, path = self._uri_component_split(dfs_path)
+        self.debug(
+            "Streaming to scheme/container/path: %s" % str([scheme, container, path])
+        )
+        if not self._container_exists(container):
+            raise GOEDfsException("Container does not exist: %s" % container)
+        if self._blob_exists(container, path) and not overwrite:
+            raise GOEDfsException("Cannot write to existing file: %s" % path)
+        container_client = self._client.get_container_client(container)
+        return GOEAzureStreamWriter(container_client.get_blob_client(path), dfs_path)
+
     def read(self, dfs_path, as_str=False):
         assert dfs_path
         assert isinstance(dfs_path, str)
@@ -462,6 +510,9 @@ class GOEAzure(GOEDfs):
         else:
             return None
 
+    def supports_open_for_write(self) -> bool:
+        return True
+
     def write(self, dfs_path, data, overwrite=False):
         assert dfs_path
         assert isinstance(dfs_path, str)
@@ -128,6 +128,10 @@ URI_SEP = "/"
 # Delay after deleting files from cloud storage. We have a retry but also give it chance.
 POST_CLOUD_DELETE_WAIT_SECONDS = 0.2
 
+# Size of each part uploaded by streaming writers. S3 requires parts of at least 5MB (other than the last)
+# and GCS requires resumable upload chunks to be a multiple of 256KB.
+DFS_STREAM_PART_SIZE = 1024 * 1024 * 16
+
 
 ###############################################################################
 # STANDALONE FUNCTIONS
@@ -230,6 +234,101 @@ logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
 
 
+###############################################################################
+# GOEDfsStreamWriter
+###############################################################################
+
+
+class GOEDfsStreamWriter(metaclass=ABCMeta):
+    """Writable binary file object which uploads to object storage in parts as data is written.
+    Nothing is visible in object storage until close() succeeds, abort() discards any uploaded parts.
+    Used as a context manager close() is called on success and abort() on an exception.
+    """
+
+    def __init__(self, dfs_path, part_size=DFS_STREAM_PART_SIZE):
+        assert part_size > 0
+        self.dfs_path = dfs_path
+        self._part_size = part_size
+        self._buffer = bytearray()
+        self._position = 0
+        self._part_number = 0
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type:
+            self.abort()
+        else:
+            self.close()
+
+    ###########################################################################
+    # PRIVATE METHODS
+    ###########################################################################
+
+    @abstractmethod
+    def _upload_part(self, part_number: int, data: bytes, final: bool):
+        """Upload a single part, part numbers start at 1.
+        final=True with part_number=1 means the whole file fits in one part and can be uploaded in a single call.
+        """
+
+    @abstractmethod
+    def _complete(self):
+        """Make the uploaded parts visible as a single file."""
+
+    @abstractmethod
+    def _abort(self):
+        """Discard any uploaded parts."""
+
+    def _upload_next_part(self, data, final=False):
+        self._part_number += 1
+        self._upload_part(self._part_number, data, final)
+
+    ###########################################################################
+    # PUBLIC METHODS
+    ###########################################################################
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def abort(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._buffer = bytearray()
+        self._abort()
+
+    def close(self):
+        if self._closed:
+            return
+        self._upload_next_part(bytes(self._buffer), final=True)
+        self._buffer = bytearray()
+        self._complete()
+        self._closed = True
+
+    def flush(self):
+        pass
+
+    def tell(self):
+        return self._position
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        if self._closed:
+            raise GOEDfsException("Write to closed stream: %s" % self.dfs_path)
+        self._buffer += data
+        self._position += len(data)
+        while len(self._buffer) > self._part_size:
+            part = bytes(self._buffer[: self._part_size])
+            del self._buffer[: self._part_size]
+            self._upload_next_part(part)
+        return len(data)
+
+
 ###############################################################################
 # GOEDfs
 ###############################################################################
@@ -319,6 +418,17 @@ class GOEDfs(object, metaclass=ABCMeta):
     def write(self, dfs_path: str, data, overwrite=False):
         """Write some data to a remote file"""
 
+    def open_for_write(self, dfs_path: str, overwrite=False) -> GOEDfsStreamWriter:
+        """Return a GOEDfsStreamWriter for streaming data directly to a remote file.
+        Only implemented for object stores, check supports_open_for_write() first.
+        """
+        raise NotImplementedError(
+            "open_for_write() not implemented for %s" % type(self).__name__
+        )
+
+    def supports_open_for_write(self) -> bool:
+        return False
+
     @abstractmethod
     def list_dir(self, dfs_path):
         """Return a list of file/directory names within dfs_path"""
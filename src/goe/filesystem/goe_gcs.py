@@ -28,6 +28,7 @@ from goe.filesystem.goe_dfs import (
     GOEDfs,
     GOEDfsDeleteNotComplete,
     GOEDfsException,
+    GOEDfsStreamWriter,
     gen_fs_uri,
     DFS_RETRY_TIMEOUT,
     DFS_TYPE_DIRECTORY,
@@ -53,6 +54,36 @@ logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
 
 
+###############################################################################
+# GOEGcsStreamWriter
+###############################################################################
+
+
+class GOEGcsStreamWriter(GOEDfsStreamWriter):
+    """Streams to a GCS object using a resumable upload, an unfinished upload never becomes visible."""
+
+    def __init__(self, blob, dfs_path):
+        super(GOEGcsStreamWriter, self).__init__(dfs_path)
+        self._blob = blob
+        self._blob_writer = None
+
+    def _upload_part(self, part_number: int, data: bytes, final: bool):
+        if final and part_number == 1:
+            self._blob.upload_from_string(data)
+            return
+        if self._blob_writer is None:
+            self._blob_writer = self._blob.open("wb", chunk_size=self._part_size)
+        self._blob_writer.write(data)
+
+    def _complete(self):
+        if self._blob_writer:
+            self._blob_writer.close()
+
+    def _abort(self):
+        # Abandoning the resumable upload session is enough, it is never committed.
+        self._blob_writer = None
+
+
 ###############################################################################
 # GOEGcs
 ###############################################################################
@@ -260,6 +291,21 @@ class GOEGcs(GOEDfs):
         """No mkdir on GCS"""
         pass
 
+    def open_for_write(self, dfs_path: str, overwrite=False) -> GOEGcsStreamWriter:
+        """Not retried, a writer cannot be safely replayed after a partial upload."""
+        assert dfs_path
+        assert isinstance(dfs_path, str)
+        logger.info("open_for_write(%s)" % dfs_path)
+        scheme, container, path = self._uri_component_split(dfs_path)
+        self.debug(
+            "Streaming to scheme/container/path: %s" % str([scheme, container, path])
+        )
+        bucket = self._client.get_bucket(container)
+        blob = bucket.blob(path)
+        if blob.exists() and not overwrite:
+            raise GOEDfsException("Cannot write to existing file: %s" % path)
+        return GOEGcsStreamWriter(blob, dfs_path)
+
     @retry.Retry(
         predicate=retry.if_exception_type(google_exceptions.GatewayTimeout),
         deadline=DFS_RETRY_TIMEOUT,
@@ -334,6 +380,9 @@ class GOEGcs(GOEDfs):
         else:
             return None
 
+    def supports_open_for_write(self) -> bool:
+        return True
+
     def write(self, dfs_path: str, data, overwrite=False):
         assert dfs_path
         assert isinstance(dfs_path, str)
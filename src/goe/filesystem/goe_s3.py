@@ -28,6 +28,7 @@ from goe.filesystem.goe_dfs import (
     GOEDfs,
     GOEDfsDeleteNotComplete,
     GOEDfsException,
+    GOEDfsStreamWriter,
     gen_fs_uri,
     DFS_RETRY_TIMEOUT,
     DFS_TYPE_DIRECTORY,
@@ -54,7 +55,58 @@ logger.addHandler(logging.NullHandler())
 
 
 ###############################################################################
-# GOEGcs
+# GOES3StreamWriter
+###############################################################################
+
+
+class GOES3StreamWriter(GOEDfsStreamWriter):
+    """Streams to an S3 object using a multipart upload, small files are written with a single put_object()."""
+
+    def __init__(self, s3_client, container, path, dfs_path):
+        super(GOES3StreamWriter, self).__init__(dfs_path)
+        self._s3_client = s3_client
+        self._container = container
+        self._path = path
+        self._upload_id = None
+        self._parts = []
+
+    def _upload_part(self, part_number: int, data: bytes, final: bool):
+        if final and part_number == 1:
+            self._s3_client.put_object(
+                Bucket=self._container, Key=self._path, Body=data
+            )
+            return
+        if self._upload_id is None:
+            self._upload_id = self._s3_client.create_multipart_upload(
+                Bucket=self._container, Key=self._path
+            )["UploadId"]
+        resp = self._s3_client.upload_part(
+            Bucket=self._container,
+            Key=self._path,
+            PartNumber=part_number,
+            UploadId=self._upload_id,
+            Body=data,
+        )
+        self._parts.append({"ETag": resp["ETag"], "PartNumber": part_number})
+
+    def _complete(self):
+        if self._upload_id:
+            self._s3_client.complete_multipart_upload(
+                Bucket=self._container,
+                Key=self._path,
+                UploadId=self._upload_id,
+                MultipartUpload={"Parts": self._parts},
+            )
+
+    def _abort(self):
+        if self._upload_id:
+            self._s3_client.abort_multipart_upload(
+                Bucket=self._container, Key=self._path, UploadId=self._upload_id
+            )
+
+
+###############################################################################
+# GOES3
 ###############################################################################
 
 
@@ -291,6 +343,18 @@ class GOES3(GOEDfs):
         """No mkdir on S3"""
         pass
 
+    def open_for_write(self, dfs_path, overwrite=False) -> GOES3StreamWriter:
+        assert dfs_path
+        assert isinstance(dfs_path, str)
+        logger.info("open_for_write(%s)" % dfs_path)
+        scheme, container, path = self._uri_component_split(dfs_path)
+        self.debug(
+            "Streaming to scheme/container/path: %s" % str([scheme, container, path])
+        )
+        if self._blob_exists(container, path) and not overwrite:
+            raise GOEDfsException("Cannot write over existing file: %s" % path)
+        return GOES3StreamWriter(self._client.meta.client, container, path, dfs_path)
+
     def read(self, dfs_path, as_str=False):
         assert dfs_path
         assert isinstance(dfs_path, str)
@@ -346,6 +410,9 @@ class GOES3(GOEDfs):
             self.debug("Could not find path in %s matched files" % len(matches))
             return None
 
+    def supports_open_for_write(self) -> bool:
+        return True
+
     def write(self, dfs_path, data, overwrite=False):
         assert dfs_path
         assert isinstance(dfs_path, str)
@@ -92,6 +92,7 @@ from goe.offload.operation.data_type_controls import (
 )
 from goe.offload.operation.table_structure_checks import check_table_structure
 from goe.offload.operation.transport import (
+    OffloadResume,
     offload_data_to_target,
 )
 from goe.offload.offload import (
@@ -122,6 +123,7 @@ from goe.offload.option_validation import (
     normalise_verify_options,
 )
 from goe.offload.operation.sort_columns import sort_columns_csv_to_sort_columns
+from goe.offload.oracle.oracle_connection_pool import oracle_connection_pool_stats
 from goe.orchestration import command_steps
 from goe.orchestration.execution_id import ExecutionId
 from goe.persistence.factory.orchestration_repo_client_factory import (
@@ -207,6 +209,9 @@ EXPECTED_OFFLOAD_ARGS = [
     "not_null_columns_csv",
     "offload_by_subpartition",
     "offload_chunk_column",
+    "offload_chunk_pipeline_depth",
+    "offload_chunk_planner",
+    "offload_chunk_target_count",
     "offload_distribute_enabled",
     "offload_fs_container",
     "offload_fs_prefix",
@@ -240,6 +245,7 @@ EXPECTED_OFFLOAD_ARGS = [
     "purge_backend_table",
     "reset_backend_table",
     "reset_hybrid_view",
+    "resume_execution_id",
     "reuse_backend_table",
     "sort_columns_csv",
     "sqoop_additional_options",
@@ -516,6 +522,15 @@ def oracle_offload_transport_connection(config_options):
     )
 
 
+def log_rdbms_connection_pool_stats(messages):
+    for stats in oracle_connection_pool_stats():
+        messages.log(
+            "RDBMS connection pool: %s"
+            % ", ".join("%s=%s" % (k, v) for k, v in stats.items()),
+            detail=VVERBOSE,
+        )
+
+
 def incremental_offload_partition_overrides(
     offload_operation, existing_part_digits, messages
 ):
@@ -601,9 +616,15 @@ def verify_row_count_by_aggs(
     verification_hvs,
     prior_hvs,
     inflight_offload_predicate=None,
+    fingerprint_partitions=None,
+    as_of_scn=None,
 ):
     """Light verification by running aggregate queries in both Oracle and backend
-    and comparing their results
+    and comparing their results.
+    COUNT(*) is included in the aggregate queries so row counts are verified by the same scan of each table.
+    fingerprint_partitions: Names of offloaded partitions to record as validated, see CrossDbValidator.validate()
+    as_of_scn: Pin the frontend query to the SCN used to read data for the offload
+    Returns: (status, source_rows, backend_rows)
     """
     ipa_predicate_type = offload_operation.ipa_predicate_type
     verify_parallelism = offload_operation.verify_parallelism
@@ -647,8 +668,12 @@ def verify_row_count_by_aggs(
         frontend_filters=frontend_filters,
         frontend_query_params=query_binds,
         frontend_parallelism=verify_parallelism,
+        fingerprint_partitions=fingerprint_partitions,
+        as_of_scn=as_of_scn,
+        row_count=True,
     )
-    return status
+    source_rows, backend_rows = validator.row_counts
+    return status, source_rows, backend_rows
 
 
 def offload_data_verification(
@@ -658,10 +683,32 @@ def offload_data_verification(
     offload_options: "OrchestrationConfig",
     messages: OffloadMessages,
     source_data_client: "OffloadSourceDataInterface",
+    verification_scn=None,
 ):
     """Verify offloaded data by either rowcount or sampling aggregation functions.
     Boundary conditions used to verify only those partitions offloaded by the current operation.
+    Aggregation verification also compares row counts in the same query and, if verification_scn is set,
+    queries the frontend as of the SCN used to read the offloaded data.
+    With --verify=fingerprint every chunk has already been verified against a fingerprint of the staged data,
+    that does not cover the insert from the load table into the final table so row counts are still verified.
     """
+    if (
+        offload_operation.verify_row_count
+        == offload_constants.OFFLOAD_VERIFY_FINGERPRINT
+        and offload_operation.execute
+    ):
+        if offload_operation.chunks_without_fingerprint:
+            messages.log(
+                "Staged data fingerprints unavailable for %s offload chunks"
+                % offload_operation.chunks_without_fingerprint,
+                detail=VERBOSE,
+            )
+        else:
+            messages.log(
+                "Staged data verified by fingerprints, verifying final table by row counts",
+                detail=VERBOSE,
+            )
+
     new_hvs = None
     prior_hvs = None
     if source_data_client.is_partition_append_capable():
@@ -696,7 +743,10 @@ def offload_data_verification(
             if new_hv_tuple:
                 new_hvs = new_hv_tuple[1]
 
-    if offload_operation.verify_row_count == "minus":
+    if offload_operation.verify_row_count in (
+        offload_constants.OFFLOAD_VERIFY_MINUS,
+        offload_constants.OFFLOAD_VERIFY_FINGERPRINT,
+    ):
         verify_fn = lambda: verify_offload_by_backend_count(
             offload_source_table,
             offload_target_table,
@@ -729,6 +779,17 @@ def offload_data_verification(
                     % (num_diff, source_rows, hybrid_rows)
                 )
     else:
+        fingerprint_partitions = None
+        if (
+            source_data_client.get_partition_append_predicate_type()
+            == INCREMENTAL_PREDICATE_TYPE_RANGE
+            and not offload_source_table.offload_by_subpartition
+            and not source_data_client.get_inflight_offload_predicate()
+        ):
+            # Record the offloaded partitions so that agg_validate does not need to validate them again.
+            fingerprint_partitions = (
+                source_data_client.partitions_to_offload.partition_names()
+            )
         verify_fn = lambda: verify_row_count_by_aggs(
             offload_source_table,
             offload_target_table,
@@ -738,19 +799,33 @@ def offload_data_verification(
             new_hvs,
             prior_hvs,
             inflight_offload_predicate=source_data_client.get_inflight_offload_predicate(),
+            fingerprint_partitions=fingerprint_partitions,
+            as_of_scn=verification_scn,
         )
-        if messages.offload_step(
+        verify_by_aggs_results = messages.offload_step(
             command_steps.STEP_VERIFY_EXPORTED_DATA,
             verify_fn,
             execute=offload_operation.execute,
-        ):
-            messages.log(
-                "Source and target table data matches: offload successful%s"
-                % (" (with warnings)" if messages.get_warnings() else ""),
-                ansi_code="green",
-            )
-        else:
-            raise OffloadException("Source and target mismatch")
+        )
+        if verify_by_aggs_results:
+            # None when the step was skipped.
+            status, source_rows, backend_rows = verify_by_aggs_results
+            if status:
+                messages.log(
+                    "Source and target table data matches: offload successful%s"
+                    % (" (with warnings)" if messages.get_warnings() else ""),
+                    ansi_code="green",
+                )
+                if offload_operation.execute:
+                    messages.log(
+                        "%s origin_rows, %s backend_rows" % (source_rows, backend_rows),
+                        detail=VERBOSE,
+                    )
+            else:
+                raise OffloadException(
+                    "Source and target mismatch: %s origin_rows, %s backend_rows"
+                    % (source_rows, backend_rows)
+                )
 
 
 def normalise_column_transformations(
@@ -1260,6 +1335,8 @@ class BaseOperation(object):
         self._messages = messages
         self.hwm_in_hybrid_view = None
         self.inflight_offload_predicate = None
+        # Number of offloaded chunks that were not verified by a staged data fingerprint
+        self.chunks_without_fingerprint = None
         # This is a hidden partition filter we can feed into "find partition" logic. Not exposed to the user
         self.less_or_equal_value = None
         self.goe_version = strict_version_ready(version())
@@ -1325,6 +1402,23 @@ class BaseOperation(object):
                 "Option MAX_OFFLOAD_CHUNK_COUNT/--max-offload-chunk-count must be between 1 and 1000"
             )
 
+        self.offload_chunk_planner = (
+            self.offload_chunk_planner.upper() if self.offload_chunk_planner else None
+        )
+        if (
+            self.offload_chunk_planner
+            and self.offload_chunk_planner
+            not in offload_constants.VALID_OFFLOAD_CHUNK_PLANNERS
+        ):
+            raise OptionValueError(
+                "Unsupported value for OFFLOAD_CHUNK_PLANNER/--offload-chunk-planner: %s"
+                % self.offload_chunk_planner
+            )
+        if self.offload_chunk_target_count:
+            self.offload_chunk_target_count = check_opt_is_posint(
+                "--offload-chunk-target-count", self.offload_chunk_target_count
+            )
+
         self.sort_columns_csv = (
             self.sort_columns_csv.upper() if self.sort_columns_csv else None
         )
@@ -1664,7 +1758,14 @@ class BaseOperation(object):
                     % (self.owner.upper(), self.table_name.upper())
                 )
         else:
-            if offload_target_table.has_rows():
+            if offload_target_table.has_rows() and self.resume_execution_id:
+                # Metadata is only saved once all chunks have been loaded, the rows are from the resumed offload.
+                messages.log(
+                    f"Resuming Offload into table without metadata: {offload_target_table.db_name}.{offload_target_table.table_name}",
+                    detail=VERBOSE,
+                )
+                return None
+            elif offload_target_table.has_rows():
                 # If the table has rows but no metadata then we need to abort.
                 raise OffloadException(
                     offload_constants.MISSING_METADATA_EXCEPTION_TEMPLATE
@@ -2112,6 +2213,33 @@ class OffloadOperation(BaseOperation):
         normalise_data_sampling_options(self)
         normalise_ddl_file(self, config, messages)
 
+        self.offload_chunk_pipeline_depth = check_opt_is_posint(
+            "OFFLOAD_CHUNK_PIPELINE_DEPTH/--offload-chunk-pipeline-depth",
+            self.offload_chunk_pipeline_depth,
+        )
+        if (
+            self.offload_chunk_pipeline_depth
+            > offload_constants.MAX_OFFLOAD_CHUNK_PIPELINE_DEPTH
+        ):
+            raise OptionValueError(
+                "Option OFFLOAD_CHUNK_PIPELINE_DEPTH/--offload-chunk-pipeline-depth must be between 1 and %s"
+                % offload_constants.MAX_OFFLOAD_CHUNK_PIPELINE_DEPTH
+            )
+
+        if self.resume_execution_id:
+            if self.reset_backend_table:
+                raise OptionValueError(
+                    "Conflicting options --reset-backend-table and --resume cannot be used together"
+                )
+            try:
+                self.resume_execution_id = str(
+                    ExecutionId.from_str(str(self.resume_execution_id))
+                )
+            except (AssertionError, ValueError):
+                raise OptionValueError(
+                    "Invalid execution id for --resume: %s" % self.resume_execution_id
+                )
+
         self._setup_offload_step(messages)
 
     def vars(self):
@@ -2231,6 +2359,9 @@ class OffloadOperation(BaseOperation):
             not_null_columns_csv=options.not_null_columns_csv,
             offload_by_subpartition=options.offload_by_subpartition,
             offload_chunk_column=options.offload_chunk_column,
+            offload_chunk_pipeline_depth=options.offload_chunk_pipeline_depth,
+            offload_chunk_planner=options.offload_chunk_planner,
+            offload_chunk_target_count=options.offload_chunk_target_count,
             offload_distribute_enabled=options.offload_distribute_enabled,
             offload_fs_container=options.offload_fs_container,
             offload_fs_prefix=options.offload_fs_prefix,
@@ -2262,6 +2393,7 @@ class OffloadOperation(BaseOperation):
             purge_backend_table=options.purge_backend_table,
             reset_backend_table=options.reset_backend_table,
             reset_hybrid_view=options.reset_hybrid_view,
+            resume_execution_id=options.resume_execution_id,
             reuse_backend_table=options.reuse_backend_table,
             skip=options.skip,
             sort_columns_csv=options.sort_columns_csv,
@@ -2370,6 +2502,15 @@ class OffloadOperation(BaseOperation):
             not_null_columns_csv=operation_dict.get("not_null_columns_csv"),
             offload_by_subpartition=operation_dict.get("offload_by_subpartition"),
             offload_chunk_column=operation_dict.get("offload_chunk_column"),
+            offload_chunk_pipeline_depth=operation_dict.get(
+                "offload_chunk_pipeline_depth",
+                orchestration_defaults.offload_chunk_pipeline_depth_default(),
+            ),
+            offload_chunk_planner=operation_dict.get(
+                "offload_chunk_planner",
+                orchestration_defaults.offload_chunk_planner_default(),
+            ),
+            offload_chunk_target_count=operation_dict.get("offload_chunk_target_count"),
             offload_distribute_enabled=operation_dict.get(
                 "offload_distribute_enabled",
                 orchestration_defaults.offload_distribute_enabled_default(),
@@ -2452,6 +2593,7 @@ class OffloadOperation(BaseOperation):
             ),
             reset_backend_table=operation_dict.get("reset_backend_table", False),
             reset_hybrid_view=operation_dict.get("reset_hybrid_view", False),
+            resume_execution_id=operation_dict.get("resume_execution_id"),
             reuse_backend_table=operation_dict.get("reuse_backend_table", False),
             skip=operation_dict.get("skip", orchestration_defaults.skip_default()),
             sort_columns_csv=operation_dict.get(
@@ -2653,7 +2795,7 @@ def offload_operation_logic(
         if incr_append_capable:
             if source_data_client.nothing_to_offload():
                 return False
-        else:
+        elif not offload_operation.resume_execution_id:
             messages.notice(
                 offload_constants.TARGET_HAS_DATA_MESSAGE_TEMPLATE
                 % (offload_target_table.db_name, offload_target_table.table_name)
@@ -2870,19 +3012,44 @@ def offload_table(
         offload_source_table.columns,
         data_transport_client.get_staging_file().get_staging_columns(),
     )
-    offload_target_table.setup_staging_area_step(
-        data_transport_client.get_staging_file()
-    )
 
-    rows_offloaded = offload_data_to_target(
-        data_transport_client,
-        offload_source_table,
-        offload_target_table,
-        offload_operation,
-        offload_options,
-        source_data_client,
-        messages,
-    )
+    offload_resume = None
+    if offload_operation.resume_execution_id:
+        offload_resume = OffloadResume(
+            offload_operation.resume_execution_id,
+            offload_source_table,
+            offload_target_table,
+            source_data_client,
+            repo_client,
+            messages,
+        )
+
+    if offload_resume and offload_resume.staged_chunk:
+        # Setting up the staging area would remove the staged chunk we are about to load.
+        messages.log(
+            "Reusing data staged for chunk %s"
+            % offload_resume.staged_chunk["chunk_number"],
+            detail=VERBOSE,
+        )
+    else:
+        offload_target_table.setup_staging_area_step(
+            data_transport_client.get_staging_file()
+        )
+
+    try:
+        rows_offloaded = offload_data_to_target(
+            data_transport_client,
+            offload_source_table,
+            offload_target_table,
+            offload_operation,
+            offload_options,
+            source_data_client,
+            messages,
+            offload_resume=offload_resume,
+        )
+    finally:
+        data_transport_client.close()
+    log_rdbms_connection_pool_stats(messages)
     messages.log(
         "%s: %s"
         % (offload_constants.TOTAL_ROWS_OFFLOADED_LOG_TEXT, str(rows_offloaded)),
@@ -2917,6 +3084,11 @@ def offload_table(
                 offload_options,
                 messages,
                 source_data_client,
+                verification_scn=(
+                    pre_offload_snapshot
+                    if offload_operation.offload_transport_consistent_read
+                    else None
+                ),
             )
         else:
             messages.log(
@@ -3182,6 +3354,11 @@ def get_options(usage=None, operation_name=None):
         default=False,
         help=option_descriptions.RESET_BACKEND_TABLE,
     )
+    opt.add_option(
+        "--resume",
+        dest="resume_execution_id",
+        help=option_descriptions.RESUME_EXECUTION_ID,
+    )
     opt.add_option(
         "--reset-hybrid-view",
         dest="reset_hybrid_view",
@@ -3249,6 +3426,18 @@ def get_options(usage=None, operation_name=None):
         default=orchestration_defaults.max_offload_chunk_count_default(),
         help="Restrict number of partitions offloaded per cycle. Allowable values between 1 and 1000.",
     )
+    opt.add_option(
+        "--offload-chunk-planner",
+        dest="offload_chunk_planner",
+        default=orchestration_defaults.offload_chunk_planner_default(),
+        help="Method used to group partitions into offload chunks. GREEDY fills each chunk up to the max chunk size/count, BALANCED gives chunks of similar estimated cost. Valid values: %s"
+        % "|".join(offload_constants.VALID_OFFLOAD_CHUNK_PLANNERS),
+    )
+    opt.add_option(
+        "--offload-chunk-target-count",
+        dest="offload_chunk_target_count",
+        help="Split partitions into this number of offload chunks of similar estimated cost, overrides max chunk size/count and implies the BALANCED chunk planner",
+    )
     opt.add_option(
         "--bucket-hash-column",
         dest="bucket_hash_col",
@@ -3351,6 +3540,13 @@ def get_options(usage=None, operation_name=None):
         dest="offload_chunk_column",
         help="Splits load data by this column during insert from the load table to the final table. This can be used to manage memory usage",
     )
+    opt.add_option(
+        "--offload-chunk-pipeline-depth",
+        dest="offload_chunk_pipeline_depth",
+        default=orchestration_defaults.offload_chunk_pipeline_depth_default(),
+        help="Number of staging areas used when offloading in multiple chunks. Values greater than 1 allow the next chunk to be transported while the previous chunk is loaded into the final table. Allowable values between 1 and %s."
+        % offload_constants.MAX_OFFLOAD_CHUNK_PIPELINE_DEPTH,
+    )
     opt.add_option(
         "--offload-chunk-impala-insert-hint",
         dest="impala_insert_hint",
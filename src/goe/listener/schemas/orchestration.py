@@ -27,6 +27,7 @@ from pydantic import UUID4, Field, Json, PositiveInt, validator
 from goe.config import option_descriptions
 import goe.config.orchestration_defaults as defaults
 from goe.listener.schemas.base import BaseSchema, TotaledResults
+from goe.offload.offload_constants import MAX_OFFLOAD_CHUNK_PIPELINE_DEPTH
 from goe.orchestration.execution_id import ExecutionId
 
 
@@ -353,6 +354,25 @@ class OffloadOptions(BaseSchema):
         cli=("--max-offload-chunk-size"),
         regex=r"^(?P<value>[\d+\.?]*[KMGT]?[\d]?)$",
     )
+    offload_chunk_planner: Optional[str] = Field(
+        default=defaults.offload_chunk_planner_default(),
+        title="Offload chunk planner",
+        description=(
+            "GREEDY|BALANCED. Method used to group partitions into offload chunks. GREEDY fills each chunk up "
+            "to the max chunk size/count, BALANCED gives chunks of similar estimated cost"
+        ),
+        cli=("--offload-chunk-planner"),
+        regex=r"^(GREEDY|BALANCED)$",
+    )
+    offload_chunk_target_count: Optional[PositiveInt] = Field(
+        default=None,
+        title="Offload chunk target count",
+        description=(
+            "Split partitions into this number of offload chunks of similar estimated cost, overrides max "
+            "chunk size/count and implies the BALANCED chunk planner"
+        ),
+        cli=("--offload-chunk-target-count"),
+    )
     ansi: Optional[bool] = Field(
         default=False,
         title="ANSI",
@@ -379,7 +399,7 @@ class OffloadOptions(BaseSchema):
             "target table after the load completes."
         ),
         cli=("--verify", "--no-verify"),
-        regex=r"^(False|minus|aggregate)$",
+        regex=r"^(False|minus|aggregate|fingerprint)$",
     )
     ver_check: Optional[bool] = Field(
         default=True,
@@ -408,6 +428,25 @@ class OffloadOptions(BaseSchema):
         cli=("--offload-chunk-column"),
         no_api=True,
     )
+    offload_chunk_pipeline_depth: Optional[PositiveInt] = Field(
+        default=try_cast_int(defaults.offload_chunk_pipeline_depth_default(), 1),
+        title="Offload chunk pipeline depth",
+        description=(
+            "Number of staging areas used when offloading in multiple chunks. Values greater than 1 allow "
+            "the next chunk to be transported while the previous chunk is loaded into the final table."
+        ),
+        cli=("--offload-chunk-pipeline-depth"),
+    )
+
+    @validator("offload_chunk_pipeline_depth")
+    def validate_offload_chunk_pipeline_depth(cls, v):
+        if v < 1 or v > MAX_OFFLOAD_CHUNK_PIPELINE_DEPTH:
+            raise ValueError(
+                "Offload chunk pipeline depth must be between 1 and %s"
+                % MAX_OFFLOAD_CHUNK_PIPELINE_DEPTH
+            )
+        return v
+
     impala_insert_hint: Optional[str] = Field(
         default=None,
         title="Impala insert hint",
@@ -721,6 +760,12 @@ class OffloadOptions(BaseSchema):
         ),
         cli=("--reset-hybrid-view"),
     )
+    resume_execution_id: Optional[str] = Field(
+        default=None,
+        title="Resume execution id",
+        description=option_descriptions.RESUME_EXECUTION_ID,
+        cli=("--resume"),
+    )
     reuse_backend_table: Optional[bool] = Field(
         default=False,
         title="Reuse backend table",
@@ -536,6 +536,7 @@ class BackendApiInterface(metaclass=ABCMeta):
         filter_clauses=None,
         measures=None,
         agg_fns=None,
+        count_star=False,
     ):
         """Generate a SQL statement appropriate for running in the backend.
         This is common functionality for multiple backends, individual backends may override it.
@@ -559,6 +560,8 @@ class BackendApiInterface(metaclass=ABCMeta):
         if column_names:
             projection += [self.enclose_identifier(_) for _ in column_names]
             self._debug("gen_sql_text base projection: %s" % str(projection))
+        if count_star:
+            projection.append("COUNT(*)")
         if measures and agg_fns:
             projection += [
                 "%s(%s)" % (fn.upper(), self.enclose_identifier(m))
@@ -581,7 +584,7 @@ class BackendApiInterface(metaclass=ABCMeta):
                 "\nGROUP BY "
                 + "\n,        ".join([self.enclose_identifier(_) for _ in column_names])
             )
-            if measures and column_names
+            if (measures or count_star) and column_names
             else ""
         )
         order_by_clause = (
@@ -589,7 +592,7 @@ class BackendApiInterface(metaclass=ABCMeta):
                 "\nORDER BY "
                 + "\n,        ".join([self.enclose_identifier(_) for _ in column_names])
             )
-            if agg_fns and column_names
+            if (agg_fns or count_star) and column_names
             else ""
         )
         sql = """SELECT %(projection)s
@@ -1347,6 +1350,12 @@ FROM   %(db)s.%(table)s%(where_clause)s%(group_by)s%(order_by)s""" % {
         """Does the table/view exist"""
 
     @abstractmethod
+    @abstractmethod
+    def fingerprint_hash_sql_expression(self, string_expression):
+        """Return a SQL expression for the integer value of the first 15 hex digits of the MD5 of a string
+        expression, as hashed by StagedDataFingerprint, or None if the backend cannot calculate it.
+        """
+
     def format_query_parameter(self, param_name):
         """For backends that support query parameters this method prefixes or suffixes a parameter name.
         For example on BigQuery it prefixes an @ symbol.
@@ -1439,6 +1448,7 @@ FROM   %(db)s.%(table)s%(where_clause)s%(group_by)s%(order_by)s""" % {
         filter_clauses=None,
         measures=None,
         agg_fns=None,
+        count_star=False,
     ):
         """Generate a SQL statement appropriate for running in the backend.
         column_names: A list of column names to select, these are dimensions when aggregating.
@@ -1446,6 +1456,7 @@ FROM   %(db)s.%(table)s%(where_clause)s%(group_by)s%(order_by)s""" % {
         filter_clauses: A list of 'col=something' strings.
         measures: A list of column names to have agg_fns applied to.
         agg_fns: A list of agg fns, e.g. ['sum', 'max']
+        count_star: Include COUNT(*) in the projection, after column_names and before any measures.
         """
 
     @abstractmethod
@@ -25,6 +25,7 @@
 from abc import ABCMeta, abstractmethod
 import collections
 import inspect
+import json
 import logging
 from typing import Callable, Optional, TYPE_CHECKING
 
@@ -50,6 +51,7 @@ from goe.offload.offload_constants import (
     PART_COL_GRANULARITY_DAY,
     PART_COL_GRANULARITY_MONTH,
     PART_COL_GRANULARITY_YEAR,
+    STAGED_CHUNK_MANIFEST_FILE_NAME,
 )
 from goe.offload.offload_functions import (
     get_hybrid_threshold_clauses,
@@ -57,10 +59,17 @@ from goe.offload.offload_functions import (
     load_db_name,
 )
 from goe.offload.offload_messages import VERBOSE, VVERBOSE
+from goe.offload.staged_data_fingerprint import (
+    FINGERPRINT_HASHED_KINDS,
+    FINGERPRINT_KIND_OTHER,
+    FINGERPRINT_KIND_STRING,
+    FINGERPRINT_NUMERIC_KINDS,
+    StagedDataFingerprint,
+)
 from goe.offload.synthetic_partition_literal import SyntheticPartitionLiteral
 from goe.orchestration import command_steps
 from goe.offload.hadoop.hadoop_column import HADOOP_TYPE_STRING
-from goe.util.misc_functions import csv_split
+from goe.util.misc_functions import add_suffix_in_same_case, csv_split
 
 if TYPE_CHECKING:
     from goe.config.orchestration_config import OrchestrationConfig
@@ -97,6 +106,10 @@ OFFLOAD_CHUNK_COLUMN_MESSAGE_PATTERN = "Identified %s sub-chunks"
 PARTITION_KEY_OUT_OF_RANGE = (
     "Value(s) for {column} exceed configured range ({start} - {end})"
 )
+# Maximum source values converted by a partition function in a single backend query
+PARTITION_FUNCTION_LITERAL_BATCH_SIZE = 1000
+# Synthetic literals memoized for each partition function
+PARTITION_FUNCTION_LITERAL_MEMO_SIZE = 10000
 PARTITION_FUNCTION_ARG_COUNT_EXCEPTION_TEXT = "must only have 1 input parameter"
 PARTITION_FUNCTION_DOES_NOT_EXIST_EXCEPTION_TEXT = "Partition function does not exist"
 PARTITION_FUNCTION_ARG_TYPE_EXCEPTION_TEXT = (
@@ -113,6 +126,53 @@ logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
 
 
+###########################################################################
+# PartitionFunctionLiteral
+###########################################################################
+
+
+class PartitionFunctionLiteral:
+    """Python function equivalent of a partition function UDF, the UDF can only be evaluated by the backend.
+    convert_values() converts any number of source values with one backend query per batch and an LRU memo means
+    recently converted values do not need to go back to the backend at all.
+    to_sql_literal_fn: Returns a backend SQL literal for a source value.
+    evaluate_fn: Returns the partition function output for a list of SQL literals, in the same order.
+    """
+
+    def __init__(
+        self,
+        to_sql_literal_fn: Callable,
+        evaluate_fn: Callable,
+        batch_size: int = PARTITION_FUNCTION_LITERAL_BATCH_SIZE,
+        memo_size: int = PARTITION_FUNCTION_LITERAL_MEMO_SIZE,
+    ):
+        self._to_sql_literal_fn = to_sql_literal_fn
+        self._evaluate_fn = evaluate_fn
+        self._batch_size = batch_size
+        self._memo_size = memo_size
+        self._memo = collections.OrderedDict()
+
+    def __call__(self, source_value):
+        return self.convert_values([source_value])[0]
+
+    def convert_values(self, source_values) -> list:
+        sql_literals = [self._to_sql_literal_fn(_) for _ in source_values]
+        converted = {}
+        for sql_literal in sql_literals:
+            if sql_literal in self._memo:
+                self._memo.move_to_end(sql_literal)
+                converted[sql_literal] = self._memo[sql_literal]
+        pending = list(dict.fromkeys(_ for _ in sql_literals if _ not in converted))
+        for i in range(0, len(pending), self._batch_size):
+            batch = pending[i : i + self._batch_size]
+            converted.update(zip(batch, self._evaluate_fn(batch)))
+        for sql_literal in pending:
+            self._memo[sql_literal] = converted[sql_literal]
+        while len(self._memo) > self._memo_size:
+            self._memo.popitem(last=False)
+        return [converted[_] for _ in sql_literals]
+
+
 ###########################################################################
 # BackendTableInterface
 ###########################################################################
@@ -214,6 +274,7 @@ class BackendTableInterface(metaclass=ABCMeta):
         self._offload_distribute_enabled = None
         self._offload_stats_method = None
         self._partition_functions = None
+        self._partition_function_literals = {}
         self._sort_columns = None
         self._final_table_casts = {}
         self._user_requested_offload_chunk_column = None
@@ -750,6 +811,22 @@ class BackendTableInterface(metaclass=ABCMeta):
                 }
         return final_table_casts
 
+    def _gen_load_table_path(self):
+        """Return the cloud storage URI for the load table, only applicable to backends staging in cloud storage."""
+        return self._get_dfs_client().gen_uri(
+            self._orchestration_config.offload_fs_scheme,
+            self._orchestration_config.offload_fs_container,
+            self._orchestration_config.offload_fs_prefix,
+            backend_db=self._load_db_name,
+            table_name=self._load_table_name,
+        )
+
+    def _gen_staged_chunk_manifest_path(self):
+        return "%s/%s" % (
+            self.get_staging_table_location().rstrip("/"),
+            STAGED_CHUNK_MANIFEST_FILE_NAME,
+        )
+
     def _gen_mat_join_insert_sqls(
         self,
         select_expr_tuples,
@@ -922,23 +999,24 @@ class BackendTableInterface(metaclass=ABCMeta):
         assert isinstance(partition_column, ColumnMetadataInterface)
         if partition_column.partition_info.function:
             # We cannot use Python logic to provide synthetic value conversion because we're using a backend UDF.
-            # partition_fn needs to be a call to the backend.
-
-            def partition_fn(source_value):
-                source_column = self.get_column(
-                    partition_column.partition_info.source_column_name
-                )
-                sql_literal = self._db_api.to_backend_literal(
-                    source_value, data_type=source_column.data_type
-                )
-                sql = "SELECT {}".format(
-                    self._partition_function_sql_expression(
-                        partition_column.partition_info, sql_literal
+            # partition_fn needs to be a call to the backend, one per column so memoized values are reused.
+            partition_info = partition_column.partition_info
+            fn_key = (partition_column.name.upper(), partition_info.function)
+            if fn_key not in self._partition_function_literals:
+
+                def to_sql_literal_fn(source_value):
+                    source_column = self.get_column(partition_info.source_column_name)
+                    return self._db_api.to_backend_literal(
+                        source_value, data_type=source_column.data_type
                     )
-                )
-                row = self._db_api.execute_query_fetch_one(sql)
-                return row[0] if row else None
 
+                self._partition_function_literals[fn_key] = PartitionFunctionLiteral(
+                    to_sql_literal_fn,
+                    lambda sql_literals: self._evaluate_partition_function(
+                        partition_info, sql_literals
+                    ),
+                )
+            partition_fn = self._partition_function_literals[fn_key]
         else:
             partition_fn = SyntheticPartitionLiteral.gen_synthetic_literal_function(
                 partition_column, self.get_columns()
@@ -1041,6 +1119,25 @@ class BackendTableInterface(metaclass=ABCMeta):
                 backend_column, partition_info.granularity
             )
 
+    def _evaluate_partition_function(self, partition_info, sql_literals) -> list:
+        """Return the output of a partition function UDF for each of sql_literals, in a single query."""
+        sql = self._gen_partition_function_literals_sql(partition_info, sql_literals)
+        rows = self._db_api.execute_query_fetch_all(sql)
+        literals_by_position = {position: literal for position, literal in rows or []}
+        return [literals_by_position.get(_) for _ in range(len(sql_literals))]
+
+    def _gen_partition_function_literals_sql(self, partition_info, sql_literals):
+        """Return SQL selecting (position, partition function output) for each of sql_literals.
+        UNION ALL is portable, individual backends may override with something more concise.
+        """
+        return "\nUNION ALL\n".join(
+            "SELECT {} AS pos, {} AS synthetic_value".format(
+                position,
+                self._partition_function_sql_expression(partition_info, sql_literal),
+            )
+            for position, sql_literal in enumerate(sql_literals)
+        )
+
     def _partition_function_sql_expression(self, partition_info, sql_input_expression):
         """Return a string containing a call to a partition function UDF.
         e.g. SCHEMA.UDF_NAME(sql_input_expression)
@@ -1434,18 +1531,34 @@ class BackendTableInterface(metaclass=ABCMeta):
         expected_rows,
         staging_columns,
         log_profile=None,
+        staged_fingerprint=None,
     ):
         """Run some tests on the data offloaded to the load table before moving it to the final table
         Most tests produce warnings only, however some are coded to raise an exception (fatal=True)
         The most important test is that COUNT(*) of the staged data matches what we thought we transferred
+        If staged_fingerprint is provided then per column NULL counts, numeric MIN/MAX and value hash sums are
+        calculated by the same query and compared with the fingerprint taken by offload transport.
         """
         pred_list = self._validate_staged_data_rules(
             rdbms_part_cols, rdbms_columns, staging_columns
         )
-        projection = [
-            "MAX(CASE WHEN %s THEN %s END)" % (_.expression, i)
-            for i, _ in enumerate(pred_list)
-        ] + ["COUNT(*)"]
+        fingerprint_columns = self._staged_fingerprint_columns(
+            staged_fingerprint, staging_columns
+        )
+        projection = (
+            [
+                "MAX(CASE WHEN %s THEN %s END)" % (_.expression, i)
+                for i, _ in enumerate(pred_list)
+            ]
+            + [
+                expr
+                for _, column_kind, column_expr in fingerprint_columns
+                for expr in self._staged_fingerprint_projection(
+                    column_kind, column_expr
+                )
+            ]
+            + ["COUNT(*)"]
+        )
         pred_messages = "\n,      ".join(projection)
         sql = """SELECT %s\nFROM   %s""" % (
             pred_messages,
@@ -1461,6 +1574,14 @@ class BackendTableInterface(metaclass=ABCMeta):
         if validation_set:
             validation_set = list(validation_set)
             count_star = validation_set.pop()
+            if fingerprint_columns:
+                self._check_staged_fingerprint(
+                    staged_fingerprint,
+                    fingerprint_columns,
+                    validation_set[len(pred_list) :],
+                    count_star,
+                )
+                validation_set = validation_set[: len(pred_list)]
             if expected_rows is None:
                 self._log("Load table row count: %s" % count_star, detail=VERBOSE)
             else:
@@ -1501,6 +1622,96 @@ class BackendTableInterface(metaclass=ABCMeta):
         """Default to no query options for load table validation, Hive has an override."""
         return {}
 
+    def _staged_fingerprint_columns(self, staged_fingerprint, staging_columns) -> list:
+        """Return a list of (column name, kind, load table column expression) for fingerprinted columns.
+        MIN/MAX are only compared for columns staged as numbers and string hash sums for columns staged as
+        strings, for anything else the kind is downgraded to FINGERPRINT_KIND_OTHER and only NULL counts are
+        compared.
+        """
+        if not staged_fingerprint:
+            return []
+        fingerprint_columns = []
+        for column_name, column in staged_fingerprint.columns.items():
+            staging_col = match_table_column(column_name, staging_columns)
+            if not staging_col:
+                continue
+            column_kind = column["kind"]
+            if column_kind in FINGERPRINT_NUMERIC_KINDS and (
+                staging_col.is_string_based() or not staging_col.is_number_based()
+            ):
+                column_kind = FINGERPRINT_KIND_OTHER
+            elif (
+                column_kind == FINGERPRINT_KIND_STRING
+                and not staging_col.is_string_based()
+            ):
+                column_kind = FINGERPRINT_KIND_OTHER
+            fingerprint_columns.append(
+                (
+                    column_name,
+                    column_kind,
+                    self._format_staging_column_name(staging_col),
+                )
+            )
+        return fingerprint_columns
+
+    def _staged_fingerprint_hash_expression(self, column_kind, column_expr):
+        """Return a SQL expression hashing column_expr as StagedDataFingerprint does, None if it is not hashed."""
+        if column_kind not in FINGERPRINT_HASHED_KINDS:
+            return None
+        if column_kind != FINGERPRINT_KIND_STRING:
+            column_expr = "CAST(%s AS %s)" % (
+                column_expr,
+                self._db_api.generic_string_data_type(),
+            )
+        return self._db_api.fingerprint_hash_sql_expression(column_expr)
+
+    def _staged_fingerprint_projection(self, column_kind, column_expr) -> list:
+        projection = ["COUNT(%s)" % column_expr]
+        if column_kind in FINGERPRINT_NUMERIC_KINDS:
+            projection.extend(["MIN(%s)" % column_expr, "MAX(%s)" % column_expr])
+        hash_expr = self._staged_fingerprint_hash_expression(column_kind, column_expr)
+        if hash_expr:
+            projection.append("COALESCE(SUM(%s), 0)" % hash_expr)
+        return projection
+
+    def _check_staged_fingerprint(
+        self, staged_fingerprint, fingerprint_columns, fingerprint_values, count_star
+    ):
+        """Compare staged_fingerprint with values projected by _staged_fingerprint_projection()."""
+        load_fingerprint = StagedDataFingerprint()
+        load_fingerprint.add_rows(count_star)
+        fingerprint_values = list(fingerprint_values)
+        for column_name, column_kind, column_expr in fingerprint_columns:
+            nulls = count_star - fingerprint_values.pop(0)
+            column_min, column_max, column_hash_sum = None, None, None
+            if column_kind in FINGERPRINT_NUMERIC_KINDS:
+                column_min = fingerprint_values.pop(0)
+                column_max = fingerprint_values.pop(0)
+            if self._staged_fingerprint_hash_expression(column_kind, column_expr):
+                column_hash_sum = fingerprint_values.pop(0)
+            load_fingerprint.set_column(
+                column_name,
+                column_kind,
+                nulls,
+                column_min=column_min,
+                column_max=column_max,
+                column_hash_sum=column_hash_sum,
+            )
+        differences = staged_fingerprint.compare(load_fingerprint)
+        if differences:
+            self._log(
+                "Staged data fingerprint: %s" % staged_fingerprint, detail=VVERBOSE
+            )
+            raise DataValidationException(
+                "Staged data fingerprint does not match load table: %s"
+                % ", ".join(differences)
+            )
+        self._log(
+            "Staged data fingerprint matches load table (%s columns)"
+            % len(fingerprint_columns),
+            detail=VERBOSE,
+        )
+
     # enforced private methods
 
     @abstractmethod
@@ -2164,6 +2375,22 @@ class BackendTableInterface(metaclass=ABCMeta):
     def predicate_to_where_clause(self, predicate, columns_override=None):
         pass
 
+    def read_staged_chunk_manifest(self) -> Optional[dict]:
+        """Return the manifest written by write_staged_chunk_manifest(), None if there is no usable manifest.
+        Any failure to read the manifest is logged and treated as no manifest, the chunk will be transported again.
+        """
+        manifest_path = self._gen_staged_chunk_manifest_path()
+        try:
+            if not self._get_dfs_client().stat(manifest_path):
+                return None
+            return json.loads(self._get_dfs_client().read(manifest_path, as_str=True))
+        except Exception as exc:
+            self._log(
+                f"Unable to read staged chunk manifest {manifest_path}: {str(exc)}",
+                detail=VVERBOSE,
+            )
+            return None
+
     def refresh_operational_settings(
         self,
         offload_operation=None,
@@ -2222,6 +2449,19 @@ class BackendTableInterface(metaclass=ABCMeta):
             self.db_name, self.table_name, new_partition_stats, additive_stats
         )
 
+    def set_staging_slot(self, staging_slot: int):
+        """Switch the load table, and therefore the staging location, to an alternate staging slot.
+        This allows one offload chunk to be staged while a previous chunk is loaded from a different slot.
+        Slot 0 is the regular load table.
+        """
+        assert isinstance(staging_slot, int) and staging_slot >= 0
+        if staging_slot:
+            self._load_table_name = add_suffix_in_same_case(
+                self.table_name, "_slot%s" % staging_slot
+            )
+        else:
+            self._load_table_name = self.table_name
+
     def set_table_stats(self, new_table_stats, additive_stats):
         return self._db_api.set_table_stats(
             self.db_name, self.table_name, new_table_stats, additive_stats
@@ -2325,6 +2565,7 @@ class BackendTableInterface(metaclass=ABCMeta):
         rdbms_columns,
         expected_rows,
         staging_columns,
+        staged_fingerprint=None,
     ):
         """Validate the staged data before we insert it into the final backend table.
         There is scope for this to need a backend specific override but for the time being it is common
@@ -2336,11 +2577,28 @@ class BackendTableInterface(metaclass=ABCMeta):
             expected_rows,
             staging_columns,
             log_profile=self._log_profile_after_verification_queries,
+            staged_fingerprint=staged_fingerprint,
         )
 
     def view_exists(self):
         return self._db_api.view_exists(self.db_name, self.table_name)
 
+    def write_staged_chunk_manifest(self, manifest: dict):
+        """Write a manifest to the staging area recording the offload chunk that has been fully staged.
+        This allows a resumed offload to load the staged data without transporting it again.
+        The manifest is non-essential, a failure to write it is reported as a warning.
+        """
+        manifest_path = self._gen_staged_chunk_manifest_path()
+        self._log(f"Writing staged chunk manifest: {manifest_path}", detail=VVERBOSE)
+        try:
+            self._get_dfs_client().write(
+                manifest_path, json.dumps(manifest), overwrite=True
+            )
+        except Exception as exc:
+            self._warning(
+                f"Unable to write staged chunk manifest {manifest_path}: {str(exc)}"
+            )
+
     def _warning(self, msg):
         self._messages.warning(msg)
         logger.warn(msg)
@@ -2434,6 +2692,7 @@ class BackendTableInterface(metaclass=ABCMeta):
         rdbms_columns,
         expected_rows,
         staging_columns,
+        staged_fingerprint=None,
     ):
         self._offload_step(
             command_steps.STEP_VALIDATE_DATA,
@@ -2442,6 +2701,7 @@ class BackendTableInterface(metaclass=ABCMeta):
                 rdbms_columns,
                 expected_rows,
                 staging_columns,
+                staged_fingerprint=staged_fingerprint,
             ),
         )
 
@@ -1323,6 +1323,13 @@ LIMIT 1""" % {
     def exists(self, db_name, object_name):
         return self._object_exists(db_name, object_name)
 
+    def fingerprint_hash_sql_expression(self, string_expression):
+        assert string_expression
+        return (
+            "CAST(CAST(CONCAT('0x', SUBSTR(TO_HEX(MD5(%s)), 1, 15)) AS INT64) AS NUMERIC)"
+            % string_expression
+        )
+
     def format_query_parameter(self, param_name):
         assert param_name
         return "@{}".format(param_name)
@@ -1536,6 +1543,7 @@ FROM   %(from_db_table)s%(where)s""" % {
         filter_clauses=None,
         measures=None,
         agg_fns=None,
+        count_star=False,
     ):
         return self._gen_sql_text_common(
             db_name,
@@ -1544,6 +1552,7 @@ FROM   %(from_db_table)s%(where)s""" % {
             filter_clauses=filter_clauses,
             measures=measures,
             agg_fns=agg_fns,
+            count_star=count_star,
         )
 
     def generic_string_data_type(self):
@@ -100,13 +100,7 @@ class BackendBigQueryTable(BackendTableInterface):
         self._sql_engine_name = "BigQuery"
         self._log_profile_after_final_table_load = True
         self._log_profile_after_verification_queries = True
-        self._load_table_path = self._get_dfs_client().gen_uri(
-            self._orchestration_config.offload_fs_scheme,
-            self._orchestration_config.offload_fs_container,
-            self._orchestration_config.offload_fs_prefix,
-            backend_db=self._load_db_name,
-            table_name=self._load_table_name,
-        )
+        self._load_table_path = self._gen_load_table_path()
         self._kms_key_name = self._db_api.kms_key_name()
 
     ###########################################################################
@@ -186,6 +180,13 @@ class BackendBigQueryTable(BackendTableInterface):
         else:
             return None
 
+    def _gen_partition_function_literals_sql(self, partition_info, sql_literals):
+        """One array rather than UNION ALL to keep the query text short for large batches."""
+        return "SELECT pos, {} AS synthetic_value FROM UNNEST([{}]) AS source_value WITH OFFSET AS pos".format(
+            self._partition_function_sql_expression(partition_info, "source_value"),
+            ", ".join(sql_literals),
+        )
+
     def _gen_synthetic_partition_column_object(self, synthetic_name, canonical_column):
         """Return BigQuery column object for synthetic partition column"""
         if canonical_column.is_date_based():
@@ -598,6 +599,10 @@ class BackendBigQueryTable(BackendTableInterface):
     def result_cache_area_exists(self):
         return self._result_cache_db_exists()
 
+    def set_staging_slot(self, staging_slot: int):
+        super(BackendBigQueryTable, self).set_staging_slot(staging_slot)
+        self._load_table_path = self._gen_load_table_path()
+
     def setup_result_cache_area(self):
         """Prepare result cache area for Hybrid Queries"""
         if self.create_database_supported() and self._user_requested_create_backend_db:
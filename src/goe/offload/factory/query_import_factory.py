@@ -23,14 +23,28 @@ from goe.util.parquet_encoder import ParquetEncoder
 
 
 def query_import_factory(
-    staging_file, messages, compression=False, base64_columns=None
+    staging_file,
+    messages,
+    compression=False,
+    base64_columns=None,
+    offload_options=None,
+    fingerprint=False,
+    adaptive_fetch=True,
 ):
+    fetch_kwargs = {}
+    if offload_options and adaptive_fetch:
+        fetch_kwargs = {
+            "fetch_batch_bytes": offload_options.offload_transport_query_import_batch_size,
+            "max_fetch_batch_bytes": offload_options.offload_transport_query_import_max_batch_size,
+        }
     if staging_file.file_format == FILE_STORAGE_FORMAT_AVRO:
         return AvroEncoder(
             staging_file.get_file_schema_json(),
             messages,
             compression=compression,
             base64_columns=base64_columns,
+            fingerprint=fingerprint,
+            **fetch_kwargs,
         )
     elif staging_file.file_format == FILE_STORAGE_FORMAT_PARQUET:
         return ParquetEncoder(
@@ -38,6 +52,23 @@ def query_import_factory(
             messages,
             compression=compression,
             base64_columns=base64_columns,
+            row_group_size=(
+                offload_options.offload_staging_parquet_row_group_size
+                if offload_options
+                else None
+            ),
+            data_page_size=(
+                offload_options.offload_staging_parquet_data_page_size
+                if offload_options
+                else None
+            ),
+            use_dictionary=(
+                offload_options.offload_staging_parquet_use_dictionary
+                if offload_options
+                else True
+            ),
+            fingerprint=fingerprint,
+            **fetch_kwargs,
         )
     else:
         raise NotImplementedError(
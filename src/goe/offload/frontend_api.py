@@ -771,6 +771,12 @@ class FrontendApiInterface(metaclass=ABCMeta):
         """Some frontends have overrides due to stylistic formatting, e.g. MSSQL"""
         return self._frontend_type.capitalize()
 
+    def reserve_connections(self, connections: int):
+        """Prepare for this many concurrent sessions, e.g. by growing a connection pool.
+        No-op unless an implementation pools connections.
+        """
+        pass
+
     def get_table_default_parallelism(self, schema, table_name):
         """Return the table level default parallelism. Oracle has an override for this."""
         # Assume no table level default unless an implementation overrides.
@@ -924,6 +924,12 @@ LIMIT 1""" % {
         assert self._backend_type in [DBTYPE_HIVE, DBTYPE_IMPALA]
         return self._format_partition_clause(partition_tuples, sep_char=sep_char)
 
+    def fingerprint_hash_sql_expression(self, string_expression):
+        assert string_expression
+        return "CAST(CONV(SUBSTR(MD5(%s), 1, 15), 16, 10) AS DECIMAL(38,0))" % (
+            string_expression
+        )
+
     def format_query_parameter(self, param_name):
         return param_name
 
@@ -1000,6 +1006,7 @@ SELECT %(projection)s%(from_clause)s%(limit_clause)s""" % {
         filter_clauses=None,
         measures=None,
         agg_fns=None,
+        count_star=False,
     ):
         return self._gen_sql_text_common(
             db_name,
@@ -1008,6 +1015,7 @@ SELECT %(projection)s%(from_clause)s%(limit_clause)s""" % {
             filter_clauses=filter_clauses,
             measures=measures,
             agg_fns=agg_fns,
+            count_star=count_star,
         )
 
     def generic_string_data_type(self):
@@ -22,12 +22,16 @@
     by Impala and Hive implementations.
 """
 
+import concurrent.futures
 import logging
 import os
+import threading
+import time
 from typing import TYPE_CHECKING
 
 from goe.filesystem.goe_dfs import gen_load_uri_from_options
 from goe.offload.column_metadata import ColumnMetadataInterface, get_column_names
+from goe.offload.factory.backend_api_factory import backend_api_factory
 from goe.offload.hadoop import hadoop_predicate
 from goe.offload.hadoop.hadoop_column import (
     HADOOP_TYPE_BIGINT,
@@ -175,25 +179,87 @@ class BackendHadoopTable(BackendTableInterface):
             self._load_db_name, self._load_table_name, incremental=True
         )
 
-    def _compute_hive_table_statistics(
-        self, incremental_stats, materialized_join=False
-    ):
-        def progress_message(partitions_done, partitions_total):
-            perc = float(partitions_done) / partitions_total * 100
-            self._log(
-                "Partition progress %d%% (%d/%d)"
-                % (int(perc), partitions_done, partitions_total),
-                detail=VERBOSE,
-            )
+    def _gather_partition_stats(self, partitions: list, for_columns: bool):
+        """Compute stats for each partition spec in partitions using up to OFFLOAD_STATS_PARALLELISM sessions.
+        A HiveServer2 connection cannot run concurrent statements therefore each worker thread opens its own
+        backend connection, with a single thread (or partition) we use the table's existing connection.
+        Progress is logged from the calling thread and the first failure is re-raised as is.
+        """
+        if not partitions:
+            return
+        parallelism = min(
+            int(self._orchestration_config.offload_stats_parallelism or 1),
+            len(partitions),
+        )
+        api_lock = threading.Lock()
+        thread_apis = threading.local()
+        worker_apis = []
+
+        def get_thread_api():
+            if parallelism == 1:
+                return self._db_api
+            if not getattr(thread_apis, "api", None):
+                thread_apis.api = backend_api_factory(
+                    self._backend_type,
+                    self._connection_options,
+                    self._messages,
+                    dry_run=self._dry_run,
+                )
+                with api_lock:
+                    worker_apis.append(thread_apis.api)
+            return thread_apis.api
 
-        def gather_partition_stats(columns, partition):
-            return self._db_api.compute_stats(
+        def gather_one(partition):
+            get_thread_api().compute_stats(
                 self.db_name,
                 self.table_name,
-                for_columns=columns,
+                for_columns=for_columns,
                 partition_tuples=partition,
             )
 
+        start_time = time.time()
+        try:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=parallelism
+            ) as executor:
+                futures = [executor.submit(gather_one, _) for _ in partitions]
+                try:
+                    for partitions_done, future in enumerate(
+                        concurrent.futures.as_completed(futures), start=1
+                    ):
+                        future.result()
+                        perc = float(partitions_done) / len(partitions) * 100
+                        self._log(
+                            "Partition progress %d%% (%d/%d)"
+                            % (int(perc), partitions_done, len(partitions)),
+                            detail=VERBOSE,
+                        )
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+        finally:
+            for api in worker_apis:
+                try:
+                    api.close()
+                except Exception:
+                    pass
+        elapsed = max(time.time() - start_time, 0.001)
+        self._log(
+            "Gathered %sstats for %d partitions in %.1fs using %d sessions (%.2f partitions/s)"
+            % (
+                "column " if for_columns else "",
+                len(partitions),
+                elapsed,
+                parallelism,
+                len(partitions) / elapsed,
+            ),
+            detail=VVERBOSE,
+        )
+
+    def _compute_hive_table_statistics(
+        self, incremental_stats, materialized_join=False
+    ):
         def partition_str_to_tuples(partition_str):
             part_kvs = partition_str.split(",")
             partition_tuples = []
@@ -260,10 +326,9 @@ FROM %s.%s""" % (
             ):
                 self._log("Gathering column stats for new partitions", detail=VVERBOSE)
                 if not self._dry_run:
-                    new_partitions = partitions_from_load_table()
-                    for index, partition in enumerate(new_partitions):
-                        gather_partition_stats(True, partition)
-                        progress_message(index + 1, len(new_partitions))
+                    self._gather_partition_stats(
+                        partitions_from_load_table(), for_columns=True
+                    )
             elif self._offload_stats_method == OFFLOAD_STATS_METHOD_HISTORY:
                 self._log("Detecting partitions with no stats", detail=VVERBOSE)
                 if not self._dry_run:
@@ -282,18 +347,18 @@ FROM %s.%s""" % (
                         % str(list(part_stats.keys())),
                         detail=VVERBOSE,
                     )
-                    for index, partition_str in enumerate(part_stats.keys()):
-                        partition_tuples = partition_str_to_tuples(partition_str)
-                        gather_partition_stats(False, partition_tuples)
-                        progress_message(index + 1, len(part_stats))
+                    self._gather_partition_stats(
+                        [partition_str_to_tuples(_) for _ in part_stats],
+                        for_columns=False,
+                    )
                     if self._hive_column_stats_enabled:
                         self._log(
                             "Gathering stats on columns that have none", detail=VVERBOSE
                         )
-                        for index, partition_str in enumerate(col_stats.keys()):
-                            partition_tuples = partition_str_to_tuples(partition_str)
-                            gather_partition_stats(True, partition_tuples)
-                            progress_message(index + 1, len(col_stats))
+                        self._gather_partition_stats(
+                            [partition_str_to_tuples(_) for _ in col_stats],
+                            for_columns=True,
+                        )
 
     def _create_hadoop_load_database(self):
         """Hadoop specific method to create a HDFS path and load database"""
@@ -762,6 +827,11 @@ FROM %s.%s""" % (
         if self.table_stats_compute_supported():
             self._compute_load_table_statistics()
 
+    def set_staging_slot(self, staging_slot: int):
+        super(BackendHadoopTable, self).set_staging_slot(staging_slot)
+        # Load table directory is derived from the load table name
+        self._load_table_hdfs_dir = None
+
     def setup_result_cache_area(self):
         """Prepare result cache area for Hybrid Queries"""
         self._create_hadoop_load_database()
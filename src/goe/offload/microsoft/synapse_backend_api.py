@@ -1401,6 +1401,12 @@ class BackendSynapseApi(BackendApiInterface):
         else:
             return "{} {} {}".format(left_identifier, operator, right_identifier)
 
+    def fingerprint_hash_sql_expression(self, string_expression):
+        """HASHBYTES() hashes the collation specific encoding of a string rather than UTF-8,
+        staged data hash sums are not compared on Synapse.
+        """
+        return None
+
     def format_query_parameter(self, param_name):
         """No named parameters so always return "?" """
         return "?"
@@ -1534,6 +1540,7 @@ FROM   %(from_db_table)s%(where)s""" % {
         filter_clauses=None,
         measures=None,
         agg_fns=None,
+        count_star=False,
     ):
         return self._gen_sql_text_common(
             db_name,
@@ -1542,6 +1549,7 @@ FROM   %(from_db_table)s%(where)s""" % {
             filter_clauses=filter_clauses,
             measures=measures,
             agg_fns=agg_fns,
+            count_star=count_star,
         )
 
     def generic_string_data_type(self):
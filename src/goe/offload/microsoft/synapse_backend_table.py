@@ -103,13 +103,7 @@ class BackendSynapseTable(BackendTableInterface):
             self._load_db_name,
             self._load_table_name,
         )
-        self._load_table_path = self._get_dfs_client().gen_uri(
-            self._orchestration_config.offload_fs_scheme,
-            self._orchestration_config.offload_fs_container,
-            self._orchestration_config.offload_fs_prefix,
-            backend_db=self._load_db_name,
-            table_name=self._load_table_name,
-        )
+        self._load_table_path = self._gen_load_table_path()
         self._log_profile_after_final_table_load = True
         self._log_profile_after_verification_queries = True
         self._offload_stats_method = getattr(
@@ -607,6 +601,15 @@ class BackendSynapseTable(BackendTableInterface):
             status = False
         return status
 
+    def set_staging_slot(self, staging_slot: int):
+        super(BackendSynapseTable, self).set_staging_slot(staging_slot)
+        self._ext_table_location = os.path.join(
+            self._orchestration_config.offload_fs_prefix,
+            self._load_db_name,
+            self._load_table_name,
+        )
+        self._load_table_path = self._gen_load_table_path()
+
     def setup_result_cache_area(self):
         """Prepare result cache area for Hybrid Queries"""
         cmds = []
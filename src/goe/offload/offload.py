@@ -698,7 +698,11 @@ def get_offload_options(opt):
     opt.add_option(
         "--verify",
         dest="verify_row_count",
-        choices=["minus", "aggregate"],
+        choices=[
+            offload_constants.OFFLOAD_VERIFY_MINUS,
+            offload_constants.OFFLOAD_VERIFY_AGGREGATE,
+            offload_constants.OFFLOAD_VERIFY_FINGERPRINT,
+        ],
         default=orchestration_defaults.verify_row_count_default(),
     )
     opt.add_option(
@@ -0,0 +1,327 @@
+# Copyright 2016 The GOE Authors. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" OffloadChunkPlanner: Classes that break the partitions to be offloaded into chunks.
+
+    Planners receive partitions in the order they will be offloaded and return a list of chunks, each chunk being a
+    list of partitions also in offload order. Partitions that share a high water mark are always placed in the same
+    chunk, this prevents a failed offload from believing a HWM is completely offloaded (important for offload by
+    subpartition).
+"""
+
+from abc import ABCMeta, abstractmethod
+from bisect import bisect_left
+import logging
+from typing import TYPE_CHECKING
+
+from goe.offload.offload_constants import (
+    OFFLOAD_CHUNK_PLANNER_BALANCED,
+    OFFLOAD_CHUNK_PLANNER_GREEDY,
+)
+from goe.offload.offload_messages import VVERBOSE
+
+if TYPE_CHECKING:
+    from goe.offload.offload_messages import OffloadMessages
+    from goe.offload.offload_source_data import OffloadSourcePartition
+
+
+###############################################################################
+# CONSTANTS
+###############################################################################
+
+# Partitions with fewer rows than this do not contribute to the estimated uncompressed bytes per row.
+# Small partitions are dominated by initial extent sizes and give misleading figures.
+COST_DENSITY_MIN_ROWS = 1000
+# Percentile of bytes per row used as the estimated uncompressed bytes per row for all partitions.
+COST_DENSITY_PERCENTILE = 0.9
+
+###############################################################################
+# LOGGING
+###############################################################################
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+class OffloadChunkPlannerException(Exception):
+    pass
+
+
+###########################################################################
+# GLOBAL FUNCTIONS
+###########################################################################
+
+
+def estimate_partition_costs(partitions: list) -> list:
+    """Return a list of estimated costs, one per partition, of offloading each partition.
+
+    Segment sizes understate the volume of data in compressed partitions. Partitions with plenty of rows are used
+    to estimate the uncompressed bytes per row and the cost of a partition is the greater of its size in bytes and
+    its row count at that density. Partitions without statistics are costed on size alone.
+    """
+    densities = sorted(
+        p.size_in_bytes / p.row_count
+        for p in partitions
+        if p.row_count and p.row_count >= COST_DENSITY_MIN_ROWS and p.size_in_bytes
+    )
+    if densities:
+        density = densities[int((len(densities) - 1) * COST_DENSITY_PERCENTILE)]
+    else:
+        density = 0
+    return [
+        max(p.size_in_bytes or 0, int((p.row_count or 0) * density)) for p in partitions
+    ]
+
+
+def group_partitions_by_hwm(partitions: list) -> list:
+    """Return partitions grouped into units that must not be split across chunks.
+    Partitions with the same high water mark form a single unit positioned at the first member, all other
+    partitions are a unit of their own.
+    """
+    units = []
+    units_by_hwm = {}
+    for p in partitions:
+        if p.partition_values_python:
+            if p.partition_values_python in units_by_hwm:
+                units_by_hwm[p.partition_values_python].append(p)
+                continue
+            units_by_hwm[p.partition_values_python] = [p]
+            units.append(units_by_hwm[p.partition_values_python])
+        else:
+            units.append([p])
+    return units
+
+
+###########################################################################
+# OffloadChunkPlannerInterface
+###########################################################################
+
+
+class OffloadChunkPlannerInterface(metaclass=ABCMeta):
+    """Abstract base class for chunk planners."""
+
+    def __init__(
+        self,
+        max_chunk_size: int,
+        max_chunk_count: int,
+        messages: "OffloadMessages" = None,
+    ):
+        self._max_chunk_size = max_chunk_size
+        self._max_chunk_count = max_chunk_count
+        self._messages = messages
+
+    def _log(self, msg, detail=None):
+        if self._messages:
+            self._messages.log(msg, detail=detail)
+        logger.info(msg)
+
+    def _log_plan(self, chunks: list):
+        if not chunks:
+            return
+        partitions = [p for chunk in chunks for p in chunk]
+        partition_costs = dict(
+            zip([id(_) for _ in partitions], estimate_partition_costs(partitions))
+        )
+        costs = [sum(partition_costs[id(p)] for p in chunk) for chunk in chunks]
+        self._log(
+            "%s chunk plan: chunks=%s, min cost=%s, max cost=%s"
+            % (
+                self.planner_name(),
+                len(chunks),
+                min(costs),
+                max(costs),
+            ),
+            detail=VVERBOSE,
+        )
+
+    @abstractmethod
+    def plan(self, partitions: "list[OffloadSourcePartition]") -> list:
+        """Return a list of chunks, each chunk a list of partitions, covering all partitions in order."""
+
+    @abstractmethod
+    def planner_name(self) -> str:
+        pass
+
+
+###########################################################################
+# OffloadChunkPlannerGreedy
+###########################################################################
+
+
+class OffloadChunkPlannerGreedy(OffloadChunkPlannerInterface):
+    """Pack partitions into a chunk until adding another would exceed max chunk size or count.
+    Partitions sharing a HWM with the final partition of a chunk are added to the chunk regardless of the limits.
+    """
+
+    def plan(self, partitions: list) -> list:
+        chunks = []
+        remaining = partitions[:]
+        while remaining:
+            chunk = [remaining.pop(0)]
+            chunk_size = chunk[0].size_in_bytes
+            while (
+                remaining
+                and (chunk_size + remaining[0].size_in_bytes) < self._max_chunk_size
+                and len(chunk) < self._max_chunk_count
+            ):
+                p = remaining.pop(0)
+                chunk.append(p)
+                chunk_size += p.size_in_bytes
+            more_of_this_hwm = chunk[-1].partition_values_python
+            if more_of_this_hwm:
+                with_matching_hwm = [
+                    _
+                    for _ in remaining
+                    if _.partition_values_python == more_of_this_hwm
+                ]
+                chunk.extend(with_matching_hwm)
+                remaining = remaining[len(with_matching_hwm) :]
+            chunks.append(chunk)
+        self._log_plan(chunks)
+        return chunks
+
+    def planner_name(self) -> str:
+        return OFFLOAD_CHUNK_PLANNER_GREEDY
+
+
+###########################################################################
+# OffloadChunkPlannerBalanced
+###########################################################################
+
+
+class OffloadChunkPlannerBalanced(OffloadChunkPlannerInterface):
+    """Split partitions into contiguous chunks of roughly equal estimated cost.
+
+    With a target chunk count the partitions are split into that many chunks, max chunk size and count are ignored.
+    Otherwise the plan starts with the number of chunks the greedy planner would produce and any chunk that would
+    breach max chunk size or count is itself split in the same way until none do.
+    """
+
+    def __init__(
+        self,
+        max_chunk_size: int,
+        max_chunk_count: int,
+        messages: "OffloadMessages" = None,
+        target_chunk_count: int = None,
+    ):
+        super().__init__(max_chunk_size, max_chunk_count, messages=messages)
+        self._target_chunk_count = target_chunk_count
+
+    def _split_units(self, units: list, unit_costs: list, chunk_count: int) -> list:
+        """Cut units into chunk_count contiguous (units, unit_costs) pairs, each cut placed at the unit boundary
+        nearest to an equal share of the cumulative cost.
+        """
+        cumulative_costs = [0]
+        for cost in unit_costs:
+            cumulative_costs.append(cumulative_costs[-1] + cost)
+        total_cost = cumulative_costs[-1]
+        cuts = [0]
+        for i in range(1, chunk_count):
+            target = total_cost * i / chunk_count
+            # Each chunk needs at least one unit, both before and after this cut.
+            lowest_cut = cuts[-1] + 1
+            highest_cut = len(units) - (chunk_count - i)
+            cut = bisect_left(cumulative_costs, target, lowest_cut, highest_cut)
+            if (
+                cut > lowest_cut
+                and target - cumulative_costs[cut - 1] <= cumulative_costs[cut] - target
+            ):
+                cut -= 1
+            cuts.append(cut)
+        cuts.append(len(units))
+        return [
+            (units[cuts[i] : cuts[i + 1]], unit_costs[cuts[i] : cuts[i + 1]])
+            for i in range(chunk_count)
+        ]
+
+    def _within_limits(self, chunk: list) -> bool:
+        return bool(
+            sum(_.size_in_bytes for _ in chunk) < self._max_chunk_size
+            and len(chunk) <= self._max_chunk_count
+        )
+
+    def _greedy_chunk_count(self, partitions: list) -> int:
+        return len(
+            OffloadChunkPlannerGreedy(self._max_chunk_size, self._max_chunk_count).plan(
+                partitions
+            )
+        )
+
+    def _plan_units(self, units: list, unit_costs: list, chunk_count: int) -> list:
+        chunks = []
+        for chunk_units, chunk_unit_costs in self._split_units(
+            units, unit_costs, min(chunk_count, len(units))
+        ):
+            chunk = [p for unit in chunk_units for p in unit]
+            if (
+                self._target_chunk_count
+                or len(chunk_units) == 1
+                or self._within_limits(chunk)
+            ):
+                # A single HWM cannot be split any further.
+                chunks.append(chunk)
+            else:
+                # Re-balance only the offending chunk, leaving its neighbours untouched.
+                chunks.extend(
+                    self._plan_units(
+                        chunk_units,
+                        chunk_unit_costs,
+                        max(2, self._greedy_chunk_count(chunk)),
+                    )
+                )
+        return chunks
+
+    def plan(self, partitions: list) -> list:
+        if not partitions:
+            return []
+        units = group_partitions_by_hwm(partitions)
+        partition_costs = dict(
+            zip([id(_) for _ in partitions], estimate_partition_costs(partitions))
+        )
+        unit_costs = [sum(partition_costs[id(p)] for p in unit) for unit in units]
+        chunks = self._plan_units(
+            units,
+            unit_costs,
+            self._target_chunk_count or self._greedy_chunk_count(partitions),
+        )
+        self._log_plan(chunks)
+        return chunks
+
+    def planner_name(self) -> str:
+        return OFFLOAD_CHUNK_PLANNER_BALANCED
+
+
+def offload_chunk_planner_factory(
+    planner_name: str,
+    max_chunk_size: int,
+    max_chunk_count: int,
+    messages: "OffloadMessages" = None,
+    target_chunk_count: int = None,
+) -> OffloadChunkPlannerInterface:
+    """Return a chunk planner object, a target chunk count implies the balanced planner."""
+    if target_chunk_count or planner_name == OFFLOAD_CHUNK_PLANNER_BALANCED:
+        return OffloadChunkPlannerBalanced(
+            max_chunk_size,
+            max_chunk_count,
+            messages=messages,
+            target_chunk_count=target_chunk_count,
+        )
+    elif planner_name in (OFFLOAD_CHUNK_PLANNER_GREEDY, None):
+        return OffloadChunkPlannerGreedy(
+            max_chunk_size, max_chunk_count, messages=messages
+        )
+    else:
+        raise OffloadChunkPlannerException(
+            "Unknown offload chunk planner: %s" % planner_name
+        )
@@ -88,6 +88,11 @@ OFFLOAD_STATS_METHOD_HISTORY = "HISTORY"
 OFFLOAD_STATS_METHOD_NATIVE = "NATIVE"
 OFFLOAD_STATS_METHOD_NONE = "NONE"
 
+# Offloaded data verification methods (--verify).
+OFFLOAD_VERIFY_AGGREGATE = "aggregate"
+OFFLOAD_VERIFY_FINGERPRINT = "fingerprint"
+OFFLOAD_VERIFY_MINUS = "minus"
+
 EMPTY_BACKEND_TABLE_STATS_LIST = [-1, 0, 0]  # num_rows, num_bytes, avg_row_len
 EMPTY_BACKEND_TABLE_STATS_DICT = {"num_rows": -1, "num_bytes": 0, "avg_row_len": 0}
 EMPTY_BACKEND_COLUMN_STATS_LIST = []
@@ -109,10 +114,28 @@ OFFLOAD_TRANSPORT_VALIDATION_POLLER_DISABLED = -1
 # Offload transport constants
 LIVY_IDLE_SESSION_TIMEOUT = 600
 LIVY_MAX_SESSIONS = 10
+# Number of warm Livy sessions to keep available for offloads
+LIVY_MIN_SESSIONS = 0
+# Recycle a Livy session after this many statements, 0 means never recycle
+LIVY_MAX_SESSION_STATEMENTS = 0
+# Seconds to wait for a Livy session when the maximum number of sessions exist, 0 means fail immediately
+LIVY_LEASE_TIMEOUT = 0
+# Sessions in each per-process Oracle session pool, grown for concurrent validation. 0 disables pooling
+ORA_CONNECTION_POOL_SIZE = 4
 OFFLOAD_TRANSPORT_AUTO = "AUTO"
 OFFLOAD_TRANSPORT_GOE = "GOE"
 OFFLOAD_TRANSPORT_GCP = "GCP"
 OFFLOAD_TRANSPORT_SQOOP = "SQOOP"
+MAX_OFFLOAD_CHUNK_PIPELINE_DEPTH = 4
+OFFLOAD_CHUNK_PLANNER_BALANCED = "BALANCED"
+OFFLOAD_CHUNK_PLANNER_GREEDY = "GREEDY"
+VALID_OFFLOAD_CHUNK_PLANNERS = [
+    OFFLOAD_CHUNK_PLANNER_BALANCED,
+    OFFLOAD_CHUNK_PLANNER_GREEDY,
+]
+# Written alongside staged data to record which offload chunk has been fully staged.
+# Leading underscore ensures the file is ignored by backend load tables.
+STAGED_CHUNK_MANIFEST_FILE_NAME = "_goe_staged_chunk.json"
 
 # DDL file
 DDL_FILE_AUTO = "AUTO"
@@ -16,9 +16,11 @@
 """
 
 # Standard Library
+from contextlib import contextmanager
 import logging
 import os
 import sys
+import threading
 import traceback
 from datetime import datetime, timedelta
 from functools import partial
@@ -138,11 +140,42 @@ class OffloadMessages(object):
         self._command_type = command_type
         self._redis_in_error = False
         self._stdout_in_error = False
+        self._thread_state = threading.local()
 
     ###########################################################################
     # PRIVATE METHODS
     ###########################################################################
 
+    def _defer(self, method_name: str, *args, **kwargs) -> bool:
+        """Buffer a call if the current thread is inside deferred(), returns True if the call was buffered."""
+        deferred = getattr(self._thread_state, "deferred", None)
+        if deferred is None:
+            return False
+        deferred.append((method_name, args, kwargs))
+        return True
+
+    def _end_command_step(
+        self, csid, command_type, step_constant, status, step_details=None
+    ):
+        if self._defer(
+            "_record_command_step",
+            command_type,
+            step_constant,
+            status,
+            step_details=step_details,
+        ):
+            return
+        self._repo_client.end_command_step(csid, status, step_details=step_details)
+
+    def _record_command_step(
+        self, command_type, step_constant, status, step_details=None
+    ):
+        """Record a complete command step for a step that ran in a deferred thread."""
+        csid = self._repo_client.start_command_step(
+            self.execution_id, command_type, step_constant
+        )
+        self._repo_client.end_command_step(csid, status, step_details=step_details)
+
     ###########################################################################
     # PUBLIC METHODS
     ###########################################################################
@@ -324,6 +357,9 @@ class OffloadMessages(object):
     ########################################################################################
 
     def log(self, line, detail=NORMAL, ansi_code=None):
+        if self._defer("log", line, detail=detail, ansi_code=ansi_code):
+            return
+
         def fh_log(line):
             self._log_fh.write((line or "") + "\n")
             self._log_fh.flush()
@@ -375,11 +411,15 @@ class OffloadMessages(object):
             self.log(line, detail, ansi_code)
 
     def notice(self, msg, detail=VERBOSE):
+        if self._defer("notice", msg, detail=detail):
+            return
         if msg not in self.messages["notices"]:
             self.messages["notices"].append(msg)
         self.log(msg, detail)
 
     def warning(self, msg, detail=NORMAL, ansi_code=None):
+        if self._defer("warning", msg, detail=detail, ansi_code=ansi_code):
+            return
         if msg not in self.messages["warnings"]:
             self.messages["warnings"].append(msg)
         self.log("WARNING:" + msg, detail, ansi_code)
@@ -391,6 +431,8 @@ class OffloadMessages(object):
         We would use this when logging information and then looking for strings in logs is not appropriate.
         """
         assert token
+        if self._defer("event", token):
+            return
         self.messages["events"].append(token)
 
     def debug_enabled(self):
@@ -479,7 +521,7 @@ class OffloadMessages(object):
             self.log("skipped")
             return None
 
-        if step_repo_logging(parent_command_type):
+        if step_repo_logging(parent_command_type) and not self.deferring():
             csid = self._repo_client.start_command_step(
                 self.execution_id, parent_command_type, step_constant
             )
@@ -503,8 +545,11 @@ class OffloadMessages(object):
                 self.step_no_delta(title)
 
             if step_repo_logging(parent_command_type):
-                self._repo_client.end_command_step(
-                    csid, orchestration_constants.COMMAND_SUCCESS
+                self._end_command_step(
+                    csid,
+                    parent_command_type,
+                    step_constant,
+                    orchestration_constants.COMMAND_SUCCESS,
                 )
 
             return step_results
@@ -515,8 +560,10 @@ class OffloadMessages(object):
                     command_steps.CTX_ERROR_MESSAGE: str(exc),
                     command_steps.CTX_EXCEPTION_STACK: traceback.format_exc(),
                 }
-                self._repo_client.end_command_step(
+                self._end_command_step(
                     csid,
+                    parent_command_type,
+                    step_constant,
                     orchestration_constants.COMMAND_ERROR,
                     step_details=error_context,
                 )
@@ -532,6 +579,26 @@ class OffloadMessages(object):
                     "%s after step: %s" % (FORCED_EXCEPTION_TEXT, title)
                 )
 
+    @contextmanager
+    def deferred(self):
+        """Buffer messages, step timings and repo step records produced by the current thread.
+        Allows a background thread to run offload steps without touching the log file, shared message
+        state or the repository. The buffer is passed to replay() by the thread that owns this object.
+        """
+        self._thread_state.deferred = []
+        try:
+            yield self._thread_state.deferred
+        finally:
+            self._thread_state.deferred = None
+
+    def deferring(self) -> bool:
+        return bool(getattr(self._thread_state, "deferred", None) is not None)
+
+    def replay(self, deferred: list):
+        """Apply messages buffered by deferred() in the current thread."""
+        for method_name, args, kwargs in deferred or []:
+            getattr(self, method_name)(*args, **kwargs)
+
     def set_execution_id(self, execution_id):
         self.execution_id = execution_id
 
@@ -582,7 +649,7 @@ class OffloadMessages(object):
                 self.log(msg)
 
     def step_delta(self, step, time_delta):
-        if time_delta is None:
+        if time_delta is None or self._defer("step_delta", step, time_delta):
             return
         if step in self.steps:
             self.steps[step]["seconds"] = (
@@ -594,6 +661,8 @@ class OffloadMessages(object):
 
     def step_no_delta(self, step):
         """Record a step without any time delta, for non-execture mode."""
+        if self._defer("step_no_delta", step):
+            return
         if step in self.steps:
             self.steps[step]["count"] += 1
         else:
@@ -22,15 +22,18 @@
 """
 
 from abc import ABCMeta, abstractmethod
+from bisect import bisect_left
 from datetime import datetime, date
 import logging
 import re
+import sys
 from functools import partial
 
 from numpy import datetime64
 
 from goe.offload import offload_constants, predicate_offload
 from goe.offload.column_metadata import valid_column_list
+from goe.offload.offload_chunk_planner import offload_chunk_planner_factory
 from goe.offload.offload_functions import (
     get_dsl_threshold_clauses,
     datetime_literal_to_python,
@@ -46,12 +49,14 @@ from goe.offload.offload_source_table import (
     OffloadSourceTableInterface,
     OFFLOAD_PARTITION_TYPE_RANGE,
     OFFLOAD_PARTITION_TYPE_LIST,
+    RdbmsPartition,
 )
 from goe.offload.backend_table import BackendTableInterface
 from goe.offload.oracle.oracle_column import (
     ORACLE_TYPE_TIMESTAMP,
     ORACLE_TYPE_TIMESTAMP_TZ,
 )
+from goe.util.misc_functions import bytes_to_human_size
 from goe.persistence.orchestration_metadata import (
     INCREMENTAL_PREDICATE_TYPE_PREDICATE,
     INCREMENTAL_PREDICATE_TYPE_RANGE,
@@ -384,8 +389,21 @@ class OffloadSourcePartition(object):
     , is the boundary a common boundary (True or False and only applies when subpartition range offloads are in play)
     , [ is a list of subpartitions for the partition (only applies for partition range offloads) ]
     ]
+    Uses __slots__ because there is an instance per (sub)partition, high value tuples are shared between
+    partitions with the same high value by OffloadSourcePartitions.from_source_table().
     """
 
+    __slots__ = (
+        "partition_name",
+        "partition_literal",
+        "partition_values_python",
+        "partition_values_individual",
+        "size_in_bytes",
+        "row_count",
+        "common_partition_literal",
+        "subpartitions",
+    )
+
     def __init__(
         self,
         partition_name,
@@ -425,11 +443,84 @@ class OffloadSourcePartition(object):
         )
 
 
+class OffloadSourcePartitionsIndex(object):
+    """Lookup structures for an OffloadSourcePartitions list, built in a single pass over the partitions.
+    Tables can have hundreds of thousands of (sub)partitions and planning code looks partitions up in loops,
+    the index turns those lookups from linear scans into dict or bisect operations.
+    """
+
+    def __init__(self, partitions):
+        self.by_name = {}
+        self.duplicate_names = set()
+        self.by_values = {}
+        self.default_partition = None
+        values_hashable = True
+        prior_entries = []
+        for position, p in enumerate(partitions):
+            if p.partition_name in self.by_name:
+                self.duplicate_names.add(p.partition_name)
+            else:
+                self.by_name[p.partition_name] = p
+            if values_hashable and isinstance(p.partition_values_python, tuple):
+                try:
+                    self.by_values.setdefault(p.partition_values_python, p)
+                except TypeError:
+                    values_hashable = False
+            if is_default_partition(p):
+                if self.default_partition is None:
+                    self.default_partition = p
+            else:
+                prior_entries.append((tuple(p.partition_values_python), position))
+        if not values_hashable:
+            # Unhashable values fall back to a scan in OffloadSourcePartitions.get_partition().
+            self.by_values = None
+        try:
+            prior_entries.sort(key=lambda _: _[0])
+        except TypeError:
+            # Values that cannot be ordered (e.g. None) fall back to a scan in get_prior_partition().
+            self.prior_values = self.prior_positions = None
+        else:
+            self.prior_values = [_[0] for _ in prior_entries]
+            # prior_positions[i] is the earliest position in the list of a partition with values <= prior_values[i]
+            self.prior_positions = []
+            for _, position in prior_entries:
+                self.prior_positions.append(
+                    min(position, self.prior_positions[-1])
+                    if self.prior_positions
+                    else position
+                )
+        self.partition_names = [_.partition_name for _ in partitions]
+        self.subpartition_names = [
+            s
+            for p in partitions
+            if p.subpartitions is not None
+            for s in p.subpartitions
+        ]
+
+    def prior_position(self, partition_values_python):
+        """Return the earliest list position of partitions with values < partition_values_python, or None.
+        Returns False if values cannot be ordered and the caller must scan instead.
+        """
+        if self.prior_values is None:
+            return False
+        try:
+            i = bisect_left(self.prior_values, tuple(partition_values_python))
+        except TypeError:
+            return False
+        return self.prior_positions[i - 1] if i else None
+
+
 class OffloadSourcePartitions(object):
-    """Holds partitions in scope for offload"""
+    """Holds partitions in scope for offload.
+    Lookups by name or partition values and aggregates use an OffloadSourcePartitionsIndex which is built on
+    first use and discarded when the list of partitions changes.
+    """
 
     def __init__(self, partitions=[]):
         self._partitions = partitions
+        self._index = None
+        self._index_key = None
+        self._aggregates = {}
 
     def __str__(self):
         if self._partitions:
@@ -441,6 +532,25 @@ class OffloadSourcePartitions(object):
         else:
             return "OffloadSourcePartitions(None)"
 
+    def _get_index(self):
+        # The list is exposed by get_partitions() so also check it has not been replaced or resized.
+        index_key = (id(self._partitions), len(self._partitions or []))
+        if self._index is None or self._index_key != index_key:
+            self._index = OffloadSourcePartitionsIndex(self._partitions or [])
+            self._index_key = index_key
+            self._aggregates = {}
+        return self._index
+
+    def _partitions_changed(self):
+        self._index = None
+        self._aggregates = {}
+
+    def _cached_aggregate(self, name, fn):
+        self._get_index()
+        if name not in self._aggregates:
+            self._aggregates[name] = fn()
+        return self._aggregates[name]
+
     @staticmethod
     def from_source_table(offload_source_table, partition_append_capable):
         """Constructor to return partitions from an OffloadSourceTable"""
@@ -460,6 +570,8 @@ class OffloadSourcePartitions(object):
 
         partitions = []
         if rdbms_partitions:
+            # Every high value is needed, the decoder shares values between partitions with the same high value.
+            RdbmsPartition.decode_high_values_batch(rdbms_partitions)
             for ora_partition in rdbms_partitions:
                 partitions.append(
                     OffloadSourcePartition(
@@ -484,20 +596,43 @@ class OffloadSourcePartitions(object):
     def count(self):
         return len(self._partitions)
 
+    def memory_usage(self) -> int:
+        """Approximate bytes used by the partition metadata, values shared between partitions are counted once."""
+        seen = set()
+
+        def size(obj):
+            if obj is None or id(obj) in seen:
+                return 0
+            seen.add(id(obj))
+            total = sys.getsizeof(obj)
+            if isinstance(obj, (list, tuple)):
+                total += sum(size(_) for _ in obj)
+            return total
+
+        return sys.getsizeof(self._partitions) + sum(
+            size(p) + sum(size(getattr(p, _)) for _ in OffloadSourcePartition.__slots__)
+            for p in self._partitions or []
+        )
+
     def get_partitions(self):
         return self._partitions
 
     def partition_names(self):
-        return [_.partition_name for _ in self._partitions]
+        return list(self._get_index().partition_names)
 
     def row_count(self):
-        return sum(_.row_count for _ in self._partitions)
+        return self._cached_aggregate(
+            "row_count", lambda: sum(_.row_count for _ in self._partitions)
+        )
 
     def set_partitions(self, partitions):
         self._partitions = partitions
+        self._partitions_changed()
 
     def size_in_bytes(self):
-        return sum(_.size_in_bytes for _ in self._partitions)
+        return self._cached_aggregate(
+            "size_in_bytes", lambda: sum(_.size_in_bytes for _ in self._partitions)
+        )
 
     def sort_partitions(self, sort_fn, reverse=False):
         if self._partitions:
@@ -510,14 +645,10 @@ class OffloadSourcePartitions(object):
                     self._partitions.insert(0, default_partition)
                 else:
                     self._partitions.append(default_partition)
+            self._partitions_changed()
 
     def subpartition_names(self):
-        return [
-            s
-            for p in self._partitions
-            if p.subpartitions is not None
-            for s in p.subpartitions
-        ]
+        return list(self._get_index().subpartition_names)
 
     def report_partitions(self, offload_by_subpartition, messages, include_stats=True):
         """Reports partitions in a standard format, used in offload stdout"""
@@ -549,6 +680,11 @@ class OffloadSourcePartitions(object):
         else:
             messages.log("%s %s" % (len(self._partitions), part_description))
         if messages.debug_enabled():
+            messages.log(
+                "%s metadata memory: %s"
+                % (part_description, bytes_to_human_size(self.memory_usage())),
+                detail=VVERBOSE,
+            )
             for p in self._partitions:
                 messages.log("%s" % str(p), detail=VVERBOSE)
 
@@ -558,6 +694,23 @@ class OffloadSourcePartitions(object):
         if partition_values_python:
             assert isinstance(partition_values_python, (list, tuple))
 
+        index = self._get_index()
+        if partition_name:
+            if partition_name in index.duplicate_names:
+                raise OffloadSourceDataException(
+                    "Unexpected partition count for partition name %s: %s"
+                    % (partition_name, self.partition_names().count(partition_name))
+                )
+            return index.by_name.get(partition_name)
+        elif index.by_values is not None:
+            try:
+                matched_partition = index.by_values.get(tuple(partition_values_python))
+            except TypeError:
+                matched_partition = None
+            if matched_partition:
+                return matched_partition
+            # Values can compare equal without hashing equal (e.g. datetime64 vs datetime), confirm by scanning.
+
         if partition_name:
             filter_fn = lambda x: x.partition_name == partition_name
         else:
@@ -614,18 +767,18 @@ class OffloadSourcePartitions(object):
             "get_prior_partition filter partition: %s" % start_partition.partition_name
         )
 
-        def filter_fn(p):
-            if is_default_partition(p):
-                return False
-            return bool(
-                tuple(p.partition_values_python)
-                < tuple(start_partition.partition_values_python)
-            )
-
-        true_part_list, _ = self.split_partitions(filter_fn)
-        return (
-            true_part_list.get_partitions()[0] if true_part_list.count() > 0 else None
+        position = self._get_index().prior_position(
+            start_partition.partition_values_python
         )
+        if position is not False:
+            return None if position is None else self._partitions[position]
+
+        for p in self._partitions:
+            if not is_default_partition(p) and tuple(p.partition_values_python) < tuple(
+                start_partition.partition_values_python
+            ):
+                return p
+        return None
 
     def has_maxvalue_partition(self):
         """Partitions are sorted new to old therefore, if there's an OUT-OF-RANGE partition it will be first
@@ -648,7 +801,9 @@ class OffloadSourcePartitions(object):
         """
         if self.has_maxvalue_partition():
             # TODO need to review this for Teradata when there could be 2 open (MAXVALUE) partitions
-            return self._partitions.pop(0)
+            maxvalue_partition = self._partitions.pop(0)
+            self._partitions_changed()
+            return maxvalue_partition
         return None
 
     def remove_default_partition(self):
@@ -658,6 +813,7 @@ class OffloadSourcePartitions(object):
         default_partition = self.get_default_partition()
         if default_partition:
             self._partitions.remove(default_partition)
+            self._partitions_changed()
         return default_partition
 
     def get_default_partition(self):
@@ -667,28 +823,23 @@ class OffloadSourcePartitions(object):
     def has_default_partition(self, return_partition_object=False):
         """For convenience returns a matching partition name/None instead of True/False"""
         if self._partitions:
-            default_partitions = [
-                _ for _ in self._partitions if is_default_partition(_)
-            ]
-            if default_partitions:
+            default_partition = self._get_index().default_partition
+            if default_partition:
                 return (
-                    default_partitions[0]
+                    default_partition
                     if return_partition_object
-                    else default_partitions[0].partition_name
+                    else default_partition.partition_name
                 )
         return None
 
     def search_by_filter(self, filter_fn):
         """Use filter_fn() on each partition and keep/reject them based on truthyness of filter_fn return"""
-        filtered_partitions = []
-        for p in self._partitions:
-            if filter_fn(p):
-                filtered_partitions.append(p)
-        return filtered_partitions
+        return [p for p in self._partitions if filter_fn(p)]
 
     def apply_filter(self, filter_fn):
         """Apply filtered partitions to the object state"""
         self._partitions = self.search_by_filter(filter_fn)
+        self._partitions_changed()
 
     def split_partitions(self, split_fn):
         """Divvy up _partitions based on split_fn
@@ -796,6 +947,12 @@ class OffloadSourceDataInterface(metaclass=ABCMeta):
         self._user_requested_max_offload_chunk_count = (
             offload_operation.max_offload_chunk_count
         )
+        self._user_requested_offload_chunk_planner = (
+            offload_operation.offload_chunk_planner
+        )
+        self._user_requested_offload_chunk_target_count = (
+            offload_operation.offload_chunk_target_count
+        )
         # cache any offload_source_table attributes that are used frequently - just for convenience
         self._offload_by_subpartition = offload_source_table.offload_by_subpartition
 
@@ -869,10 +1026,11 @@ class OffloadSourceDataInterface(metaclass=ABCMeta):
         assert self._source_partitions
         assert self._offloaded_partitions
         if not self._partitions_to_offload:
+            offloaded_names = set(self._offloaded_partitions.partition_names())
             partition_delta = [
                 _
                 for _ in self._source_partitions.get_partitions()
-                if _.partition_name not in self._offloaded_partitions.partition_names()
+                if _.partition_name not in offloaded_names
             ]
             self._partitions_to_offload = OffloadSourcePartitions(partition_delta)
             self.debug(
@@ -1271,35 +1429,23 @@ class OffloadSourceDataInterface(metaclass=ABCMeta):
         pass
 
     def get_partitions_to_offload_chunks(self):
-        """Break a list of offloadable partitions up in to chunks
+        """Break a list of offloadable partitions up in to chunks using the chunk planner requested by the user
         Allows user to control volume of data processed in one pass (smaller chunks = less Impala memory)
         """
         # TODO nj@2019-06-07 Don't like the double reverse but didn't want to dig into why right now
 
         remaining = self.partitions_to_offload.get_partitions()[:]
         remaining.reverse()
-        while remaining:
-            chunk = [remaining.pop(0)]
-            chunk_size = chunk[0].size_in_bytes
-            while (
-                remaining
-                and (chunk_size + remaining[0].size_in_bytes)
-                < self._user_requested_max_offload_chunk_size
-                and len(chunk) < self._user_requested_max_offload_chunk_count
-            ):
-                p = remaining.pop(0)
-                chunk.append(p)
-                chunk_size += p.size_in_bytes
-            with_matching_hwm = self._partitions_of_matching_hwm(
-                chunk[-1].partition_values_python, remaining
-            )
-            if with_matching_hwm:
-                # If there are partitions with a matching HWM then they should be included in the chunk, overriding
-                # max chunk size/count. This prevents failed offloads from believing a HWM is completely offloaded
-                # (important for offload by subpartition)
-                chunk.extend(with_matching_hwm)
-                chunk_size += sum(p.size_in_bytes for p in with_matching_hwm)
-                remaining = remaining[len(with_matching_hwm) :]
+        planner = offload_chunk_planner_factory(
+            self._user_requested_offload_chunk_planner,
+            self._user_requested_max_offload_chunk_size,
+            self._user_requested_max_offload_chunk_count,
+            messages=self._messages,
+            target_chunk_count=self._user_requested_offload_chunk_target_count,
+        )
+        for chunk in planner.plan(remaining):
+            chunk_ids = set(id(_) for _ in chunk)
+            remaining = [_ for _ in remaining if id(_) not in chunk_ids]
             # Remaining was reversed before we started so let's reverse the chunk before yielding it
             chunk.reverse()
             yield (
@@ -118,8 +118,50 @@ def char_literal_to_python(rdbms_literal, quote_type="'"):
 ###########################################################################
 
 
+class PartitionHighValueDecoder:
+    """Decodes partition high value strings on demand, shared by all RdbmsPartitions from a single fetch.
+    decode_fn takes a list of high value strings and returns a (python values, individual literals) pair of
+    tuples for each one. Each distinct high value is decoded only once and the tuples are shared.
+    """
+
+    def __init__(self, decode_fn):
+        self._decode_fn = decode_fn
+        self._decoded = {}
+
+    def decode(self, hv_csv) -> tuple:
+        if hv_csv not in self._decoded:
+            self._decoded[hv_csv] = self._decode_fn([hv_csv])[0]
+        return self._decoded[hv_csv]
+
+    def decode_all(self, hv_csvs):
+        """Decode any outstanding high values in a single batch, used when all values are needed anyway."""
+        pending = list(dict.fromkeys(_ for _ in hv_csvs if _ not in self._decoded))
+        if pending:
+            self._decoded.update(zip(pending, self._decode_fn(pending)))
+
+
 class RdbmsPartition:
-    """Holds RDBMS partition details for a single partition"""
+    """Holds RDBMS partition details for a single partition
+    Uses __slots__ because composite partitioned tables can have hundreds of thousands of subpartitions.
+    When given a PartitionHighValueDecoder high_values_python and high_values_individual are only decoded
+    from high_values_csv when first accessed, frequently only the newest few partitions are of interest.
+    """
+
+    __slots__ = (
+        "partition_name",
+        "partition_count",
+        "partition_position",
+        "subpartition_count",
+        "subpartition_name",
+        "subpartition_names",
+        "subpartition_position",
+        "high_values_csv",
+        "_high_values_python",
+        "partition_size",
+        "num_rows",
+        "_high_values_individual",
+        "_high_values_decoder",
+    )
 
     def __init__(self):
         self.partition_name = None
@@ -130,10 +172,11 @@ class RdbmsPartition:
         self.subpartition_names = None
         self.subpartition_position = None
         self.high_values_csv = None
-        self.high_values_python = None
+        self._high_values_python = None
         self.partition_size = None
         self.num_rows = None
-        self.high_values_individual = None
+        self._high_values_individual = None
+        self._high_values_decoder = None
 
     def __str__(self):
         return (
@@ -158,6 +201,48 @@ class RdbmsPartition:
             )
         )
 
+    def _decode_high_values(self):
+        if self._high_values_decoder is not None:
+            self._high_values_python, self._high_values_individual = (
+                self._high_values_decoder.decode(self.high_values_csv)
+            )
+            self._high_values_decoder = None
+
+    @property
+    def high_values_python(self):
+        self._decode_high_values()
+        return self._high_values_python
+
+    @high_values_python.setter
+    def high_values_python(self, new_value):
+        self._decode_high_values()
+        self._high_values_python = new_value
+
+    @property
+    def high_values_individual(self):
+        self._decode_high_values()
+        return self._high_values_individual
+
+    @high_values_individual.setter
+    def high_values_individual(self, new_value):
+        self._decode_high_values()
+        self._high_values_individual = new_value
+
+    @staticmethod
+    def decode_high_values_batch(partitions):
+        """Decode outstanding high values for partitions in a single batch per decoder.
+        Used by callers that need every high value, saves decoding partitions one at a time.
+        """
+        pending = {}
+        for partition in partitions:
+            if partition._high_values_decoder is not None:
+                pending.setdefault(
+                    id(partition._high_values_decoder),
+                    (partition._high_values_decoder, []),
+                )[1].append(partition.high_values_csv)
+        for decoder, hv_csvs in pending.values():
+            decoder.decode_all(hv_csvs)
+
     @staticmethod
     def by_name(
         partition_name=None,
@@ -172,6 +257,7 @@ class RdbmsPartition:
         partition_size=None,
         num_rows=None,
         high_values_individual=None,
+        high_values_decoder=None,
     ):
         """Accepts named attributes and returns object based on them"""
         partition = RdbmsPartition()
@@ -187,6 +273,7 @@ class RdbmsPartition:
         partition.partition_size = partition_size
         partition.num_rows = num_rows
         partition.high_values_individual = high_values_individual
+        partition._high_values_decoder = high_values_decoder
         return partition
 
 
@@ -15,9 +15,11 @@
 """OffloadTransport: Library for offloading data from an RDBMS frontend to a cloud backend."""
 
 from abc import ABCMeta, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import json
 import logging
+import multiprocessing
 import os
 import re
 from socket import gethostname
@@ -29,6 +31,7 @@ from goe.config import orchestration_defaults
 from goe.offload.column_metadata import match_table_column
 from goe.offload.factory.backend_api_factory import backend_api_factory
 from goe.offload.factory.query_import_factory import query_import_factory
+from goe.offload.query_import_interface import initial_fetch_rows
 from goe.offload.factory.offload_transport_rdbms_api_factory import (
     offload_transport_rdbms_api_factory,
 )
@@ -49,8 +52,14 @@ from goe.offload.offload_constants import (
     OFFLOAD_TRANSPORT_GCP,
     OFFLOAD_TRANSPORT_SQOOP,
     OFFLOAD_TRANSPORT_VALIDATION_POLLER_DISABLED,
+    OFFLOAD_VERIFY_FINGERPRINT,
+)
+from goe.offload.offload_messages import (
+    OffloadMessages,
+    SUPPRESS_STDOUT,
+    VERBOSE,
+    VVERBOSE,
 )
-from goe.offload.offload_messages import VERBOSE, VVERBOSE
 from goe.offload.oracle.oracle_column import (
     ORACLE_TYPE_TIMESTAMP_TZ,
     ORACLE_TYPE_XMLTYPE,
@@ -73,9 +82,26 @@ from goe.offload.offload_transport_rdbms_api import (
 from goe.offload.offload_xform_functions import apply_transformation
 from goe.offload.operation.data_type_controls import char_semantics_override_map
 from goe.offload.spark.pyspark_literal import PysparkLiteral
+from goe.offload.staged_data_fingerprint import (
+    FINGERPRINT_HASH_HEX_DIGITS,
+    FINGERPRINT_HASH_MD5,
+    FINGERPRINT_KIND_DOUBLE,
+    FINGERPRINT_KIND_INTEGER,
+    FINGERPRINT_KIND_OTHER,
+    FINGERPRINT_KIND_STRING,
+    FINGERPRINT_LOG_MARKER,
+    StagedDataFingerprint,
+    staged_data_fingerprint_from_log,
+)
+from goe.offload.spark.spark_persistent_app import (
+    SparkPersistentApp,
+    persistent_app_control_dir,
+    persistent_app_driver_pyspark_body,
+)
 from goe.orchestration import command_steps
 
 from goe.filesystem.goe_dfs import DFS_TYPE_FILE
+from goe.filesystem.goe_dfs_factory import get_dfs_from_options
 
 from goe.util.misc_functions import (
     ansi_c_string_safe,
@@ -91,7 +117,6 @@ if TYPE_CHECKING:
     from goe.config.orchestration_config import OrchestrationConfig
     from goe.offload.backend_table import BackendTableInterface
     from goe.offload.column_metadata import ColumnMetadataInterface
-    from goe.offload.offload_messages import OffloadMessages
     from goe.offload.offload_source_data import OffloadSourcePartitions
     from goe.offload.offload_source_table import OffloadSourceTableInterface
 
@@ -189,7 +214,11 @@ SPARK_LOG_ROW_COUNT_PATTERN = r'^.* GOETaskListener: .*"recordsWritten":(\d+).*}
 GOE_LISTENER_NAME = "GOETaskListener"
 GOE_LISTENER_JAR = "goe-spark-listener.jar"
 
+# Query Import staging file names, in line with Sqoop/Spark output
+QUERY_IMPORT_PART_FILE_TEMPLATE = "part-m-%05d.%s"
+
 TRANSPORT_CXT_BYTES = "staged_bytes"
+TRANSPORT_CXT_FINGERPRINT = "staged_fingerprint"
 TRANSPORT_CXT_ROWS = "staged_rows"
 
 logger = logging.getLogger(__name__)
@@ -708,6 +737,95 @@ def get_offload_transport_value(
         return None
 
 
+def query_import_extraction_worker(
+    offload_options: "OrchestrationConfig",
+    rdbms_owner: str,
+    rdbms_table_name: str,
+    load_db_name: str,
+    load_table_name: str,
+    staging_format: str,
+    canonical_columns: list,
+    binary_data_as_base64: bool,
+    rdbms_columns: list,
+    base64_columns: list,
+    compression: bool,
+    source_query: str,
+    fetch_size: int,
+    qi_fetch_size: Optional[int],
+    rdbms_session_setup_commands: list,
+    local_staging_path: Optional[str],
+    dfs_load_path: Optional[str] = None,
+    fingerprint: bool = False,
+    adaptive_fetch: bool = True,
+) -> tuple:
+    """Extract a single Query Import split to a local staging file, or if local_staging_path is None
+    stream it directly to dfs_load_path.
+    Runs in a separate process therefore all inputs must be picklable and any objects that hold
+    connections or log file handles are rebuilt here, logging from the worker goes nowhere.
+    Returns a tuple of (rows imported, elapsed seconds, staged data fingerprint dict or None).
+    """
+    worker_messages = OffloadMessages(detail=SUPPRESS_STDOUT)
+    try:
+        start_time = datetime.now()
+        staging_file = staging_file_factory(
+            load_db_name,
+            load_table_name,
+            staging_format,
+            canonical_columns,
+            offload_options,
+            binary_data_as_base64,
+            worker_messages,
+        )
+        rdbms_api = offload_transport_rdbms_api_factory(
+            rdbms_owner, rdbms_table_name, offload_options, worker_messages
+        )
+        encoder = query_import_factory(
+            staging_file,
+            worker_messages,
+            compression=compression,
+            base64_columns=base64_columns,
+            offload_options=offload_options,
+            fingerprint=fingerprint,
+            adaptive_fetch=adaptive_fetch,
+        )
+        with rdbms_api.query_import_extraction(
+            staging_file.get_staging_columns(),
+            source_query,
+            None,
+            fetch_size,
+            compression,
+            rdbms_session_setup_commands,
+        ) as rdbms_cursor:
+            if local_staging_path:
+                rows_imported = encoder.write_from_cursor(
+                    local_staging_path, rdbms_cursor, rdbms_columns, qi_fetch_size
+                )
+            else:
+                dfs_client = get_dfs_from_options(
+                    offload_options, messages=worker_messages, dry_run=False
+                )
+                with dfs_client.open_for_write(
+                    dfs_load_path, overwrite=True
+                ) as output_file:
+                    rows_imported = encoder.write_from_cursor(
+                        output_file, rdbms_cursor, rdbms_columns, qi_fetch_size
+                    )
+        return (
+            rows_imported,
+            (datetime.now() - start_time).total_seconds(),
+            (
+                encoder.staged_fingerprint.to_dict()
+                if encoder.staged_fingerprint
+                else None
+            ),
+        )
+    except Exception as exc:
+        # Driver exceptions do not always survive the trip back to the parent process.
+        raise OffloadTransportException(
+            "Query Import worker failed: %s\n%s" % (str(exc), traceback.format_exc())
+        ) from None
+
+
 class OffloadTransport(object, metaclass=ABCMeta):
     """Interface for classes transporting data from an RDBMS frontend to storage that can be accessed by a backend.
     Overloads by different transport methods, such a Spark, Sqoop, etc
@@ -796,8 +914,11 @@ class OffloadTransport(object, metaclass=ABCMeta):
         self._compress_load_table = offload_operation.compress_load_table
         self._preserve_load_table = offload_operation.preserve_load_table
         self._compute_load_table_stats = offload_operation.compute_load_table_stats
+        self._fingerprint_staged_data = bool(
+            offload_operation.verify_row_count == OFFLOAD_VERIFY_FINGERPRINT
+        )
         self._load_db_name = self._target_table.get_load_db_name()
-        self._load_table_name = self._target_table.table_name
+        self._load_table_name = self._target_table.get_load_table_name()
         self._staging_format = offload_options.offload_staging_format
         self._staging_file = staging_file_factory(
             self._load_db_name,
@@ -921,6 +1042,7 @@ class OffloadTransport(object, metaclass=ABCMeta):
     def _reset_transport_context(self):
         self._transport_context = {
             TRANSPORT_CXT_BYTES: None,
+            TRANSPORT_CXT_FINGERPRINT: None,
             TRANSPORT_CXT_ROWS: None,
         }
 
@@ -1128,6 +1250,33 @@ class OffloadTransport(object, metaclass=ABCMeta):
             # Return any column
             return self._rdbms_columns[0].name
 
+    def _get_id_range(
+        self, split_row_source_by, id_range_column, partition_chunk
+    ) -> tuple:
+        col_name = (
+            id_range_column
+            if isinstance(id_range_column, str)
+            else id_range_column.name
+        )
+        predicate_offload_clause = self._rdbms_table.predicate_to_where_clause(
+            self._rdbms_offload_predicate
+        )
+        id_col_min, id_col_max = self._rdbms_api.get_id_range(
+            col_name, predicate_offload_clause, partition_chunk=partition_chunk
+        )
+        if id_col_min is None or id_col_max is None:
+            self.log(
+                f"Switching from range to mod data split due to blank values: {id_col_min} -> {id_col_max}",
+                detail=VVERBOSE,
+            )
+            split_row_source_by = TRANSPORT_ROW_SOURCE_QUERY_SPLIT_BY_MOD
+            id_col_min = None
+            id_col_max = None
+        return split_row_source_by, id_col_min, id_col_max
+
+    def _get_id_column_for_range_splitting(self) -> "ColumnMetadataInterface":
+        return self._rdbms_api.get_id_column_for_range_splitting(self._rdbms_table)
+
     def _get_transport_row_source_query(
         self,
         partition_by: str,
@@ -1421,10 +1570,18 @@ FROM (%(row_source_subquery)s) %(table_alias)s) v2""" % {
         """Return a dict used to pass contextual information back from transport()"""
         return self._transport_context.get(TRANSPORT_CXT_BYTES)
 
+    def get_staged_fingerprint(self) -> Optional[StagedDataFingerprint]:
+        """Return the fingerprint of data staged by transport(), None if the data was not fingerprinted."""
+        return self._transport_context.get(TRANSPORT_CXT_FINGERPRINT)
+
     def get_transport_snapshot(self) -> Union[int, None]:
         """Return RDBMS SCN applied to this operation."""
         return self._offload_transport_snapshot
 
+    def close(self):
+        """Release any resources held across calls to transport(), a no-op for most transport methods."""
+        pass
+
     def get_staging_file(self):
         return self._staging_file
 
@@ -1465,6 +1622,16 @@ class OffloadTransportSpark(OffloadTransport, metaclass=ABCMeta):
         )
         self._spark_files_csv = offload_options.offload_transport_spark_files
         self._spark_jars_csv = offload_options.offload_transport_spark_jars
+        self._persistent_app = None
+        self._persistent_app_rm_commands = []
+        if (
+            offload_options.offload_transport_spark_persistent_app
+            and not self._persistent_app_supported()
+        ):
+            self.warning(
+                "Persistent Spark application not supported by %s, ignoring OFFLOAD_TRANSPORT_SPARK_PERSISTENT_APP"
+                % self.__class__.__name__
+            )
 
     ###########################################################################
     # PRIVATE METHODS
@@ -1492,33 +1659,6 @@ class OffloadTransportSpark(OffloadTransport, metaclass=ABCMeta):
             jdbc_option_clauses = ".option('oracle.jdbc.timezoneAsRegion', 'false')"
         return jdbc_option_clauses
 
-    def _get_id_range(
-        self, split_row_source_by, id_range_column, partition_chunk
-    ) -> tuple:
-        col_name = (
-            id_range_column
-            if isinstance(id_range_column, str)
-            else id_range_column.name
-        )
-        predicate_offload_clause = self._rdbms_table.predicate_to_where_clause(
-            self._rdbms_offload_predicate
-        )
-        id_col_min, id_col_max = self._rdbms_api.get_id_range(
-            col_name, predicate_offload_clause, partition_chunk=partition_chunk
-        )
-        if id_col_min is None or id_col_max is None:
-            self.log(
-                f"Switching from range to mod data split due to blank values: {id_col_min} -> {id_col_max}",
-                detail=VVERBOSE,
-            )
-            split_row_source_by = TRANSPORT_ROW_SOURCE_QUERY_SPLIT_BY_MOD
-            id_col_min = None
-            id_col_max = None
-        return split_row_source_by, id_col_min, id_col_max
-
-    def _get_id_column_for_range_splitting(self) -> "ColumnMetadataInterface":
-        return self._rdbms_api.get_id_column_for_range_splitting(self._rdbms_table)
-
     def _get_pyspark_body(
         self, partition_chunk=None, create_spark_context=True, canary_query=None
     ) -> str:
@@ -1679,11 +1819,12 @@ class OffloadTransportSpark(OffloadTransport, metaclass=ABCMeta):
 
         pyspark_body = ""
 
-        if self._offload_transport_method != OFFLOAD_TRANSPORT_METHOD_SPARK_LIVY:
+        if create_spark_context:
             # On HDP2 Livy the UTF coding is causing errors submitting the script:
             # SyntaxError: encoding declaration in Unicode string
             # We want UTF coding just in case we have PBO with a unicode predicate but decided to exclude line below
-            # for Livy only. In reality no-one is using Livy with GOE in the near future. We might have to revisit.
+            # for code run in an existing Spark session (Livy or a persistent application) because it is executed
+            # as a Unicode string.
             pyspark_body += dedent(
                 """\
                    # -*- coding: UTF-8 -*-
@@ -1788,11 +1929,19 @@ class OffloadTransportSpark(OffloadTransport, metaclass=ABCMeta):
                 % params
             )
 
+        pyspark_body += dedent(
+            """\
+            staged_df = df.select(projection)
+            """
+        )
+        if self._fingerprint_staged_data:
+            pyspark_body += self._get_pyspark_fingerprint_snippet()
+
         if self._standalone_spark():
             pyspark_body += (
                 dedent(
                     """\
-            df.select(projection).write.format('%(write_format)s').save('%(uri)s')
+            staged_df.write.format('%(write_format)s').save('%(uri)s')
             """
                 )
                 % params
@@ -1801,13 +1950,133 @@ class OffloadTransportSpark(OffloadTransport, metaclass=ABCMeta):
             pyspark_body += (
                 dedent(
                     """\
-            df.select(projection).write.mode('append').format('hive').saveAsTable('`%(load_db)s`.`%(table_name)s`')
+            staged_df.write.mode('append').format('hive').saveAsTable('`%(load_db)s`.`%(table_name)s`')
             """
                 )
                 % params
             )
+
+        if self._fingerprint_staged_data:
+            pyspark_body += dedent(
+                """\
+                if goe_fp:
+                    goe_fp_row = goe_fp.get
+                    goe_fp_rows = goe_fp_row['rows']
+                    goe_fp_columns = {}
+                    for i, (c, kind) in enumerate(goe_fp_kinds):
+                        goe_fp_columns[c] = {'kind': kind, 'nulls': goe_fp_rows - goe_fp_row['c' + str(i)]}
+                        if 'l' + str(i) in goe_fp_row:
+                            goe_fp_columns[c].update({'min': goe_fp_row['l' + str(i)], 'max': goe_fp_row['u' + str(i)]})
+                        if 'h' + str(i) in goe_fp_row:
+                            goe_fp_columns[c]['hash_sum'] = goe_fp_row['h' + str(i)]
+                    print(goe_fp_marker + json.dumps({'rows': goe_fp_rows, 'hash_fn': goe_fp_hash_fn, 'columns': goe_fp_columns}, default=str))
+                """
+            )
         return pyspark_body
 
+    def _get_pyspark_fingerprint_snippet(self) -> str:
+        """Return PySpark code that observes a StagedDataFingerprint of staged_df while it is written.
+        Observations are computed by the write itself, no additional pass over the data is made. Spark versions
+        prior to 3.3 have no Python Observation API and do not fingerprint staged data.
+        """
+        return (
+            dedent(
+                """\
+            import json
+            from pyspark.sql import functions as goe_fn
+            try:
+                from pyspark.sql import Observation
+                goe_fp = Observation('goe_staged_fingerprint')
+            except ImportError:
+                goe_fp = None
+            goe_fp_marker = %(marker)r
+            goe_fp_hash_fn = %(hash_fn)r
+            if goe_fp:
+                goe_fp_kinds = [(c, %(integer)r if t in ('tinyint', 'smallint', 'int', 'bigint') else %(double)r if t == 'double' else %(string)r if t == 'string' else %(other)r) for c, t in staged_df.dtypes]
+                goe_fp_aggs = [goe_fn.count(goe_fn.lit(1)).alias('rows')]
+                for i, (c, kind) in enumerate(goe_fp_kinds):
+                    goe_fp_aggs.append(goe_fn.count(staged_df[c]).alias('c' + str(i)))
+                    if kind in (%(integer)r, %(double)r):
+                        goe_fp_aggs.extend([goe_fn.min(staged_df[c]).alias('l' + str(i)), goe_fn.max(staged_df[c]).alias('u' + str(i))])
+                    if kind in (%(integer)r, %(string)r):
+                        goe_fp_hash = goe_fn.conv(goe_fn.substring(goe_fn.md5(staged_df[c].cast('string')), 1, %(hash_digits)s), 16, 10).cast('decimal(38,0)')
+                        goe_fp_aggs.append(goe_fn.coalesce(goe_fn.sum(goe_fp_hash), goe_fn.lit(0)).alias('h' + str(i)))
+                staged_df = staged_df.observe(goe_fp, *goe_fp_aggs)
+            """
+            )
+            % {
+                "marker": FINGERPRINT_LOG_MARKER,
+                "hash_fn": FINGERPRINT_HASH_MD5,
+                "hash_digits": FINGERPRINT_HASH_HEX_DIGITS,
+                "integer": FINGERPRINT_KIND_INTEGER,
+                "double": FINGERPRINT_KIND_DOUBLE,
+                "string": FINGERPRINT_KIND_STRING,
+                "other": FINGERPRINT_KIND_OTHER,
+            }
+        )
+
+    def _get_persistent_app_submit_command(self, pyspark_body) -> tuple:
+        """Return (command, no_log_items, rm_commands) to submit the persistent driver in pyspark_body.
+        Only required for transport methods that support a persistent Spark application.
+        """
+        raise NotImplementedError(
+            "Persistent Spark application not supported for %s"
+            % self._offload_transport_method
+        )
+
+    def _persistent_app_supported(self) -> bool:
+        """Override in transport methods that implement _get_persistent_app_submit_command()."""
+        return False
+
+    def _persistent_app_enabled(self) -> bool:
+        return bool(
+            self._offload_options.offload_transport_spark_persistent_app
+            and self._persistent_app_supported()
+            and not self._dry_run
+        )
+
+    def _run_in_persistent_app(self, partition_chunk=None) -> str:
+        """Transport partition_chunk using the persistent Spark application, starting it if required.
+        Returns the application output logged while the chunk was transported.
+        """
+        if not (self._persistent_app and self._persistent_app.is_running()):
+            control_dir = persistent_app_control_dir(
+                self._target_table.get_staging_table_location()
+            )
+            driver_body = persistent_app_driver_pyspark_body(
+                self._get_transport_app_name(),
+                control_dir,
+                hive_support=bool(not self._standalone_spark()),
+            )
+            (
+                submit_cmd,
+                no_log_password,
+                rm_commands,
+            ) = self._get_persistent_app_submit_command(driver_body)
+            self._persistent_app_rm_commands.extend(rm_commands or [])
+            self._persistent_app = SparkPersistentApp(
+                control_dir, self._dfs_client, self._messages
+            )
+            self._persistent_app.start(submit_cmd, no_log_items=no_log_password)
+        pyspark_body = self._get_pyspark_body(
+            partition_chunk, create_spark_context=False
+        )
+        self.log("PySpark: " + pyspark_body, detail=VVERBOSE)
+        return self._persistent_app.run_work_item(pyspark_body)
+
+    def _record_staged_fingerprint_from_spark_log(self, spark_log_text):
+        """Record the StagedDataFingerprint printed by the PySpark body, if there is one."""
+        if not self._fingerprint_staged_data:
+            return
+        fingerprint = staged_data_fingerprint_from_log(spark_log_text)
+        if fingerprint:
+            self.log(
+                "Staged data fingerprint rows: %s" % fingerprint.rows, detail=VVERBOSE
+            )
+        else:
+            self.log("Spark did not log a staged data fingerprint", detail=VVERBOSE)
+        self._transport_context[TRANSPORT_CXT_FINGERPRINT] = fingerprint
+
     def _get_rows_imported_from_spark_log(self, spark_log_text):
         """Scrape spark_log_text searching for rows imported information"""
         self.debug("_get_rows_imported_from_spark_log()")
@@ -1947,6 +2216,18 @@ class OffloadTransportSpark(OffloadTransport, metaclass=ABCMeta):
                 )
                 return self._OffloadTransportSqlStatsThread.drain_queue()
 
+    ###########################################################################
+    # PUBLIC METHODS
+    ###########################################################################
+
+    def close(self):
+        if self._persistent_app:
+            self._persistent_app.stop()
+            self._persistent_app = None
+        if self._persistent_app_rm_commands:
+            [self._run_os_cmd(_) for _ in self._persistent_app_rm_commands]
+            self._persistent_app_rm_commands = []
+
 
 class OffloadTransportSparkThrift(OffloadTransportSpark):
     """Use Spark Thrift Server to transport data"""
@@ -2548,6 +2829,19 @@ class OffloadTransportSparkSubmit(OffloadTransportSpark):
         spark_submit_cmd.append(options_file_remote_path)
         return spark_submit_cmd, no_log_password, py_rm_commands
 
+    def _persistent_app_supported(self) -> bool:
+        return True
+
+    def _get_persistent_app_submit_command(self, pyspark_body) -> tuple:
+        spark_submit_cmd, no_log_password, py_rm_commands = (
+            self._get_spark_submit_command(pyspark_body)
+        )
+        return (
+            self._ssh_cmd_prefix() + spark_submit_cmd,
+            no_log_password,
+            py_rm_commands,
+        )
+
     def _spark_submit_import(self, partition_chunk=None):
         self._refresh_rdbms_action()
 
@@ -2555,21 +2849,28 @@ class OffloadTransportSparkSubmit(OffloadTransportSpark):
             return 0
 
         rows_imported = None
-        pyspark_body = self._get_pyspark_body(partition_chunk)
-        (
-            spark_submit_cmd,
-            no_log_password,
-            py_rm_commands,
-        ) = self._get_spark_submit_command(pyspark_body)
+        py_rm_commands = None
+        if self._persistent_app_enabled():
+            self._start_validation_polling_thread()
+            cmd_out = self._run_in_persistent_app(partition_chunk)
+            self._stop_validation_polling_thread()
+        else:
+            pyspark_body = self._get_pyspark_body(partition_chunk)
+            (
+                spark_submit_cmd,
+                no_log_password,
+                py_rm_commands,
+            ) = self._get_spark_submit_command(pyspark_body)
 
-        self._start_validation_polling_thread()
-        rc, cmd_out = self._run_os_cmd(
-            self._ssh_cmd_prefix() + spark_submit_cmd, no_log_items=no_log_password
-        )
-        self._stop_validation_polling_thread()
+            self._start_validation_polling_thread()
+            rc, cmd_out = self._run_os_cmd(
+                self._ssh_cmd_prefix() + spark_submit_cmd, no_log_items=no_log_password
+            )
+            self._stop_validation_polling_thread()
 
         if not self._dry_run:
             rows_imported = self._get_rows_imported_from_spark_log(cmd_out)
+            self._record_staged_fingerprint_from_spark_log(cmd_out)
             rows_imported_from_sql_stats = self._rdbms_api.log_sql_stats(
                 self._rdbms_module,
                 self._rdbms_action,
@@ -2710,7 +3011,10 @@ class OffloadTransportSparkSubmitCanary(OffloadTransportSparkSubmit):
 
 
 class OffloadTransportQueryImport(OffloadTransport):
-    """Use Python to transport data, only suitable for small chunks"""
+    """Use Python to transport data.
+    Extraction can be split across multiple worker processes using the same row source splitting
+    as Spark/Sqoop, each worker writes its own staging file.
+    """
 
     def __init__(
         self,
@@ -2731,11 +3035,21 @@ class OffloadTransportQueryImport(OffloadTransport):
             messages,
             dfs_client,
         )
-        self._offload_transport_parallelism = 1
-        # Cap fetch size at 1000
-        self._offload_transport_fetch_size = min(
-            int(self._offload_transport_fetch_size), 1000
+        # An explicit --offload-transport-fetch-size is used as is, otherwise the fetch size is derived
+        # from the width of the source rows and row batches are adapted to measured widths during extraction.
+        self._adaptive_fetch = not self._query_import_fetch_size_is_explicit(
+            offload_operation
         )
+        if self._adaptive_fetch:
+            self._offload_transport_fetch_size = initial_fetch_rows(
+                self._rdbms_columns,
+                offload_options.offload_transport_query_import_batch_size,
+                offload_options.offload_transport_query_import_max_batch_size,
+            )
+        else:
+            self._offload_transport_fetch_size = int(
+                offload_operation.offload_transport_fetch_size
+            )
         self._convert_nans_to_nulls = convert_nans_to_nulls(
             offload_target_table, offload_operation
         )
@@ -2748,45 +3062,82 @@ class OffloadTransportQueryImport(OffloadTransport):
         # Not applicable to Query Import
         return None
 
-    def _query_import_to_local_fs(self, partition_chunk=None) -> tuple:
-        """Execute Query Import transport.
-
-        Query Import is not partition aware therefore partition_chunk is ignored"""
+    def _query_import_fetch_size_is_explicit(self, offload_operation) -> bool:
+        """The fetch size has been set on the command line or in the environment, rather than defaulted."""
+        return bool(
+            os.environ.get("OFFLOAD_TRANSPORT_FETCH_SIZE")
+            or int(offload_operation.offload_transport_fetch_size)
+            != int(orchestration_defaults.offload_transport_fetch_size_default())
+        )
 
-        if self._nothing_to_do(partition_chunk):
-            return 0
+    def _query_import_dfs_load_path(self, batch: int) -> str:
+        return os.path.join(
+            self._staging_table_location,
+            QUERY_IMPORT_PART_FILE_TEMPLATE % (batch, self._staging_format.lower()),
+        )
 
-        local_staging_path = get_local_staging_path(
+    def _query_import_local_staging_path(self, batch: int) -> str:
+        extension = "." + self._staging_format.lower()
+        if batch:
+            extension = ".%05d%s" % (batch, extension)
+        return get_local_staging_path(
             self._target_owner,
             self._target_table_name,
             self._offload_options,
-            "." + self._staging_format.lower(),
+            extension,
         )
-        dfs_load_path = os.path.join(
-            self._staging_table_location, "part-m-00000." + self._staging_format.lower()
+
+    def _query_import_source_queries(self, partition_chunk=None) -> list:
+        """Return a list of extraction queries, one for each Query Import worker.
+        A single worker uses a simple query, multiple workers each filter a split row source on
+        TRANSPORT_ROW_SOURCE_QUERY_SPLIT_COLUMN.
+        """
+        colexpressions, colnames = self._build_offload_query_lists(
+            convert_expressions_on_rdbms_side=self._rdbms_api.convert_query_import_expressions_on_rdbms_side(),
+            for_qi=True,
         )
-        qi_fetch_size = (
-            self._offload_transport_fetch_size
-            if self._fetchmany_takes_fetch_size
+        sql_projection = self._sql_projection_from_offload_query_expression_list(
+            colexpressions, colnames
+        )
+        predicate_clause = (
+            self._rdbms_table.predicate_to_where_clause(self._rdbms_offload_predicate)
+            if self._rdbms_offload_predicate
             else None
         )
 
-        staging_columns = self._staging_file.get_staging_columns()
+        if self._offload_transport_parallelism > 1:
+            split_row_source_by = self._get_transport_split_type(partition_chunk)
+            id_col_min, id_col_max = None, None
+            if split_row_source_by == TRANSPORT_ROW_SOURCE_QUERY_SPLIT_BY_ID_RANGE:
+                split_row_source_by, id_col_min, id_col_max = self._get_id_range(
+                    split_row_source_by,
+                    self._get_id_column_for_range_splitting(),
+                    partition_chunk,
+                )
+            row_source = self._get_transport_row_source_query(
+                split_row_source_by,
+                partition_chunk,
+                id_col_min=id_col_min,
+                id_col_max=id_col_max,
+            )
+            source_queries = []
+            for batch in range(self._offload_transport_parallelism):
+                source_query = "SELECT %s\nFROM (%s)\nWHERE %s = %s" % (
+                    sql_projection,
+                    row_source,
+                    TRANSPORT_ROW_SOURCE_QUERY_SPLIT_COLUMN,
+                    batch,
+                )
+                if predicate_clause:
+                    source_query += "\nAND (%s)" % predicate_clause
+                source_queries.append(source_query)
+            return source_queries
 
         if self._offload_transport_consistent_read:
             self.log(
                 "Ignoring --offload-transport-consistent-read for serial transport task",
                 detail=VVERBOSE,
             )
-
-        colexpressions, colnames = self._build_offload_query_lists(
-            convert_expressions_on_rdbms_side=self._rdbms_api.convert_query_import_expressions_on_rdbms_side(),
-            for_qi=True,
-        )
-
-        sql_projection = self._sql_projection_from_offload_query_expression_list(
-            colexpressions, colnames
-        )
         table_name = ('"%s"."%s"' % (self._rdbms_owner, self._rdbms_table_name)).upper()
         if partition_chunk:
             split_row_source_by = self._get_transport_split_type(partition_chunk)
@@ -2804,40 +3155,184 @@ class OffloadTransportQueryImport(OffloadTransport):
                 table_name,
                 snapshot_clause,
             )
-        if self._rdbms_offload_predicate:
-            source_query += (
-                "\nWHERE (%s)"
-                % self._rdbms_table.predicate_to_where_clause(
-                    self._rdbms_offload_predicate
+        if predicate_clause:
+            source_query += "\nWHERE (%s)" % predicate_clause
+        return [source_query]
+
+    def _query_import_stream_to_dfs(self) -> bool:
+        """Stream staging files directly to object storage rather than via local disk."""
+        return bool(
+            self._offload_options.offload_transport_query_import_stream_to_dfs
+            and self._dfs_client.supports_open_for_write()
+        )
+
+    def _query_import_serial(
+        self, source_query, local_staging_path, dfs_load_path, qi_fetch_size
+    ) -> Union[int, None]:
+        """Extract to local_staging_path or, if it is None, stream directly to dfs_load_path."""
+        encoder = query_import_factory(
+            self._staging_file,
+            self._messages,
+            compression=self._compress_load_table,
+            base64_columns=self._base64_staged_columns(),
+            offload_options=self._offload_options,
+            fingerprint=self._fingerprint_staged_data,
+            adaptive_fetch=self._adaptive_fetch,
+        )
+        with self._rdbms_api.query_import_extraction(
+            self._staging_file.get_staging_columns(),
+            source_query,
+            None,
+            self._offload_transport_fetch_size,
+            self._compress_load_table,
+            self._get_rdbms_session_setup_commands(),
+        ) as rdbms_cursor:
+            if local_staging_path:
+                rows_imported = encoder.write_from_cursor(
+                    local_staging_path, rdbms_cursor, self._rdbms_columns, qi_fetch_size
+                )
+            else:
+                with self._dfs_client.open_for_write(
+                    dfs_load_path, overwrite=True
+                ) as output_file:
+                    rows_imported = encoder.write_from_cursor(
+                        output_file, rdbms_cursor, self._rdbms_columns, qi_fetch_size
+                    )
+        self._transport_context[TRANSPORT_CXT_FINGERPRINT] = encoder.staged_fingerprint
+        return rows_imported
+
+    def _query_import_parallel(
+        self, source_queries, staging_paths, qi_fetch_size
+    ) -> int:
+        """Run one extraction worker process per source query.
+        Workers are started with "spawn" because RDBMS client libraries are not safe to use across a fork.
+        """
+        worker_kwargs = {
+            "offload_options": self._offload_options,
+            "rdbms_owner": self._rdbms_owner,
+            "rdbms_table_name": self._rdbms_table_name,
+            "load_db_name": self._load_db_name,
+            "load_table_name": self._load_table_name,
+            "staging_format": self._staging_format,
+            "canonical_columns": self._get_canonical_columns(),
+            "binary_data_as_base64": bool(
+                self._target_table
+                and self._target_table.transport_binary_data_in_base64()
+            ),
+            "rdbms_columns": self._rdbms_columns,
+            "base64_columns": self._base64_staged_columns(),
+            "compression": self._compress_load_table,
+            "fetch_size": self._offload_transport_fetch_size,
+            "qi_fetch_size": qi_fetch_size,
+            "rdbms_session_setup_commands": self._get_rdbms_session_setup_commands(),
+            "fingerprint": self._fingerprint_staged_data,
+            "adaptive_fetch": self._adaptive_fetch,
+        }
+        for source_query in source_queries:
+            self.log("Extraction sql: %s" % source_query, detail=VERBOSE)
+
+        rows_imported = 0
+        fingerprint = None
+        with ProcessPoolExecutor(
+            max_workers=len(source_queries),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            futures = [
+                executor.submit(
+                    query_import_extraction_worker,
+                    source_query=source_query,
+                    local_staging_path=local_staging_path,
+                    dfs_load_path=dfs_load_path,
+                    **worker_kwargs,
+                )
+                for source_query, (local_staging_path, dfs_load_path) in zip(
+                    source_queries, staging_paths
+                )
+            ]
+            for batch, future in enumerate(futures):
+                worker_rows, worker_seconds, worker_fingerprint = future.result()
+                self.log(
+                    "Query Import worker %s rows/elapsed: %s/%.1fs"
+                    % (batch, worker_rows, worker_seconds),
+                    detail=VVERBOSE,
                 )
+                rows_imported += worker_rows or 0
+                if worker_fingerprint:
+                    worker_fingerprint = StagedDataFingerprint.from_dict(
+                        worker_fingerprint
+                    )
+                    fingerprint = (
+                        fingerprint.merge(worker_fingerprint)
+                        if fingerprint
+                        else worker_fingerprint
+                    )
+        self._transport_context[TRANSPORT_CXT_FINGERPRINT] = fingerprint
+        return rows_imported
+
+    def _query_import_extract(self, partition_chunk=None) -> tuple:
+        """Execute Query Import transport.
+        Returns a tuple of (rows imported, list of (local staging path, DFS load path) tuples).
+        The local staging path is None when data was streamed directly to the DFS load path.
+        """
+
+        if self._nothing_to_do(partition_chunk):
+            return 0
+
+        qi_fetch_size = (
+            self._offload_transport_fetch_size
+            if self._fetchmany_takes_fetch_size
+            else None
+        )
+
+        source_queries = self._query_import_source_queries(partition_chunk)
+        stream_to_dfs = self._query_import_stream_to_dfs()
+        staging_paths = [
+            (
+                (
+                    None
+                    if stream_to_dfs
+                    else self._query_import_local_staging_path(batch)
+                ),
+                self._query_import_dfs_load_path(batch),
+            )
+            for batch in range(len(source_queries))
+        ]
+        if stream_to_dfs:
+            self.log(
+                "Query Import streaming directly to: %s"
+                % ", ".join(_[1] for _ in staging_paths),
+                detail=VVERBOSE,
             )
-        source_binds = None
 
         self._refresh_rdbms_action()
         rows_imported = None
         if self._dry_run:
-            self.log("Extraction sql: %s" % source_query, detail=VERBOSE)
+            for source_query in source_queries:
+                self.log("Extraction sql: %s" % source_query, detail=VERBOSE)
+        elif len(source_queries) == 1:
+            rows_imported = self._query_import_serial(
+                source_queries[0],
+                staging_paths[0][0],
+                staging_paths[0][1],
+                qi_fetch_size,
+            )
         else:
-            encoder = query_import_factory(
-                self._staging_file,
-                self._messages,
-                compression=self._compress_load_table,
-                base64_columns=self._base64_staged_columns(),
-            )
-            with self._rdbms_api.query_import_extraction(
-                staging_columns,
-                source_query,
-                source_binds,
-                self._offload_transport_fetch_size,
-                self._compress_load_table,
-                self._get_rdbms_session_setup_commands(),
-            ) as rdbms_cursor:
-                rows_imported = encoder.write_from_cursor(
-                    local_staging_path, rdbms_cursor, self._rdbms_columns, qi_fetch_size
+            self.log(
+                "Query Import extracting with %s workers" % len(source_queries),
+                detail=VERBOSE,
+            )
+            try:
+                rows_imported = self._query_import_parallel(
+                    source_queries, staging_paths, qi_fetch_size
                 )
+            except Exception:
+                local_staging_paths = [_[0] for _ in staging_paths if _[0]]
+                if local_staging_paths:
+                    self._run_os_cmd(["rm", "-f"] + local_staging_paths)
+                raise
 
         self._check_rows_imported(rows_imported)
-        return rows_imported, local_staging_path, dfs_load_path
+        return rows_imported, staging_paths
 
     def _query_import_copy_to_dfs(self, local_staging_path, dfs_load_path):
         rm_local_file = ["rm", "-f", local_staging_path]
@@ -2862,10 +3357,14 @@ class OffloadTransportQueryImport(OffloadTransport):
         self._reset_transport_context()
 
         def step_fn():
-            return_values = self._query_import_to_local_fs(partition_chunk)
+            return_values = self._query_import_extract(partition_chunk)
             if return_values:
-                rows_imported, local_staging_path, dfs_load_path = return_values
-                self._query_import_copy_to_dfs(local_staging_path, dfs_load_path)
+                rows_imported, staging_paths = return_values
+                for local_staging_path, dfs_load_path in staging_paths:
+                    if local_staging_path:
+                        self._query_import_copy_to_dfs(
+                            local_staging_path, dfs_load_path
+                        )
                 staged_bytes = self._check_and_log_transported_files(rows_imported)
                 self._transport_context[TRANSPORT_CXT_BYTES] = staged_bytes
                 self._transport_context[TRANSPORT_CXT_ROWS] = rows_imported
@@ -15,6 +15,7 @@
 """ OffloadTransportFunctions: Library of functions used in goe.py and data transport modules
 """
 
+from bisect import bisect_left
 import decimal
 import logging
 from getpass import getuser
@@ -34,6 +35,7 @@ from goe.offload.offload_constants import (
     HADOOP_BASED_BACKEND_DISTRIBUTIONS,
 )
 from goe.offload.offload_messages import VERBOSE, VVERBOSE
+from goe.offload.oracle.oracle_connection_pool import get_pooled_oracle_connection
 from goe.orchestration import orchestration_constants
 from goe.util.goe_log_fh import is_gcs_path
 from goe.util.misc_functions import (
@@ -51,6 +53,7 @@ if TYPE_CHECKING:
     from goe.offload.offload_source_table import OffloadSourceTableInterface
     from goe.offload.offload_transport import OffloadTransport
     from goe.offload.predicate_offload import GenericPredicate
+    from goe.offload.staged_data_fingerprint import StagedDataFingerprint
     from goe.orchestration.execution_id import ExecutionId
     from goe.persistence.orchestration_repo_client import (
         OrchestrationRepoClientInterface,
@@ -65,6 +68,11 @@ class OffloadTransportException(Exception):
 # CONSTANTS
 ###############################################################################
 
+# Approximate number of rows to sample when calculating quantiles for ID range splitting.
+ID_RANGE_QUANTILE_SAMPLE_ROWS = 100_000
+# Sample percentage used when no statistics are available to size the sample.
+ID_RANGE_QUANTILE_DEFAULT_SAMPLE_PERCENT = 1
+
 logger = logging.getLogger(__name__)
 # Disabling logging by default
 logger.addHandler(logging.NullHandler())
@@ -141,8 +149,25 @@ def scp_to_cmd(user, host, from_path, to_path) -> list:
 
 
 def get_rdbms_connection_for_oracle(
-    ora_user, ora_pass, ora_dsn, use_oracle_wallet=False, ora_trace_id="GOE"
+    ora_user,
+    ora_pass,
+    ora_dsn,
+    use_oracle_wallet=False,
+    ora_trace_id="GOE",
+    pool_size=0,
 ):
+    """Return a connection for transport helpers, from the process wide session pool if pool_size is set."""
+    if pool_size:
+        return get_pooled_oracle_connection(
+            ora_user,
+            ora_pass,
+            ora_dsn,
+            use_oracle_wallet,
+            pool_size,
+            module=FRONTEND_TRACE_MODULE,
+            action="OffloadTransport",
+            ora_trace_id=ora_trace_id,
+        )
     if use_oracle_wallet:
         ora_conn = cxo.connect(dsn=ora_dsn)
     else:
@@ -311,42 +336,42 @@ def offload_chunk_backend_bytes(
         return None
 
 
-def transport_and_load_offload_chunk(
-    data_transport_client: "OffloadTransport",
+def offload_chunk_frontend_bytes(
     offload_source_table: "OffloadSourceTableInterface",
-    offload_target_table: "BackendTableInterface",
-    execution_id: "ExecutionId",
-    repo_client: "OrchestrationRepoClientInterface",
     messages: "OffloadMessages",
     partition_chunk: Optional["OffloadSourcePartitions"] = None,
-    chunk_count: int = 0,
-    sync: bool = True,
     offload_predicate: Optional["GenericPredicate"] = None,
-    dry_run: bool = False,
 ):
-    """Offload transport steps for a regular offload chunk, used in goe.py."""
-
-    def get_frontend_bytes():
-        try:
-            if offload_predicate:
-                messages.log(
-                    "Unable to calculate frontend bytes for predicate based Offload",
-                    detail=VVERBOSE,
-                )
-                return None
-            elif partition_chunk:
-                return partition_chunk.size_in_bytes()
-            else:
-                return offload_source_table.size_in_bytes
-        except Exception as exc:
-            # This is for instrumentation and non-essential
-            messages.warning(
-                "Unable to calculate transport frontend bytes due to exception: {}".format(
-                    str(exc)
-                )
+    try:
+        if offload_predicate:
+            messages.log(
+                "Unable to calculate frontend bytes for predicate based Offload",
+                detail=VVERBOSE,
+            )
+            return None
+        elif partition_chunk:
+            return partition_chunk.size_in_bytes()
+        else:
+            return offload_source_table.size_in_bytes
+    except Exception as exc:
+        # This is for instrumentation and non-essential
+        messages.warning(
+            "Unable to calculate transport frontend bytes due to exception: {}".format(
+                str(exc)
             )
+        )
 
-    chunk_id = repo_client.start_offload_chunk(
+
+def start_offload_chunk(
+    offload_source_table: "OffloadSourceTableInterface",
+    offload_target_table: "BackendTableInterface",
+    execution_id: "ExecutionId",
+    repo_client: "OrchestrationRepoClientInterface",
+    partition_chunk: Optional["OffloadSourcePartitions"] = None,
+    chunk_count: int = 0,
+) -> int:
+    """Record the start of an offload chunk in the repository, returns the chunk id."""
+    return repo_client.start_offload_chunk(
         execution_id,
         offload_source_table.owner,
         offload_source_table.table_name,
@@ -359,36 +384,133 @@ def transport_and_load_offload_chunk(
         offload_partition_level=offload_source_table.offload_partition_level,
     )
 
-    try:
-        if chunk_count > 0:
-            offload_target_table.empty_staging_area_step(
-                data_transport_client.get_staging_file()
-            )
-
-        rows_staged = data_transport_client.transport(partition_chunk=partition_chunk)
-        transport_bytes = data_transport_client.get_transport_bytes()
-        staging_columns = data_transport_client.get_staging_file().get_staging_columns()
 
-        offload_target_table.validate_staged_data_step(
-            offload_source_table.partition_columns,
-            offload_source_table.columns,
-            rows_staged,
-            staging_columns,
+def transport_offload_chunk(
+    data_transport_client: "OffloadTransport",
+    offload_target_table: "BackendTableInterface",
+    partition_chunk: Optional["OffloadSourcePartitions"] = None,
+    empty_staging_area: bool = False,
+    execution_id: Optional["ExecutionId"] = None,
+    chunk_count: int = 0,
+) -> tuple:
+    """Stage an offload chunk in the staging area of offload_target_table.
+    When execution_id is supplied a manifest is written alongside the staged data to allow the chunk to be
+    loaded by a resumed offload without transporting it again.
+    Returns a tuple of (rows_staged, transport_bytes).
+    """
+    if empty_staging_area:
+        offload_target_table.empty_staging_area_step(
+            data_transport_client.get_staging_file()
+        )
+    rows_staged = data_transport_client.transport(partition_chunk=partition_chunk)
+    transport_bytes = data_transport_client.get_transport_bytes()
+    if execution_id and rows_staged is not None and rows_staged >= 0:
+        staged_fingerprint = data_transport_client.get_staged_fingerprint()
+        offload_target_table.write_staged_chunk_manifest(
+            {
+                "execution_id": str(execution_id),
+                "chunk_number": chunk_count + 1,
+                "partition_names": (
+                    partition_chunk.partition_names() if partition_chunk else []
+                ),
+                "rows_staged": rows_staged,
+                "transport_bytes": transport_bytes,
+                "staged_fingerprint": (
+                    staged_fingerprint.to_dict() if staged_fingerprint else None
+                ),
+            }
         )
+    return rows_staged, transport_bytes
+
+
+def load_offload_chunk(
+    data_transport_client: "OffloadTransport",
+    offload_source_table: "OffloadSourceTableInterface",
+    offload_target_table: "BackendTableInterface",
+    rows_staged: int,
+    messages: "OffloadMessages",
+    sync: bool = True,
+    dry_run: bool = False,
+    staged_fingerprint: Optional["StagedDataFingerprint"] = None,
+):
+    """Validate staged data for an offload chunk and load it into the final table.
+    staged_fingerprint is compared with the load table during validation when supplied.
+    Returns the change in backend bytes caused by the load, None if it cannot be calculated.
+    """
+    staging_columns = data_transport_client.get_staging_file().get_staging_columns()
+
+    offload_target_table.validate_staged_data_step(
+        offload_source_table.partition_columns,
+        offload_source_table.columns,
+        rows_staged,
+        staging_columns,
+        staged_fingerprint=staged_fingerprint,
+    )
+
+    offload_target_table.validate_type_conversions_step(staging_columns)
+
+    pre_load_backend_bytes = (
+        offload_target_table.get_table_size() if not dry_run else None
+    )
+    offload_target_table.load_final_table_step(sync=sync)
+    post_load_backend_bytes = (
+        offload_target_table.get_table_size(no_cache=True) if not dry_run else None
+    )
+    return offload_chunk_backend_bytes(
+        pre_load_backend_bytes, post_load_backend_bytes, messages
+    )
 
-        offload_target_table.validate_type_conversions_step(staging_columns)
 
-        pre_load_backend_bytes = (
-            offload_target_table.get_table_size() if not dry_run else None
+def transport_and_load_offload_chunk(
+    data_transport_client: "OffloadTransport",
+    offload_source_table: "OffloadSourceTableInterface",
+    offload_target_table: "BackendTableInterface",
+    execution_id: "ExecutionId",
+    repo_client: "OrchestrationRepoClientInterface",
+    messages: "OffloadMessages",
+    partition_chunk: Optional["OffloadSourcePartitions"] = None,
+    chunk_count: int = 0,
+    sync: bool = True,
+    offload_predicate: Optional["GenericPredicate"] = None,
+    dry_run: bool = False,
+):
+    """Offload transport steps for a regular offload chunk, used in goe.py."""
+    chunk_id = start_offload_chunk(
+        offload_source_table,
+        offload_target_table,
+        execution_id,
+        repo_client,
+        partition_chunk=partition_chunk,
+        chunk_count=chunk_count,
+    )
+
+    try:
+        rows_staged, transport_bytes = transport_offload_chunk(
+            data_transport_client,
+            offload_target_table,
+            partition_chunk=partition_chunk,
+            empty_staging_area=bool(chunk_count > 0),
+            execution_id=execution_id,
+            chunk_count=chunk_count,
         )
-        offload_target_table.load_final_table_step(sync=sync)
-        post_load_backend_bytes = (
-            offload_target_table.get_table_size(no_cache=True) if not dry_run else None
+        staged_fingerprint = data_transport_client.get_staged_fingerprint()
+
+        backend_byte_delta = load_offload_chunk(
+            data_transport_client,
+            offload_source_table,
+            offload_target_table,
+            rows_staged,
+            messages,
+            sync=sync,
+            dry_run=dry_run,
+            staged_fingerprint=staged_fingerprint,
         )
-        backend_byte_delta = offload_chunk_backend_bytes(
-            pre_load_backend_bytes, post_load_backend_bytes, messages
+        frontend_bytes = offload_chunk_frontend_bytes(
+            offload_source_table,
+            messages,
+            partition_chunk=partition_chunk,
+            offload_predicate=offload_predicate,
         )
-        frontend_bytes = get_frontend_bytes()
 
         repo_client.end_offload_chunk(
             chunk_id,
@@ -397,6 +519,9 @@ def transport_and_load_offload_chunk(
             frontend_bytes=frontend_bytes,
             transport_bytes=transport_bytes,
             backend_bytes=backend_byte_delta,
+            staged_fingerprint=(
+                staged_fingerprint.to_dict() if staged_fingerprint else None
+            ),
         )
 
         return rows_staged
@@ -428,6 +553,62 @@ def split_ranges_for_id_range(id_min, id_max, parallelism):
     return id_ranges
 
 
+def split_ranges_for_id_quantiles(id_min, id_max, quantiles):
+    """Take a range of numbers and a list of boundary values, typically quantiles derived from a histogram or a
+    sample, and return sub-ranges that can be used in comparisons like:
+        id >= i and id < j
+    Boundaries outside of (id_min, id_max] and duplicates are discarded therefore heavily skewed data may result in
+    fewer ranges than boundaries. Returned values are Decimal, consistent with split_ranges_for_id_range().
+    For example:
+        id_min=1, id_max=100, quantiles=[2, 3, 3, 50]
+    should result in:
+        [(1, 2), (2, 3), (3, 50), (50, 101)]
+    """
+    decimal.getcontext().prec = MAX_SUPPORTED_PRECISION
+    if not isinstance(id_min, decimal.Decimal):
+        id_min = decimal.Decimal(str(id_min))
+    if not isinstance(id_max, decimal.Decimal):
+        id_max = decimal.Decimal(str(id_max))
+    boundaries = sorted(
+        set(
+            _ if isinstance(_, decimal.Decimal) else decimal.Decimal(str(_))
+            for _ in quantiles
+            if _ is not None
+        )
+    )
+    boundaries = [id_min] + [_ for _ in boundaries if id_min < _ <= id_max]
+    boundaries.append(id_max + 1)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def quantiles_from_histogram(endpoints: list, parallelism: int) -> list:
+    """Return (parallelism - 1) values that divide a column into groups of roughly equal population.
+    endpoints: A list of (cumulative_count, endpoint_value) tuples in ascending order, as stored in RDBMS
+               height balanced, hybrid or frequency histograms.
+    """
+    if not endpoints or parallelism < 2:
+        return []
+    cumulative_counts = [_[0] for _ in endpoints]
+    total = cumulative_counts[-1]
+    return [
+        endpoints[bisect_left(cumulative_counts, total * i / parallelism)][1]
+        for i in range(1, parallelism)
+    ]
+
+
+def sample_percent_for_id_quantiles(num_rows: Optional[int]) -> Optional[float]:
+    """Return the sample percentage for an ID range quantile query that reads roughly
+    ID_RANGE_QUANTILE_SAMPLE_ROWS rows, or None if the row source is small enough to read in full.
+    """
+    if not num_rows:
+        return ID_RANGE_QUANTILE_DEFAULT_SAMPLE_PERCENT
+    sample_percent = ID_RANGE_QUANTILE_SAMPLE_ROWS * 100 / num_rows
+    if sample_percent >= 100:
+        return None
+    # 0.000001 is the smallest sample percentage Oracle accepts.
+    return max(round(sample_percent, 6), 0.000001)
+
+
 def split_lists_for_id_list(
     id_list: list, parallelism: int, round_robin=True, as_csvs=False
 ) -> list:
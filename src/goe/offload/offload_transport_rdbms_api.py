@@ -19,7 +19,12 @@ from contextlib import contextmanager
 from typing import TYPE_CHECKING
 
 from goe.offload.offload_constants import OFFLOAD_TRANSPORT_VALIDATION_POLLER_DISABLED
-from goe.offload.offload_transport_functions import ssh_cmd_prefix
+from goe.offload.offload_messages import VVERBOSE
+from goe.offload.offload_transport_functions import (
+    split_ranges_for_id_quantiles,
+    split_ranges_for_id_range,
+    ssh_cmd_prefix,
+)
 from goe.util.misc_functions import ansi_c_string_safe
 
 if TYPE_CHECKING:
@@ -94,6 +99,52 @@ class OffloadTransportRdbmsApiInterface(metaclass=ABCMeta):
     # PRIVATE METHODS
     ###########################################################################
 
+    def _get_id_ranges(
+        self,
+        id_split_col: "ColumnMetadataInterface",
+        predicate_offload_clause: str,
+        parallelism: int,
+        rdbms_table: "OffloadSourceTableInterface",
+        partition_chunk: "OffloadSourcePartitions",
+        id_col_min,
+        id_col_max,
+    ) -> list:
+        """Return (low, high) tuples spanning id_col_min to id_col_max.
+        Ranges are of equal population when the frontend can provide quantiles for the column, otherwise of
+        equal width.
+        """
+        quantiles = None
+        if parallelism > 1 and id_split_col.is_number_based():
+            try:
+                quantiles = self.get_id_range_quantiles(
+                    id_split_col.name,
+                    predicate_offload_clause,
+                    parallelism,
+                    rdbms_table,
+                    partition_chunk=partition_chunk,
+                )
+            except Exception as exc:
+                self.log(
+                    "Unable to retrieve ID range quantiles, falling back to equal width ranges: %s"
+                    % str(exc),
+                    detail=VVERBOSE,
+                )
+        if quantiles:
+            self.log("ID range quantiles: %s" % quantiles, detail=VVERBOSE)
+            return split_ranges_for_id_quantiles(id_col_min, id_col_max, quantiles)
+        return split_ranges_for_id_range(id_col_min, id_col_max, parallelism)
+
+    def _get_id_range_num_rows(
+        self,
+        rdbms_table: "OffloadSourceTableInterface",
+        partition_chunk: "OffloadSourcePartitions",
+    ):
+        """Return the number of rows in the row source according to optimizer statistics, None if not known."""
+        if partition_chunk and partition_chunk.count() > 0:
+            row_counts = [_.row_count for _ in partition_chunk.get_partitions()]
+            return None if None in row_counts else sum(row_counts)
+        return rdbms_table.stats_num_rows
+
     def _row_source_query_union_all_clause(self, pad):
         if pad is None:
             # All on one line, Sqoop needs this
@@ -149,6 +200,20 @@ class OffloadTransportRdbmsApiInterface(metaclass=ABCMeta):
     ) -> tuple:
         """Function to get the MIN and MAX values for an id column"""
 
+    def get_id_range_quantiles(
+        self,
+        rdbms_col_name: str,
+        predicate_offload_clause: str,
+        parallelism: int,
+        rdbms_table: "OffloadSourceTableInterface",
+        partition_chunk: "OffloadSourcePartitions" = None,
+    ) -> list:
+        """Return (parallelism - 1) values of an id column that split the row source into groups of roughly
+        equal population. An empty list means quantiles are not available and ID ranges will be of equal width.
+        Frontends supporting ID range splitting should override this.
+        """
+        return []
+
     @abstractmethod
     def get_rdbms_query_cast(
         self,
@@ -18,11 +18,30 @@
 
     CrossDbValidator:   Validate successful offload via calculating aggregates in front/back databases
                         and comparing them
+
+    Validation of RANGE partitioned tables can be sharded, the validated partitions are split into contiguous
+    buckets and aggregates for each bucket are run on separate frontend and backend sessions in parallel.
+
+    When validation fails CrossDbValidator.diff() locates the differing rows using a hash tree style descent:
+    digests (COUNT/SUM) are compared for buckets of partitions and then of ranges of a numeric key, only
+    descending into buckets that differ, until buckets are small enough to compare row by row. The number of
+    queries is therefore proportional to the number of differences rather than the size of the table.
+
+    Successful validations of RANGE partitioned tables can be recorded in the orchestration repository as
+    validation fingerprints. A fingerprint records, for each validated range of partitions, the aggregates
+    and cheap frontend dictionary attributes of each partition (high value, rows and size). Incremental
+    validation only scans ranges containing partitions which are new or have changed since they were fingerprinted.
+    Ranges are stored separately for each set of aggregated columns and aggregations, and sampled columns are
+    reused from a matching set so that repeated validations aggregate the same columns.
 """
 
-from datetime import date, datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from decimal import Decimal
 import logging
 from functools import reduce
+import math
+import threading
 
 from goe.util.misc_functions import is_number, isclose, str_floatlike
 from goe.util.parallel_exec import ParallelExecutor
@@ -47,6 +66,9 @@ from goe.offload.offload_metadata_functions import (
     decode_metadata_incremental_high_values_from_metadata,
 )
 from goe.offload.offload_messages import OffloadMessagesMixin, VERBOSE, VVERBOSE
+from goe.persistence.factory.orchestration_repo_client_factory import (
+    orchestration_repo_client_factory,
+)
 from goe.persistence.orchestration_metadata import (
     OrchestrationMetadata,
     INCREMENTAL_PREDICATE_TYPE_LIST,
@@ -72,6 +94,9 @@ DEFAULT_SELECT_COLS = 5  # Number of columns to run aggregations on
 
 DEFAULT_AGGS = ("min", "max", "count")  # Default list of aggregations to run
 
+# Concurrent sessions per database for sharded validation when neither shard nor frontend parallelism is set
+DEFAULT_SHARD_PARALLELISM = 4
+
 GROUPBY_PARTITIONS = "<extract partition columns>"  # GROUP BY partition columns
 
 # Supported FILTER operations
@@ -81,6 +106,30 @@ SUPPORTED_OPERATIONS = ("<", "<=", ">", ">=", "=", "!=", "<>", "like", "not like
 ENGINE_FRONT = "FRONT"
 ENGINE_BACK = "BACK"
 
+# Validation fingerprint keys
+FINGERPRINT_AGGS = "aggs"
+FINGERPRINT_PARTITIONS = "partitions"
+FINGERPRINT_RANGES = "ranges"
+FINGERPRINT_RESULTS = "results"
+FINGERPRINT_SAMPLE = "sample"
+FINGERPRINT_SELECTS = "selects"
+FINGERPRINT_SETS = "sets"
+FINGERPRINT_VALIDATED = "validated"
+# Number of column/aggregation sets kept in a table's fingerprint, the least recently saved are dropped
+FINGERPRINT_MAX_SETS = 8
+# Change detection only sees frontend dictionary attributes so validated ranges expire after this many days,
+# forcing a periodic full validation to catch backend changes and DML that does not alter the dictionary
+FINGERPRINT_MAX_AGE_DAYS = 7
+
+# Validation diff reasons and defaults
+DIFF_MISSING_BACKEND = "MISSING_BACK"
+DIFF_MISSING_FRONTEND = "MISSING_FRONT"
+DIFF_VALUES = "VALUES"
+DIFF_DUPLICATE_KEY = "DUPLICATE_KEY"
+DIFF_DEFAULT_FAN_OUT = 16
+DIFF_DEFAULT_LEAF_ROWS = 1000
+DIFF_DEFAULT_MAX_KEYS = 100
+
 
 ###############################################################################
 # GLOBAL FUNCTIONS
@@ -240,6 +289,168 @@ def build_verification_clauses(
     return threshold_clauses, query_params
 
 
+def partition_validation_signature(partition) -> dict:
+    """Frontend dictionary attributes of an RdbmsPartition used to detect changes since it was validated.
+    Row counts come from optimizer statistics so a stats gather also triggers validation of the partition.
+    Changes to backend data are not visible here, they are caught when a range reaches FINGERPRINT_MAX_AGE_DAYS.
+    """
+    return {
+        "high_value": partition.high_values_csv,
+        "num_rows": partition.num_rows,
+        "bytes": partition.partition_size,
+    }
+
+
+def fingerprint_set_key(selects, aggs) -> tuple:
+    """Identity of a validation fingerprint set, the order and case of columns and aggregations is not significant."""
+    return (
+        tuple(sorted(_.upper() for _ in selects)),
+        tuple(sorted(_.lower() for _ in aggs)),
+    )
+
+
+def stored_fingerprint_set_key(fingerprint_set: dict) -> tuple:
+    return fingerprint_set_key(
+        fingerprint_set.get(FINGERPRINT_SELECTS) or [],
+        fingerprint_set.get(FINGERPRINT_AGGS) or [],
+    )
+
+
+def partition_validation_shards(
+    prior_partition, partitions: list, shard_count: int
+) -> list:
+    """Split partitions (in partition order) into up to shard_count contiguous buckets of similar size.
+    Returns a list of (prior partition or None, list of partitions in the bucket) tuples like
+    partition_validation_runs(). Partitions with unknown size are treated as equal.
+    """
+    if not partitions:
+        return []
+    shard_count = max(min(int(shard_count or 1), len(partitions)), 1)
+    sizes = [_.partition_size or 0 for _ in partitions]
+    if not all(sizes):
+        sizes = [1 for _ in partitions]
+    target = float(sum(sizes)) / shard_count
+    shards, bucket, cumulative = [], [], 0
+    for i, partition in enumerate(partitions):
+        bucket.append(partition)
+        cumulative += sizes[i]
+        remaining_partitions = len(partitions) - i - 1
+        remaining_shards = shard_count - len(shards) - 1
+        if remaining_shards and (
+            cumulative >= target * (len(shards) + 1)
+            or remaining_partitions == remaining_shards
+        ):
+            shards.append((prior_partition, bucket))
+            prior_partition, bucket = partition, []
+    if bucket:
+        shards.append((prior_partition, bucket))
+    return shards
+
+
+def front_and_back_match(front, back) -> bool:
+    """Compare a single FRONT value with a BACK value."""
+    # TODO: maxym@ 2016-09-14
+    # Somewhat dubious isclose(float(), float()) comparison
+    # Works for now, but may need to find a better way to compare
+    matched = False
+    if is_number(front) and is_number(back) and isclose(float(front), float(back)):
+        matched = True
+    elif isinstance(front, date) and isinstance(back, (date, str)):
+        if isinstance(back, str):
+            # This may be a backend DATE which we need to convert to datetime.date because of Impyla issue 410:
+            # https://github.com/cloudera/impyla/issues/410
+            back = datetime.strptime(back, "%Y-%m-%d").date()
+        if front.strftime("%Y-%m-%d %H:%M:%S.%f") == back.strftime(
+            "%Y-%m-%d %H:%M:%S.%f"
+        ):
+            matched = True
+    elif str(front) == str(back):
+        matched = True
+    return matched
+
+
+def diff_key(value):
+    """Normalise a key value so FRONT and BACK representations of the same number are equal dict keys."""
+    if is_number(value):
+        return Decimal(str(value))
+    return value
+
+
+def diff_rows_by_key(rows) -> dict:
+    """Return {normalised key: [values tuple, ...]} for (key, values...) rows, keeping rows with duplicate keys."""
+    rows_by_key = {}
+    for row in rows or []:
+        rows_by_key.setdefault(diff_key(row[0]), []).append(row[1:])
+    return rows_by_key
+
+
+def diff_values_match(front_values: list, back_values: list) -> bool:
+    """Return True if each FRONT values tuple matches a different BACK values tuple, in any order."""
+    if len(front_values) != len(back_values):
+        return False
+    unmatched = list(back_values)
+    for front in front_values:
+        for i, back in enumerate(unmatched):
+            if all(front_and_back_match(f, b) for f, b in zip(front, back)):
+                del unmatched[i]
+                break
+        else:
+            return False
+    return True
+
+
+def diff_buckets(front_rows, back_rows) -> list:
+    """Return ids of buckets whose digests differ given (bucket id, digest values...) rows from each side.
+    Buckets only present on one side are included, as are NULL bucket ids and ids repeated on one side only.
+    """
+    front = diff_rows_by_key(front_rows)
+    back = diff_rows_by_key(back_rows)
+    mismatched = [
+        bucket_id
+        for bucket_id in set(front) | set(back)
+        if not diff_values_match(front.get(bucket_id, []), back.get(bucket_id, []))
+    ]
+    return sorted(mismatched, key=lambda _: (_ is None, _))
+
+
+def diff_rows(front_rows, back_rows) -> list:
+    """Return (key, reason) for rows that differ given (key, column values...) rows from each side.
+    A key repeated a different number of times on each side is reported as DIFF_DUPLICATE_KEY.
+    """
+    front = diff_rows_by_key(front_rows)
+    back = diff_rows_by_key(back_rows)
+    diffs = []
+    for key in sorted(set(front) | set(back), key=lambda _: (_ is None, _)):
+        if key not in back:
+            diffs.append((key, DIFF_MISSING_BACKEND))
+        elif key not in front:
+            diffs.append((key, DIFF_MISSING_FRONTEND))
+        elif len(front[key]) != len(back[key]):
+            diffs.append((key, DIFF_DUPLICATE_KEY))
+        elif not diff_values_match(front[key], back[key]):
+            diffs.append((key, DIFF_VALUES))
+    return diffs
+
+
+def partition_validation_runs(partitions: list, validated_names: set) -> list:
+    """Return contiguous runs of partitions, in partition order, which are not in validated_names.
+    Each run is a tuple of (prior partition or None, list of partitions in the run).
+    """
+    runs = []
+    prior_partition, run = None, []
+    for partition in partitions:
+        if partition.partition_name in validated_names:
+            if run:
+                runs.append((prior_partition, run))
+                run = []
+            prior_partition = partition
+        else:
+            run.append(partition)
+    if run:
+        runs.append((prior_partition, run))
+    return runs
+
+
 ###############################################################################
 # LOGGING
 ###############################################################################
@@ -289,14 +500,9 @@ class CrossDbValidator(OffloadMessagesMixin, object):
         self._db_name = db_name
         self._table_name = table_name
         self._db_table = "%s.%s" % (db_name, table_name)
-        self._frontend = frontend_api_factory(
-            connection_options.db_type,
-            connection_options,
-            messages,
-            conn_user_override=connection_options.rdbms_app_user,
-            dry_run=(not self._execute),
-            trace_action=self.__class__.__name__,
-        )
+        self._connection_options = connection_options
+        self._messages = messages
+        self._frontend = self._new_frontend_api()
         if backend_obj:
             self._backend = backend_obj
         else:
@@ -306,8 +512,6 @@ class CrossDbValidator(OffloadMessagesMixin, object):
                 messages,
                 dry_run=bool(not self._execute),
             )
-        self._connection_options = connection_options
-        self._messages = messages
 
         if not backend_db and not backend_table:
             self._offload_metadata = OrchestrationMetadata.from_name(
@@ -332,21 +536,38 @@ class CrossDbValidator(OffloadMessagesMixin, object):
 
         # Execution results and intermediaries
         self._frontend_table = None
+        self._backend_table_obj = None
+        self._repo_client = None
         self._frontend_sql = None
         self._backend_sql = None
         self._results = None
         self._success = None
+        self._count_star = False
+        self._row_count_position = None
+        self._select_sample = None
 
         logger.debug("Initialized CrossDbValidator() object for: %s" % self._db_table)
 
     def __del__(self):
         if self._frontend:
             self._frontend.close()
+        if self._repo_client:
+            self._repo_client.close(force=True)
 
     ###########################################################################
     # PRIVATE METHODS
     ###########################################################################
 
+    def _new_frontend_api(self):
+        return frontend_api_factory(
+            self._connection_options.db_type,
+            self._connection_options,
+            self._messages,
+            conn_user_override=self._connection_options.rdbms_app_user,
+            dry_run=(not self._execute),
+            trace_action=self.__class__.__name__,
+        )
+
     def _get_frontend_table(self):
         if not self._frontend_table:
             # Connection we already have in self._frontend cannot be passed into OffloadSourceTable
@@ -367,6 +588,30 @@ class CrossDbValidator(OffloadMessagesMixin, object):
                 )
         return self._frontend_table
 
+    def _get_backend_table(self):
+        if not self._backend_table_obj:
+            self._backend_table_obj = backend_table_factory(
+                self._backend_db,
+                self._backend_table,
+                self._backend.backend_type(),
+                self._connection_options,
+                self._messages,
+                hybrid_metadata=self._offload_metadata,
+                existing_backend_api=self._backend,
+                dry_run=(not self._execute),
+            )
+        return self._backend_table_obj
+
+    def _get_repo_client(self):
+        if not self._repo_client:
+            self._repo_client = orchestration_repo_client_factory(
+                self._connection_options,
+                self._messages,
+                dry_run=(not self._execute),
+                trace_action="repo_client(CrossDbValidator)",
+            )
+        return self._repo_client
+
     def _get_sample_cols(self, required_no):
         """Get sample of columns from self._db_table"""
         return self._frontend.agg_validate_sample_column_names(
@@ -392,13 +637,19 @@ class CrossDbValidator(OffloadMessagesMixin, object):
         logger.info("GROUPING BY columns: %s" % group_bys)
         return group_bys
 
-    def _get_select_cols(self, select_cols, aggs):
+    def _get_select_cols(self, select_cols, aggs, fingerprinted=False):
         """Analyze 'requested' select_cols and return a full list of columns
-        to run aggregations on
+        to run aggregations on.
+        When fingerprinted, sampled columns are taken from a stored fingerprint for the same sample size
+        and aggregations, if all its columns still exist, so that they match the fingerprinted ranges.
         """
+        self._select_sample = None
         if is_number(select_cols):
             select_cols = max(int(select_cols), 1)  # Set the floor for column sample
-            select_cols = self._get_sample_cols(select_cols)
+            self._select_sample = select_cols
+            select_cols = (
+                fingerprinted and self._get_fingerprinted_sample_cols(select_cols, aggs)
+            ) or self._get_sample_cols(select_cols)
         elif isinstance(select_cols, (list, tuple)):
             frontend_table = self._get_frontend_table()
             select_cols = expand_columns_csv(
@@ -445,8 +696,10 @@ class CrossDbValidator(OffloadMessagesMixin, object):
         db_name=None,
         table_name=None,
         frontend_hint_block=None,
+        count_star=False,
     ):
         """Construct appropriate aggregate SQL
+        count_star: Include COUNT(*) after the GROUP BY expressions so row counts are verified by the same scan
 
         Returns: sql, select_expressions
         """
@@ -460,9 +713,11 @@ class CrossDbValidator(OffloadMessagesMixin, object):
 
         if not group_bys:
             group_bys = []
-        select_expressions = group_bys + [
-            "%s(%s)" % (a.upper(), s) for s in selects for a in aggs
-        ]
+        select_expressions = (
+            group_bys
+            + (["COUNT(*)"] if count_star else [])
+            + ["%s(%s)" % (a.upper(), s) for s in selects for a in aggs]
+        )
         hint_clause = f" {frontend_hint_block}" if frontend_hint_block else ""
 
         sql = """SELECT%s %s\nFROM   %s.%s %s""" % (
@@ -505,6 +760,7 @@ class CrossDbValidator(OffloadMessagesMixin, object):
             aggs,
             as_of_scn=as_of_scn,
             frontend_hint_block=frontend_hint_block,
+            count_star=self._count_star,
         )
 
     def _construct_simple_back_agg_sql(self, selects, filters, group_bys, aggs):
@@ -521,6 +777,7 @@ class CrossDbValidator(OffloadMessagesMixin, object):
             filter_clauses=backend_filters,
             measures=selects,
             agg_fns=aggs,
+            count_star=self._count_star,
         )
 
     def _adjust_filters_front(self, filters):
@@ -593,30 +850,6 @@ class CrossDbValidator(OffloadMessagesMixin, object):
         def col_name(col_no):
             return front_selects[col_no]
 
-        def front_and_back_match(front, back):
-            # TODO: maxym@ 2016-09-14
-            # Somewhat dubious isclose(float(), float()) comparison
-            # Works for now, but may need to find a better way to compare
-            matched = False
-            if (
-                is_number(front)
-                and is_number(back)
-                and isclose(float(front), float(back))
-            ):
-                matched = True
-            elif isinstance(front, date) and isinstance(back, (date, str)):
-                if isinstance(back, str):
-                    # This may be a backend DATE which we need to convert to datetime.date because of Impyla issue 410:
-                    # https://github.com/cloudera/impyla/issues/410
-                    back = datetime.strptime(back, "%Y-%m-%d").date()
-                if front.strftime("%Y-%m-%d %H:%M:%S.%f") == back.strftime(
-                    "%Y-%m-%d %H:%M:%S.%f"
-                ):
-                    matched = True
-            elif str(front) == str(back):
-                matched = True
-            return matched
-
         def merge_front_end_results(front_results, back_results):
             """
             Transform: [
@@ -760,16 +993,7 @@ class CrossDbValidator(OffloadMessagesMixin, object):
         if frontend:
             backend_table = None
         else:
-            backend_table = backend_table_factory(
-                self._offload_metadata.backend_owner,
-                self._offload_metadata.backend_table,
-                self._backend.backend_type(),
-                self._connection_options,
-                self._messages,
-                hybrid_metadata=self._offload_metadata,
-                existing_backend_api=self._backend,
-                dry_run=(not self._execute),
-            )
+            backend_table = self._get_backend_table()
         (
             inc_keys,
             hv_real_vals,
@@ -852,6 +1076,728 @@ class CrossDbValidator(OffloadMessagesMixin, object):
             frontend_table.parallel_query_hint(frontend_parallelism)
         )
 
+    def _offloaded_range_partitions(self):
+        """Return offloaded partitions in partition order or None if partition-wise validation is not possible.
+        Only tables offloaded by RANGE partition without an offload predicate are eligible.
+        """
+        if not self._offload_metadata:
+            self.log_verbose("Partition-wise validation requires offload metadata")
+            return None
+        if (
+            self._offload_metadata.incremental_predicate_type
+            != INCREMENTAL_PREDICATE_TYPE_RANGE
+            or self._offload_metadata.is_subpartition_offload()
+            or self._offload_metadata.incremental_predicate_value
+        ):
+            self.log_verbose(
+                "Partition-wise validation is only supported for tables offloaded by RANGE partition"
+            )
+            return None
+        frontend_table = self._get_frontend_table()
+        _, hwm_values, _ = decode_metadata_incremental_high_values_from_metadata(
+            self._offload_metadata, frontend_table
+        )
+        if not hwm_values or not frontend_table.get_partitions():
+            return None
+        partitions = sorted(
+            frontend_table.get_partitions(), key=lambda _: _.partition_position
+        )
+        return [
+            _ for _ in partitions if tuple(_.high_values_python) <= tuple(hwm_values)
+        ]
+
+    def _partition_signatures(self) -> dict:
+        return {
+            _.partition_name: partition_validation_signature(_)
+            for _ in self._get_frontend_table().get_partitions() or []
+        }
+
+    def _get_fingerprint_sets(self) -> list:
+        """Return the column/aggregation sets stored in the validation fingerprint, most recently saved first."""
+        frontend_table = self._get_frontend_table()
+        fingerprint = self._get_repo_client().get_validation_fingerprint(
+            frontend_table.owner,
+            frontend_table.table_name,
+            self._backend_db,
+            self._backend_table,
+        )
+        if not fingerprint:
+            return []
+        if FINGERPRINT_SELECTS in fingerprint:
+            # A fingerprint stored before sets were introduced holds a single set
+            return [fingerprint]
+        return fingerprint.get(FINGERPRINT_SETS) or []
+
+    def _get_fingerprint_set(self, selects, aggs):
+        """Return the stored fingerprint set for selects and aggs, or None if there is none."""
+        key = fingerprint_set_key(selects, aggs)
+        for fingerprint_set in self._get_fingerprint_sets():
+            if stored_fingerprint_set_key(fingerprint_set) == key:
+                return fingerprint_set
+        return None
+
+    def _get_fingerprinted_sample_cols(self, required_no, aggs):
+        """Return sampled columns from the most recent fingerprint set for the same sample size and aggs.
+        Returns None if there is no such set or any of its columns no longer exist.
+        """
+        aggs_key = fingerprint_set_key([], aggs)[1]
+        fingerprint_set = next(
+            (
+                _
+                for _ in self._get_fingerprint_sets()
+                if _.get(FINGERPRINT_SAMPLE) == required_no
+                and stored_fingerprint_set_key(_)[1] == aggs_key
+            ),
+            None,
+        )
+        if not fingerprint_set:
+            return None
+        frontend_table = self._get_frontend_table()
+        selects = fingerprint_set.get(FINGERPRINT_SELECTS) or []
+        if not selects or not all(frontend_table.get_column(_) for _ in selects):
+            return None
+        self.log_verbose(
+            "Reusing sampled columns from validation fingerprint: %s" % selects
+        )
+        return selects
+
+    def _get_validated_ranges(
+        self, selects, aggs, signatures, max_age_days=FINGERPRINT_MAX_AGE_DAYS
+    ) -> list:
+        """Return ranges from the stored validation fingerprint that remain valid.
+        A range is invalidated by a change to any of its partitions or by being validated more than
+        max_age_days ago. Only ranges stored for the same columns and aggregations are considered.
+        """
+        fingerprint_set = self._get_fingerprint_set(selects, aggs)
+        if not fingerprint_set:
+            self.log_verbose(
+                "No validation fingerprint for aggregations: %s(%s)"
+                % ([_.lower() for _ in aggs], list(selects))
+            )
+            return []
+        expired_before = (
+            (datetime.now() - timedelta(days=max_age_days)).isoformat()
+            if max_age_days
+            else None
+        )
+        return [
+            _
+            for _ in fingerprint_set.get(FINGERPRINT_RANGES) or []
+            if all(
+                signatures.get(name) == signature
+                for name, signature in _[FINGERPRINT_PARTITIONS].items()
+            )
+            and not (
+                expired_before and (_.get(FINGERPRINT_VALIDATED) or "") < expired_before
+            )
+        ]
+
+    def _save_validated_ranges(self, selects, aggs, ranges):
+        """Store ranges for selects and aggs, retaining sets stored for other columns or aggregations."""
+        key = fingerprint_set_key(selects, aggs)
+        other_sets = [
+            _
+            for _ in self._get_fingerprint_sets()
+            if stored_fingerprint_set_key(_) != key
+        ]
+        fingerprint_set = {
+            FINGERPRINT_SELECTS: list(selects),
+            FINGERPRINT_AGGS: [_.lower() for _ in aggs],
+            FINGERPRINT_SAMPLE: self._select_sample,
+            FINGERPRINT_RANGES: ranges,
+        }
+        frontend_table = self._get_frontend_table()
+        self._get_repo_client().set_validation_fingerprint(
+            frontend_table.owner,
+            frontend_table.table_name,
+            self._backend_db,
+            self._backend_table,
+            {FINGERPRINT_SETS: ([fingerprint_set] + other_sets)[:FINGERPRINT_MAX_SETS]},
+        )
+
+    def _validated_range(self, partitions, signatures) -> dict:
+        """Return a validation fingerprint range for partitions validated by the most recent queries."""
+        front_results = (self._results or {}).get(ENGINE_FRONT) or []
+        return {
+            FINGERPRINT_PARTITIONS: {
+                _.partition_name: signatures[_.partition_name] for _ in partitions
+            },
+            FINGERPRINT_RESULTS: [
+                [None if _ is None else str(_) for _ in row] for row in front_results
+            ],
+            FINGERPRINT_VALIDATED: datetime.now().isoformat(),
+        }
+
+    def _partition_range_filters(
+        self, prior_partition, last_partition, with_binds=True
+    ):
+        """Return frontend filters, frontend query parameters and backend filters for the data between the high
+        values of prior_partition (or the start of the table if None) and last_partition.
+        """
+        frontend_table = self._get_frontend_table()
+        prior_hvs = prior_partition.high_values_python if prior_partition else None
+        if "MAXVALUE" in (last_partition.high_values_csv or "").upper():
+            # No upper bound, a list of None values retains any lower bound.
+            verification_hvs = [None for _ in frontend_table.partition_columns]
+        else:
+            verification_hvs = last_partition.high_values_python
+        frontend_filters, query_params = build_verification_clauses(
+            frontend_table,
+            INCREMENTAL_PREDICATE_TYPE_RANGE,
+            verification_hvs,
+            prior_hvs,
+            with_binds=with_binds,
+        )
+        backend_filters, _ = build_verification_clauses(
+            frontend_table,
+            INCREMENTAL_PREDICATE_TYPE_RANGE,
+            verification_hvs,
+            prior_hvs,
+            with_binds=False,
+            backend_table=self._get_backend_table(),
+        )
+        return frontend_filters, query_params, backend_filters
+
+    def _validate_filtered(
+        self,
+        selects,
+        backend_filters,
+        group_bys,
+        aggs,
+        as_of_scn,
+        execute,
+        frontend_filters,
+        frontend_query_params,
+        frontend_hint_block,
+    ) -> bool:
+        """Run and compare a single pair of aggregate queries."""
+        self._frontend_sql, front_selects = self._construct_simple_front_agg_sql(
+            selects, frontend_filters, group_bys, aggs, as_of_scn, frontend_hint_block
+        )
+        self._backend_sql = self._construct_simple_back_agg_sql(
+            selects, backend_filters, group_bys, aggs
+        )
+        if execute:
+            self._results = self._run_sqls(
+                self._frontend_sql, self._backend_sql, frontend_query_params
+            )
+            return self._compare_results(self._results, front_selects, group_bys)
+        else:
+            self.log_verbose("Frontend sql: %s" % self._frontend_sql)
+            self.log_verbose("Backend sql: %s" % self._backend_sql)
+            return True
+
+    def _validate_sharded(
+        self,
+        selects,
+        backend_filters,
+        group_bys,
+        aggs,
+        as_of_scn,
+        execute,
+        frontend_filters,
+        frontend_query_params,
+        frontend_hint_block,
+        shards,
+        shard_parallelism,
+        stop_on_mismatch,
+    ) -> bool:
+        """Run and compare a pair of aggregate queries for each shard from partition_validation_shards().
+        Frontend and backend queries run on separate pools of up to shard_parallelism sessions each, results
+        are compared as soon as both queries for a shard have completed.
+        """
+        shard_sqls = []
+        front_selects = None
+        for prior_partition, bucket in shards:
+            shard_frontend_filters, _, shard_backend_filters = (
+                self._partition_range_filters(
+                    prior_partition, bucket[-1], with_binds=False
+                )
+            )
+            front_sql, front_selects = self._construct_simple_front_agg_sql(
+                selects,
+                (frontend_filters or []) + shard_frontend_filters,
+                group_bys,
+                aggs,
+                as_of_scn,
+                frontend_hint_block,
+            )
+            back_sql = self._construct_simple_back_agg_sql(
+                selects,
+                (backend_filters or []) + shard_backend_filters,
+                group_bys,
+                aggs,
+            )
+            shard_sqls.append(
+                (
+                    "%s - %s" % (bucket[0].partition_name, bucket[-1].partition_name),
+                    front_sql,
+                    back_sql,
+                )
+            )
+        self._frontend_sql = "\n\n".join(_[1] for _ in shard_sqls)
+        self._backend_sql = "\n\n".join(_[2] for _ in shard_sqls)
+        if not execute:
+            self.log_verbose("Frontend sql: %s" % self._frontend_sql)
+            self.log_verbose("Backend sql: %s" % self._backend_sql)
+            return True
+
+        parallelism = max(
+            min(int(shard_parallelism or DEFAULT_SHARD_PARALLELISM), len(shard_sqls)),
+            1,
+        )
+        self.log(
+            "Validating %s shards using up to %s sessions per database"
+            % (len(shard_sqls), parallelism)
+        )
+        # Worker sessions are in addition to the long lived frontend session held by the validator.
+        self._frontend.reserve_connections(parallelism + 1)
+        thread_apis = threading.local()
+        worker_apis = []
+        api_lock = threading.Lock()
+
+        def get_thread_api(engine):
+            # Each worker thread has its own session because connections cannot run concurrent queries.
+            api = getattr(thread_apis, engine, None)
+            if not api:
+                if engine == ENGINE_FRONT:
+                    api = self._new_frontend_api()
+                else:
+                    api = backend_api_factory(
+                        self._connection_options.target,
+                        self._connection_options,
+                        self._messages,
+                        dry_run=bool(not self._execute),
+                    )
+                setattr(thread_apis, engine, api)
+                with api_lock:
+                    worker_apis.append(api)
+            return api
+
+        def exec_sql_front(sql):
+            return get_thread_api(ENGINE_FRONT).execute_query_fetch_all(
+                sql, query_params=frontend_query_params, log_level=VERBOSE
+            )
+
+        def exec_sql_back(sql):
+            return get_thread_api(ENGINE_BACK).execute_query_fetch_all(
+                sql, log_level=VERBOSE
+            )
+
+        front_pool = ThreadPoolExecutor(max_workers=parallelism)
+        back_pool = ThreadPoolExecutor(max_workers=parallelism)
+        shard_futures = [
+            (front_pool.submit(exec_sql_front, f), back_pool.submit(exec_sql_back, b))
+            for _, f, b in shard_sqls
+        ]
+        future_shards = {
+            future: i for i, futures in enumerate(shard_futures) for future in futures
+        }
+        shard_results = {}
+        success = True
+        try:
+            for future in as_completed(future_shards):
+                i = future_shards[future]
+                front_future, back_future = shard_futures[i]
+                if i in shard_results or not (
+                    front_future.done() and back_future.done()
+                ):
+                    continue
+                shard_results[i] = {
+                    ENGINE_FRONT: front_future.result(),
+                    ENGINE_BACK: back_future.result(),
+                }
+                shard_success = self._compare_results(
+                    shard_results[i], front_selects, group_bys
+                )
+                self.log_verbose(
+                    "Validated shard %s/%s (%s): %s"
+                    % (i + 1, len(shard_sqls), shard_sqls[i][0], shard_success)
+                )
+                if not shard_success:
+                    success = False
+                    if stop_on_mismatch:
+                        self.log(
+                            "Stopping validation on first mismatch, %s of %s shards compared"
+                            % (len(shard_results), len(shard_sqls))
+                        )
+                        break
+        finally:
+            # Python 3.7 has no shutdown(cancel_futures=True), pending queries are cancelled individually.
+            for future in future_shards:
+                future.cancel()
+            front_pool.shutdown(wait=True)
+            back_pool.shutdown(wait=True)
+            for api in worker_apis:
+                try:
+                    api.close()
+                except Exception:
+                    pass
+
+        self._results = {
+            engine: [
+                row
+                for i in sorted(shard_results)
+                for row in (shard_results[i][engine] or [])
+            ]
+            for engine in (ENGINE_FRONT, ENGINE_BACK)
+        }
+        return success
+
+    def _validate_partitions(
+        self,
+        selects,
+        aggs,
+        execute,
+        frontend_hint_block,
+        prior_partition,
+        partitions,
+        shard_count=None,
+        shard_parallelism=None,
+        stop_on_mismatch=False,
+    ) -> bool:
+        """Validate data in a contiguous run of partitions, sharded if shard_count > 1."""
+        if shard_count and shard_count > 1 and len(partitions) > 1:
+            return self._validate_sharded(
+                selects,
+                None,
+                None,
+                aggs,
+                None,
+                execute,
+                None,
+                None,
+                frontend_hint_block,
+                partition_validation_shards(prior_partition, partitions, shard_count),
+                shard_parallelism,
+                stop_on_mismatch,
+            )
+        frontend_filters, query_params, backend_filters = self._partition_range_filters(
+            prior_partition, partitions[-1]
+        )
+        return self._validate_filtered(
+            selects,
+            backend_filters,
+            None,
+            aggs,
+            None,
+            execute,
+            frontend_filters,
+            query_params or None,
+            frontend_hint_block,
+        )
+
+    def _validate_incrementally(
+        self,
+        selects,
+        aggs,
+        partitions,
+        full,
+        execute,
+        frontend_hint_block,
+        shard_count=None,
+        shard_parallelism=None,
+        stop_on_mismatch=False,
+        fingerprint_max_age_days=FINGERPRINT_MAX_AGE_DAYS,
+    ) -> bool:
+        """Validate ranges of offloaded partitions that are not covered by a stored validation fingerprint."""
+        signatures = self._partition_signatures()
+        offloaded_names = set(_.partition_name for _ in partitions)
+        ranges = (
+            []
+            if full
+            else [
+                _
+                for _ in self._get_validated_ranges(
+                    selects, aggs, signatures, max_age_days=fingerprint_max_age_days
+                )
+                if offloaded_names.issuperset(_[FINGERPRINT_PARTITIONS])
+            ]
+        )
+        validated_names = set(
+            name for _ in ranges for name in _[FINGERPRINT_PARTITIONS]
+        )
+        runs = partition_validation_runs(partitions, validated_names)
+        self.log(
+            "Validating %s of %s offloaded partitions, %s unchanged since last validation"
+            % (
+                len(offloaded_names) - len(validated_names),
+                len(offloaded_names),
+                len(validated_names),
+            )
+        )
+        success = True
+        for prior_partition, run in runs:
+            self.log_verbose(
+                "Validating partitions: %s - %s"
+                % (run[0].partition_name, run[-1].partition_name)
+            )
+            if self._validate_partitions(
+                selects,
+                aggs,
+                execute,
+                frontend_hint_block,
+                prior_partition,
+                run,
+                shard_count=shard_count,
+                shard_parallelism=shard_parallelism,
+                stop_on_mismatch=stop_on_mismatch,
+            ):
+                ranges.append(self._validated_range(run, signatures))
+            else:
+                success = False
+                if stop_on_mismatch:
+                    break
+        if execute and runs:
+            self._save_validated_ranges(selects, aggs, ranges)
+        return success
+
+    def _record_validated_partitions(self, selects, aggs, partition_names):
+        """Add a range of partitions validated by filters supplied by the caller to the stored fingerprint."""
+        signatures = self._partition_signatures()
+        partitions = [
+            _
+            for _ in self._get_frontend_table().get_partitions() or []
+            if _.partition_name in partition_names
+        ]
+        if not partitions:
+            return
+        ranges = [
+            _
+            for _ in self._get_validated_ranges(selects, aggs, signatures)
+            if not set(partition_names).intersection(_[FINGERPRINT_PARTITIONS])
+        ]
+        ranges.append(self._validated_range(partitions, signatures))
+        self._save_validated_ranges(selects, aggs, ranges)
+
+    def _diff_columns(self, key_column, selects, aggs):
+        """Return frontend and backend (key expression, digest expressions, row expressions) for diff queries.
+        Bucket digests are COUNT(*) and SUM(key) plus, for each compared column, COUNT and SUM for numeric
+        columns or the requested aggregations for other columns.
+        """
+        frontend_table = self._get_frontend_table()
+        backend_table = self._get_backend_table()
+        key = frontend_table.get_column(key_column)
+        if not key or not key.is_number_based():
+            raise CrossDbValidatorException(
+                "Diff key must be a numeric column: %s" % key_column
+            )
+        columns = [_ for _ in selects if _.upper() != key.name.upper()]
+
+        def side_columns(enclose_fn, get_column_fn):
+            def enclose(name):
+                column = get_column_fn(name)
+                return enclose_fn(column.name) if column else name
+
+            key_expr = enclose(key.name)
+            digests = ["COUNT(*)", "SUM(%s)" % key_expr]
+            for name in columns:
+                column = frontend_table.get_column(name)
+                column_aggs = (
+                    ("count", "sum") if column and column.is_number_based() else aggs
+                )
+                digests.extend(
+                    "%s(%s)" % (a.upper(), enclose(name)) for a in column_aggs
+                )
+            return key_expr, digests, [key_expr] + [enclose(_) for _ in columns]
+
+        return {
+            ENGINE_FRONT: side_columns(
+                self._frontend.enclose_identifier, frontend_table.get_column
+            ),
+            ENGINE_BACK: side_columns(
+                self._backend.enclose_identifier, backend_table.get_column
+            ),
+        }
+
+    def _diff_sqls(self, expressions, filters, group_by=None):
+        """Construct FRONT and BACK SQL selecting expressions, optionally grouped by the first one."""
+        frontend_table = self._get_frontend_table()
+        table_refs = {
+            ENGINE_FRONT: self._frontend.enclose_object_reference(
+                frontend_table.owner, frontend_table.table_name
+            ),
+            ENGINE_BACK: self._backend.enclose_object_reference(
+                self._backend_db, self._backend_table
+            ),
+        }
+        adjust_fns = {
+            ENGINE_FRONT: self._adjust_filters_front,
+            ENGINE_BACK: self._adjust_filters_back,
+        }
+        sqls = []
+        for engine in (ENGINE_FRONT, ENGINE_BACK):
+            sql = "SELECT %s\nFROM   %s" % (
+                "\n,      ".join(expressions[engine]),
+                table_refs[engine],
+            )
+            engine_filters = adjust_fns[engine](filters[engine])
+            if engine_filters:
+                sql += "\nWHERE  %s" % "\nAND    ".join(engine_filters)
+            if group_by:
+                sql += "\nGROUP BY %s" % expressions[engine][0]
+            sqls.append(sql)
+        return sqls
+
+    def _diff_query(self, expressions, filters, group_by=False):
+        front_sql, back_sql = self._diff_sqls(expressions, filters, group_by=group_by)
+        self._diff_queries += 1
+        results = self._run_sqls(front_sql, back_sql)
+        if False in (results[ENGINE_FRONT], results[ENGINE_BACK]):
+            raise CrossDbValidatorException("Diff SQL execution failed")
+        return results
+
+    def _diff_partitions(self, columns, filters, prior_partition, partitions, state):
+        """Descend into buckets of partitions whose digests differ, finishing with a key diff per partition."""
+        if len(state["diffs"]) >= state["max_keys"]:
+            return
+        if len(partitions) == 1:
+            frontend_filters, _, backend_filters = self._partition_range_filters(
+                prior_partition, partitions[0], with_binds=False
+            )
+            self.log_verbose(
+                "Diff descending into partition: %s" % partitions[0].partition_name
+            )
+            self._diff_keys(
+                columns,
+                {
+                    ENGINE_FRONT: filters[ENGINE_FRONT] + frontend_filters,
+                    ENGINE_BACK: filters[ENGINE_BACK] + backend_filters,
+                },
+                state,
+            )
+            return
+        shards = partition_validation_shards(
+            prior_partition, partitions, state["fan_out"]
+        )
+        cases = {ENGINE_FRONT: [], ENGINE_BACK: []}
+        for bucket_id, (prior, bucket) in enumerate(shards):
+            frontend_filters, _, backend_filters = self._partition_range_filters(
+                prior, bucket[-1], with_binds=False
+            )
+            cases[ENGINE_FRONT].append((frontend_filters, bucket_id))
+            cases[ENGINE_BACK].append((backend_filters, bucket_id))
+        expressions = {
+            engine: [
+                "CASE %s END"
+                % " ".join(
+                    "WHEN %s THEN %s"
+                    % (" AND ".join("(%s)" % _ for _ in case_filters), bucket_id)
+                    for case_filters, bucket_id in cases[engine]
+                )
+            ]
+            + columns[engine][1]
+            for engine in (ENGINE_FRONT, ENGINE_BACK)
+        }
+        results = self._diff_query(expressions, filters, group_by=True)
+        for bucket_id in diff_buckets(results[ENGINE_FRONT], results[ENGINE_BACK]):
+            if bucket_id is None:
+                continue
+            prior, bucket = shards[int(bucket_id)]
+            self._diff_partitions(columns, filters, prior, bucket, state)
+
+    def _diff_keys(self, columns, filters, state):
+        """Find the key range of data matching filters and descend into it."""
+        expressions = {
+            engine: ["MIN(%s)" % columns[engine][0], "MAX(%s)" % columns[engine][0]]
+            for engine in (ENGINE_FRONT, ENGINE_BACK)
+        }
+        results = self._diff_query(expressions, filters)
+        bounds = [
+            diff_key(_)
+            for engine in (ENGINE_FRONT, ENGINE_BACK)
+            for _ in (results[engine] or [[]])[0]
+            if _ is not None
+        ]
+        if bounds:
+            low = int(math.floor(min(bounds)))
+            self._diff_key_range(
+                columns, filters, low, int(math.floor(max(bounds))) + 1, None, state
+            )
+        if len(state["diffs"]) < state["max_keys"]:
+            # Rows with a NULL key cannot be located by key range, only report if they differ.
+            self._diff_null_keys(columns, filters, state)
+
+    def _diff_key_range(self, columns, filters, low, high, row_count, state):
+        """Compare digests for fan_out buckets of the key range [low, high) and descend into those that differ.
+        Buckets with no more than leaf_rows rows, or a width of 1, are compared row by row.
+        """
+        if len(state["diffs"]) >= state["max_keys"]:
+            return
+
+        def range_filters(engine, range_low, range_high):
+            key_expr = columns[engine][0]
+            return filters[engine] + [
+                "%s >= %s" % (key_expr, range_low),
+                "%s < %s" % (key_expr, range_high),
+            ]
+
+        if (
+            row_count is not None and row_count <= state["leaf_rows"]
+        ) or high - low <= 1:
+            expressions = {
+                engine: columns[engine][2] for engine in (ENGINE_FRONT, ENGINE_BACK)
+            }
+            results = self._diff_query(
+                expressions,
+                {
+                    engine: range_filters(engine, low, high)
+                    for engine in (ENGINE_FRONT, ENGINE_BACK)
+                },
+            )
+            remaining = state["max_keys"] - len(state["diffs"])
+            state["diffs"].extend(
+                diff_rows(results[ENGINE_FRONT], results[ENGINE_BACK])[:remaining]
+            )
+            return
+
+        width = max(int(math.ceil(float(high - low) / state["fan_out"])), 1)
+        expressions = {
+            engine: ["FLOOR((%s - %s) / %s)" % (columns[engine][0], low, width)]
+            + columns[engine][1]
+            for engine in (ENGINE_FRONT, ENGINE_BACK)
+        }
+        results = self._diff_query(
+            expressions,
+            {
+                engine: range_filters(engine, low, high)
+                for engine in (ENGINE_FRONT, ENGINE_BACK)
+            },
+            group_by=True,
+        )
+        counts = {}
+        for engine in (ENGINE_FRONT, ENGINE_BACK):
+            for row in results[engine]:
+                bucket_id = diff_key(row[0])
+                counts[bucket_id] = max(counts.get(bucket_id, 0), int(row[1] or 0))
+        for bucket_id in diff_buckets(results[ENGINE_FRONT], results[ENGINE_BACK]):
+            bucket_low = low + int(bucket_id) * width
+            self._diff_key_range(
+                columns,
+                filters,
+                bucket_low,
+                min(bucket_low + width, high),
+                counts[bucket_id],
+                state,
+            )
+
+    def _diff_null_keys(self, columns, filters, state):
+        expressions = {
+            engine: columns[engine][1][:1] for engine in (ENGINE_FRONT, ENGINE_BACK)
+        }
+        results = self._diff_query(
+            expressions,
+            {
+                engine: filters[engine] + ["%s IS NULL" % columns[engine][0]]
+                for engine in (ENGINE_FRONT, ENGINE_BACK)
+            },
+        )
+        if diff_buckets(
+            [(None,) + tuple(results[ENGINE_FRONT][0])],
+            [(None,) + tuple(results[ENGINE_BACK][0])],
+        ):
+            state["diffs"].append((None, DIFF_VALUES))
+
     ###########################################################################
     # PROPERTIES
     ###########################################################################
@@ -872,6 +1818,19 @@ class CrossDbValidator(OffloadMessagesMixin, object):
     def success(self):
         return self._success
 
+    @property
+    def row_counts(self):
+        """FRONT and BACK row counts from the most recent validate(row_count=True), (None, None) otherwise."""
+        if self._row_count_position is None or not self._results:
+            return None, None
+        return tuple(
+            sum(
+                int(row[self._row_count_position] or 0)
+                for row in self._results[_] or []
+            )
+            for _ in (ENGINE_FRONT, ENGINE_BACK)
+        )
+
     ###########################################################################
     # PUBLIC METHODS
     ###########################################################################
@@ -888,6 +1847,14 @@ class CrossDbValidator(OffloadMessagesMixin, object):
         frontend_filters=None,
         frontend_query_params=None,
         frontend_parallelism=None,
+        incremental=False,
+        full=False,
+        fingerprint_max_age_days=FINGERPRINT_MAX_AGE_DAYS,
+        fingerprint_partitions=None,
+        shards=None,
+        shard_parallelism=None,
+        stop_on_mismatch=False,
+        row_count=False,
     ):
         """Main entry point validation routine
 
@@ -916,6 +1883,29 @@ class CrossDbValidator(OffloadMessagesMixin, object):
         frontend_query_params: Optional list of QueryParameter objects
 
         frontend_parallelism: See Offload option --verify-parallelism
+
+        incremental: Only validate offloaded partitions that are new or changed since they were last validated
+                    and record the outcome as a validation fingerprint. Not possible in combination with filters,
+                    group_bys, as_of_scn or safe=False, in which case all data is validated
+
+        full:       Used with incremental to ignore any validation fingerprint and validate all offloaded partitions
+
+        fingerprint_max_age_days: Used with incremental, partitions last validated more than this many days ago
+                    are validated again. Backend changes are only detected by this revalidation. 0 = no expiry
+
+        fingerprint_partitions: Names of the partitions covered by filters, recorded as a validation fingerprint
+                    if validation is successful
+
+        shards:     Split offloaded partitions into up to this many contiguous ranges validated concurrently.
+                    Only possible for tables offloaded by RANGE partition with safe=True, otherwise ignored
+
+        shard_parallelism: Maximum concurrent sessions per database for sharded validation, defaults to
+                    frontend_parallelism or DEFAULT_SHARD_PARALLELISM
+
+        stop_on_mismatch: Stop sharded or incremental validation at the first range that does not match
+
+        row_count:  Include COUNT(*) in the aggregate queries, verifying row counts in the same scan as the
+                    aggregates. Counts are available from row_counts after validation
         """
         logger.info("Validating table: %s" % self._db_table)
         logger.debug(
@@ -927,35 +1917,90 @@ class CrossDbValidator(OffloadMessagesMixin, object):
             assert isinstance(frontend_query_params, list)
             assert isinstance(frontend_query_params[0], QueryParameter)
 
-        selects = self._get_select_cols(selects, aggs)  # Expand SELECTs if necessary
-        backend_filters = self._get_filters(
-            filters, safe
-        )  # Expand FILTERs if necessary
+        selects = self._get_select_cols(
+            selects, aggs, fingerprinted=bool(incremental or fingerprint_partitions)
+        )  # Expand SELECTs if necessary
         group_bys = self._get_group_bys(group_bys)  # Expand GROUPBYs if necessary
-        frontend_filters = frontend_filters or self._get_filters(
-            filters, safe, frontend=True
-        )
+        self._count_star = bool(row_count)
+        self._row_count_position = len(group_bys or []) if row_count else None
         frontend_hint_block = ""
         if frontend_parallelism is not None:
             frontend_hint_block = self._get_frontend_query_hint_block(
                 frontend_parallelism
             )
-        self._frontend_sql, front_selects = self._construct_simple_front_agg_sql(
-            selects, frontend_filters, group_bys, aggs, as_of_scn, frontend_hint_block
-        )
-        self._backend_sql = self._construct_simple_back_agg_sql(
-            selects, backend_filters, group_bys, aggs
-        )
         agg_message = "Compared aggregations of columns: %s" % ", ".join(selects)
-
-        if execute:
-            self._results = self._run_sqls(
-                self._frontend_sql, self._backend_sql, frontend_query_params
+        if shards and not shard_parallelism:
+            shard_parallelism = frontend_parallelism or DEFAULT_SHARD_PARALLELISM
+
+        incremental_partitions = None
+        if incremental:
+            if filters or frontend_filters or group_bys or as_of_scn or not safe:
+                self.log_verbose(
+                    "Incremental validation is not possible with filters, GROUP BYs, an SCN or without boundary check"
+                )
+            else:
+                incremental_partitions = self._offloaded_range_partitions()
+
+        if incremental_partitions is not None:
+            success = self._validate_incrementally(
+                selects,
+                aggs,
+                incremental_partitions,
+                full,
+                execute,
+                frontend_hint_block,
+                shard_count=shards,
+                shard_parallelism=shard_parallelism,
+                stop_on_mismatch=stop_on_mismatch,
+                fingerprint_max_age_days=fingerprint_max_age_days,
             )
-            self._success = self._compare_results(
-                self._results, front_selects, group_bys
+        else:
+            backend_filters = self._get_filters(
+                filters, safe
+            )  # Expand FILTERs if necessary
+            frontend_filters = frontend_filters or self._get_filters(
+                filters, safe, frontend=True
             )
+            shard_partitions = None
+            if shards and shards > 1:
+                if safe:
+                    shard_partitions = self._offloaded_range_partitions()
+                else:
+                    self.log_verbose(
+                        "Sharded validation is not possible without boundary check"
+                    )
+            if shard_partitions and len(shard_partitions) > 1:
+                success = self._validate_sharded(
+                    selects,
+                    backend_filters,
+                    group_bys,
+                    aggs,
+                    as_of_scn,
+                    execute,
+                    frontend_filters,
+                    frontend_query_params,
+                    frontend_hint_block,
+                    partition_validation_shards(None, shard_partitions, shards),
+                    shard_parallelism,
+                    stop_on_mismatch,
+                )
+            else:
+                success = self._validate_filtered(
+                    selects,
+                    backend_filters,
+                    group_bys,
+                    aggs,
+                    as_of_scn,
+                    execute,
+                    frontend_filters,
+                    frontend_query_params,
+                    frontend_hint_block,
+                )
+            if execute and success and fingerprint_partitions:
+                self._record_validated_partitions(selects, aggs, fingerprint_partitions)
 
+        if execute:
+            self._success = success
             logger.info(
                 "Validating table: %s. Valid: %s" % (self._db_table, self._success)
             )
@@ -964,10 +2009,62 @@ class CrossDbValidator(OffloadMessagesMixin, object):
             logger.info(
                 "Skipping validation for table: %s as execute=False" % self._db_table
             )
-            self.log_verbose("Frontend sql: %s" % self._frontend_sql)
-            self.log_verbose("Backend sql: %s" % self._backend_sql)
             return True, agg_message
 
+    def diff(
+        self,
+        key_column,
+        selects=DEFAULT_SELECT_COLS,
+        aggs=DEFAULT_AGGS,
+        filters=None,
+        safe=True,
+        fan_out=DIFF_DEFAULT_FAN_OUT,
+        leaf_rows=DIFF_DEFAULT_LEAF_ROWS,
+        max_keys=DIFF_DEFAULT_MAX_KEYS,
+    ) -> list:
+        """Locate rows that differ between FRONT and BACK by descending into buckets whose digests differ
+
+        key_column: Numeric column identifying rows, ideally unique
+
+        selects, aggs, filters, safe: As for validate()
+
+        fan_out:    Number of buckets to split partitions or key ranges into at each level
+
+        leaf_rows:  Buckets with no more than this many rows are compared row by row
+
+        max_keys:   Stop after locating this many differing keys
+
+        Returns: A list of (key, reason) tuples where reason is one of DIFF_MISSING_BACKEND,
+                 DIFF_MISSING_FRONTEND, DIFF_DUPLICATE_KEY or DIFF_VALUES. A key of None means rows with a
+                 NULL key differ.
+        """
+        assert fan_out and fan_out > 1
+        selects = self._get_select_cols(selects, aggs)
+        columns = self._diff_columns(key_column, selects, aggs)
+        filters = {
+            ENGINE_FRONT: self._get_filters(filters, safe, frontend=True) or [],
+            ENGINE_BACK: self._get_filters(filters, safe) or [],
+        }
+        state = {
+            "diffs": [],
+            "fan_out": fan_out,
+            "leaf_rows": leaf_rows,
+            "max_keys": max_keys,
+        }
+        self._diff_queries = 0
+        partitions = self._offloaded_range_partitions() if safe else None
+        if partitions:
+            self._diff_partitions(columns, filters, None, partitions, state)
+        else:
+            self._diff_keys(columns, filters, state)
+        self.log(
+            "Located %s differing keys using %s pairs of queries"
+            % (len(state["diffs"]), self._diff_queries)
+        )
+        for key, reason in state["diffs"]:
+            self.log("%s: %s" % (reason, key))
+        return state["diffs"]
+
 
 ###############################################################################
 # BackendCountValidator
@@ -26,6 +26,7 @@ from goe.offload.offload_messages import OffloadMessages, VERBOSE, VVERBOSE
 from goe.offload.offload_metadata_functions import (
     flatten_lpa_high_values,
 )
+from goe.offload.synthetic_partition_literal import SyntheticPartitionLiteral
 from goe.persistence.orchestration_metadata import (
     INCREMENTAL_PREDICATE_TYPE_LIST,
     INCREMENTAL_PREDICATE_TYPE_LIST_AS_RANGE,
@@ -373,9 +374,13 @@ def copy_rdbms_stats_to_backend(
             # In the backend the list partition literals are not grouped like they may be in the RDBMS, therefore
             # we need to flatten the groups out
             new_hvs = flatten_lpa_high_values(new_hvs)
-            # LIST can only have singular partition keys, we multiply this up for each HV
+            # LIST can only have singular partition keys, we multiply this up for each HV.
+            # Converting all HVs together means partition functions need a single backend query.
             hv_tuples = [
-                comparision_tuple_from_hv([hv], rdbms_only_expr) for hv in new_hvs
+                (_,)
+                for _ in SyntheticPartitionLiteral.gen_synthetic_literals(
+                    rdbms_only_expr[0][2], new_hvs
+                )
             ]
 
             messages.log(
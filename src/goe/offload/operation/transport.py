@@ -14,16 +14,456 @@
 
 """data_type_controls: Library of functions used in GOE related to offload transport."""
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import json
+import threading
+
+from goe.filesystem.goe_dfs_factory import get_dfs_from_options
+from goe.offload.factory.backend_table_factory import backend_table_factory
+from goe.offload.factory.offload_transport_factory import offload_transport_factory
 from goe.offload.offload_constants import (
     DBTYPE_HIVE,
     OFFLOAD_STATS_METHOD_COPY,
     OFFLOAD_STATS_METHOD_HISTORY,
     OFFLOAD_STATS_METHOD_NATIVE,
 )
-from goe.offload.offload_messages import OffloadMessages, VERBOSE
-from goe.offload.offload_transport_functions import transport_and_load_offload_chunk
+from goe.offload.offload_messages import OffloadMessages, VERBOSE, VVERBOSE
+from goe.offload.offload_transport_functions import (
+    load_offload_chunk,
+    offload_chunk_frontend_bytes,
+    start_offload_chunk,
+    transport_and_load_offload_chunk,
+    transport_offload_chunk,
+)
 from goe.offload.operation.stats_controls import copy_rdbms_stats_to_backend
-from goe.orchestration import command_steps
+from goe.offload.staged_data_fingerprint import StagedDataFingerprint
+from goe.orchestration import command_steps, orchestration_constants
+from goe.orchestration.execution_id import ExecutionId
+
+
+class OffloadChunkPipelineException(Exception):
+    pass
+
+
+class OffloadResumeException(Exception):
+    pass
+
+
+class OffloadResume:
+    """Details of a failed offload that is being resumed with --resume.
+
+    Partitions in chunks loaded successfully by the resumed execution, or by any execution it was itself
+    resuming, are removed from the partitions to offload. The remaining partitions are chunked as normal.
+    If the staging area contains a chunk that was fully staged by one of those executions, but not loaded,
+    then the chunk is loaded without transporting it again.
+    """
+
+    def __init__(
+        self,
+        resume_execution_id: str,
+        offload_source_table,
+        offload_target_table,
+        source_data_client,
+        repo_client,
+        messages: OffloadMessages,
+    ):
+        self._offload_source_table = offload_source_table
+        self._messages = messages
+        self._execution_ids = []
+        self.completed_partition_names = set()
+        self.completed_without_partitions = False
+        self._load_resumed_chunks(
+            ExecutionId.from_str(resume_execution_id), repo_client
+        )
+        self.staged_chunk = self._get_staged_chunk(
+            offload_target_table, source_data_client
+        )
+
+    ###########################################################################
+    # PRIVATE METHODS
+    ###########################################################################
+
+    def _get_resumed_execution_id(self, execution_id: ExecutionId, repo_client):
+        """Return the execution id resumed by execution_id, None if execution_id was not itself a resume."""
+        command_execution = repo_client.get_command_execution(execution_id)
+        if not command_execution:
+            if not self._execution_ids:
+                raise OffloadResumeException(
+                    "Unknown execution id for --resume: %s" % execution_id
+                )
+            return None
+        parameters = command_execution.get("COMMAND_PARAMETERS")
+        if hasattr(parameters, "read"):
+            parameters = parameters.read()
+        try:
+            resumed_id = json.loads(parameters or "{}").get("resume_execution_id")
+        except ValueError:
+            resumed_id = None
+        return ExecutionId.from_str(resumed_id) if resumed_id else None
+
+    def _get_staged_chunk(self, offload_target_table, source_data_client):
+        """Return the manifest of a staged chunk that can be loaded without transport, None if there isn't one."""
+        manifest = offload_target_table.read_staged_chunk_manifest()
+        if not manifest:
+            return None
+        partition_names = manifest.get("partition_names") or []
+        if manifest.get("execution_id") not in [str(_) for _ in self._execution_ids]:
+            self._messages.log(
+                "Ignoring staged chunk from unrelated execution: %s"
+                % manifest.get("execution_id"),
+                detail=VVERBOSE,
+            )
+            return None
+        if self.completed_partition_names.intersection(partition_names) or (
+            not partition_names and self.completed_without_partitions
+        ):
+            self._messages.log(
+                "Ignoring staged chunk that has already been loaded: %s"
+                % manifest.get("chunk_number"),
+                detail=VVERBOSE,
+            )
+            return None
+        partitions_to_offload = source_data_client.partitions_to_offload
+        if set(partition_names) - set(partitions_to_offload.partition_names()) or (
+            not partition_names and partitions_to_offload.count()
+        ):
+            self._messages.log(
+                "Ignoring staged chunk that does not match partitions to offload: %s"
+                % manifest.get("chunk_number"),
+                detail=VVERBOSE,
+            )
+            return None
+        return manifest
+
+    def _load_resumed_chunks(self, execution_id: ExecutionId, repo_client):
+        """Collect details of chunks recorded for execution_id and any executions it resumed."""
+        while execution_id and execution_id not in self._execution_ids:
+            resumed_execution_id = self._get_resumed_execution_id(
+                execution_id, repo_client
+            )
+            self._execution_ids.append(execution_id)
+            for chunk_partition in repo_client.get_offload_chunks(execution_id) or []:
+                if (
+                    chunk_partition["FRONTEND_OWNER"].upper(),
+                    chunk_partition["FRONTEND_TABLE_NAME"].upper(),
+                ) != (
+                    self._offload_source_table.owner.upper(),
+                    self._offload_source_table.table_name.upper(),
+                ):
+                    raise OffloadResumeException(
+                        "Execution id %s did not offload %s.%s"
+                        % (
+                            execution_id,
+                            self._offload_source_table.owner,
+                            self._offload_source_table.table_name,
+                        )
+                    )
+                if (
+                    chunk_partition["STATUS_CODE"]
+                    != orchestration_constants.COMMAND_SUCCESS
+                ):
+                    continue
+                if chunk_partition["PARTITION_NAME"]:
+                    self.completed_partition_names.add(
+                        chunk_partition["PARTITION_NAME"]
+                    )
+                else:
+                    self.completed_without_partitions = True
+            execution_id = resumed_execution_id
+        self._messages.log(
+            "Resuming execution%s: %s"
+            % (
+                "s" if len(self._execution_ids) > 1 else "",
+                ", ".join(str(_) for _ in self._execution_ids),
+            ),
+            detail=VERBOSE,
+        )
+        self._messages.log(
+            "Partitions offloaded by resumed execution: %s"
+            % len(self.completed_partition_names),
+            detail=VERBOSE,
+        )
+
+    ###########################################################################
+    # PUBLIC METHODS
+    ###########################################################################
+
+    def discard_completed_partitions(self, source_data_client):
+        """Remove partitions already offloaded by the resumed execution from the to-offload list."""
+        source_data_client.partitions_to_offload.apply_filter(
+            lambda p: bool(p.partition_name not in self.completed_partition_names)
+        )
+
+    def pop_staged_partitions(self, source_data_client):
+        """Remove partitions in the staged chunk from the to-offload list and return them."""
+        staged_partition_names = self.staged_chunk["partition_names"]
+        staged_partitions, remaining = (
+            source_data_client.partitions_to_offload.split_partitions(
+                lambda p: bool(p.partition_name in staged_partition_names)
+            )
+        )
+        source_data_client.partitions_to_offload.set_partitions(
+            remaining.get_partitions()
+        )
+        return staged_partitions
+
+
+class OffloadChunkPipeline:
+    """Overlap transport of offload chunks with the final load of previously transported chunks.
+
+    Chunks are staged into a rotating set of staging slots, each slot is a backend table and data transport
+    client pair with its own load table and staging location. Transport runs in the calling thread and loads
+    run, in chunk order, on a single background thread. A slot is only reused once the load of the chunk
+    previously staged in it has completed.
+
+    If a load fails then no further chunks are loaded, chunks already staged are recorded as failed.
+    If a transport fails then chunks already staged are loaded before the exception is raised, this leaves
+    the backend in the same state as a serial offload would.
+    Messages and step records produced by loads are buffered on the loader thread and replayed when the load
+    is completed, therefore the log, shared message state and the repository are only written from the
+    calling thread.
+    """
+
+    def __init__(
+        self,
+        depth: int,
+        data_transport_client,
+        offload_source_table,
+        offload_target_table,
+        offload_operation,
+        offload_options,
+        messages: OffloadMessages,
+    ):
+        assert depth > 1
+        self._depth = depth
+        self._offload_source_table = offload_source_table
+        self._offload_target_table = offload_target_table
+        self._offload_operation = offload_operation
+        self._offload_options = offload_options
+        self._messages = messages
+        self._slots = [(data_transport_client, offload_target_table)]
+        self._pending_loads = deque()
+        self._load_failed = threading.Event()
+        self._loader = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="offload_chunk_load"
+        )
+        self.rows_offloaded = None
+        self.chunks_without_fingerprint = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        try:
+            self._complete_pending_loads(raise_errors=bool(exc_type is None))
+            if exc_type is None and not self._offload_operation.preserve_load_table:
+                for _, slot_target_table in self._slots[1:]:
+                    slot_target_table.cleanup_staging_area_step()
+        finally:
+            self._loader.shutdown(wait=True)
+            for slot_transport_client, slot_target_table in self._slots[1:]:
+                slot_transport_client.close()
+                slot_target_table.close()
+        return False
+
+    ###########################################################################
+    # PRIVATE METHODS
+    ###########################################################################
+
+    def _add_staging_slot(self):
+        """Create a backend table and data transport client pair for the next staging slot.
+        Each slot has its own backend connection so that a load can run while another slot is being staged.
+        """
+        staging_slot = len(self._slots)
+        data_transport_client = self._slots[0][0]
+        self._messages.log("Creating staging slot: %s" % staging_slot, detail=VVERBOSE)
+        if not self._offload_operation.offload_transport_snapshot:
+            # All slots must read the RDBMS at the same point in time.
+            self._offload_operation.offload_transport_snapshot = (
+                data_transport_client.get_transport_snapshot()
+            )
+        slot_target_table = backend_table_factory(
+            self._offload_target_table.db_name,
+            self._offload_target_table.table_name,
+            self._offload_options.target,
+            self._offload_options,
+            self._messages,
+            orchestration_operation=self._offload_operation,
+        )
+        slot_target_table.set_staging_slot(staging_slot)
+        slot_target_table.refresh_operational_settings(self._offload_operation)
+        slot_transport_client = offload_transport_factory(
+            self._offload_operation.offload_transport_method,
+            self._offload_source_table,
+            slot_target_table,
+            self._offload_operation,
+            self._offload_options,
+            self._messages,
+            get_dfs_from_options(
+                self._offload_options,
+                self._messages,
+                dry_run=(not self._offload_operation.execute),
+            ),
+        )
+        slot_target_table.set_final_table_casts(
+            self._offload_source_table.columns,
+            slot_transport_client.get_staging_file().get_staging_columns(),
+        )
+        slot_target_table.setup_staging_area_step(
+            slot_transport_client.get_staging_file()
+        )
+        self._slots.append((slot_transport_client, slot_target_table))
+
+    def _complete_load(self, pending_load: dict):
+        """Wait for a chunk load to finish, replay its messages and record the outcome in the repository."""
+        repo_client = self._offload_operation.repo_client
+        backend_bytes, deferred_messages, load_exc = pending_load["future"].result()
+        self._messages.replay(deferred_messages)
+        if load_exc:
+            repo_client.end_offload_chunk(
+                pending_load["chunk_id"], orchestration_constants.COMMAND_ERROR
+            )
+            raise load_exc
+        repo_client.end_offload_chunk(
+            pending_load["chunk_id"],
+            orchestration_constants.COMMAND_SUCCESS,
+            row_count=pending_load["rows_staged"],
+            frontend_bytes=pending_load["frontend_bytes"],
+            transport_bytes=pending_load["transport_bytes"],
+            backend_bytes=backend_bytes,
+            staged_fingerprint=(
+                pending_load["staged_fingerprint"].to_dict()
+                if pending_load["staged_fingerprint"]
+                else None
+            ),
+        )
+        if pending_load["rows_staged"] and pending_load["rows_staged"] >= 0:
+            self.rows_offloaded = (self.rows_offloaded or 0) + pending_load[
+                "rows_staged"
+            ]
+
+    def _complete_pending_loads(self, raise_errors=True):
+        first_exc = None
+        while self._pending_loads:
+            try:
+                self._complete_load(self._pending_loads.popleft())
+            except Exception as exc:
+                if first_exc is None:
+                    first_exc = exc
+                if not raise_errors:
+                    self._messages.warning("Offload chunk load failed: %s" % str(exc))
+        if first_exc and raise_errors:
+            raise first_exc
+
+    def _load_chunk(
+        self, chunk_count, data_transport_client, target_table, **kwargs
+    ) -> tuple:
+        """Load a staged chunk, runs on the loader thread.
+        Returns a tuple of (backend bytes, deferred messages, exception or None) for _complete_load().
+        """
+        if self._load_failed.is_set():
+            return (
+                None,
+                [],
+                OffloadChunkPipelineException(
+                    "Chunk %s not loaded due to an earlier load failure"
+                    % (chunk_count + 1)
+                ),
+            )
+        with self._messages.deferred() as deferred_messages:
+            try:
+                backend_bytes = load_offload_chunk(
+                    data_transport_client,
+                    self._offload_source_table,
+                    target_table,
+                    messages=self._messages,
+                    **kwargs,
+                )
+            except Exception as exc:
+                self._load_failed.set()
+                return None, deferred_messages, exc
+        return backend_bytes, deferred_messages, None
+
+    def _wait_for_staging_slot(self, chunk_count):
+        """Complete loads that must finish before chunk_count can be staged.
+        Loads that have already finished are also completed so that failures surface early.
+        """
+        while self._pending_loads and (
+            self._pending_loads[0]["chunk_count"] <= chunk_count - self._depth
+            or self._pending_loads[0]["future"].done()
+        ):
+            if not self._pending_loads[0]["future"].done():
+                self._messages.log(
+                    "Waiting for load of chunk %s"
+                    % (self._pending_loads[0]["chunk_count"] + 1),
+                    detail=VERBOSE,
+                )
+            self._complete_load(self._pending_loads.popleft())
+
+    ###########################################################################
+    # PUBLIC METHODS
+    ###########################################################################
+
+    def offload_chunk(self, partition_chunk, chunk_count: int, sync: bool = True):
+        """Transport partition_chunk into the next staging slot and queue its load into the final table."""
+        self._wait_for_staging_slot(chunk_count)
+        staging_slot = chunk_count % self._depth
+        if staging_slot == len(self._slots):
+            self._add_staging_slot()
+        data_transport_client, target_table = self._slots[staging_slot]
+
+        chunk_id = start_offload_chunk(
+            self._offload_source_table,
+            self._offload_target_table,
+            self._offload_operation.execution_id,
+            self._offload_operation.repo_client,
+            partition_chunk=partition_chunk,
+            chunk_count=chunk_count,
+        )
+        try:
+            rows_staged, transport_bytes = transport_offload_chunk(
+                data_transport_client,
+                target_table,
+                partition_chunk=partition_chunk,
+                empty_staging_area=bool(chunk_count >= self._depth),
+                execution_id=self._offload_operation.execution_id,
+                chunk_count=chunk_count,
+            )
+        except Exception:
+            self._offload_operation.repo_client.end_offload_chunk(
+                chunk_id, orchestration_constants.COMMAND_ERROR
+            )
+            raise
+        staged_fingerprint = data_transport_client.get_staged_fingerprint()
+        if not staged_fingerprint:
+            self.chunks_without_fingerprint += 1
+
+        future = self._loader.submit(
+            self._load_chunk,
+            chunk_count,
+            data_transport_client,
+            target_table,
+            rows_staged=rows_staged,
+            sync=sync,
+            staged_fingerprint=staged_fingerprint,
+        )
+        self._pending_loads.append(
+            {
+                "chunk_count": chunk_count,
+                "chunk_id": chunk_id,
+                "frontend_bytes": offload_chunk_frontend_bytes(
+                    self._offload_source_table,
+                    self._messages,
+                    partition_chunk=partition_chunk,
+                    offload_predicate=self._offload_operation.inflight_offload_predicate,
+                ),
+                "future": future,
+                "rows_staged": rows_staged,
+                "staged_fingerprint": staged_fingerprint,
+                "transport_bytes": transport_bytes,
+            }
+        )
 
 
 def announce_offload_chunk(
@@ -43,6 +483,72 @@ def announce_offload_chunk(
     chunk.report_partitions(offload_by_subpartition, messages)
 
 
+def load_staged_offload_chunk(
+    staged_chunk: dict,
+    data_transport_client,
+    offload_source_table,
+    offload_target_table,
+    offload_operation,
+    messages: OffloadMessages,
+    partition_chunk=None,
+    sync=True,
+):
+    """Load a chunk staged by a resumed execution into the final table without transporting it again.
+    Returns the number of rows loaded.
+    """
+    messages.log(
+        "Loading chunk %s staged by execution %s"
+        % (staged_chunk["chunk_number"], staged_chunk["execution_id"]),
+        detail=VERBOSE,
+    )
+    repo_client = offload_operation.repo_client
+    staged_fingerprint = (
+        StagedDataFingerprint.from_dict(staged_chunk["staged_fingerprint"])
+        if staged_chunk.get("staged_fingerprint")
+        else None
+    )
+    chunk_id = start_offload_chunk(
+        offload_source_table,
+        offload_target_table,
+        offload_operation.execution_id,
+        repo_client,
+        partition_chunk=partition_chunk,
+    )
+    try:
+        # The load table may need to be recreated over the staged files.
+        offload_target_table.post_transport_tasks(
+            data_transport_client.get_staging_file()
+        )
+        backend_byte_delta = load_offload_chunk(
+            data_transport_client,
+            offload_source_table,
+            offload_target_table,
+            staged_chunk["rows_staged"],
+            messages,
+            sync=sync,
+            dry_run=bool(not offload_operation.execute),
+            staged_fingerprint=staged_fingerprint,
+        )
+        repo_client.end_offload_chunk(
+            chunk_id,
+            orchestration_constants.COMMAND_SUCCESS,
+            row_count=staged_chunk["rows_staged"],
+            frontend_bytes=offload_chunk_frontend_bytes(
+                offload_source_table,
+                messages,
+                partition_chunk=partition_chunk,
+                offload_predicate=offload_operation.inflight_offload_predicate,
+            ),
+            transport_bytes=staged_chunk.get("transport_bytes"),
+            backend_bytes=backend_byte_delta,
+            staged_fingerprint=staged_chunk.get("staged_fingerprint"),
+        )
+    except Exception:
+        repo_client.end_offload_chunk(chunk_id, orchestration_constants.COMMAND_ERROR)
+        raise
+    return staged_chunk["rows_staged"]
+
+
 def offload_data_to_target(
     data_transport_client,
     offload_source_table,
@@ -51,8 +557,12 @@ def offload_data_to_target(
     offload_options,
     source_data_client,
     messages: OffloadMessages,
+    offload_resume=None,
 ):
     """Offloads the data via whatever means is appropriate (including validation steps).
+    offload_resume is an OffloadResume object when resuming a failed offload.
+    The number of chunks staged without a StagedDataFingerprint is recorded in
+    offload_operation.chunks_without_fingerprint.
     Returns the number of rows offloaded, None if nothing to do (i.e. non execute mode).
     """
 
@@ -66,20 +576,44 @@ def offload_data_to_target(
         )
 
     rows_offloaded = None
+    chunks_without_fingerprint = 0
     discarded_all_partitions = False
     if source_data_client.partitions_to_offload.count() > 0:
         source_data_client.discard_partitions_to_offload_by_no_segment()
+        if offload_resume:
+            offload_resume.discard_completed_partitions(source_data_client)
         if source_data_client.partitions_to_offload.count() == 0:
             discarded_all_partitions = True
         incremental_stats = True
     else:
         incremental_stats = False
 
+    first_chunk_count = 0
+    if offload_resume and offload_resume.staged_chunk and not discarded_all_partitions:
+        staged_partitions = offload_resume.pop_staged_partitions(source_data_client)
+        if staged_partitions.count():
+            announce_offload_chunk(staged_partitions, offload_operation, messages)
+        rows_offloaded = load_staged_offload_chunk(
+            offload_resume.staged_chunk,
+            data_transport_client,
+            offload_source_table,
+            offload_target_table,
+            offload_operation,
+            messages,
+            partition_chunk=staged_partitions if staged_partitions.count() else None,
+            sync=bool(not source_data_client.partitions_to_offload.count()),
+        )
+        if not offload_resume.staged_chunk.get("staged_fingerprint"):
+            chunks_without_fingerprint += 1
+        # Subsequent chunks must empty the staging area before transporting.
+        first_chunk_count = 1
+
     def transport_and_load_offload_chunk_fn(
         partition_chunk=None, chunk_count=0, sync=True
     ):
         """In-line function to de-dupe partition chunk logic that follows"""
-        return transport_and_load_offload_chunk(
+        nonlocal chunks_without_fingerprint
+        rows_imported = transport_and_load_offload_chunk(
             data_transport_client,
             offload_source_table,
             offload_target_table,
@@ -92,14 +626,59 @@ def offload_data_to_target(
             offload_predicate=offload_operation.inflight_offload_predicate,
             dry_run=bool(not offload_operation.execute),
         )
+        if not data_transport_client.get_staged_fingerprint():
+            chunks_without_fingerprint += 1
+        return rows_imported
 
     if discarded_all_partitions:
         messages.log("No partitions to offload")
         # exit early, skipping any stats steps (GOE-1300)
         return 0
+    elif (
+        offload_resume
+        and offload_resume.completed_without_partitions
+        and not source_data_client.partitions_to_offload.count()
+    ):
+        messages.log("No data to offload, it was offloaded by the resumed execution")
+        return 0
+    elif (
+        source_data_client.partitions_to_offload.count() > 0
+        and offload_operation.execute
+        and offload_operation.offload_chunk_pipeline_depth > 1
+    ):
+        messages.log(
+            "Offload chunk pipeline depth: %s"
+            % offload_operation.offload_chunk_pipeline_depth,
+            detail=VERBOSE,
+        )
+        with OffloadChunkPipeline(
+            offload_operation.offload_chunk_pipeline_depth,
+            data_transport_client,
+            offload_source_table,
+            offload_target_table,
+            offload_operation,
+            offload_options,
+            messages,
+        ) as chunk_pipeline:
+            for i, (chunk, remaining) in enumerate(
+                source_data_client.get_partitions_to_offload_chunks(),
+                start=first_chunk_count,
+            ):
+                announce_offload_chunk(chunk, offload_operation, messages)
+                progress_message(
+                    source_data_client.partitions_to_offload.count(),
+                    chunk.count(),
+                    remaining.count(),
+                )
+                chunk_pipeline.offload_chunk(chunk, i, sync=bool(not remaining.count()))
+        if chunk_pipeline.rows_offloaded:
+            rows_offloaded = (rows_offloaded or 0) + chunk_pipeline.rows_offloaded
+        chunks_without_fingerprint += chunk_pipeline.chunks_without_fingerprint
+        progress_message(source_data_client.partitions_to_offload.count(), 0, 0)
     elif source_data_client.partitions_to_offload.count() > 0:
         for i, (chunk, remaining) in enumerate(
-            source_data_client.get_partitions_to_offload_chunks()
+            source_data_client.get_partitions_to_offload_chunks(),
+            start=first_chunk_count,
         ):
             announce_offload_chunk(chunk, offload_operation, messages)
             progress_message(
@@ -114,10 +693,11 @@ def offload_data_to_target(
             if rows_imported and rows_imported >= 0:
                 rows_offloaded = (rows_offloaded or 0) + rows_imported
         progress_message(source_data_client.partitions_to_offload.count(), 0, 0)
-    else:
+    elif not first_chunk_count:
         rows_imported = transport_and_load_offload_chunk_fn()
         if rows_imported and rows_imported >= 0:
             rows_offloaded = rows_imported
+    offload_operation.chunks_without_fingerprint = chunks_without_fingerprint
 
     if offload_operation.offload_stats_method in [
         OFFLOAD_STATS_METHOD_NATIVE,
@@ -0,0 +1,329 @@
+# Copyright 2016 The GOE Authors. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" OracleConnectionPool: Per-process cx_Oracle SessionPools shared by the frontend and transport APIs.
+
+    Connections are acquired from a SessionPool keyed on user/DSN so a single offload logs on to Oracle a
+    handful of times rather than once for every metadata query, ID range lookup and SQL stats poll.
+    Closing a pooled connection returns it to the pool.
+
+    Session state is reset whenever a connection is checked out:
+      - MODULE/ACTION and TRACEFILE_IDENTIFIER are set for the new owner.
+      - NLS settings and TIME_ZONE are restored to those of a fresh session, captured when the pool is created.
+    Callers that make other session changes, e.g. offload transport ALTER SESSION commands, should drop the
+    connection rather than return it to the pool.
+
+    API objects hold their connection for as long as they exist, so a pool can be exhausted by long lived
+    connections. An exhausted pool returns a standalone connection immediately rather than making the caller
+    wait. Code that runs concurrent sessions calls reserve_oracle_connection_pool_sessions() so that pools
+    are sized for its parallelism. Pools are closed when the process exits.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from typing import Optional
+
+import cx_Oracle as cxo
+
+from goe.offload.frontend_api import FRONTEND_TRACE_ID, FRONTEND_TRACE_MODULE
+
+
+###############################################################################
+# CONSTANTS
+###############################################################################
+
+# Seconds a pooled session may sit unused before cx_Oracle closes it
+ORACLE_POOL_SESSION_TIMEOUT = 300
+# NLS parameters that implicitly reset other NLS parameters so must be restored first
+ORACLE_POOL_LEADING_NLS_PARAMETERS = ["NLS_LANGUAGE", "NLS_TERRITORY"]
+
+NLS_BASELINE_QUERY_TEXT = """SELECT parameter, value FROM nls_session_parameters
+UNION ALL
+SELECT 'TIME_ZONE', SESSIONTIMEZONE FROM dual"""
+
+###############################################################################
+# LOGGING
+###############################################################################
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+_pools = {}
+_pools_lock = threading.Lock()
+# Minimum size of every pool in this process, see reserve_oracle_connection_pool_sessions()
+_reserved_sessions = 0
+
+
+###########################################################################
+# GLOBAL FUNCTIONS
+###########################################################################
+
+
+def oracle_connection_pool(
+    ora_user: str,
+    ora_pass: str,
+    ora_dsn: str,
+    use_oracle_wallet: bool,
+    max_sessions: int,
+) -> "OracleConnectionPool":
+    """Return the process wide pool for user/DSN, creating it on first use."""
+    key = (None if use_oracle_wallet else (ora_user or "").upper(), ora_dsn)
+    with _pools_lock:
+        if key not in _pools:
+            if not _pools:
+                atexit.register(close_oracle_connection_pools)
+            _pools[key] = OracleConnectionPool(
+                ora_user,
+                ora_pass,
+                ora_dsn,
+                use_oracle_wallet,
+                max(max_sessions, _reserved_sessions),
+            )
+        return _pools[key]
+
+
+def get_pooled_oracle_connection(
+    ora_user: str,
+    ora_pass: str,
+    ora_dsn: str,
+    use_oracle_wallet: bool,
+    max_sessions: int,
+    module: str = FRONTEND_TRACE_MODULE,
+    action: Optional[str] = None,
+    ora_trace_id: str = FRONTEND_TRACE_ID,
+):
+    """Return a connection from the process wide pool for user/DSN with session state reset."""
+    return oracle_connection_pool(
+        ora_user, ora_pass, ora_dsn, use_oracle_wallet, max_sessions
+    ).acquire(module=module, action=action, ora_trace_id=ora_trace_id)
+
+
+def drop_oracle_connection(connection):
+    """Close connection without returning the session to a pool, for connections with altered session state."""
+    for pool in list(_pools.values()):
+        if pool.drop(connection):
+            return
+    connection.close()
+
+
+def oracle_connection_pool_stats() -> list:
+    """Return a list of dicts describing usage of each pool in this process."""
+    return [_.stats() for _ in list(_pools.values())]
+
+
+def reserve_oracle_connection_pool_sessions(sessions: int):
+    """Grow existing and future pools in this process to at least sessions, for callers about to run that
+    many concurrent sessions. Pools are never shrunk.
+    """
+    global _reserved_sessions
+    with _pools_lock:
+        _reserved_sessions = max(_reserved_sessions, sessions)
+        for pool in _pools.values():
+            pool.resize(_reserved_sessions)
+
+
+def close_oracle_connection_pools():
+    """Close all pools in this process, registered to run at exit when the first pool is created."""
+    global _reserved_sessions
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        if _pools:
+            atexit.unregister(close_oracle_connection_pools)
+        _pools.clear()
+        _reserved_sessions = 0
+
+
+###########################################################################
+# OracleConnectionPool
+###########################################################################
+
+
+class OracleConnectionPool:
+    """A cx_Oracle SessionPool that resets session state on checkout and records usage."""
+
+    def __init__(
+        self,
+        ora_user: str,
+        ora_pass: str,
+        ora_dsn: str,
+        use_oracle_wallet: bool,
+        max_sessions: int,
+    ):
+        assert max_sessions and max_sessions > 0
+        self._ora_user = ora_user
+        self._ora_pass = ora_pass
+        self._ora_dsn = ora_dsn
+        self._use_oracle_wallet = use_oracle_wallet
+        self._max_sessions = max_sessions
+        self._pool = None
+        self._lock = threading.Lock()
+        self._nls_baseline_sql = None
+        self._acquires = 0
+        self._overflows = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+
+    def __str__(self):
+        return "%s@%s" % (
+            "[wallet]" if self._use_oracle_wallet else self._ora_user,
+            self._ora_dsn,
+        )
+
+    ###########################################################################
+    # PRIVATE METHODS
+    ###########################################################################
+
+    def _create_pool(self):
+        kwargs = {
+            "dsn": self._ora_dsn,
+            "min": 0,
+            "max": self._max_sessions,
+            "increment": 1,
+            "threaded": True,
+            # Fail fast when exhausted, acquire() falls back to a standalone connection.
+            "getmode": cxo.SPOOL_ATTRVAL_NOWAIT,
+            "timeout": ORACLE_POOL_SESSION_TIMEOUT,
+        }
+        if self._use_oracle_wallet:
+            # External authentication requires a heterogeneous pool.
+            kwargs.update({"externalauth": True, "homogeneous": False})
+        else:
+            kwargs.update({"user": self._ora_user, "password": self._ora_pass})
+        logger.info("Creating Oracle session pool: %s" % str(self))
+        return cxo.SessionPool(**kwargs)
+
+    def _standalone_connection(self):
+        if self._use_oracle_wallet:
+            return cxo.connect(dsn=self._ora_dsn, threaded=True)
+        else:
+            return cxo.connect(
+                self._ora_user, self._ora_pass, self._ora_dsn, threaded=True
+            )
+
+    def _nls_baseline(self, connection) -> str:
+        """Return an ALTER SESSION clause restoring the NLS settings of a fresh session."""
+        if self._nls_baseline_sql is None:
+            cursor = connection.cursor()
+            try:
+                rows = cursor.execute(NLS_BASELINE_QUERY_TEXT).fetchall()
+            finally:
+                cursor.close()
+            rows.sort(
+                key=lambda r: (
+                    ORACLE_POOL_LEADING_NLS_PARAMETERS.index(r[0])
+                    if r[0] in ORACLE_POOL_LEADING_NLS_PARAMETERS
+                    else len(ORACLE_POOL_LEADING_NLS_PARAMETERS)
+                )
+            )
+            self._nls_baseline_sql = " ".join(
+                "%s='%s'" % (parameter, str(value).replace("'", "''"))
+                for parameter, value in rows
+                if value is not None
+            )
+        return self._nls_baseline_sql
+
+    def _reset_session(self, connection, module, action, ora_trace_id):
+        connection.module = module
+        connection.action = action or ""
+        cursor = connection.cursor()
+        try:
+            # A single round trip which also pushes the module/action to the session.
+            cursor.execute(
+                'ALTER SESSION SET TRACEFILE_IDENTIFIER="%s" %s'
+                % (ora_trace_id, self._nls_baseline(connection))
+            )
+        finally:
+            cursor.close()
+
+    ###########################################################################
+    # PUBLIC METHODS
+    ###########################################################################
+
+    def acquire(
+        self,
+        module: str = FRONTEND_TRACE_MODULE,
+        action: Optional[str] = None,
+        ora_trace_id: str = FRONTEND_TRACE_ID,
+    ):
+        with self._lock:
+            if not self._pool:
+                self._pool = self._create_pool()
+        start = time.time()
+        try:
+            connection = self._pool.acquire()
+        except cxo.DatabaseError as exc:
+            # Pool exhausted (or unable to create a session), a standalone connection raises a clear error if
+            # the problem is not exhaustion.
+            logger.info(
+                "Unable to acquire from Oracle session pool %s: %s" % (str(self), exc)
+            )
+            connection = self._standalone_connection()
+            with self._lock:
+                self._overflows += 1
+        wait_seconds = time.time() - start
+        with self._lock:
+            self._acquires += 1
+            self._wait_seconds_total += wait_seconds
+            self._wait_seconds_max = max(self._wait_seconds_max, wait_seconds)
+        self._reset_session(connection, module, action, ora_trace_id)
+        return connection
+
+    def drop(self, connection) -> bool:
+        """Drop connection from the pool, returns False if connection does not belong to this pool."""
+        if not self._pool:
+            return False
+        try:
+            self._pool.drop(connection)
+        except cxo.Error:
+            # cx_Oracle rejects connections acquired from other pools or not pooled at all.
+            return False
+        return True
+
+    def resize(self, max_sessions: int):
+        """Increase the maximum number of sessions, smaller values are ignored."""
+        with self._lock:
+            if max_sessions <= self._max_sessions:
+                return
+            logger.info(
+                "Resizing Oracle session pool %s: %s -> %s"
+                % (str(self), self._max_sessions, max_sessions)
+            )
+            self._max_sessions = max_sessions
+            if self._pool:
+                self._pool.reconfigure(max=max_sessions)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "pool": str(self),
+                "max_sessions": self._max_sessions,
+                "open_sessions": self._pool.opened if self._pool else 0,
+                "busy_sessions": self._pool.busy if self._pool else 0,
+                "acquires": self._acquires,
+                "overflow_connections": self._overflows,
+                "wait_seconds_total": round(self._wait_seconds_total, 3),
+                "wait_seconds_max": round(self._wait_seconds_max, 3),
+            }
+
+    def close(self):
+        with self._lock:
+            if self._pool:
+                try:
+                    self._pool.close(force=True)
+                except cxo.DatabaseError as exc:
+                    logger.info("Unable to close Oracle session pool: %s" % exc)
+                self._pool = None
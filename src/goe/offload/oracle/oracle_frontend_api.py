@@ -48,6 +48,11 @@ from goe.offload.oracle.oracle_column import (
     ORACLE_TYPE_VARCHAR2,
     OracleColumn,
 )
+from goe.offload.oracle.oracle_connection_pool import (
+    drop_oracle_connection,
+    get_pooled_oracle_connection,
+    reserve_oracle_connection_pool_sessions,
+)
 from goe.offload.oracle.oracle_literal import OracleLiteral
 from goe.util.goe_version import GOEVersion
 from goe.util.misc_functions import double_quote_sandwich, format_list_for_logging
@@ -120,6 +125,8 @@ class OracleFrontendApi(FrontendApiInterface):
 
         self._db_conn = None
         self._db_curs = None
+        # Sessions altered by query_options must not be returned to a connection pool
+        self._session_altered = False
         if not do_not_connect:
             # Unit testing requires no db connection.
             self._connect()
@@ -181,6 +188,27 @@ class OracleFrontendApi(FrontendApiInterface):
         if default_type == cxo.BLOB:
             return cursor.var(cxo.LONG_BINARY, arraysize=cursor.arraysize)
 
+    def _pooled_or_new_connection(self, user, password, dsn):
+        """Return a connection from the process wide session pool, or a new connection if pooling is disabled.
+        user/password of None means Oracle Wallet authentication.
+        """
+        pool_size = getattr(self._connection_options, "ora_connection_pool_size", 0)
+        use_wallet = bool(user is None)
+        if pool_size:
+            return get_pooled_oracle_connection(
+                user,
+                password,
+                dsn,
+                use_wallet,
+                pool_size,
+                module=FRONTEND_TRACE_MODULE,
+                action=self._trace_action,
+            )
+        elif use_wallet:
+            return cxo.connect(dsn=dsn, threaded=True)
+        else:
+            return cxo.connect(user, password, dsn, threaded=True)
+
     def _connect(self):
         made_new_connection = False
         if self._existing_connection:
@@ -207,20 +235,19 @@ class OracleFrontendApi(FrontendApiInterface):
                     )
                 else:
                     self._debug("Connecting to DSN %s" % dsn)
-                    self._db_conn = cxo.connect(dsn=dsn, threaded=threaded)
+                    self._db_conn = self._pooled_or_new_connection(None, None, dsn)
             elif self._conn_user_override:
                 conn_user, conn_pass = self._conn_user_and_pass_for_override()
                 self._debug("Connecting to %s" % conn_user)
-                self._db_conn = cxo.connect(
-                    conn_user, conn_pass, dsn, threaded=threaded
+                self._db_conn = self._pooled_or_new_connection(
+                    conn_user, conn_pass, dsn
                 )
             else:
                 self._debug("Connecting to %s" % self._connection_options.ora_adm_user)
-                self._db_conn = cxo.connect(
+                self._db_conn = self._pooled_or_new_connection(
                     self._connection_options.ora_adm_user,
                     self._connection_options.ora_adm_pass,
                     dsn,
-                    threaded=threaded,
                 )
             made_new_connection = True
         self._db_conn.module = FRONTEND_TRACE_MODULE
@@ -293,8 +320,12 @@ class OracleFrontendApi(FrontendApiInterface):
                 self._close_cursor()
             try:
                 if self._db_conn:
-                    self._db_conn.close()
+                    if force or self._session_altered:
+                        drop_oracle_connection(self._db_conn)
+                    else:
+                        self._db_conn.close()
                     self._db_conn = None
+                    self._session_altered = False
             except Exception as exc:
                 self._log(
                     "Exception closing connection:\n%s" % str(exc), detail=VVERBOSE
@@ -499,6 +530,7 @@ class OracleFrontendApi(FrontendApiInterface):
                 )
                 if self._db_conn:
                     self._db_curs.execute(prep_sql)
+                    self._session_altered = True
                 return_list.append(prep_sql)
         return return_list
 
@@ -797,14 +829,15 @@ class OracleFrontendApi(FrontendApiInterface):
                SELECT column_name
                ,      column_id
                ,      MAX(column_id) OVER () AS last_column_id
-               ,      ROW_NUMBER() OVER (ORDER BY num_distinct DESC) AS ndv_rank
+               ,      ROW_NUMBER() OVER (ORDER BY num_distinct DESC, column_id) AS ndv_rank
                FROM   all_tab_cols
                WHERE  owner = :OWNER
                AND    table_name = :TABLE_NAME
                AND    hidden_column = 'NO'
               )
         WHERE  column_id IN (1, last_column_id)
-        OR     ndv_rank <= :REQUIRED_NO"""
+        OR     ndv_rank <= :REQUIRED_NO
+        ORDER BY column_id"""
         )
         binds = [
             QueryParameter(param_name="OWNER", param_value=schema),
@@ -1178,6 +1211,10 @@ class OracleFrontendApi(FrontendApiInterface):
         tokens = [switch_oracle_open_partition_token(_) for _ in tokens]
         return tokens
 
+    def reserve_connections(self, connections: int):
+        if getattr(self._connection_options, "ora_connection_pool_size", 0):
+            reserve_oracle_connection_pool_sessions(connections)
+
     def schema_exists(self, schema) -> bool:
         sql = "SELECT 1 FROM dba_users WHERE username = :schema"
         row = self.execute_query_fetch_one(sql, query_params={"schema": schema})
@@ -22,6 +22,7 @@ import re
 from typing import Union
 
 from cx_Oracle import DatabaseError
+import numpy
 from numpy import datetime64
 
 from goe.offload import offload_constants
@@ -60,6 +61,7 @@ from goe.offload.offload_messages import VERBOSE, VVERBOSE
 from goe.offload.offload_source_table import (
     OffloadSourceTableInterface,
     OffloadSourceTableException,
+    PartitionHighValueDecoder,
     RdbmsPartition,
     convert_high_values_to_python,
     OFFLOAD_PARTITION_TYPE_HASH,
@@ -93,6 +95,7 @@ from goe.offload.oracle.oracle_column import (
     ORACLE_TIMESTAMP_RE,
 )
 from goe.offload.oracle import oracle_predicate
+from goe.offload.oracle.oracle_partition_cache import OraclePartitionMetadataCache
 from goe.util.goe_version import GOEVersion
 
 
@@ -141,6 +144,56 @@ def oracle_datetime_literal_to_python(rdbms_literal, strict=True):
     return OracleSourceTable.datetime_literal_to_python(rdbms_literal, strict=strict)
 
 
+def oracle_datetime_literals_to_python(rdbms_literals, strict=True) -> list:
+    """Vectorised equivalent of oracle_datetime_literal_to_python() for a list of literals.
+    Date strings are extracted in a single pass and converted to datetime64 in one numpy call per unit, seconds
+    for DATE/TIMESTAMP(0) and nanoseconds for TIMESTAMP(9). Values have the same unit as the scalar function so
+    they compare and hash identically. Anything else is left to the scalar function.
+    """
+    py_values = [None] * len(rdbms_literals)
+    by_unit = {"s": ([], []), "ns": ([], [])}
+    for i, rdbms_literal in enumerate(rdbms_literals):
+        # Slices rather than split() or regular expressions to keep this loop cheap.
+        unit = None
+        if (
+            rdbms_literal.startswith("TO_DATE('")
+            and rdbms_literal[29:30] == "'"
+            and rdbms_literal.count("'") == 6
+        ):
+            date_string, unit = rdbms_literal[9:29], "s"
+        elif (
+            rdbms_literal.startswith("TIMESTAMP'")
+            and len(rdbms_literal) in (31, 41)
+            and rdbms_literal.count("'") == 2
+            and rdbms_literal[-1] == "'"
+        ):
+            # len 31 == no FF. len 41 == with FF9
+            date_string = rdbms_literal[10:-1]
+            unit = "s" if len(rdbms_literal) == 31 else "ns"
+        if unit:
+            positions, date_strings = by_unit[unit]
+            positions.append(i)
+            date_strings.append(date_string)
+        else:
+            py_values[i] = oracle_datetime_literal_to_python(
+                rdbms_literal, strict=strict
+            )
+    for unit, (positions, date_strings) in by_unit.items():
+        if not positions:
+            continue
+        try:
+            datetimes = numpy.array(date_strings, dtype="datetime64[%s]" % unit)
+        except ValueError:
+            # Leave it to the scalar function to decide what to do with invalid values.
+            datetimes = [
+                oracle_datetime_literal_to_python(rdbms_literals[i], strict=strict)
+                for i in positions
+            ]
+        for i, py_value in zip(positions, datetimes):
+            py_values[i] = py_value
+    return py_values
+
+
 def oracle_number_literal_to_python(rdbms_literal):
     """Helper function for Offload Status Report"""
     return OracleSourceTable.numeric_literal_to_python(rdbms_literal)
@@ -229,6 +282,9 @@ class OracleSourceTable(OffloadSourceTableInterface):
         self._parallelism = None
         self._compression_enabled = None
         self._columns_with_subpartition_info = []
+        self._partition_metadata_cache = getattr(
+            connection_options, "ora_partition_metadata_cache", False
+        )
 
         self._conn = conn
         if do_not_connect:
@@ -447,22 +503,112 @@ class OracleSourceTable(OffloadSourceTableInterface):
         )
         return rows[0] if rows else None
 
+    def _fetch_partition_metadata_rows(
+        self, fetch_type, sql, refresh_fn, num_rows_fn
+    ) -> list:
+        """Run a partition metadata query, or when ORA_PARTITION_METADATA_CACHE is enabled return cached rows
+        with refreshed sizes and row counts if the table structure has not changed since they were fetched.
+        """
+
+        def fetch_fn():
+            return self._db_api.execute_query_fetch_all(
+                sql, query_params={"owner": self.owner, "table_name": self.table_name}
+            )
+
+        if not self._partition_metadata_cache:
+            return fetch_fn()
+        cache = OraclePartitionMetadataCache(
+            self._db_api, self._dsn, self.owner, self.table_name
+        )
+        rows = cache.get_rows(fetch_type, fetch_fn, refresh_fn, num_rows_fn)
+        self._messages.log(
+            "Partition metadata cache %s for %s: %s rows"
+            % ("hit" if cache.hit else "miss", fetch_type, len(rows)),
+            detail=VVERBOSE,
+        )
+        return rows
+
+    @staticmethod
+    def _partition_rows_num_rows(rows) -> dict:
+        """Return the raw (sub)partition row counts held in _get_partitions() rows."""
+        num_rows = {"P": {}, "S": {}}
+        for row in rows:
+            num_rows["P"][row[1]] = row[9]
+            if row[4] is not None:
+                num_rows["S"][row[4]] = row[10]
+        return num_rows
+
+    @staticmethod
+    def _subpartition_rows_num_rows(rows) -> dict:
+        """Return the subpartition row counts held in _get_subpartitions() rows."""
+        return {"P": {}, "S": {row[4]: row[8] for row in rows if row[4] is not None}}
+
+    @staticmethod
+    def _refresh_partition_rows(rows, segment_bytes, num_rows) -> list:
+        """Apply current segment sizes and row counts to cached _get_partitions() rows.
+        Mirrors the query: bytes are summed over subpartition segments, num_rows falls back to the sum of
+        subpartition row counts when the partition has none.
+        """
+        subpartitions = {}
+        for row in rows:
+            if row[4] is not None:
+                subpartitions.setdefault(row[1], []).append(row[4])
+        new_rows = []
+        for row in rows:
+            partition_name = row[1]
+            subpartition_names = subpartitions.get(partition_name)
+            partition_bytes = sum(
+                segment_bytes.get(_) or 0
+                for _ in (subpartition_names or [partition_name])
+            )
+            raw_num_rows = num_rows["P"].get(partition_name)
+            partition_num_rows = raw_num_rows
+            if partition_num_rows is None:
+                subpartition_num_rows = [
+                    num_rows["S"].get(_) for _ in subpartition_names or []
+                ]
+                partition_num_rows = sum(
+                    _ for _ in subpartition_num_rows if _ is not None
+                )
+            new_rows.append(
+                list(row[:7])
+                + [
+                    partition_bytes,
+                    partition_num_rows,
+                    raw_num_rows,
+                    num_rows["S"].get(row[4]),
+                ]
+            )
+        return new_rows
+
+    @staticmethod
+    def _refresh_subpartition_rows(rows, segment_bytes, num_rows) -> list:
+        """Apply current segment sizes and row counts to cached _get_subpartitions() rows."""
+        return [
+            list(row[:7])
+            + [
+                segment_bytes.get(row[4] or row[1]) or 0,
+                num_rows["S"].get(row[4]) or 0,
+            ]
+            for row in rows
+        ]
+
+    def _high_value_decoder(self, strict, populate_hvs):
+        """Return a decoder for lazily populating RdbmsPartition high values, or None if they are not required"""
+        if not populate_hvs:
+            return None
+        return PartitionHighValueDecoder(
+            lambda hv_csvs: self._decode_partition_high_values_batch(
+                hv_csvs, strict=strict
+            )
+        )
+
     def _get_partitions(self, strict=True, populate_hvs=True) -> list:
         """Return a list of RdbmsPartition() objects
         Partitions are in high value descending order
         """
 
-        def hv_python_fn(hv):
-            if populate_hvs:
-                return tuple(self.decode_partition_high_values(hv, strict=strict))
-            else:
-                return None
-
-        def hv_individual_fn(hv):
-            if populate_hvs:
-                return tuple(self._decode_partition_high_values_string(hv))
-            else:
-                return None
+        hv_decoder = self._high_value_decoder(strict, populate_hvs)
 
         logger.debug("_get_partitions: %s, %s" % (self.owner, self.table_name))
         q = """
@@ -473,6 +619,8 @@ class OracleSourceTable(OffloadSourceTableInterface):
                      ,      tp.subpartition_count
                      ,      COALESCE(SUM(s.bytes) OVER (PARTITION BY tp.partition_name), 0)                       AS bytes
                      ,      COALESCE(tp.num_rows, SUM(tsp.num_rows) OVER (PARTITION BY tp.partition_name), 0)     AS num_rows
+                     ,      tp.num_rows                                                                           AS partition_num_rows
+                     ,      tsp.num_rows                                                                          AS subpartition_num_rows
                      ,      tsp.subpartition_name
                      ,      NVL(tsp.subpartition_position, 0)                                                     AS subpartition_position
                      ,      ROW_NUMBER() OVER (PARTITION BY tp.partition_name ORDER BY tsp.subpartition_position) AS partition_rownum
@@ -512,6 +660,8 @@ class OracleSourceTable(OffloadSourceTableInterface):
               ,      high_value
               ,      bytes
               ,      num_rows
+              ,      partition_num_rows
+              ,      subpartition_num_rows
               FROM   partition_data
               ORDER  BY
                      partition_position DESC
@@ -523,8 +673,11 @@ class OracleSourceTable(OffloadSourceTableInterface):
         # an array fetch loop with a nested loop for generating a subpartitions list. Not only is this necessary
         # for assigning the subpartition names to a nested list, it also prevents fetching lots of redundant
         # denormalised high_values from the partition row to the subpartition rows.
-        rows = self._db_api.execute_query_fetch_all(
-            q, query_params={"owner": self.owner, "table_name": self.table_name}
+        rows = self._fetch_partition_metadata_rows(
+            "partitions",
+            q,
+            self._refresh_partition_rows,
+            self._partition_rows_num_rows,
         )
         partitions = []
         for row in rows:
@@ -538,7 +691,7 @@ class OracleSourceTable(OffloadSourceTableInterface):
                 partition_high_value,
                 partition_bytes,
                 num_rows,
-            ) = row
+            ) = row[:9]
             if partition_rownum == 1:
                 # Initialise new partition on first occurrence of this partition...
                 partition = RdbmsPartition.by_name(
@@ -552,8 +705,7 @@ class OracleSourceTable(OffloadSourceTableInterface):
                     high_values_csv=partition_high_value,
                     partition_size=partition_bytes,
                     num_rows=num_rows,
-                    high_values_individual=hv_individual_fn(partition_high_value),
-                    high_values_python=hv_python_fn(partition_high_value),
+                    high_values_decoder=hv_decoder,
                 )
             else:
                 # Append the subpartition name to the list of subpartitions for this partition...
@@ -569,17 +721,7 @@ class OracleSourceTable(OffloadSourceTableInterface):
         Partitions are in high value descending order
         """
 
-        def hv_python_fn(hv):
-            if populate_hvs:
-                return tuple(self.decode_partition_high_values(hv, strict=strict))
-            else:
-                return None
-
-        def hv_individual_fn(hv):
-            if populate_hvs:
-                return tuple(self._decode_partition_high_values_string(hv))
-            else:
-                return None
+        hv_decoder = self._high_value_decoder(strict, populate_hvs)
 
         logger.debug("_get_subpartitions: %s, %s" % (self.owner, self.table_name))
         q = """
@@ -622,8 +764,11 @@ class OracleSourceTable(OffloadSourceTableInterface):
                        tp.partition_position
                 ,      tsp.subpartition_position
               """
-        rows = self._db_api.execute_query_fetch_all(
-            q, query_params={"owner": self.owner, "table_name": self.table_name}
+        rows = self._fetch_partition_metadata_rows(
+            "subpartitions",
+            q,
+            self._refresh_subpartition_rows,
+            self._subpartition_rows_num_rows,
         )
         logger.debug("len(rows): %s" % len(rows))
         partitions = []
@@ -650,12 +795,14 @@ class OracleSourceTable(OffloadSourceTableInterface):
                     high_values_csv=subpartition_high_value,
                     partition_size=subpartition_size,
                     num_rows=num_rows,
-                    high_values_individual=hv_individual_fn(subpartition_high_value),
-                    high_values_python=hv_python_fn(subpartition_high_value),
+                    high_values_decoder=hv_decoder,
                 )
             )
 
         # sort by high value descending to match output from _get_partitions()
+        if hv_decoder:
+            # Sorting needs every high value, decode them in a single batch.
+            hv_decoder.decode_all(_.high_values_csv for _ in partitions)
         partitions.sort(key=lambda x: x.high_values_python, reverse=True)
 
         return partitions
@@ -702,6 +849,55 @@ class OracleSourceTable(OffloadSourceTableInterface):
         """
         return self._db_api.split_partition_high_value_string(hv_csv)
 
+    def _decode_partition_high_values_batch(self, hv_csvs, strict=True) -> list:
+        """Equivalent of _decode_partition_high_values() for a list of high values, returns a list of
+        (python values, individual literals) tuple pairs.
+        Date based literals for all high values are converted in a single call to oracle_datetime_literals_to_python().
+        """
+        logger.debug(
+            "_decode_partition_high_values_batch: %s, %s" % (len(hv_csvs), strict)
+        )
+        hvs_individual = [
+            tuple(self._decode_partition_high_values_string(_)) for _ in hv_csvs
+        ]
+        if self.partition_type == OFFLOAD_PARTITION_TYPE_LIST:
+            # LIST partition tables can have multiple values per partition key and only one partition column
+            part_cols = self.partition_columns[:1]
+        else:
+            part_cols = self.partition_columns
+        hvs_python = []
+        datetime_positions = []
+        for hv_literals in hvs_individual:
+            if self.partition_type == OFFLOAD_PARTITION_TYPE_LIST:
+                zip_part_cols = part_cols * len(hv_literals)
+            else:
+                zip_part_cols = part_cols
+            hv_list = []
+            for part_col, hv in zip(zip_part_cols, hv_literals):
+                if part_col.is_date_based() and hv.upper() not in (
+                    "DEFAULT",
+                    offload_constants.PART_OUT_OF_LIST,
+                ):
+                    datetime_positions.append((hv_list, len(hv_list), hv))
+                    hv_list.append(None)
+                else:
+                    hv_list.append(
+                        self.rdbms_literal_to_python(
+                            part_col, hv, self.partition_type, strict=strict
+                        )
+                    )
+            hvs_python.append(hv_list)
+        if datetime_positions:
+            datetimes = oracle_datetime_literals_to_python(
+                [hv for _, _, hv in datetime_positions], strict=strict
+            )
+            for (hv_list, i, _), py_value in zip(datetime_positions, datetimes):
+                hv_list[i] = py_value
+        return [
+            (tuple(hv_list), hv_literals)
+            for hv_list, hv_literals in zip(hvs_python, hvs_individual)
+        ]
+
     def _decode_partition_high_values(self, hv_csv, strict=True):
         """Takes Oracle dba_tab_partitions.high_value and rationalises to Python values
         The values returned are tuples
@@ -27,7 +27,8 @@ from goe.offload.offload_messages import VERBOSE, VVERBOSE
 from goe.offload.offload_source_table import OFFLOAD_PARTITION_TYPE_RANGE
 from goe.offload.offload_transport_functions import (
     get_rdbms_connection_for_oracle,
-    split_ranges_for_id_range,
+    quantiles_from_histogram,
+    sample_percent_for_id_quantiles,
 )
 from goe.offload.offload_transport_rdbms_api import (
     OffloadTransportRdbmsApiInterface,
@@ -42,6 +43,7 @@ from goe.offload.offload_transport_rdbms_api import (
     TRANSPORT_ROW_SOURCE_QUERY_SPLIT_COLUMN,
     TRANSPORT_ROW_SOURCE_QUERY_SPLIT_TYPE_TEXT,
 )
+from goe.offload.oracle.oracle_connection_pool import drop_oracle_connection
 from goe.offload.oracle.oracle_column import (
     ORACLE_TYPE_FLOAT,
     ORACLE_TYPE_NUMBER,
@@ -58,6 +60,7 @@ from goe.offload.oracle.oracle_column import (
 from goe.offload.oracle.oracle_offload_source_table import (
     oracle_version_is_smart_scan_unsafe,
 )
+from goe.offload.query_import_interface import DEFINE_CONVERTED_STRING_CHARS
 from goe.util.misc_functions import id_generator
 
 if TYPE_CHECKING:
@@ -74,6 +77,32 @@ if TYPE_CHECKING:
 
 MAX_UNION_ALL_SPLITS = 1024
 
+ID_RANGE_HISTOGRAM_QUERY_TEXT = """SELECT h.endpoint_number, h.endpoint_value
+FROM   all_tab_col_statistics s
+,      all_tab_histograms h
+WHERE  s.owner = :owner
+AND    s.table_name = :table_name
+AND    s.column_name = :column_name
+AND    s.histogram IN ('FREQUENCY', 'HEIGHT BALANCED', 'HYBRID')
+AND    h.owner = s.owner
+AND    h.table_name = s.table_name
+AND    h.column_name = s.column_name
+ORDER BY h.endpoint_number"""
+
+ID_RANGE_PART_HISTOGRAM_QUERY_TEXT = """SELECT h.bucket_number, h.endpoint_value
+FROM   all_part_col_statistics s
+,      all_part_histograms h
+WHERE  s.owner = :owner
+AND    s.table_name = :table_name
+AND    s.partition_name = :partition_name
+AND    s.column_name = :column_name
+AND    s.histogram IN ('FREQUENCY', 'HEIGHT BALANCED', 'HYBRID')
+AND    h.owner = s.owner
+AND    h.table_name = s.table_name
+AND    h.partition_name = s.partition_name
+AND    h.column_name = s.column_name
+ORDER BY h.bucket_number"""
+
 LOG_SQL_STATS_QUERY_TEXT = """SELECT sql_id,
    child_number,
    rows_processed,
@@ -142,6 +171,7 @@ class OffloadTransportOracleApi(OffloadTransportRdbmsApiInterface):
                 self._offload_options.ora_adm_pass,
                 self._rdbms_adm_dsn,
                 self._offload_options.use_oracle_wallet,
+                pool_size=self._offload_options.ora_connection_pool_size,
             )
         return self._rdbms_adm_conn
 
@@ -157,6 +187,7 @@ class OffloadTransportOracleApi(OffloadTransportRdbmsApiInterface):
                 self._offload_options.rdbms_app_pass,
                 self._offload_transport_dsn,
                 self._offload_options.use_oracle_wallet,
+                pool_size=self._offload_options.ora_connection_pool_size,
             )
         return self._rdbms_app_conn
 
@@ -232,6 +263,29 @@ class OffloadTransportOracleApi(OffloadTransportRdbmsApiInterface):
             else incoming
         )
 
+    def _get_id_range_histogram(self, rdbms_col_name: str, partition_chunk) -> list:
+        """Return (cumulative_count, endpoint_value) tuples from the optimizer histogram for rdbms_col_name.
+        Only returns histograms that describe the whole row source, i.e. for the table or a single partition.
+        """
+        binds = {
+            "owner": self._rdbms_owner.upper(),
+            "table_name": self._rdbms_table_name.upper(),
+            "column_name": rdbms_col_name,
+        }
+        if partition_chunk and partition_chunk.count() > 1:
+            return []
+        elif partition_chunk and partition_chunk.count() == 1:
+            sql = ID_RANGE_PART_HISTOGRAM_QUERY_TEXT
+            binds["partition_name"] = partition_chunk.partition_names().pop()
+        else:
+            sql = ID_RANGE_HISTOGRAM_QUERY_TEXT
+        self.log("Oracle SQL:\n%s\nBinds: %s" % (sql, binds), detail=VVERBOSE)
+        cursor = self._get_app_connection().cursor()
+        try:
+            return cursor.execute(sql, binds).fetchall()
+        finally:
+            cursor.close()
+
     def _get_iot_single_partition_clause(self, partition_chunk):
         """Return PARTITION(partition_name) clause partition_chunk if there is a single partition.
         This is because we treat single partition IOT offloads like non-partitioned tables. It's a small
@@ -319,6 +373,7 @@ FROM  (
             self._offload_options.rdbms_app_pass,
             self._offload_transport_dsn,
             self._offload_options.use_oracle_wallet,
+            pool_size=self._offload_options.ora_connection_pool_size,
         )
         try:
             ora_cursor = cx.cursor()
@@ -345,6 +400,57 @@ FROM  (
                 pass
         return min_max_row[0], min_max_row[1]
 
+    def get_id_range_quantiles(
+        self,
+        rdbms_col_name: str,
+        predicate_offload_clause: str,
+        parallelism: int,
+        rdbms_table: "OffloadSourceTableInterface",
+        partition_chunk: "OffloadSourcePartitions" = None,
+    ) -> list:
+        """Return (parallelism - 1) values of an id column that split the row source into groups of roughly
+        equal population.
+
+        Optimizer histograms are used when they describe the entire row source, otherwise quantiles are
+        calculated using PERCENTILE_DISC over a SAMPLE of the row source.
+        """
+        if not predicate_offload_clause:
+            quantiles = quantiles_from_histogram(
+                self._get_id_range_histogram(rdbms_col_name, partition_chunk),
+                parallelism,
+            )
+            if quantiles:
+                self.log("ID range quantiles from histogram", detail=VVERBOSE)
+                return quantiles
+
+        sample_percent = sample_percent_for_id_quantiles(
+            self._get_id_range_num_rows(rdbms_table, partition_chunk)
+        )
+        quantile_qry = """SELECT %(percentiles)s
+FROM   "%(owner)s"."%(table)s"%(partition_clause)s%(sample_clause)s%(predicate_clause)s""" % {
+            "percentiles": "\n,      ".join(
+                "PERCENTILE_DISC(%s) WITHIN GROUP (ORDER BY %s)"
+                % (i / parallelism, rdbms_col_name)
+                for i in range(1, parallelism)
+            ),
+            "owner": self._rdbms_owner,
+            "table": self._rdbms_table_name,
+            "partition_clause": self._get_iot_single_partition_clause(partition_chunk),
+            "sample_clause": f" SAMPLE ({sample_percent})" if sample_percent else "",
+            "predicate_clause": (
+                f"\nWHERE  {predicate_offload_clause}"
+                if predicate_offload_clause
+                else ""
+            ),
+        }
+        self.log("Oracle SQL:\n%s" % quantile_qry, detail=VVERBOSE)
+        cursor = self._get_app_connection().cursor()
+        try:
+            row = cursor.execute(quantile_qry).fetchone()
+        finally:
+            cursor.close()
+        return [_ for _ in row if _ is not None] if row else []
+
     def get_rdbms_query_cast(
         self,
         column_expression,
@@ -783,7 +889,15 @@ FROM  (
                 row_source += "\nWHERE (%s)" % predicate_offload_clause
         elif partition_by == TRANSPORT_ROW_SOURCE_QUERY_SPLIT_BY_ID_RANGE:
             # Create a range of min/max tuples spanning the entire id range
-            id_ranges = split_ranges_for_id_range(id_col_min, id_col_max, parallelism)
+            id_ranges = self._get_id_ranges(
+                id_split_col,
+                predicate_offload_clause,
+                parallelism,
+                rdbms_table,
+                partition_chunk,
+                id_col_min,
+                id_col_max,
+            )
             union_branch_template = (
                 "SELECT g.*, %(batch)s AS %(batch_col)s FROM %(owner_table)s%(part_clause)s%(scn_clause)s g "
                 "WHERE %(batch_source_col)s >= %(low_val)s AND %(batch_source_col)s < %(high_val)s"
@@ -988,11 +1102,13 @@ ORDER BY seconds DESC"""
                     or staging_column.is_string_based()
                 ):
                     # We are offloading to string and should convert the value to string
-                    return cursor.var(str, 255, cursor.arraysize)
+                    return cursor.var(
+                        str, DEFINE_CONVERTED_STRING_CHARS, cursor.arraysize
+                    )
             elif default_type in (cxo.STRING, cxo.FIXED_CHAR):
                 return cursor.var(str, size, cursor.arraysize)
             elif default_type in (cxo.DATETIME, cxo.TIMESTAMP):
-                return cursor.var(str, 255, cursor.arraysize)
+                return cursor.var(str, DEFINE_CONVERTED_STRING_CHARS, cursor.arraysize)
 
         def setup_rdbms_session(ora_cursor):
             # Dependency on this TIME_ZONE=UTC (inside offload.setup_offload_session()) with encode logic appending UTC.
@@ -1006,15 +1122,18 @@ ORDER BY seconds DESC"""
             self._offload_options.rdbms_app_pass,
             self._offload_transport_dsn,
             self._offload_options.use_oracle_wallet,
+            pool_size=self._offload_options.ora_connection_pool_size,
         )
         ora_cursor = cx.cursor()
         cx.outputtypehandler = cx_type_handler
 
+        # Define buffers and round trips are sized when the query is executed, not by later fetches.
         ora_cursor.arraysize = fetch_size
+        ora_cursor.prefetchrows = fetch_size
 
         self.log(
-            "Importing load data with arraysize=%s, compression=%s"
-            % (ora_cursor.arraysize, compress),
+            "Importing load data with arraysize=%s, prefetchrows=%s, compression=%s"
+            % (ora_cursor.arraysize, ora_cursor.prefetchrows, compress),
             detail=VERBOSE,
         )
 
@@ -1031,7 +1150,8 @@ ORDER BY seconds DESC"""
             yield ora_cursor
         finally:
             ora_cursor.close()
-            cx.close()
+            # Session setup commands have altered the session, it must not be returned to a pool.
+            drop_oracle_connection(cx)
 
     def sqoop_by_query_boundary_query(self, offload_transport_parallelism):
         """Return a query providing a value range for Sqoop --boundary-query option."""
@@ -0,0 +1,271 @@
+# Copyright 2016 The GOE Authors. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" OraclePartitionMetadataCache: Cache of partition metadata rows shared by offload, status report and listener.
+
+    Fetching partition details joins dba_tab_partitions, dba_tab_subpartitions and dba_segments and converts
+    the HIGH_VALUE LONG for every row, on tables with hundreds of thousands of segments this takes tens of seconds
+    and the same details are fetched many times.
+
+    Cached rows are keyed on DSN/owner/table and validated with a single cheap dba_objects query: the most recent
+    LAST_DDL_TIME and the number of table, partition and subpartition objects. Partition maintenance changes one
+    or the other and forces a full fetch. On a hit only sizes and row counts are refreshed:
+      - Segment sizes from a single aggregate on dba_segments, dba_segments has no change timestamp.
+      - Row counts from the (sub)partition stats, re-queried only when an aggregate of NUM_ROWS/LAST_ANALYZED
+        shows stats were gathered, deleted or restored since the entry was stored.
+    On a miss row counts are taken from the fetched rows themselves.
+
+    Entries are held in process memory and, when the listener Redis integration is configured, also in Redis so
+    they survive between offload processes.
+"""
+
+from collections import OrderedDict
+from datetime import timedelta
+import logging
+import threading
+from typing import Callable, Optional
+
+from goe.config import orchestration_defaults
+from goe.util.json_tools import deserialize_object, serialize_object
+from goe.util.redis_tools import RedisClient
+
+
+###############################################################################
+# CONSTANTS
+###############################################################################
+
+# Tables held in process memory, least recently used entries are discarded beyond this
+ORACLE_PARTITION_CACHE_MAX_TABLES = 64
+ORACLE_PARTITION_CACHE_REDIS_KEY_PREFIX = "goe:partition_metadata"
+ORACLE_PARTITION_CACHE_REDIS_TTL = timedelta(days=1)
+
+ORACLE_PARTITION_CACHE_DATE_FORMAT = "YYYY-MM-DD HH24:MI:SS"
+
+PARTITION_CACHE_VERSION_SQL = f"""SELECT TO_CHAR(MAX(o.last_ddl_time), '{ORACLE_PARTITION_CACHE_DATE_FORMAT}')
+,      COUNT(*)
+FROM   dba_objects o
+WHERE  o.owner = :owner
+AND    o.object_name = :table_name
+AND    o.object_type IN ('TABLE', 'TABLE PARTITION', 'TABLE SUBPARTITION')"""
+
+# Changes whenever (sub)partition stats are gathered, deleted or restored from history.
+PARTITION_CACHE_STATS_SQL = """SELECT 'P'
+,      COUNT(tp.last_analyzed)
+,      SUM(tp.num_rows)
+,      TO_CHAR(SUM(tp.last_analyzed - DATE '1970-01-01'))
+FROM   dba_tab_partitions tp
+WHERE  tp.table_owner = :owner
+AND    tp.table_name = :table_name
+UNION ALL
+SELECT 'S'
+,      COUNT(tsp.last_analyzed)
+,      SUM(tsp.num_rows)
+,      TO_CHAR(SUM(tsp.last_analyzed - DATE '1970-01-01'))
+FROM   dba_tab_subpartitions tsp
+WHERE  tsp.table_owner = :owner
+AND    tsp.table_name = :table_name
+ORDER  BY 1"""
+
+PARTITION_CACHE_SEGMENT_BYTES_SQL = """SELECT s.partition_name
+,      SUM(s.bytes)
+FROM   dba_segments s
+WHERE  s.owner = :owner
+AND    s.segment_name = (SELECT DECODE(t.iot_type, 'IOT', c.index_name, t.table_name)
+                         FROM   dba_tables t
+                                LEFT OUTER JOIN
+                                dba_constraints c
+                                ON (    c.owner           = t.owner
+                                    AND c.table_name      = t.table_name
+                                    AND c.constraint_type = 'P')
+                         WHERE  t.owner      = :owner
+                         AND    t.table_name = :table_name)
+GROUP  BY s.partition_name"""
+
+PARTITION_CACHE_NUM_ROWS_SQL = """SELECT 'P', tp.partition_name, tp.num_rows
+FROM   dba_tab_partitions tp
+WHERE  tp.table_owner = :owner
+AND    tp.table_name = :table_name
+UNION ALL
+SELECT 'S', tsp.subpartition_name, tsp.num_rows
+FROM   dba_tab_subpartitions tsp
+WHERE  tsp.table_owner = :owner
+AND    tsp.table_name = :table_name"""
+
+###############################################################################
+# LOGGING
+###############################################################################
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+_entries = OrderedDict()
+_entries_lock = threading.Lock()
+_redis_in_error = False
+
+
+###########################################################################
+# GLOBAL FUNCTIONS
+###########################################################################
+
+
+def clear_oracle_partition_cache():
+    """Discard all entries held in process memory."""
+    with _entries_lock:
+        _entries.clear()
+
+
+###########################################################################
+# OraclePartitionMetadataCache
+###########################################################################
+
+
+class OraclePartitionMetadataCache:
+    """Cached partition metadata rows for a single table.
+    Rows are cached per fetch type, e.g. partitions or subpartitions, alongside the segment sizes and row
+    counts they were built from so that both can be refreshed without repeating the fetch.
+    """
+
+    def __init__(self, db_api, dsn: str, owner: str, table_name: str):
+        self._db_api = db_api
+        self._owner = owner
+        self._table_name = table_name
+        self._key = "%s:%s:%s.%s" % (
+            ORACLE_PARTITION_CACHE_REDIS_KEY_PREFIX,
+            dsn,
+            owner,
+            table_name,
+        )
+        self.hit = None
+
+    ###########################################################################
+    # PRIVATE METHODS
+    ###########################################################################
+
+    def _query_params(self, **kwargs) -> dict:
+        return {"owner": self._owner, "table_name": self._table_name, **kwargs}
+
+    def _get_version(self) -> list:
+        """Return [last DDL time, object count] for the table."""
+        return list(
+            self._db_api.execute_query_fetch_one(
+                PARTITION_CACHE_VERSION_SQL, query_params=self._query_params()
+            )
+        )
+
+    def _get_stats_version(self) -> list:
+        """Return a per level aggregate of (sub)partition stats for detecting stats changes."""
+        rows = self._db_api.execute_query_fetch_all(
+            PARTITION_CACHE_STATS_SQL, query_params=self._query_params()
+        )
+        return [list(_) for _ in rows or []]
+
+    def _get_segment_bytes(self) -> dict:
+        rows = self._db_api.execute_query_fetch_all(
+            PARTITION_CACHE_SEGMENT_BYTES_SQL, query_params=self._query_params()
+        )
+        return {partition_name: size for partition_name, size in rows or []}
+
+    def _get_num_rows(self) -> dict:
+        """Return row counts keyed on (sub)partition level and then name."""
+        rows = self._db_api.execute_query_fetch_all(
+            PARTITION_CACHE_NUM_ROWS_SQL, query_params=self._query_params()
+        )
+        num_rows = {"P": {}, "S": {}}
+        for level, name, level_num_rows in rows or []:
+            num_rows[level][name] = level_num_rows
+        return num_rows
+
+    def _load(self) -> Optional[dict]:
+        global _redis_in_error
+        with _entries_lock:
+            if self._key in _entries:
+                _entries.move_to_end(self._key)
+                return _entries[self._key]
+        if orchestration_defaults.cache_enabled() and not _redis_in_error:
+            try:
+                cached = RedisClient.connect().get(self._key)
+                return deserialize_object(cached) if cached else None
+            except Exception as exc:
+                logger.warning("Disabling Redis partition cache due to: %s" % str(exc))
+                _redis_in_error = True
+        return None
+
+    def _store(self, entry: dict):
+        global _redis_in_error
+        with _entries_lock:
+            _entries[self._key] = entry
+            _entries.move_to_end(self._key)
+            while len(_entries) > ORACLE_PARTITION_CACHE_MAX_TABLES:
+                _entries.popitem(last=False)
+        if orchestration_defaults.cache_enabled() and not _redis_in_error:
+            try:
+                RedisClient.connect().set(
+                    self._key,
+                    serialize_object(entry),
+                    ttl=ORACLE_PARTITION_CACHE_REDIS_TTL,
+                )
+            except Exception as exc:
+                logger.warning("Disabling Redis partition cache due to: %s" % str(exc))
+                _redis_in_error = True
+
+    ###########################################################################
+    # PUBLIC METHODS
+    ###########################################################################
+
+    def get_rows(
+        self,
+        fetch_type: str,
+        fetch_fn: Callable,
+        refresh_fn: Callable,
+        num_rows_fn: Callable,
+    ) -> list:
+        """Return rows for fetch_type, from the cache when the table structure has not changed.
+        fetch_fn() runs the full metadata query.
+        refresh_fn(rows, segment_bytes, num_rows) returns cached rows with current sizes and row counts,
+        segment_bytes is keyed on segment partition name and num_rows as returned by _get_num_rows().
+        num_rows_fn(rows) returns the row counts held in rows from fetch_fn(), in the same format as num_rows.
+        """
+        version = self._get_version()
+        stats_version = self._get_stats_version()
+        entry = self._load()
+        if entry and entry["version"] == version:
+            if entry["stats_version"] == stats_version:
+                num_rows = entry["num_rows"]
+            else:
+                logger.debug("Partition cache refreshing row counts after stats change")
+                num_rows = self._get_num_rows()
+        else:
+            entry = {"version": version, "rows": {}}
+            num_rows = {"P": {}, "S": {}}
+
+        self.hit = fetch_type in entry["rows"]
+        if self.hit:
+            rows = refresh_fn(
+                entry["rows"][fetch_type], self._get_segment_bytes(), num_rows
+            )
+        else:
+            rows = fetch_fn()
+            fetched_num_rows = num_rows_fn(rows)
+            num_rows = {
+                level: {**num_rows[level], **fetched_num_rows[level]}
+                for level in ("P", "S")
+            }
+        new_entry = {
+            "version": version,
+            "stats_version": stats_version,
+            "num_rows": num_rows,
+            "rows": {**entry["rows"], fetch_type: [list(_) for _ in rows]},
+        }
+        self._store(new_entry)
+        return rows
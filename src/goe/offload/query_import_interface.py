@@ -14,22 +14,295 @@
 
 from abc import ABCMeta, abstractmethod
 import base64
+import queue
+import threading
+import time
+
+from goe.offload.column_metadata import match_table_column
 from goe.offload.oracle.oracle_column import (
     ORACLE_TYPE_BLOB,
     ORACLE_TYPE_CLOB,
+    ORACLE_TYPE_LONG,
+    ORACLE_TYPE_LONG_RAW,
     ORACLE_TYPE_NCLOB,
 )
 from goe.offload.offload_messages import VVERBOSE
+from goe.offload.staged_data_fingerprint import StagedDataFingerprint
 
 
 ###############################################################################
 # CONSTANTS
 ###############################################################################
 
+# WITH LOCAL TIME ZONE values need a UTC suffix to match Sqoop
+TSLTZ_SUFFIX = " UTC"
+
+# Maximum number of items buffered between fetch/encode/write pipeline stages.
+PIPELINE_QUEUE_DEPTH = 4
+# How often a blocked pipeline stage checks whether another stage has failed.
+PIPELINE_POLL_SECONDS = 0.5
+
+# Adaptive fetch size bounds and tuning.
+FETCH_MIN_ROWS = 10
+FETCH_MAX_ROWS = 100000
+# Rows per batch inspected when measuring the size of fetched data.
+FETCH_SAMPLE_ROWS = 20
+# Limit on how quickly fetch size can grow between batches, shrinking is immediate.
+FETCH_MAX_GROWTH_FACTOR = 2
+# Fetch size is only changed when the ideal size differs from the current one by more than this ratio.
+FETCH_RESIZE_THRESHOLD = 0.25
+# Do not grow the fetch size further once a single fetch is this slow, it starves the pipeline.
+FETCH_SLOW_SECONDS = 10
+
+# Define buffers for string values are sized in characters, each of which may take this many bytes.
+DEFINE_BYTES_PER_CHAR = 4
+# Numbers and datetimes are fetched as strings of this many characters.
+DEFINE_CONVERTED_STRING_CHARS = 255
+
+# Row width estimates for columns without a useful length.
+ESTIMATE_LOB_BYTES = 1024 * 64
+ESTIMATE_OTHER_BYTES = 16
+ESTIMATE_UNBOUND_STRING_CHARS = 4000
+ESTIMATE_LONG_TYPES = [
+    ORACLE_TYPE_BLOB,
+    ORACLE_TYPE_CLOB,
+    ORACLE_TYPE_LONG,
+    ORACLE_TYPE_LONG_RAW,
+    ORACLE_TYPE_NCLOB,
+]
+
 ###########################################################################
 # GLOBAL FUNCTIONS
 ###########################################################################
 
+
+def read_lob_value(lob_or_value):
+    """LOB values may already have been read by the pipeline fetch stage."""
+    return lob_or_value.read() if hasattr(lob_or_value, "read") else lob_or_value
+
+
+def estimate_row_bytes(columns) -> int:
+    """Estimate the memory needed per fetched row from column metadata.
+    Matches the define buffers allocated for an extraction query: strings are sized in characters,
+    numbers and datetimes are fetched as strings and LOB contents are read into memory.
+    String lengths are maximums, therefore this tends to overestimate which is the safe direction.
+    """
+    row_bytes = 0
+    for column in columns:
+        if column.data_type in ESTIMATE_LONG_TYPES:
+            row_bytes += ESTIMATE_LOB_BYTES
+        elif column.is_string_based():
+            row_bytes += (
+                column.char_length
+                or column.data_length
+                or ESTIMATE_UNBOUND_STRING_CHARS
+            ) * DEFINE_BYTES_PER_CHAR
+        elif column.is_binary():
+            row_bytes += column.data_length or ESTIMATE_UNBOUND_STRING_CHARS
+        elif column.is_number_based() or column.is_date_based():
+            row_bytes += DEFINE_CONVERTED_STRING_CHARS * DEFINE_BYTES_PER_CHAR
+        else:
+            row_bytes += ESTIMATE_OTHER_BYTES
+    return max(row_bytes, 1)
+
+
+def initial_fetch_rows(columns, target_batch_bytes, max_batch_bytes=None) -> int:
+    """Fetch size approaching target_batch_bytes per fetch based on estimate_row_bytes(),
+    never exceeding max_batch_bytes unless that is less than FETCH_MIN_ROWS rows.
+    """
+    row_bytes = estimate_row_bytes(columns)
+    rows = min(
+        FETCH_MAX_ROWS,
+        int(target_batch_bytes / row_bytes),
+        int((max_batch_bytes or target_batch_bytes) / row_bytes),
+    )
+    return max(FETCH_MIN_ROWS, rows)
+
+
+def sample_row_bytes(rows) -> float:
+    """Average size of a sample of fetched rows, str/bytes values are measured, unread LOBs are estimated."""
+
+    def value_bytes(value):
+        if value is None:
+            return 1
+        elif isinstance(value, (str, bytes)):
+            return len(value)
+        elif hasattr(value, "read"):
+            return ESTIMATE_LOB_BYTES
+        else:
+            return 8
+
+    step = max(1, len(rows) // FETCH_SAMPLE_ROWS)
+    sample = rows[::step]
+    total_bytes = sum(value_bytes(v) for row in sample for v in row)
+    return max(float(total_bytes) / len(sample), 1.0)
+
+
+###########################################################################
+# AdaptiveFetchSize
+###########################################################################
+
+
+class AdaptiveFetchSize:
+    """Controls the number of rows per batch handed to the encode/write pipeline so that each batch approaches
+    a target size in bytes without exceeding a hard ceiling.
+    Starts from a size derived from column metadata then adjusts using the measured size of fetched rows.
+    Narrow rows grow the batch size, reducing per batch overhead, wide rows (LOBs) shrink it, protecting memory.
+    This does not change database round trips, those are fixed by the cursor arraysize/prefetch rows set
+    before the extraction query is executed.
+    """
+
+    def __init__(self, initial_rows, target_batch_bytes, max_batch_bytes):
+        assert target_batch_bytes > 0
+        assert max_batch_bytes >= target_batch_bytes
+        self._target_batch_bytes = target_batch_bytes
+        self._max_batch_bytes = max_batch_bytes
+        self._row_bytes = None
+        self.rows = max(FETCH_MIN_ROWS, min(FETCH_MAX_ROWS, int(initial_rows)))
+        self.fetches = 0
+        self.resizes = 0
+        self.total_rows = 0
+        self.total_bytes = 0.0
+        self.total_seconds = 0.0
+        self.min_rows = self.max_rows = self.rows
+
+    def record_fetch(self, rows, seconds):
+        """Record the size and duration of a fetch and adjust the fetch size for the next one."""
+        if not rows:
+            return
+        sampled_row_bytes = sample_row_bytes(rows)
+        # Smooth the measurement so one unusual batch does not swing the fetch size.
+        self._row_bytes = (
+            sampled_row_bytes
+            if self._row_bytes is None
+            else (self._row_bytes + sampled_row_bytes) / 2
+        )
+        self.fetches += 1
+        self.total_rows += len(rows)
+        self.total_bytes += sampled_row_bytes * len(rows)
+        self.total_seconds += seconds
+
+        ceiling_rows = max(FETCH_MIN_ROWS, int(self._max_batch_bytes / self._row_bytes))
+        ideal_rows = int(self._target_batch_bytes / self._row_bytes)
+        if ideal_rows > self.rows:
+            if seconds > FETCH_SLOW_SECONDS:
+                ideal_rows = self.rows
+            ideal_rows = min(ideal_rows, self.rows * FETCH_MAX_GROWTH_FACTOR)
+        ideal_rows = max(FETCH_MIN_ROWS, min(ideal_rows, ceiling_rows, FETCH_MAX_ROWS))
+        if (
+            abs(ideal_rows - self.rows) > self.rows * FETCH_RESIZE_THRESHOLD
+            or self.rows > ceiling_rows
+        ):
+            self.rows = ideal_rows
+            self.resizes += 1
+            self.min_rows = min(self.min_rows, self.rows)
+            self.max_rows = max(self.max_rows, self.rows)
+
+    def stats_message(self) -> str:
+        return (
+            "Adaptive fetch: fetches=%s, resizes=%s, rows min/max/final=%s/%s/%s, avg row bytes=%.0f, avg fetch seconds=%.3f"
+            % (
+                self.fetches,
+                self.resizes,
+                self.min_rows,
+                self.max_rows,
+                self.rows,
+                self.total_bytes / self.total_rows if self.total_rows else 0.0,
+                self.total_seconds / self.fetches if self.fetches else 0.0,
+            )
+        )
+
+
+###########################################################################
+# PipelineStopped
+###########################################################################
+
+
+class PipelineStopped(Exception):
+    """Raised inside a pipeline stage when another stage has failed."""
+
+    pass
+
+
+###########################################################################
+# PipelineQueue
+###########################################################################
+
+
+class PipelineQueue:
+    """Bounded queue between two Query Import pipeline stages.
+    Records queue depth and how often, and for how long, each side was blocked waiting on the other.
+    Producer stalls mean the consuming stage is the bottleneck, consumer stalls mean the producing stage is.
+    """
+
+    def __init__(self, name, stop_event, maxsize=PIPELINE_QUEUE_DEPTH):
+        self.name = name
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._stop_event = stop_event
+        self.puts = 0
+        self.max_depth = 0
+        self._total_depth = 0
+        self.producer_stalls = 0
+        self.producer_stall_seconds = 0.0
+        self.consumer_stalls = 0
+        self.consumer_stall_seconds = 0.0
+
+    def put(self, item):
+        depth = self._queue.qsize()
+        self.puts += 1
+        self._total_depth += depth
+        self.max_depth = max(self.max_depth, depth)
+        try:
+            self._queue.put_nowait(item)
+            return
+        except queue.Full:
+            pass
+        self.producer_stalls += 1
+        t1 = time.time()
+        while True:
+            if self._stop_event.is_set():
+                raise PipelineStopped()
+            try:
+                self._queue.put(item, timeout=PIPELINE_POLL_SECONDS)
+                break
+            except queue.Full:
+                pass
+        self.producer_stall_seconds += time.time() - t1
+
+    def get(self):
+        try:
+            return self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        self.consumer_stalls += 1
+        t1 = time.time()
+        while True:
+            if self._stop_event.is_set():
+                raise PipelineStopped()
+            try:
+                item = self._queue.get(timeout=PIPELINE_POLL_SECONDS)
+                break
+            except queue.Empty:
+                pass
+        self.consumer_stall_seconds += time.time() - t1
+        return item
+
+    def stats_message(self) -> str:
+        return (
+            "%s queue: items=%s, max depth=%s, avg depth=%.1f, producer stalls=%s (%.1fs), consumer stalls=%s (%.1fs)"
+            % (
+                self.name,
+                self.puts,
+                self.max_depth,
+                float(self._total_depth) / self.puts if self.puts else 0.0,
+                self.producer_stalls,
+                self.producer_stall_seconds,
+                self.consumer_stalls,
+                self.consumer_stall_seconds,
+            )
+        )
+
+
 ###########################################################################
 # QueryImportInterface
 ###########################################################################
@@ -40,12 +313,30 @@ class QueryImportInterface(metaclass=ABCMeta):
     Also provides some common functions for the sub-classes.
     """
 
-    def __init__(self, schema, messages, compression=False, base64_columns=None):
+    def __init__(
+        self,
+        schema,
+        messages,
+        compression=False,
+        base64_columns=None,
+        fetch_batch_bytes=None,
+        max_fetch_batch_bytes=None,
+        fingerprint=False,
+    ):
+        """fetch_batch_bytes/max_fetch_batch_bytes: When set the number of rows per fetch is adapted to
+        approach fetch_batch_bytes per batch without exceeding max_fetch_batch_bytes.
+        fingerprint: Build a StagedDataFingerprint of written data, available from staged_fingerprint
+        after write_from_cursor().
+        """
         assert schema
         self.schema = None
         self._messages = messages
         self._codec = None
         self._base64_columns = base64_columns or []
+        self._fetch_batch_bytes = fetch_batch_bytes
+        self._max_fetch_batch_bytes = max_fetch_batch_bytes or fetch_batch_bytes
+        self._fingerprint = fingerprint
+        self.staged_fingerprint = None
         self._source_data_types_requiring_read = [
             ORACLE_TYPE_BLOB,
             ORACLE_TYPE_NCLOB,
@@ -62,21 +353,168 @@ class QueryImportInterface(metaclass=ABCMeta):
     def _log(self, msg, detail=None):
         self._messages.log(msg, detail=detail)
 
+    def _extract_rows(self, extraction_cursor, fetch_size):
+        """Generator of fetched row batches.
+        If adaptive fetching is enabled the number of rows per batch (or cursor arraysize for frontends where
+        fetchmany() does not take a size) is adjusted between batches. Drivers size their fetch buffers when
+        the query is executed, therefore this changes how many rows are grouped into each batch and not the
+        number of round trips.
+        """
+        fetch_controller = None
+        if self._fetch_batch_bytes:
+            fetch_controller = AdaptiveFetchSize(
+                fetch_size or extraction_cursor.arraysize,
+                self._fetch_batch_bytes,
+                self._max_fetch_batch_bytes,
+            )
+
+        def do_fetch(cursor):
+            if fetch_controller:
+                if fetch_size:
+                    return cursor.fetchmany(fetch_controller.rows)
+                cursor.arraysize = fetch_controller.rows
+            if fetch_size:
+                return cursor.fetchmany(fetch_size)
+            else:
+                return cursor.fetchmany()
+
+        batch = 1
+        while True:
+            self._debug(f"Fetching row batch: {batch}")
+            t1 = time.time()
+            rows = do_fetch(extraction_cursor)
+            if not rows:
+                break
+            if fetch_controller:
+                fetch_controller.record_fetch(rows, time.time() - t1)
+            batch += 1
+            yield rows
+        if fetch_controller:
+            self._log(fetch_controller.stats_message(), detail=VVERBOSE)
+
+    def _fingerprint_rows(self, rows, fingerprint_columns):
+        """Add a batch of rows to the staged data fingerprint.
+        fingerprint_columns is a list of (staging column name, projection index, kind, convert function) tuples,
+        the convert function (optional) returns the value as it is staged.
+        """
+        self.staged_fingerprint.add_rows(len(rows))
+        columns = list(zip(*rows))
+        for column_name, projection_index, kind, convert_fn in fingerprint_columns:
+            values = columns[projection_index]
+            if convert_fn:
+                values = [convert_fn(_) if _ is not None else _ for _ in values]
+            self.staged_fingerprint.update_column(column_name, values, kind=kind)
+
     def _get_base64_encode_fn(self, rdbms_data_type):
         if rdbms_data_type in self._source_data_types_requiring_read:
             # BLOB should not undergo any character conversion therefore avoiding write_utf8
-            return lambda x: base64.b64encode(x.read())
+            return lambda x: base64.b64encode(read_lob_value(x))
         else:
             return lambda x: base64.b64encode(x)
 
     def _get_encode_read_fn(self):
-        return lambda x: x.read()
+        return read_lob_value
+
+    def _reset_fingerprint(self):
+        self.staged_fingerprint = StagedDataFingerprint() if self._fingerprint else None
+
+    def _lob_projection_indexes(self, column_names, source_columns) -> list:
+        """Positions in fetched rows of LOB columns, these need read() applying to each value."""
+        lob_indexes = []
+        for i, column_name in enumerate(column_names):
+            source_column = match_table_column(column_name, source_columns)
+            if (
+                source_column
+                and source_column.data_type in self._source_data_types_requiring_read
+            ):
+                lob_indexes.append(i)
+        return lob_indexes
+
+    def _read_lobs(self, rows, lob_indexes):
+        """Replace LOB locators with their contents."""
+        read_rows = []
+        for row in rows:
+            row = list(row)
+            for i in lob_indexes:
+                if row[i] is not None:
+                    row[i] = row[i].read()
+            read_rows.append(tuple(row))
+        return read_rows
+
+    def _run_pipeline(
+        self, extraction_cursor, fetch_size, encode_fn, write_fn, lob_indexes=None
+    ):
+        """Overlap fetching, encoding and writing of row batches.
+        A fetch thread feeds row batches to encode_fn() in the calling thread whose output is passed
+        to write_fn() in a writer thread. Database drivers and compression/file I/O release the GIL therefore
+        the stages genuinely overlap.
+        LOB locators are read in the fetch thread so that the database connection is only used by one thread.
+        Queue statistics are logged at VVERBOSE to show which stage limits throughput.
+        """
+        stop_event = threading.Event()
+        fetch_queue = PipelineQueue("Fetch", stop_event)
+        write_queue = PipelineQueue("Write", stop_event)
+        end_of_data = object()
+        stage_exceptions = []
+
+        def fetch_stage():
+            try:
+                for rows in self._extract_rows(extraction_cursor, fetch_size):
+                    if lob_indexes:
+                        rows = self._read_lobs(rows, lob_indexes)
+                    fetch_queue.put(rows)
+                fetch_queue.put(end_of_data)
+            except PipelineStopped:
+                pass
+            except Exception as exc:
+                stage_exceptions.append(exc)
+                stop_event.set()
+
+        def write_stage():
+            try:
+                while True:
+                    item = write_queue.get()
+                    if item is end_of_data:
+                        break
+                    write_fn(item)
+            except PipelineStopped:
+                pass
+            except Exception as exc:
+                stage_exceptions.append(exc)
+                stop_event.set()
+
+        threads = [
+            threading.Thread(target=fetch_stage, name="query_import_fetch"),
+            threading.Thread(target=write_stage, name="query_import_write"),
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            while True:
+                rows = fetch_queue.get()
+                if rows is end_of_data:
+                    break
+                write_queue.put(encode_fn(rows))
+            write_queue.put(end_of_data)
+        except PipelineStopped:
+            pass
+        except Exception:
+            stop_event.set()
+            raise
+        finally:
+            for thread in threads:
+                thread.join()
+
+        if stage_exceptions:
+            raise stage_exceptions[0]
+        self._log(fetch_queue.stats_message(), detail=VVERBOSE)
+        self._log(write_queue.stats_message(), detail=VVERBOSE)
 
     def _get_tsltz_encode_fn(self):
         """WITH LOCAL TIME ZONE needs UTC suffix to match Sqoop.
         Can't achieve with NLS_TIMESTAMP_FORMAT because that impacts normal timestamp format.
         """
-        return lambda x: str(x) + " UTC"
+        return lambda x: str(x) + TSLTZ_SUFFIX
 
     def _strip_trailing_dot(self, strval):
         return strval[:-1] if strval.endswith(".") else strval
@@ -87,6 +525,9 @@ class QueryImportInterface(metaclass=ABCMeta):
 
     @abstractmethod
     def write_from_cursor(
-        self, local_output_path, extraction_cursor, source_columns, fetch_size=None
+        self, output_file, extraction_cursor, source_columns, fetch_size=None
     ):
-        """fetch_size optional because not all frontends take a parameter to fetchmany()."""
+        """output_file is either a local file path or a writable binary file object, such as a
+        stream returned by GOEDfs.open_for_write(). File objects are not closed.
+        fetch_size optional because not all frontends take a parameter to fetchmany().
+        """
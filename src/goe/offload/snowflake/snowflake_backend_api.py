@@ -1024,6 +1024,12 @@ class BackendSnowflakeApi(BackendApiInterface):
             or self.view_exists(db_name, object_name)
         )
 
+    def fingerprint_hash_sql_expression(self, string_expression):
+        assert string_expression
+        return "TO_NUMBER(SUBSTR(MD5(%s), 1, 15), 'XXXXXXXXXXXXXXX')" % (
+            string_expression
+        )
+
     def format_query_parameter(self, param_name):
         return "?"
 
@@ -1198,6 +1204,7 @@ class BackendSnowflakeApi(BackendApiInterface):
         filter_clauses=None,
         measures=None,
         agg_fns=None,
+        count_star=False,
     ):
         return self._gen_sql_text_common(
             db_name,
@@ -1206,6 +1213,7 @@ class BackendSnowflakeApi(BackendApiInterface):
             filter_clauses=filter_clauses,
             measures=measures,
             agg_fns=agg_fns,
+            count_star=count_star,
         )
 
     def generic_string_data_type(self):
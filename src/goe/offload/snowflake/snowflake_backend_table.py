@@ -105,13 +105,7 @@ class BackendSnowflakeTable(BackendTableInterface):
         self._log_profile_after_verification_queries = True
         # Load DB is also final DB
         self._load_db_name = self.db_name
-        self._load_table_path = self._get_dfs_client().gen_uri(
-            self._orchestration_config.offload_fs_scheme,
-            self._orchestration_config.offload_fs_container,
-            self._orchestration_config.offload_fs_prefix,
-            backend_db=self._load_db_name,
-            table_name=self._load_table_name,
-        )
+        self._load_table_path = self._gen_load_table_path()
 
     ###########################################################################
     # PRIVATE METHODS
@@ -670,6 +664,10 @@ class BackendSnowflakeTable(BackendTableInterface):
         cols = [_.clone(name=_.name.upper()) for _ in new_columns]
         self._columns = cols
 
+    def set_staging_slot(self, staging_slot: int):
+        super(BackendSnowflakeTable, self).set_staging_slot(staging_slot)
+        self._load_table_path = self._gen_load_table_path()
+
     def setup_result_cache_area(self):
         """Prepare result cache area for Hybrid Queries"""
         # TODO NJ@2020-11-12 Temporary solution that will be removed
@@ -247,6 +247,20 @@ class OffloadTransportSparkBatchesGcloud(OffloadTransportSpark):
 
         return cmd, no_log_password, py_rm_commands
 
+    def _persistent_app_supported(self) -> bool:
+        return True
+
+    def _get_persistent_app_submit_command(self, pyspark_body) -> tuple:
+        """The persistent driver is a single batch (or job) that lives for the whole offload."""
+        spark_gcloud_cmd, no_log_password, py_rm_commands = (
+            self._get_spark_gcloud_command(pyspark_body, id=self._get_batch_name())
+        )
+        return (
+            self._ssh_cmd_prefix() + spark_gcloud_cmd,
+            no_log_password,
+            py_rm_commands,
+        )
+
     def _spark_gcloud_import(self, partition_chunk=None):
         self._refresh_rdbms_action()
 
@@ -254,23 +268,32 @@ class OffloadTransportSparkBatchesGcloud(OffloadTransportSpark):
             return 0
 
         rows_imported = None
-        pyspark_body = self._get_pyspark_body(partition_chunk)
-        batch_name = self._get_batch_name()
-        (
-            spark_gcloud_cmd,
-            no_log_password,
-            py_rm_commands,
-        ) = self._get_spark_gcloud_command(pyspark_body, id=batch_name)
-
-        self._start_validation_polling_thread()
-        rc, cmd_out = self._run_os_cmd(
-            self._ssh_cmd_prefix() + spark_gcloud_cmd, no_log_items=no_log_password
-        )
-        self._stop_validation_polling_thread()
+        py_rm_commands = None
+        if self._persistent_app_enabled():
+            batch_name = None
+            self._start_validation_polling_thread()
+            cmd_out = self._run_in_persistent_app(partition_chunk)
+            self._stop_validation_polling_thread()
+        else:
+            pyspark_body = self._get_pyspark_body(partition_chunk)
+            batch_name = self._get_batch_name()
+            (
+                spark_gcloud_cmd,
+                no_log_password,
+                py_rm_commands,
+            ) = self._get_spark_gcloud_command(pyspark_body, id=batch_name)
+
+            self._start_validation_polling_thread()
+            rc, cmd_out = self._run_os_cmd(
+                self._ssh_cmd_prefix() + spark_gcloud_cmd, no_log_items=no_log_password
+            )
+            self._stop_validation_polling_thread()
 
         if not self._dry_run:
-            self._verify_batch(batch_name)
+            if batch_name:
+                self._verify_batch(batch_name)
             rows_imported = self._get_rows_imported_from_spark_log(cmd_out)
+            self._record_staged_fingerprint_from_spark_log(cmd_out)
             rows_imported_from_sql_stats = self._rdbms_api.log_sql_stats(
                 self._rdbms_module,
                 self._rdbms_action,
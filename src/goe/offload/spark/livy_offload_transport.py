@@ -23,7 +23,12 @@ from goe.filesystem.goe_dfs_factory import get_dfs_from_options
 from goe.offload.factory.offload_transport_rdbms_api_factory import (
     offload_transport_rdbms_api_factory,
 )
-from goe.offload.offload_constants import LIVY_MAX_SESSIONS
+from goe.offload.offload_constants import (
+    LIVY_LEASE_TIMEOUT,
+    LIVY_MAX_SESSIONS,
+    LIVY_MAX_SESSION_STATEMENTS,
+    LIVY_MIN_SESSIONS,
+)
 from goe.offload.offload_messages import VERBOSE, VVERBOSE
 from goe.offload.offload_transport import (
     OffloadTransportException,
@@ -39,6 +44,10 @@ from goe.offload.offload_transport_functions import (
     finish_progress_on_stdout,
     write_progress_to_stdout,
 )
+from goe.offload.spark.livy_session_pool import (
+    LivySessionPool,
+    LivySessionPoolException,
+)
 from goe.offload.spark.offload_transport_livy_requests import (
     OffloadTransportLivyRequests,
 )
@@ -95,6 +104,21 @@ class OffloadTransportSparkLivy(OffloadTransportSpark):
         self._idle_session_timeout = int(
             offload_options.offload_transport_livy_idle_session_timeout
         )
+        # keep sessions warm and recycle them after a number of statements
+        self._livy_min_sessions = int(
+            offload_options.offload_transport_livy_min_sessions or LIVY_MIN_SESSIONS
+        )
+        self._livy_max_session_statements = int(
+            offload_options.offload_transport_livy_max_session_statements
+            or LIVY_MAX_SESSION_STATEMENTS
+        )
+        # wait for a free session when the pool is full
+        self._livy_lease_timeout = int(
+            offload_options.offload_transport_livy_lease_timeout or LIVY_LEASE_TIMEOUT
+        )
+        # A session leased from the pool is held across chunks until close()
+        self._livy_session_pool = None
+        self._livy_session_lease = None
         # For Livy we need to pass compression in as a config to the driving session
         self._load_table_compression_pyspark_settings()
 
@@ -162,8 +186,9 @@ class OffloadTransportSparkLivy(OffloadTransportSpark):
                 )
         return spark_listener_jar_remote_path
 
-    def _create_livy_session(self):
+    def _create_livy_session(self, wait_for_idle=True):
         """Create a Livy session via REST API post
+        wait_for_idle=False returns the session URL as soon as the session is requested, used to warm sessions.
         Valid attributes for the payload are:
             kind           Session kind
             proxyUser      User ID to impersonate
@@ -232,6 +257,8 @@ class OffloadTransportSparkLivy(OffloadTransportSpark):
                 if resp.headers.get("location")
                 else None
             )
+            if not wait_for_idle:
+                return session_url
             session_state = None
             polls = 0
             # Wait until the state of the session is "idle" - not "starting"
@@ -278,67 +305,51 @@ class OffloadTransportSparkLivy(OffloadTransportSpark):
             self.log("Response text: %s" % resp.text, detail=VERBOSE)
             resp.raise_for_status()
 
-    def _attach_livy_session(self):
-        def is_goe_usable_session(job_dict, ignore_session_state=False):
-            if job_dict.get("kind") != "pyspark" or (
-                job_dict.get("state") != "idle" and not ignore_session_state
-            ):
-                return False
-            if self._offload_transport_queue_name:
-                pattern = re.compile(
-                    LIVY_LOG_QUEUE_PATTERN % self._offload_transport_queue_name,
-                    re.IGNORECASE,
-                )
-                if [_ for _ in job_dict.get("log") if pattern.search(_)]:
-                    # Found a message in the log stating this is on the right queue for us
-                    return True
-                return False
-            return True
+    def _is_goe_usable_session(self, job_dict, ignore_session_state=False):
+        if job_dict.get("kind") != "pyspark" or (
+            job_dict.get("state") != "idle" and not ignore_session_state
+        ):
+            return False
+        if self._offload_transport_queue_name:
+            pattern = re.compile(
+                LIVY_LOG_QUEUE_PATTERN % self._offload_transport_queue_name,
+                re.IGNORECASE,
+            )
+            if [_ for _ in job_dict.get("log") if pattern.search(_)]:
+                # Found a message in the log stating this is on the right queue for us
+                return True
+            return False
+        return True
 
-        resp = self._livy_requests.get(self._get_api_sessions_url())
-        if resp.ok:
-            sessions = resp.json()["sessions"] or []
-            goe_usable_sessions = [_ for _ in sessions if is_goe_usable_session(_)]
-            self.log(
-                "Found %s usable Livy sessions" % len(goe_usable_sessions),
-                detail=VVERBOSE,
+    def _get_livy_session_pool(self) -> LivySessionPool:
+        if not self._livy_session_pool:
+            self._livy_session_pool = LivySessionPool(
+                self._api_url,
+                self._livy_requests,
+                self._messages,
+                self._is_goe_usable_session,
+                self._create_livy_session,
+                self._close_livy_session,
+                self._livy_max_sessions,
+                min_sessions=self._livy_min_sessions,
+                max_session_statements=self._livy_max_session_statements,
+                lease_timeout=self._livy_lease_timeout,
             )
-            if len(goe_usable_sessions) > 0:
-                use_session = goe_usable_sessions.pop()
-                self.log(
-                    "Re-using Livy session: %s/%s"
-                    % (str(use_session["id"]), use_session.get("appId")),
-                    detail=VERBOSE,
-                )
-                return URL_SEP.join(
-                    [self._get_api_sessions_url(), str(use_session["id"])]
-                )
-            else:
-                all_goe_sessions = [
-                    _
-                    for _ in sessions
-                    if is_goe_usable_session(_, ignore_session_state=True)
-                ]
-                self.log(
-                    "No usable Livy sessions out of total: %s" % len(all_goe_sessions),
-                    detail=VVERBOSE,
-                )
-                if len(all_goe_sessions) < self._livy_max_sessions:
-                    # create and use a new session
-                    return self._create_livy_session()
-                else:
-                    self.log(
-                        "All goe capable Livy sessions: %s" % str(all_goe_sessions),
-                        detail=VVERBOSE,
-                    )
-                    raise OffloadTransportException(
-                        "Exceeded maximum Livy sessions for offload transport: %s"
-                        % str(self._livy_max_sessions)
-                    )
-        else:
-            self.log("Response code: %s" % resp.status_code, detail=VERBOSE)
-            self.log("Response text: %s" % resp.text, detail=VERBOSE)
-            resp.raise_for_status()
+        return self._livy_session_pool
+
+    def _attach_livy_session(self):
+        """Lease a session from the pool, the lease is held until close() so all chunks use the same session."""
+        if not self._livy_session_lease:
+            try:
+                self._livy_session_lease = self._get_livy_session_pool().lease()
+            except LivySessionPoolException as exc:
+                raise OffloadTransportException(str(exc)) from exc
+        return self._livy_session_lease.session_url
+
+    def _release_livy_session(self):
+        if self._livy_session_lease:
+            self._get_livy_session_pool().release(self._livy_session_lease)
+            self._livy_session_lease = None
 
     def _submit_pyspark_to_session(self, session_url, payload_data):
         """Submit a pyspark job to Livy and poll until the job is complete. Returns log output."""
@@ -346,6 +357,11 @@ class OffloadTransportSparkLivy(OffloadTransportSpark):
         statements_url = URL_SEP.join([session_url, "statements"])
         payload = {"code": payload_data}
         resp = self._livy_requests.post(statements_url, data=json.dumps(payload))
+        if (
+            self._livy_session_lease
+            and self._livy_session_lease.session_url == session_url
+        ):
+            self._livy_session_lease.record_statement()
         if resp.ok:
             statement_url = (
                 (self._api_url + resp.headers["location"])
@@ -418,6 +434,7 @@ class OffloadTransportSparkLivy(OffloadTransportSpark):
             self._start_validation_polling_thread()
             job_output = self._submit_pyspark_to_session(session_url, pyspark_body)
             self._stop_validation_polling_thread()
+            self._record_staged_fingerprint_from_spark_log(job_output)
             # In theory we should be able to get rows_imported from Livy logging here but we can't get at
             # the executor logger messages even if we put our Spark Listener in place, therefore we continue
             # to use RDBMS SQL stats.
@@ -436,7 +453,10 @@ class OffloadTransportSparkLivy(OffloadTransportSpark):
         pyspark_body = self._get_pyspark_body(canary_query=rdbms_source_query)
         self.log("PySpark: " + pyspark_body, detail=VVERBOSE)
         session_url = self._attach_livy_session()
-        self._submit_pyspark_to_session(session_url, pyspark_body)
+        try:
+            self._submit_pyspark_to_session(session_url, pyspark_body)
+        finally:
+            self._release_livy_session()
         return True
 
     ###########################################################################
@@ -464,6 +484,10 @@ class OffloadTransportSparkLivy(OffloadTransportSpark):
     def ping_source_rdbms(self):
         return self._verify_rdbms_connectivity()
 
+    def close(self):
+        self._release_livy_session()
+        super().close()
+
 
 class OffloadTransportSparkLivyCanary(OffloadTransportSparkLivy):
     """Validate Spark Livy connectivity"""
@@ -490,6 +514,12 @@ class OffloadTransportSparkLivyCanary(OffloadTransportSparkLivy):
         )
         # We don't want to leave this canary session hanging around but need it there for long enough to use it
         self._idle_session_timeout = 30
+        # The canary never warms or recycles sessions
+        self._livy_min_sessions = 0
+        self._livy_max_session_statements = 0
+        self._livy_lease_timeout = LIVY_LEASE_TIMEOUT
+        self._livy_session_pool = None
+        self._livy_session_lease = None
 
         self._dfs_client = get_dfs_from_options(
             self._offload_options,
@@ -0,0 +1,396 @@
+# Copyright 2016 The GOE Authors. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" LivySessionPool: Lease warm Livy sessions to offload transports.
+
+    Livy itself has no concept of a session being in use by a client, a session is "idle" between statements
+    even if an offload intends to submit another chunk to it. The pool adds that missing piece:
+      - A session is leased by taking an exclusive lock on a local lock file named after the session. The lock
+        is held until the lease is released, or the process exits, so concurrent offloads on the same host never
+        share a session.
+      - The number of statements run in each session is stored alongside the lock so sessions can be recycled
+        after a configurable number of statements. Idle sessions are timed out by Livy itself via
+        heartbeatTimeoutInSecond.
+      - A minimum number of sessions can be kept warm, new sessions are requested without waiting for them to
+        start so the next offload can use them.
+      - Sessions requested on this host are recorded as pending until Livy lists them as usable, pending
+        sessions count towards the maximum so concurrent offloads cannot request more than max sessions.
+"""
+
+from contextlib import contextmanager
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Callable, Optional, TYPE_CHECKING
+
+from goe.offload.offload_messages import VERBOSE, VVERBOSE
+
+if TYPE_CHECKING:
+    from goe.offload.offload_messages import OffloadMessages
+    from goe.offload.spark.offload_transport_livy_requests import (
+        OffloadTransportLivyRequests,
+    )
+
+
+###############################################################################
+# CONSTANTS
+###############################################################################
+
+LIVY_POOL_DIR_PREFIX = "goe_livy_pool_"
+LIVY_SESSION_STATE_IDLE = "idle"
+LIVY_SESSION_STATE_BUSY = "busy"
+LIVY_SESSION_STATE_STARTING = "starting"
+LIVY_POOL_LOCK_FILE = "pool.lock"
+LIVY_POOL_PENDING_FILE = "pending_sessions.json"
+# Seconds between attempts to lease a session when the pool is full
+LIVY_POOL_LEASE_POLL_DELAY = 5
+# Seconds a requested session counts towards the maximum before Livy must list it as usable
+LIVY_POOL_PENDING_SESSION_TIMEOUT = 600
+
+###############################################################################
+# LOGGING
+###############################################################################
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+class LivySessionPoolException(Exception):
+    pass
+
+
+###########################################################################
+# GLOBAL FUNCTIONS
+###########################################################################
+
+
+def livy_pool_dir(api_url: str) -> str:
+    """Return a local directory for pool lock and state files, one per Livy server."""
+    return os.path.join(
+        tempfile.gettempdir(),
+        LIVY_POOL_DIR_PREFIX + hashlib.md5(api_url.encode()).hexdigest()[:16],
+    )
+
+
+###########################################################################
+# LivySessionLease
+###########################################################################
+
+
+class LivySessionLease:
+    """A Livy session leased from LivySessionPool, holds the session lock until released."""
+
+    def __init__(self, session_id, session_url: str, lock_fd: int, statements: int):
+        self.session_id = session_id
+        self.session_url = session_url
+        self.statements = statements
+        self._lock_fd = lock_fd
+
+    def record_statement(self):
+        self.statements += 1
+
+    def unlock(self):
+        if self._lock_fd is not None:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+
+###########################################################################
+# LivySessionPool
+###########################################################################
+
+
+class LivySessionPool:
+    """Lease Livy sessions to transports, creating, warming and recycling sessions as required."""
+
+    def __init__(
+        self,
+        api_url: str,
+        livy_requests: "OffloadTransportLivyRequests",
+        messages: "OffloadMessages",
+        is_usable_session_fn: Callable[[dict, bool], bool],
+        create_session_fn: Callable[[bool], Optional[str]],
+        close_session_fn: Callable[[str], None],
+        max_sessions: int,
+        min_sessions: int = 0,
+        max_session_statements: int = 0,
+        lease_timeout: int = 0,
+        pool_dir: str = None,
+    ):
+        """is_usable_session_fn: Takes a session dict from Livy and ignore_session_state.
+        create_session_fn: Takes wait_for_idle and returns the new session URL.
+        close_session_fn: Takes a session URL.
+        max_session_statements: Recycle a session after this many statements, 0 for no limit.
+        lease_timeout: Seconds to wait for a session when the pool is full, 0 fails immediately.
+        """
+        self._api_url = api_url.rstrip("/")
+        self._livy_requests = livy_requests
+        self._messages = messages
+        self._is_usable_session_fn = is_usable_session_fn
+        self._create_session_fn = create_session_fn
+        self._close_session_fn = close_session_fn
+        self._max_sessions = max_sessions
+        self._min_sessions = min(min_sessions or 0, max_sessions)
+        self._max_session_statements = max_session_statements or 0
+        self._lease_timeout = lease_timeout or 0
+        self._pool_dir = pool_dir or livy_pool_dir(self._api_url)
+        os.makedirs(self._pool_dir, exist_ok=True)
+
+    ###########################################################################
+    # PRIVATE METHODS
+    ###########################################################################
+
+    def _log(self, msg, detail=VVERBOSE):
+        self._messages.log(msg, detail=detail)
+        logger.info(msg)
+
+    def _sessions_url(self) -> str:
+        return self._api_url + "/sessions"
+
+    def _session_url(self, session_id) -> str:
+        return "%s/%s" % (self._sessions_url(), session_id)
+
+    def _lock_path(self, session_id) -> str:
+        return os.path.join(self._pool_dir, "session_%s.lock" % session_id)
+
+    def _state_path(self, session_id) -> str:
+        return os.path.join(self._pool_dir, "session_%s.json" % session_id)
+
+    def _pending_path(self) -> str:
+        return os.path.join(self._pool_dir, LIVY_POOL_PENDING_FILE)
+
+    @contextmanager
+    def _pool_lock(self):
+        """Serialise decisions to request new sessions between processes on this host."""
+        lock_fd = os.open(
+            os.path.join(self._pool_dir, LIVY_POOL_LOCK_FILE),
+            os.O_CREAT | os.O_RDWR,
+            0o600,
+        )
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            fcntl.flock(lock_fd, fcntl.LOCK_UN)
+            os.close(lock_fd)
+
+    def _pending_sessions(self, sessions: list) -> dict:
+        """Return {session id: request time} for sessions requested on this host that are not yet listed as
+        usable. Only modify while holding _pool_lock().
+        """
+        try:
+            with open(self._pending_path()) as f:
+                pending = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        listed = set(str(_["id"]) for _ in sessions)
+        expire_before = time.time() - LIVY_POOL_PENDING_SESSION_TIMEOUT
+        return {
+            session_id: requested
+            for session_id, requested in pending.items()
+            if session_id not in listed and requested > expire_before
+        }
+
+    def _write_pending_sessions(self, pending: dict):
+        tmp_path = self._pending_path() + ".%s" % os.getpid()
+        with open(tmp_path, "w") as f:
+            json.dump(pending, f)
+        os.replace(tmp_path, self._pending_path())
+
+    def _reserve_new_session(self, sessions: list) -> Optional[str]:
+        """Reserve a place for a new session if the pool is not full, returns a key for _unreserve_new_session()."""
+        with self._pool_lock():
+            pending = self._pending_sessions(sessions)
+            if len(sessions) + len(pending) >= self._max_sessions:
+                return None
+            reservation = "reserved_%s_%s" % (os.getpid(), time.time())
+            pending[reservation] = time.time()
+            self._write_pending_sessions(pending)
+            return reservation
+
+    def _unreserve_new_session(self, reservation: str):
+        with self._pool_lock():
+            pending = self._pending_sessions([])
+            pending.pop(reservation, None)
+            self._write_pending_sessions(pending)
+
+    def _get_sessions(self) -> list:
+        resp = self._livy_requests.get(self._sessions_url())
+        if not resp.ok:
+            self._log("Response code: %s" % resp.status_code, detail=VERBOSE)
+            self._log("Response text: %s" % resp.text, detail=VERBOSE)
+            resp.raise_for_status()
+        return [
+            _
+            for _ in (resp.json().get("sessions") or [])
+            if self._is_usable_session_fn(_, True)
+        ]
+
+    def _read_statements(self, session_id) -> int:
+        try:
+            with open(self._state_path(session_id)) as f:
+                return int(json.load(f).get("statements") or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def _write_statements(self, session_id, statements: int):
+        with open(self._state_path(session_id), "w") as f:
+            json.dump({"statements": statements, "last_used": time.time()}, f)
+
+    def _remove_session_files(self, session_id):
+        for path in (self._state_path(session_id), self._lock_path(session_id)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _exhausted(self, statements: int) -> bool:
+        return bool(
+            self._max_session_statements and statements >= self._max_session_statements
+        )
+
+    def _try_lock(self, session_id) -> Optional[int]:
+        """Return a locked file descriptor for session_id or None if another process holds the lease."""
+        lock_fd = os.open(self._lock_path(session_id), os.O_CREAT | os.O_RDWR, 0o600)
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(lock_fd)
+            return None
+        return lock_fd
+
+    def _try_lease(self, sessions: list) -> Optional[LivySessionLease]:
+        """Attempt to lease an idle session from sessions, recycling any that have run too many statements."""
+        for session in sessions:
+            if session.get("state") != LIVY_SESSION_STATE_IDLE:
+                continue
+            session_id = str(session["id"])
+            lock_fd = self._try_lock(session_id)
+            if lock_fd is None:
+                continue
+            lease = LivySessionLease(
+                session_id,
+                self._session_url(session_id),
+                lock_fd,
+                self._read_statements(session_id),
+            )
+            if self._exhausted(lease.statements):
+                self._recycle(lease)
+                continue
+            self._log(
+                "Leased Livy session: %s/%s" % (str(session_id), session.get("appId")),
+                detail=VERBOSE,
+            )
+            return lease
+        return None
+
+    def _recycle(self, lease: LivySessionLease):
+        self._log(
+            "Recycling Livy session %s after %s statements"
+            % (lease.session_id, lease.statements)
+        )
+        self._close_session_fn(lease.session_url)
+        self._remove_session_files(lease.session_id)
+        lease.unlock()
+
+    def _warm_sessions(self):
+        """Request new sessions, without waiting for them, until min sessions exist or are pending."""
+        if not self._min_sessions:
+            return
+        with self._pool_lock():
+            sessions = self._get_sessions()
+            pending = self._pending_sessions(sessions)
+            for _ in range(self._min_sessions - len(sessions) - len(pending)):
+                self._log("Requesting warm Livy session")
+                session_url = self._create_session_fn(False)
+                if session_url:
+                    pending[session_url.rstrip("/").split("/")[-1]] = time.time()
+            self._write_pending_sessions(pending)
+
+    def _lease_new_session(self) -> Optional[LivySessionLease]:
+        session_url = self._create_session_fn(True)
+        if not session_url:
+            return None
+        session_id = session_url.rstrip("/").split("/")[-1]
+        lock_fd = self._try_lock(session_id)
+        if lock_fd is None:
+            # Another process grabbed the new session between it becoming idle and us locking it.
+            return None
+        return LivySessionLease(session_id, self._session_url(session_id), lock_fd, 0)
+
+    ###########################################################################
+    # PUBLIC METHODS
+    ###########################################################################
+
+    def lease(self) -> LivySessionLease:
+        """Lease an idle session, creating one if the pool is not full, otherwise waiting up to lease_timeout
+        seconds for one to be free.
+        """
+        wait_until = time.time() + self._lease_timeout
+        while True:
+            sessions = self._get_sessions()
+            self.log_utilisation(sessions)
+            lease = self._try_lease(sessions)
+            if lease:
+                self._warm_sessions()
+                return lease
+            reservation = self._reserve_new_session(sessions)
+            if reservation:
+                try:
+                    lease = self._lease_new_session()
+                finally:
+                    self._unreserve_new_session(reservation)
+                if lease:
+                    self._warm_sessions()
+                    return lease
+            elif time.time() >= wait_until:
+                raise LivySessionPoolException(
+                    "Exceeded maximum Livy sessions for offload transport: %s"
+                    % str(self._max_sessions)
+                )
+            self._log("Waiting for a Livy session to become available")
+            time.sleep(LIVY_POOL_LEASE_POLL_DELAY)
+
+    def release(self, lease: LivySessionLease):
+        """Return a session to the pool, closing it if it has reached the statement limit."""
+        if self._exhausted(lease.statements):
+            self._recycle(lease)
+            return
+        self._write_statements(lease.session_id, lease.statements)
+        lease.unlock()
+        self._log("Released Livy session: %s" % lease.session_id)
+
+    def log_utilisation(self, sessions: list = None):
+        """Log the number of sessions in each state against the pool limits."""
+        if sessions is None:
+            sessions = self._get_sessions()
+        states = [_.get("state") for _ in sessions]
+        self._log(
+            "Livy session pool: sessions=%s, idle=%s, busy=%s, starting=%s, pending=%s, max=%s, min=%s"
+            % (
+                len(sessions),
+                states.count(LIVY_SESSION_STATE_IDLE),
+                states.count(LIVY_SESSION_STATE_BUSY),
+                states.count(LIVY_SESSION_STATE_STARTING),
+                len(self._pending_sessions(sessions)),
+                self._max_sessions,
+                self._min_sessions,
+            ),
+            detail=VERBOSE,
+        )
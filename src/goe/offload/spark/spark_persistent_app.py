@@ -0,0 +1,301 @@
+# Copyright 2016 The GOE Authors. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" SparkPersistentApp: A single Spark driver that transports all chunks of an offload.
+
+    The driver is submitted once, in the background, and polls a control directory on DFS for work items.
+    Each work item is a PySpark snippet that expects a "spark" session to exist, i.e. the same code that would
+    otherwise be submitted as a separate application per chunk. A work item is only picked up once a separate
+    "ready" marker has been written after it, so a partially written work file is never executed.
+    When a work item completes the driver writes a marker file containing "OK" or the error.
+    A "stop" file, or no work for an idle timeout, ends the driver.
+    Using DFS as the control channel means the driver can run anywhere that can see the staging location,
+    for example on a Dataproc cluster or Dataproc Serverless.
+"""
+
+import logging
+import os
+import subprocess
+from subprocess import STDOUT
+import tempfile
+import time
+from textwrap import dedent
+from typing import TYPE_CHECKING
+
+from goe.offload.offload_messages import VVERBOSE
+from goe.util.misc_functions import obscure_list_items
+
+if TYPE_CHECKING:
+    from goe.filesystem.goe_dfs import GOEDfs
+    from goe.offload.offload_messages import OffloadMessages
+
+
+###############################################################################
+# CONSTANTS
+###############################################################################
+
+PERSISTENT_APP_CONTROL_DIR_SUFFIX = "_goe_control"
+PERSISTENT_APP_STOP_FILE = "stop"
+PERSISTENT_APP_WORK_FILE_TEMPLATE = "chunk_%s.py"
+# Written after the work file is complete, the driver only reads a work file once this exists
+PERSISTENT_APP_READY_FILE_TEMPLATE = "chunk_%s.ready"
+PERSISTENT_APP_DONE_FILE_TEMPLATE = "chunk_%s.done"
+PERSISTENT_APP_STATUS_OK = "OK"
+# Seconds between checks for work (driver side) and for completed work (GOE side)
+PERSISTENT_APP_POLL_SECONDS = 2
+# The driver exits if no work arrives for this many seconds, this protects against an orphaned application
+PERSISTENT_APP_IDLE_TIMEOUT_SECONDS = 900
+# Seconds to wait for the driver to exit after writing the stop file
+PERSISTENT_APP_STOP_TIMEOUT_SECONDS = 120
+
+###############################################################################
+# LOGGING
+###############################################################################
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+class SparkPersistentAppException(Exception):
+    pass
+
+
+###########################################################################
+# GLOBAL FUNCTIONS
+###########################################################################
+
+
+def persistent_app_control_dir(staging_location: str) -> str:
+    """Return a control directory alongside the staging location.
+    Not inside the staging location because that is emptied between chunks.
+    """
+    return staging_location.rstrip("/") + PERSISTENT_APP_CONTROL_DIR_SUFFIX
+
+
+def persistent_app_driver_pyspark_body(
+    app_name: str,
+    control_dir: str,
+    hive_support: bool = False,
+    poll_seconds: int = PERSISTENT_APP_POLL_SECONDS,
+    idle_timeout_seconds: int = PERSISTENT_APP_IDLE_TIMEOUT_SECONDS,
+) -> str:
+    """Return PySpark code for a driver that executes work items dropped into control_dir.
+    Control files are accessed via the Hadoop FileSystem API so any file system Spark can write to will work.
+    """
+    return (
+        dedent(
+            """\
+        # -*- coding: UTF-8 -*-
+        # GOE Spark Transport persistent driver
+        import time
+        import traceback
+        from pyspark.sql import SparkSession
+        spark = SparkSession.builder.appName('%(app_name)s')%(hive_support)s.getOrCreate()
+        jvm = spark.sparkContext._jvm
+        control_dir = jvm.org.apache.hadoop.fs.Path('%(control_dir)s')
+        fs = control_dir.getFileSystem(spark.sparkContext._jsc.hadoopConfiguration())
+
+        def control_path(name):
+            return jvm.org.apache.hadoop.fs.Path(control_dir, name)
+
+        def read_text(path):
+            stream = fs.open(path)
+            try:
+                return jvm.org.apache.commons.io.IOUtils.toString(stream, 'UTF-8')
+            finally:
+                stream.close()
+
+        def write_text(path, text):
+            stream = fs.create(path, True)
+            try:
+                stream.write(bytearray(text.encode('utf-8')))
+            finally:
+                stream.close()
+
+        chunk = 0
+        idle_since = time.time()
+        while not fs.exists(control_path('%(stop_file)s')):
+            work_path = control_path('%(work_file_template)s' %% chunk)
+            if not fs.exists(control_path('%(ready_file_template)s' %% chunk)):
+                if time.time() - idle_since > %(idle_timeout_seconds)s:
+                    print('GOE persistent driver idle timeout', flush=True)
+                    break
+                time.sleep(%(poll_seconds)s)
+                continue
+            print('GOE persistent driver chunk %%s start' %% chunk, flush=True)
+            try:
+                exec(read_text(work_path), {'spark': spark})
+                status = '%(status_ok)s'
+            except Exception:
+                status = traceback.format_exc()
+            print('GOE persistent driver chunk %%s end' %% chunk, flush=True)
+            write_text(control_path('%(done_file_template)s' %% chunk), status)
+            chunk += 1
+            idle_since = time.time()
+        spark.stop()
+        """
+        )
+        % {
+            "app_name": app_name,
+            "hive_support": ".enableHiveSupport()" if hive_support else "",
+            "control_dir": control_dir,
+            "stop_file": PERSISTENT_APP_STOP_FILE,
+            "work_file_template": PERSISTENT_APP_WORK_FILE_TEMPLATE,
+            "ready_file_template": PERSISTENT_APP_READY_FILE_TEMPLATE,
+            "done_file_template": PERSISTENT_APP_DONE_FILE_TEMPLATE,
+            "status_ok": PERSISTENT_APP_STATUS_OK,
+            "poll_seconds": poll_seconds,
+            "idle_timeout_seconds": idle_timeout_seconds,
+        }
+    )
+
+
+###########################################################################
+# SparkPersistentApp
+###########################################################################
+
+
+class SparkPersistentApp:
+    """Run a persistent Spark driver in the background and hand it one work item at a time.
+
+    The submit command (spark-submit, gcloud, etc) runs as a background process with its output captured
+    in a local log file. run_work_item() returns the log output produced while the work item was running
+    so callers can scrape it just as they would the output of a foreground submission.
+    """
+
+    def __init__(
+        self,
+        control_dir: str,
+        dfs_client: "GOEDfs",
+        messages: "OffloadMessages",
+        poll_seconds: int = PERSISTENT_APP_POLL_SECONDS,
+    ):
+        self._control_dir = control_dir.rstrip("/")
+        self._dfs_client = dfs_client
+        self._messages = messages
+        self._poll_seconds = poll_seconds
+        self._proc = None
+        self._log_file = None
+        self._log_offset = 0
+        self._chunk = 0
+
+    ###########################################################################
+    # PRIVATE METHODS
+    ###########################################################################
+
+    def _control_path(self, name: str) -> str:
+        return self._control_dir + "/" + name
+
+    def _log(self, msg, detail=VVERBOSE):
+        self._messages.log(msg, detail=detail)
+        logger.info(msg)
+
+    def _new_log_output(self) -> str:
+        """Return log output written since the previous call."""
+        self._log_file.flush()
+        with open(self._log_file.name, "r", errors="replace") as f:
+            f.seek(self._log_offset)
+            output = f.read()
+            self._log_offset = f.tell()
+        return output
+
+    def _remove_control_dir(self):
+        try:
+            if self._dfs_client.stat(self._control_dir):
+                self._dfs_client.rmdir(self._control_dir, recursive=True)
+        except Exception as exc:
+            self._log(
+                "Unable to remove persistent Spark app control directory %s: %s"
+                % (self._control_dir, str(exc))
+            )
+
+    ###########################################################################
+    # PUBLIC METHODS
+    ###########################################################################
+
+    def is_running(self) -> bool:
+        return bool(self._proc and self._proc.poll() is None)
+
+    def start(self, cmd: list, no_log_items=None):
+        """Launch cmd in the background, cmd should submit a driver from persistent_app_driver_pyspark_body()."""
+        assert not self.is_running()
+        self._remove_control_dir()
+        self._log(
+            "Starting persistent Spark app: "
+            + " ".join(obscure_list_items(cmd, no_log_items or []))
+        )
+        self._log_file = tempfile.NamedTemporaryFile(
+            mode="w+", prefix="goe_spark_persistent_", suffix=".log", delete=False
+        )
+        self._log_offset = 0
+        self._chunk = 0
+        self._proc = subprocess.Popen(cmd, stdout=self._log_file, stderr=STDOUT)
+
+    def run_work_item(self, pyspark_body: str) -> str:
+        """Hand pyspark_body to the driver, wait for it to complete and return the log output produced.
+        Raises SparkPersistentAppException if the work item fails or the driver exits.
+        """
+        if not self.is_running():
+            raise SparkPersistentAppException("Persistent Spark app is not running")
+        chunk = self._chunk
+        self._chunk += 1
+        self._new_log_output()
+        self._dfs_client.write(
+            self._control_path(PERSISTENT_APP_WORK_FILE_TEMPLATE % chunk),
+            pyspark_body,
+            overwrite=True,
+        )
+        # The work file may be visible before it is complete, the driver waits for this marker instead.
+        self._dfs_client.write(
+            self._control_path(PERSISTENT_APP_READY_FILE_TEMPLATE % chunk),
+            "",
+            overwrite=True,
+        )
+        done_path = self._control_path(PERSISTENT_APP_DONE_FILE_TEMPLATE % chunk)
+        self._log("Waiting for persistent Spark app work item: %s" % chunk)
+        while not self._dfs_client.stat(done_path):
+            if not self.is_running():
+                raise SparkPersistentAppException(
+                    "Persistent Spark app exited with returncode %s:\n%s"
+                    % (self._proc.returncode, self._new_log_output())
+                )
+            time.sleep(self._poll_seconds)
+        status = self._dfs_client.read(done_path, as_str=True).strip()
+        log_output = self._new_log_output()
+        self._messages.log(log_output, detail=VVERBOSE)
+        if status != PERSISTENT_APP_STATUS_OK:
+            raise SparkPersistentAppException(
+                "Persistent Spark app work item %s failed:\n%s" % (chunk, status)
+            )
+        return log_output
+
+    def stop(self):
+        """Ask the driver to stop, killing the submit process if it does not exit in time."""
+        if self.is_running():
+            self._log("Stopping persistent Spark app")
+            try:
+                self._dfs_client.write(
+                    self._control_path(PERSISTENT_APP_STOP_FILE), "", overwrite=True
+                )
+                self._proc.wait(timeout=PERSISTENT_APP_STOP_TIMEOUT_SECONDS)
+            except Exception as exc:
+                self._log("Killing persistent Spark app: %s" % str(exc))
+                self._proc.kill()
+                self._proc.wait()
+        self._proc = None
+        self._remove_control_dir()
+        if self._log_file:
+            self._log_file.close()
+            os.remove(self._log_file.name)
+            self._log_file = None
@@ -0,0 +1,311 @@
+# Copyright 2016 The GOE Authors. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" StagedDataFingerprint: Order independent summary of data written to the staging area.
+
+    Offload transport builds a fingerprint while it writes staged data, it contains:
+      - The number of rows.
+      - Per column: the number of NULLs, MIN/MAX of numeric columns and, for integer and string columns, the
+        sum of a hash of each non-NULL value.
+    Every component can be combined across batches and parallel workers in any order and is compared with
+    a single aggregate query on the backend load table.
+
+    Values are hashed in a form every backend produces identically: integers as their decimal text and strings
+    as staged. The hash is the first 15 hex digits of the MD5 of the UTF-8 text, as an integer, so that backends
+    can calculate it with SQL functions and sum it without overflow.
+"""
+
+import hashlib
+import json
+import math
+from typing import Optional
+
+import pyarrow
+import pyarrow.compute as pc
+
+
+###############################################################################
+# CONSTANTS
+###############################################################################
+
+# Value kinds, MIN/MAX are only recorded for numeric kinds.
+FINGERPRINT_KIND_DOUBLE = "double"
+FINGERPRINT_KIND_INTEGER = "integer"
+FINGERPRINT_KIND_OTHER = "other"
+FINGERPRINT_KIND_STRING = "string"
+FINGERPRINT_NUMERIC_KINDS = (FINGERPRINT_KIND_DOUBLE, FINGERPRINT_KIND_INTEGER)
+# Kinds with a hash sum, doubles and other values have no text form that all engines agree on.
+FINGERPRINT_HASHED_KINDS = (FINGERPRINT_KIND_INTEGER, FINGERPRINT_KIND_STRING)
+
+# Recorded with hash sums, fingerprints with sums from any other hash function have them discarded.
+FINGERPRINT_HASH_MD5 = "md5"
+FINGERPRINT_HASH_HEX_DIGITS = 15
+
+# Marker preceding the JSON fingerprint in PySpark output.
+FINGERPRINT_LOG_MARKER = "GOE_STAGED_FINGERPRINT:"
+
+
+###########################################################################
+# GLOBAL FUNCTIONS
+###########################################################################
+
+
+def hash_value(value) -> Optional[int]:
+    """Hash of a single non-NULL integer or string value, None if the value cannot be hashed."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        value = str(value)
+    elif not isinstance(value, str):
+        return None
+    return int(
+        hashlib.md5(value.encode("utf-8")).hexdigest()[:FINGERPRINT_HASH_HEX_DIGITS],
+        16,
+    )
+
+
+def hash_sum(values) -> Optional[int]:
+    """Sum of hash_value() for non-NULL values, None if any value cannot be hashed."""
+    total = 0
+    for value in values:
+        if value is None:
+            continue
+        value_hash = hash_value(value)
+        if value_hash is None:
+            return None
+        total += value_hash
+    return total
+
+
+def staged_data_fingerprint_from_log(
+    log_text: str,
+) -> Optional["StagedDataFingerprint"]:
+    """Return the combined fingerprints logged by PySpark transport, None if there are none."""
+    if not log_text:
+        return None
+    fingerprint = None
+    for line in log_text.splitlines():
+        if FINGERPRINT_LOG_MARKER not in line:
+            continue
+        logged = StagedDataFingerprint.from_dict(
+            json.loads(line.split(FINGERPRINT_LOG_MARKER, 1)[1])
+        )
+        if fingerprint:
+            fingerprint.merge(logged)
+        else:
+            fingerprint = logged
+    return fingerprint
+
+
+###########################################################################
+# StagedDataFingerprint
+###########################################################################
+
+
+class StagedDataFingerprint:
+    """Accumulates a fingerprint of staged data one batch at a time."""
+
+    def __init__(self):
+        self.rows = 0
+        self.columns = {}
+
+    def __eq__(self, other):
+        return bool(
+            isinstance(other, StagedDataFingerprint)
+            and self.to_dict() == other.to_dict()
+        )
+
+    def __repr__(self):
+        return "StagedDataFingerprint(%s)" % json.dumps(self.to_dict())
+
+    ###########################################################################
+    # PRIVATE METHODS
+    ###########################################################################
+
+    def _column(self, column_name: str, kind: str) -> dict:
+        column_name = column_name.upper()
+        if column_name not in self.columns:
+            self.columns[column_name] = {
+                "kind": kind,
+                "nulls": 0,
+                "min": None,
+                "max": None,
+                "hash_sum": 0 if kind in FINGERPRINT_HASHED_KINDS else None,
+            }
+        return self.columns[column_name]
+
+    def _record_hash_sum(self, column: dict, values_hash_sum: Optional[int]):
+        if column["hash_sum"] is None:
+            return
+        if values_hash_sum is None:
+            # Values that cannot be hashed make the column's hash sum unavailable.
+            column["hash_sum"] = None
+        else:
+            column["hash_sum"] += values_hash_sum
+
+    def _record_min_max(self, column: dict, column_min, column_max):
+        if column_min is None or column_min != column_min:
+            # NaN only batches have no useful bounds, engines disagree on where NaN sorts.
+            return
+        if column["min"] is None or column_min < column["min"]:
+            column["min"] = column_min
+        if column["max"] is None or column_max > column["max"]:
+            column["max"] = column_max
+
+    ###########################################################################
+    # PUBLIC METHODS
+    ###########################################################################
+
+    def add_rows(self, row_count: int):
+        self.rows += row_count
+
+    def set_column(
+        self,
+        column_name: str,
+        kind: str,
+        nulls: int,
+        column_min=None,
+        column_max=None,
+        column_hash_sum=None,
+    ):
+        """Set the fingerprint of a column, used for fingerprints calculated elsewhere, e.g. in a backend."""
+        column = self._column(column_name, kind)
+        column.update(
+            {
+                "nulls": int(nulls or 0),
+                "min": column_min,
+                "max": column_max,
+                "hash_sum": None if column_hash_sum is None else int(column_hash_sum),
+            }
+        )
+
+    def update_column(
+        self, column_name: str, values, kind: str = FINGERPRINT_KIND_OTHER
+    ):
+        """Add a batch of values for one column, None represents NULL."""
+        if kind in FINGERPRINT_NUMERIC_KINDS:
+            try:
+                array = pyarrow.array(
+                    values,
+                    type=(
+                        pyarrow.int64()
+                        if kind == FINGERPRINT_KIND_INTEGER
+                        else pyarrow.float64()
+                    ),
+                )
+            except (OverflowError, TypeError, ValueError, pyarrow.ArrowException):
+                # Integers outside of 64 bits or values Arrow cannot convert, e.g. Decimal.
+                array = None
+            if array is not None:
+                self.update_array(column_name, array, kind)
+                return
+        column = self._column(column_name, kind)
+        if kind not in FINGERPRINT_NUMERIC_KINDS:
+            column["nulls"] += list(values).count(None)
+            if kind in FINGERPRINT_HASHED_KINDS:
+                self._record_hash_sum(column, hash_sum(values))
+            return
+        convert_fn = int if kind == FINGERPRINT_KIND_INTEGER else float
+        non_null_values = [convert_fn(_) for _ in values if _ is not None]
+        column["nulls"] += len(values) - len(non_null_values)
+        if kind in FINGERPRINT_HASHED_KINDS:
+            self._record_hash_sum(column, hash_sum(non_null_values))
+        # Excluding NaN, which is not equal to itself, as Arrow does.
+        bounded_values = [_ for _ in non_null_values if _ == _]
+        if bounded_values:
+            self._record_min_max(column, min(bounded_values), max(bounded_values))
+
+    def update_array(self, column_name: str, array: pyarrow.Array, kind: str):
+        """Add a batch of values held in a PyArrow array."""
+        column = self._column(column_name, kind)
+        column["nulls"] += array.null_count
+        if kind in FINGERPRINT_NUMERIC_KINDS and array.null_count < len(array):
+            min_max = pc.min_max(array).as_py()
+            self._record_min_max(column, min_max["min"], min_max["max"])
+        if kind in FINGERPRINT_HASHED_KINDS and array.null_count < len(array):
+            self._record_hash_sum(column, hash_sum(array.drop_null().to_pylist()))
+
+    def merge(self, other: "StagedDataFingerprint"):
+        """Combine a fingerprint of other rows, e.g. from a parallel worker, into this one."""
+        self.rows += other.rows
+        for column_name, other_column in other.columns.items():
+            column = self._column(column_name, other_column["kind"])
+            column["nulls"] += other_column["nulls"]
+            self._record_min_max(column, other_column["min"], other_column["max"])
+            self._record_hash_sum(column, other_column["hash_sum"])
+        return self
+
+    def compare(self, other: "StagedDataFingerprint") -> list:
+        """Return a list of differences between this fingerprint and other, an empty list if they match.
+        Only columns present in both fingerprints are compared, hash sums only if both fingerprints have them.
+        """
+        differences = []
+        if self.rows != other.rows:
+            differences.append("row count %s != %s" % (self.rows, other.rows))
+        for column_name, column in self.columns.items():
+            other_column = other.columns.get(column_name)
+            if not other_column:
+                continue
+            if column["nulls"] != other_column["nulls"]:
+                differences.append(
+                    "%s NULL count %s != %s"
+                    % (column_name, column["nulls"], other_column["nulls"])
+                )
+            if column["kind"] in FINGERPRINT_NUMERIC_KINDS:
+                for bound in ("min", "max"):
+                    value, other_value = column[bound], other_column[bound]
+                    if value is None or other_value is None:
+                        continue
+                    if column["kind"] == FINGERPRINT_KIND_DOUBLE:
+                        if math.isnan(float(value)) or math.isnan(float(other_value)):
+                            # Engines disagree on whether NaN sorts above all other values.
+                            continue
+                        equal = math.isclose(
+                            float(value), float(other_value), rel_tol=1e-15
+                        )
+                    else:
+                        equal = bool(int(value) == int(other_value))
+                    if not equal:
+                        differences.append(
+                            "%s %s %s != %s"
+                            % (column_name, bound.upper(), value, other_value)
+                        )
+            if (
+                column["hash_sum"] is not None
+                and other_column["hash_sum"] is not None
+                and column["hash_sum"] != other_column["hash_sum"]
+            ):
+                differences.append("%s value hash mismatch" % column_name)
+        return differences
+
+    def to_dict(self) -> dict:
+        return {
+            "rows": self.rows,
+            "hash_fn": FINGERPRINT_HASH_MD5,
+            "columns": {k: dict(v) for k, v in self.columns.items()},
+        }
+
+    @staticmethod
+    def from_dict(fingerprint_dict: dict) -> "StagedDataFingerprint":
+        fingerprint = StagedDataFingerprint()
+        fingerprint.rows = int(fingerprint_dict.get("rows") or 0)
+        same_hash_fn = bool(fingerprint_dict.get("hash_fn") == FINGERPRINT_HASH_MD5)
+        for column_name, column in (fingerprint_dict.get("columns") or {}).items():
+            fingerprint.set_column(
+                column_name,
+                column.get("kind") or FINGERPRINT_KIND_OTHER,
+                column.get("nulls"),
+                column_min=column.get("min"),
+                column_max=column.get("max"),
+                column_hash_sum=column.get("hash_sum") if same_hash_fn else None,
+            )
+        return fingerprint
@@ -241,6 +241,16 @@ class SyntheticPartitionLiteral(object):
             part_col_obj, source_column
         )
 
+    @staticmethod
+    def gen_synthetic_literals(conv_fn, source_values) -> list:
+        """Apply a synthetic literal function to many values.
+        Functions backed by a backend partition function have convert_values() and convert all values in as
+        few backend queries as possible rather than one query per value.
+        """
+        if hasattr(conv_fn, "convert_values"):
+            return conv_fn.convert_values(source_values)
+        return [conv_fn(_) for _ in source_values]
+
     @staticmethod
     def gen_synthetic_literal(partition_column, table_columns, source_value):
         conv_fn = SyntheticPartitionLiteral.gen_synthetic_literal_function(
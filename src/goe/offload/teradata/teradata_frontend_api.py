@@ -568,7 +568,7 @@ class TeradataFrontendApi(FrontendApiInterface):
                ,      c.ColumnId
                ,      MIN(c.ColumnId) OVER () AS first_column_id
                ,      MAX(c.ColumnId) OVER () AS last_column_id
-               ,      ROW_NUMBER() OVER (ORDER BY s.UniqueValueCount DESC) AS ndv_rank
+               ,      ROW_NUMBER() OVER (ORDER BY s.UniqueValueCount DESC, c.ColumnId) AS ndv_rank
                FROM   DBC.ColumnsV AS c
                LEFT OUTER JOIN DBC.StatsV AS s ON (c.DatabaseName = s.DatabaseName
                                                    AND c.TableName = s.TableName
@@ -577,7 +577,8 @@ class TeradataFrontendApi(FrontendApiInterface):
                AND    c.TableName = ?
               ) AS v
         WHERE  ColumnId IN (first_column_id, last_column_id)
-        OR     ndv_rank <= ?"""
+        OR     ndv_rank <= ?
+        ORDER BY ColumnId"""
         )
         rows = self.execute_query_fetch_all(
             sql, query_params=[schema, table_name, num_required], log_level=VVERBOSE
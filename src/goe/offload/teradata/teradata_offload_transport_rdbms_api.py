@@ -23,7 +23,7 @@ from goe.offload.offload_constants import OFFLOAD_TRANSPORT_VALIDATION_POLLER_DI
 from goe.offload.offload_messages import VERBOSE, VVERBOSE
 from goe.offload.offload_transport_functions import (
     split_lists_for_id_list,
-    split_ranges_for_id_range,
+    ID_RANGE_QUANTILE_SAMPLE_ROWS,
 )
 from goe.offload.offload_transport_rdbms_api import (
     OffloadTransportRdbmsApiInterface,
@@ -55,6 +55,7 @@ if TYPE_CHECKING:
     from goe.config.orchestration_config import OrchestrationConfig
     from goe.offload.column_metadata import ColumnMetadataInterface
     from goe.offload.offload_messages import OffloadMessages
+    from goe.offload.offload_source_data import OffloadSourcePartitions
     from goe.offload.offload_source_table import OffloadSourceTableInterface
 
 
@@ -196,6 +197,56 @@ class OffloadTransportTeradataApi(OffloadTransportRdbmsApiInterface):
         else:
             return None, None
 
+    def get_id_range_quantiles(
+        self,
+        rdbms_col_name: str,
+        predicate_offload_clause: str,
+        parallelism: int,
+        rdbms_table: "OffloadSourceTableInterface",
+        partition_chunk: "OffloadSourcePartitions" = None,
+    ) -> list:
+        """Return (parallelism - 1) values of an id column that split the row source into groups of roughly
+        equal population, calculated using PERCENTILE_DISC over a SAMPLE of the row source.
+        """
+        predicates = []
+        if partition_chunk and partition_chunk.count() > 0:
+            predicates.append(
+                "%s IN (%s)"
+                % (
+                    rdbms_table.teradata_partition_pseudo_column(),
+                    ",".join(partition_chunk.partition_names()),
+                )
+            )
+        if predicate_offload_clause:
+            predicates.append(predicate_offload_clause)
+
+        predicate = ""
+        if predicates:
+            predicate = "\n    WHERE " + "\n    AND ".join(predicates)
+
+        quantile_qry = """SELECT %(percentiles)s
+FROM (
+    SELECT %(col)s
+    FROM "%(owner)s"."%(table)s"%(predicate)s
+    SAMPLE %(sample_rows)s
+) s""" % {
+            "percentiles": "\n,      ".join(
+                "PERCENTILE_DISC(%s) WITHIN GROUP (ORDER BY %s)"
+                % (i / parallelism, rdbms_col_name)
+                for i in range(1, parallelism)
+            ),
+            "col": rdbms_col_name,
+            "owner": self._rdbms_owner,
+            "table": self._rdbms_table_name,
+            "predicate": predicate,
+            "sample_rows": ID_RANGE_QUANTILE_SAMPLE_ROWS,
+        }
+        transport_frontend_api = self._get_transport_frontend_api()
+        row = transport_frontend_api.execute_query_fetch_one(
+            quantile_qry, log_level=VVERBOSE
+        )
+        return [_ for _ in row if _ is not None] if row else []
+
     def get_offload_transport_sql_stats_function(
         self, rdbms_module, rdbms_action, conn_action=None
     ):
@@ -482,7 +533,15 @@ class OffloadTransportTeradataApi(OffloadTransportRdbmsApiInterface):
                 pseudo_part_column, partition_chunk
             )
             # Create a range of min/max tuples spanning the entire id range
-            id_ranges = split_ranges_for_id_range(id_col_min, id_col_max, parallelism)
+            id_ranges = self._get_id_ranges(
+                id_split_col,
+                predicate_offload_clause,
+                parallelism,
+                rdbms_table,
+                partition_chunk,
+                id_col_min,
+                id_col_max,
+            )
             union_branch_template = (
                 "SELECT g.*, %(batch)s AS %(batch_col)s FROM %(owner_table)s g "
                 "WHERE %(batch_source_col)s >= %(low_val)s AND %(batch_source_col)s < %(high_val)s%(partition_filter)s"
@@ -445,6 +445,7 @@ class OracleOrchestrationRepoClient(OrchestrationRepoClientInterface):
         frontend_bytes: Union[int, None] = None,
         transport_bytes: Union[int, None] = None,
         backend_bytes: Union[int, None] = None,
+        staged_fingerprint: Union[dict, None] = None,
     ) -> None:
         """Call into Oracle API function OFFLOAD_REPO.END_OFFLOAD_CHUNK()"""
         self._log(f"Recording chunk {chunk_id} status: {status}", detail=VVERBOSE)
@@ -453,6 +454,9 @@ class OracleOrchestrationRepoClient(OrchestrationRepoClientInterface):
         self._debug(f"transport_bytes: {transport_bytes})")
         self._debug(f"backend_bytes: {backend_bytes})")
         self._assert_valid_end_chunk_inputs(chunk_id, status)
+        staged_fingerprint_str = (
+            json.dumps(staged_fingerprint) if staged_fingerprint is not None else None
+        )
         self._frontend_api.execute_function(
             "offload_repo.end_offload_chunk",
             arg_list=[
@@ -462,6 +466,66 @@ class OracleOrchestrationRepoClient(OrchestrationRepoClientInterface):
                 transport_bytes,
                 backend_bytes,
                 status,
+                staged_fingerprint_str,
+            ],
+            log_level=VVERBOSE,
+            not_when_dry_running=True,
+        )
+
+    #
+    # VALIDATION FINGERPRINT METHODS
+    #
+    def get_validation_fingerprint(
+        self,
+        frontend_owner: str,
+        frontend_name: str,
+        backend_owner: str,
+        backend_name: str,
+    ) -> Optional[dict]:
+        """Call into Oracle API function OFFLOAD_REPO.GET_VALIDATION_FINGERPRINT()"""
+        assert frontend_owner and frontend_name
+        assert backend_owner and backend_name
+        fingerprint = self._frontend_api.execute_function(
+            "offload_repo.get_validation_fingerprint",
+            return_type=cx_Oracle.CLOB,
+            arg_list=[
+                frontend_owner.upper(),
+                frontend_name.upper(),
+                backend_owner,
+                backend_name,
+            ],
+            log_level=VVERBOSE,
+        )
+        if fingerprint:
+            return json.loads(
+                fingerprint.read() if hasattr(fingerprint, "read") else fingerprint
+            )
+        return None
+
+    def set_validation_fingerprint(
+        self,
+        frontend_owner: str,
+        frontend_name: str,
+        backend_owner: str,
+        backend_name: str,
+        fingerprint: dict,
+    ) -> None:
+        """Call into Oracle API function OFFLOAD_REPO.SAVE_VALIDATION_FINGERPRINT()"""
+        assert frontend_owner and frontend_name
+        assert backend_owner and backend_name
+        assert isinstance(fingerprint, dict)
+        self._log(
+            f"Recording validation fingerprint: {frontend_owner}.{frontend_name}",
+            detail=VVERBOSE,
+        )
+        self._frontend_api.execute_function(
+            "offload_repo.save_validation_fingerprint",
+            arg_list=[
+                frontend_owner.upper(),
+                frontend_name.upper(),
+                backend_owner,
+                backend_name,
+                json.dumps(fingerprint),
             ],
             log_level=VVERBOSE,
             not_when_dry_running=True,
@@ -1059,6 +1123,31 @@ class OracleOrchestrationRepoClient(OrchestrationRepoClientInterface):
             log_level=None,
         )
 
+    def get_offload_chunks(
+        self, execution_id: ExecutionId
+    ) -> List[Dict[str, Union[str, Any]]]:
+        """Gets offload chunks, and their partitions, for a command execution"""
+        sql = f"""
+            SELECT  OC.CHUNK_NUMBER    AS CHUNK_NUMBER,
+                    S.CODE             AS STATUS_CODE,
+                    FO.OBJECT_OWNER    AS FRONTEND_OWNER,
+                    FO.OBJECT_NAME     AS FRONTEND_TABLE_NAME,
+                    OP.NAME            AS PARTITION_NAME
+            FROM {self._repo_user}.COMMAND_EXECUTION CE
+            JOIN {self._repo_user}.OFFLOAD_CHUNK OC ON OC.COMMAND_EXECUTION_ID = CE.ID
+            JOIN {self._repo_user}.STATUS S on S.ID = OC.STATUS_ID
+            JOIN {self._repo_user}.FRONTEND_OBJECT FO ON FO.ID = OC.FRONTEND_OBJECT_ID
+            LEFT OUTER JOIN {self._repo_user}.OFFLOAD_PARTITION OP ON OP.OFFLOAD_CHUNK_ID = OC.ID
+            WHERE CE.UUID = :execution_id
+            ORDER BY OC.CHUNK_NUMBER, OP.NAME
+        """  # noqa: W605 W291
+        return self._frontend_api.execute_query_fetch_all(
+            sql,
+            as_dict=True,
+            query_params={"execution_id": execution_id.as_bytes()},
+            log_level=None,
+        )
+
     def get_command_execution_steps(
         self,
         execution_id: Optional[ExecutionId],
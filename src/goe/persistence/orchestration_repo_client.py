@@ -382,12 +382,38 @@ class OrchestrationRepoClientInterface(metaclass=ABCMeta):
         frontend_bytes: Union[int, None] = None,
         transport_bytes: Union[int, None] = None,
         backend_bytes: Union[int, None] = None,
+        staged_fingerprint: Union[dict, None] = None,
     ) -> None:
         """
         Record the completion of offload transport for an offload chunk.
         chunk_id: The identifier returned from start_offload_chunk.
+        staged_fingerprint: StagedDataFingerprint.to_dict() of the data staged for the chunk.
         """
 
+    #
+    # VALIDATION FINGERPRINT METHODS
+    #
+    @abstractmethod
+    def get_validation_fingerprint(
+        self,
+        frontend_owner: str,
+        frontend_name: str,
+        backend_owner: str,
+        backend_name: str,
+    ) -> Optional[dict]:
+        """Return the validation fingerprint dict stored for frontend/backend table pair, None if there is none."""
+
+    @abstractmethod
+    def set_validation_fingerprint(
+        self,
+        frontend_owner: str,
+        frontend_name: str,
+        backend_owner: str,
+        backend_name: str,
+        fingerprint: dict,
+    ) -> None:
+        """Persist the validation fingerprint dict for frontend/backend table pair, replacing any existing one."""
+
     #
     # OFFLOAD LISTENER API METHODS
     #
@@ -434,3 +460,11 @@ class OrchestrationRepoClientInterface(metaclass=ABCMeta):
         self, execution_id: Optional[ExecutionId]
     ) -> List[Dict[str, Union[str, Any]]]:
         """Return a list of steps for a given execution id"""
+
+    @abstractmethod
+    def get_offload_chunks(
+        self, execution_id: ExecutionId
+    ) -> List[Dict[str, Union[str, Any]]]:
+        """Return a list of offload chunks, and their partitions, for a given execution id.
+        One dict per chunk partition, ordered by chunk number.
+        """
@@ -293,15 +293,41 @@ class TeradataOrchestrationRepoClient(OrchestrationRepoClientInterface):
         frontend_bytes: Optional[int] = None,
         transport_bytes: Optional[int] = None,
         backend_bytes: Optional[int] = None,
+        staged_fingerprint: Optional[dict] = None,
     ) -> None:
         self._log(f"Recording chunk {chunk_id} status: {status}", detail=VVERBOSE)
         self._debug(f"row_count: {row_count})")
         self._debug(f"frontend_bytes: {frontend_bytes})")
         self._debug(f"transport_bytes: {transport_bytes})")
         self._debug(f"backend_bytes: {backend_bytes})")
+        self._debug(f"staged_fingerprint: {staged_fingerprint})")
         self._assert_valid_end_chunk_inputs(chunk_id, status)
         # TODO For MVP this method is a pass-thru
 
+    #
+    # VALIDATION FINGERPRINT METHODS
+    #
+    def get_validation_fingerprint(
+        self,
+        frontend_owner: str,
+        frontend_name: str,
+        backend_owner: str,
+        backend_name: str,
+    ) -> Optional[dict]:
+        # TODO For MVP this method is a pass-thru, no fingerprints means validation is never incremental
+        return None
+
+    def set_validation_fingerprint(
+        self,
+        frontend_owner: str,
+        frontend_name: str,
+        backend_owner: str,
+        backend_name: str,
+        fingerprint: dict,
+    ) -> None:
+        self._debug(f"validation fingerprint: {fingerprint})")
+        # TODO For MVP this method is a pass-thru
+
     #
     # ORACLE LISTENER API METHODS
     #
@@ -336,6 +362,11 @@ class TeradataOrchestrationRepoClient(OrchestrationRepoClientInterface):
             "Teradata get_command_executions pending implementation"
         )
 
+    def get_offload_chunks(
+        self, execution_id: ExecutionId
+    ) -> List[Dict[str, Union[str, Any]]]:
+        raise NotImplementedError("Teradata get_offload_chunks pending implementation")
+
     def get_offloadable_schemas(self):
         raise NotImplementedError(
             "Teradata get_offloadable_schemas pending implementation"
@@ -31,6 +31,8 @@ from goe.offload.offload_validation import (
     DEFAULT_SELECT_COLS,
     GROUPBY_PARTITIONS,
     DEFAULT_AGGS,
+    DEFAULT_SHARD_PARALLELISM,
+    FINGERPRINT_MAX_AGE_DAYS,
     SUPPORTED_OPERATIONS,
 )
 from goe.util.hs2_connection import HS2_OPTIONS
@@ -123,12 +125,26 @@ def validate_table(args, messages):
             as_of_scn=args.as_of_scn,
             execute=args.execute,
             frontend_parallelism=args.frontend_parallelism,
+            incremental=True,
+            full=args.full,
+            fingerprint_max_age_days=args.fingerprint_max_age_days,
+            shards=args.shards,
+            shard_parallelism=args.shard_parallelism,
+            stop_on_mismatch=args.stop_on_first_mismatch,
         )
         if status:
             messages.log("[OK]", ansi_code="green")
             return True
         else:
             messages.log("[ERROR]", ansi_code="red")
+            if args.diff_key and args.execute:
+                validator.diff(
+                    args.diff_key,
+                    selects=args.selects,
+                    aggs=args.aggregate_functions,
+                    filters=args.filters,
+                    safe=not args.skip_boundary_check,
+                )
             return False
 
     return (
@@ -237,6 +253,41 @@ def parse_args():
         type=int,
         help=option_descriptions.VERIFY_PARALLELISM,
     )
+    parser.add_option(
+        "--diff-key",
+        default=None,
+        help="On a mismatch, locate the rows that differ by comparing digests of ever smaller ranges of this numeric (ideally unique) column",
+    )
+    parser.add_option(
+        "--full",
+        action="store_true",
+        help="Validate all offloaded data. By default only partitions that are new or have changed since they were last successfully validated are validated (tables offloaded by RANGE partition only)",
+    )
+    parser.add_option(
+        "--fingerprint-max-age-days",
+        type=int,
+        default=FINGERPRINT_MAX_AGE_DAYS,
+        help="Validate partitions again if they were last successfully validated more than this many days ago. Changes are detected using FRONT-END dictionary attributes only, this periodic revalidation catches changes to BACK-END data. 0 = never expire. Default: %s"
+        % FINGERPRINT_MAX_AGE_DAYS,
+    )
+    parser.add_option(
+        "--shards",
+        type=int,
+        default=None,
+        help="Split offloaded partitions into up to <shards> contiguous ranges of similar size and validate them in parallel (tables offloaded by RANGE partition only)",
+    )
+    parser.add_option(
+        "--shard-parallelism",
+        type=int,
+        default=None,
+        help="Maximum number of concurrent FRONT-END and BACK-END sessions used to validate shards. Default: --frontend-parallelism if set, otherwise %s"
+        % DEFAULT_SHARD_PARALLELISM,
+    )
+    parser.add_option(
+        "--stop-on-first-mismatch",
+        action="store_true",
+        help="Stop validation as soon as any range of partitions does not match",
+    )
     parser.add_option(
         "--skip-boundary-check",
         action="store_true",
@@ -13,12 +13,14 @@
 # limitations under the License.
 
 import os
+import struct
 import time
 import zlib
 
 from io import BytesIO
 import avro
 from avro import io
+import numpy as np
 
 from goe.offload.column_metadata import match_table_column
 from goe.offload.query_import_interface import QueryImportInterface
@@ -33,6 +35,140 @@ from goe.offload.staging.avro.avro_staging_file import (
     AVRO_TYPE_STRING,
 )
 from goe.offload.oracle.oracle_column import ORACLE_TYPE_TIMESTAMP_LOCAL_TZ
+from goe.offload.staged_data_fingerprint import (
+    FINGERPRINT_KIND_DOUBLE,
+    FINGERPRINT_KIND_INTEGER,
+    FINGERPRINT_KIND_OTHER,
+    FINGERPRINT_KIND_STRING,
+)
+
+
+###########################################################################
+# CONSTANTS
+###########################################################################
+
+# Primitive encodings understood by the compiled row encoder.
+ENCODE_BOOLEAN = "boolean"
+ENCODE_BYTES = "bytes"
+ENCODE_DOUBLE = "double"
+ENCODE_FLOAT = "float"
+ENCODE_LONG = "long"
+ENCODE_UTF8 = "utf8"
+
+# Batches smaller than this are not worth the overhead of building NumPy arrays.
+NUMPY_MIN_BATCH_ROWS = 64
+
+# Zig-zag varint encodings for small non-negative values, mostly used for string/bytes length prefixes.
+SMALL_LONG_CACHE_SIZE = 1024
+
+STRUCT_DOUBLE = struct.Struct("<d")
+STRUCT_FLOAT = struct.Struct("<f")
+
+
+###########################################################################
+# GLOBAL FUNCTIONS
+###########################################################################
+
+
+def encode_long(datum: int) -> bytes:
+    """Zig-zag varint encoding of an integer, identical output to avro.io.BinaryEncoder.write_long()."""
+    datum = (datum << 1) ^ (datum >> 63)
+    encoded = bytearray()
+    while (datum & ~0x7F) != 0:
+        encoded.append((datum & 0x7F) | 0x80)
+        datum >>= 7
+    encoded.append(datum)
+    return bytes(encoded)
+
+
+SMALL_LONGS = tuple(encode_long(_) for _ in range(SMALL_LONG_CACHE_SIZE))
+
+
+def numpy_long_column(values, null_prefix=None, value_prefix=None):
+    """Vectorised zig-zag varint encoding of a column of integers.
+    Returns a tuple of (encoded bytes, list of row offsets into encoded bytes) or None if the values
+    are not all int64 compatible Python ints, in which case the caller should encode them one by one.
+    null_prefix/value_prefix are the encoded union branch indexes for nullable columns.
+    """
+    arr, null_mask = _numpy_values(values, "i")
+    if arr is None:
+        return None
+    zz = ((arr << 1) ^ (arr >> 63)).view(np.uint64)
+    varint_lengths = np.ones(len(zz), dtype=np.int64)
+    for shift in range(7, 64, 7):
+        varint_lengths += zz >= np.uint64(1 << shift)
+    # One byte per possible varint position, continuation bit set on all but the final byte.
+    max_len = int(varint_lengths.max()) if len(zz) else 1
+    positions = np.arange(max_len)
+    varint_bytes = (
+        (zz[:, None] >> (positions * 7).astype(np.uint64)) & np.uint64(0x7F)
+    ).astype(np.uint8)
+    varint_bytes |= np.where(
+        positions < (varint_lengths[:, None] - 1), np.uint8(0x80), np.uint8(0)
+    ).astype(np.uint8)
+    return _numpy_flatten(
+        varint_bytes, varint_lengths, null_mask, null_prefix, value_prefix
+    )
+
+
+def numpy_double_column(values, null_prefix=None, value_prefix=None):
+    """Vectorised little-endian encoding of a column of doubles.
+    Returns the same structure as numpy_long_column().
+    """
+    arr, null_mask = _numpy_values(values, "fi")
+    if arr is None:
+        return None
+    double_bytes = arr.astype("<f8").view(np.uint8).reshape(len(arr), 8)
+    return _numpy_flatten(
+        double_bytes,
+        np.full(len(arr), 8, dtype=np.int64),
+        null_mask,
+        null_prefix,
+        value_prefix,
+    )
+
+
+def _numpy_values(values, dtype_kinds):
+    """Return a tuple of (NumPy array of non-null values, null mask or None).
+    The array is None if NumPy cannot represent the values without loss.
+    """
+    arr = np.array(values)
+    null_mask = None
+    if arr.dtype.kind == "O" and arr.ndim == 1:
+        null_mask = np.equal(arr, None)
+        if not null_mask.any():
+            return None, None
+        arr = np.array(arr[~null_mask].tolist())
+        if len(arr) == 0:
+            arr = np.zeros(0, dtype=np.int64)
+    if arr.ndim != 1 or arr.dtype.kind not in dtype_kinds:
+        return None, None
+    if null_mask is not None:
+        # Re-expand to one entry per row, the null entries are discarded when flattening.
+        expanded = np.zeros(len(null_mask), dtype=arr.dtype)
+        expanded[~null_mask] = arr
+        arr = expanded
+    return arr, null_mask
+
+
+def _numpy_flatten(value_bytes, value_lengths, null_mask, null_prefix, value_prefix):
+    """Flatten a 2D array of per row encoded bytes into a single bytes object plus row offsets,
+    optionally prefixing each row with a union branch index.
+    """
+    if value_prefix is not None:
+        prefix = np.full((len(value_bytes), 1), value_prefix[0], dtype=np.uint8)
+        if null_mask is not None:
+            prefix[null_mask, 0] = null_prefix[0]
+            value_lengths = np.where(null_mask, 0, value_lengths)
+        value_bytes = np.hstack([prefix, value_bytes])
+        value_lengths = value_lengths + 1
+    elif null_mask is not None:
+        # Nulls in a non-nullable column, let the pure Python encoder deal with it.
+        return None
+    keep = np.arange(value_bytes.shape[1]) < value_lengths[:, None]
+    offsets = np.zeros(len(value_lengths) + 1, dtype=np.int64)
+    np.cumsum(value_lengths, out=offsets[1:])
+    return value_bytes[keep].tobytes(), offsets.tolist()
 
 
 ###########################################################################
@@ -43,7 +179,10 @@ from goe.offload.oracle.oracle_column import ORACLE_TYPE_TIMESTAMP_LOCAL_TZ
 class AvroEncoder(QueryImportInterface):
     """
     This is not a general purpose Avro encoder, but should handle the schema types we use.
-    It takes about half the CPU time to encode cf the standard avro library.
+    Rather than calling a function per column per row we generate a single row encoding function specialised
+    to the staging schema which appends each fetched batch into a bytearray. Integer and double columns
+    are encoded a whole batch at a time with NumPy when the fetched values allow it.
+    Output is byte for byte identical to encoding with the standard avro library.
     Further, the encode_from_cursor function is a generator yielding chunks suitable for incrementally appending
     to an existing HDFS file. This should allow us to support streaming to HDFS in the future.
 
@@ -54,9 +193,24 @@ class AvroEncoder(QueryImportInterface):
     This is not library code - it contains some fairly strong coupling to data formats in the offload process.
     """
 
-    def __init__(self, schema, messages, compression=False, base64_columns=None):
+    def __init__(
+        self,
+        schema,
+        messages,
+        compression=False,
+        base64_columns=None,
+        fetch_batch_bytes=None,
+        max_fetch_batch_bytes=None,
+        fingerprint=False,
+    ):
         super(AvroEncoder, self).__init__(
-            schema, messages, compression=compression, base64_columns=base64_columns
+            schema,
+            messages,
+            compression=compression,
+            base64_columns=base64_columns,
+            fetch_batch_bytes=fetch_batch_bytes,
+            max_fetch_batch_bytes=max_fetch_batch_bytes,
+            fingerprint=fingerprint,
         )
 
         self.schema = avro.schema.parse(schema)
@@ -69,13 +223,23 @@ class AvroEncoder(QueryImportInterface):
     # PRIVATE METHODS
     ###########################################################################
 
-    def _column_encode_fn(
+    def _column_encode_spec(
         self, projection_index, rdbms_column, avro_data_type, write_as_base64=False
-    ):
-        null_index, value_index = None, None
+    ) -> dict:
+        """Describe how a single column is encoded, the description is used to generate the row encoder.
+        Returns a dict of:
+            projection_index: Position of the column in fetched rows.
+            null_prefix/value_prefix: Encoded union branch indexes, None if the column is not nullable.
+            encoding: One of the ENCODE_* constants.
+            convert_fn: Optional function applied to a value before encoding.
+        """
+        null_prefix, value_prefix = None, None
         if type(avro_data_type) == avro.schema.UnionSchema:
             null_index = [str(_) for _ in avro_data_type.schemas].index('"null"')
             value_index = len(avro_data_type.schemas) - 1 - null_index
+            null_prefix, value_prefix = encode_long(null_index), encode_long(
+                value_index
+            )
             avro_type = [str(s) for s in avro_data_type.schemas if str(s) != '"null"'][
                 0
             ].strip('"')
@@ -85,94 +249,189 @@ class AvroEncoder(QueryImportInterface):
         avro_type = avro_type.upper()
         rdbms_type = rdbms_column.data_type
 
-        basic_encode = None
+        encoding, convert_fn = None, None
 
         if write_as_base64:
-            base64_fn = self._get_base64_encode_fn(rdbms_type)
-            basic_encode = lambda encoder, val: encoder.write_bytes(base64_fn(val))
+            encoding = ENCODE_BYTES
+            convert_fn = self._get_base64_encode_fn(rdbms_type)
 
         elif avro_type == AVRO_TYPE_BOOLEAN:
-            basic_encode = io.BinaryEncoder.write_boolean
+            encoding = ENCODE_BOOLEAN
 
         elif avro_type == AVRO_TYPE_DOUBLE:
-            basic_encode = io.BinaryEncoder.write_double
+            encoding = ENCODE_DOUBLE
 
         elif avro_type == AVRO_TYPE_FLOAT:
-            basic_encode = io.BinaryEncoder.write_float
-
-        elif avro_type == AVRO_TYPE_INT:
-            basic_encode = lambda encoder, val: encoder.write_long(int(val))
+            encoding = ENCODE_FLOAT
 
-        elif avro_type == AVRO_TYPE_LONG:
-            basic_encode = lambda encoder, val: encoder.write_long(int(val))
+        elif avro_type in (AVRO_TYPE_INT, AVRO_TYPE_LONG):
+            encoding = ENCODE_LONG
+            convert_fn = int
 
         elif rdbms_type in self._source_data_types_requiring_read:
-            if rdbms_column.is_string_based():
-                read_fn = self._get_encode_read_fn()
-                basic_encode = lambda encoder, val: encoder.write_utf8(read_fn(val))
-            else:
-                read_fn = self._get_encode_read_fn()
-                basic_encode = lambda encoder, val: encoder.write_bytes(read_fn(val))
+            encoding = ENCODE_UTF8 if rdbms_column.is_string_based() else ENCODE_BYTES
+            convert_fn = self._get_encode_read_fn()
 
         elif rdbms_type == ORACLE_TYPE_TIMESTAMP_LOCAL_TZ:
-            tsltz_fn = self._get_tsltz_encode_fn()
-            basic_encode = lambda encoder, val: encoder.write_utf8(tsltz_fn(val))
+            encoding = ENCODE_UTF8
+            convert_fn = self._get_tsltz_encode_fn()
 
         elif rdbms_column.is_string_based():
-            basic_encode = io.BinaryEncoder.write_utf8
+            encoding = ENCODE_UTF8
 
         elif rdbms_column.is_number_based():
             # Writing a number that is not being mapped to an Avro primitive, we expect it to already be a str.
-            basic_encode = io.BinaryEncoder.write_utf8
-
-            def basic_encode(encoder, val):
-                return io.BinaryEncoder.write_utf8(encoder, val)
+            encoding = ENCODE_UTF8
 
         elif rdbms_column.is_binary():
-            # Raw/binary should not undergo any character conversion therefore avoiding write_utf8
-            basic_encode = io.BinaryEncoder.write_bytes
+            # Raw/binary should not undergo any character conversion therefore avoiding utf8
+            encoding = ENCODE_BYTES
 
         elif avro_type == AVRO_TYPE_BYTES:
             # Doing this after LOB types to allow them to use val.read()
-            basic_encode = io.BinaryEncoder.write_bytes
+            encoding = ENCODE_BYTES
 
         elif avro_type == AVRO_TYPE_STRING:
             # If we are casting to string then it's a synthetic value and safe for str()
-            basic_encode = lambda encoder, val: encoder.write_utf8(str(val))
-            # Now that we include a number in FF of NLS_TIMESTAMP_FORMAT we don't need to look for trailing dot
-            # if rdbms_type == ORACLE_TYPE_TIMESTAMP:
-            #     # When offloading TIMESTAMP(0) we end up with a string with a trailing ".", e.g. "2024-04-29 05:55:58."
-            #     basic_encode = lambda encoder, val: encoder.write_utf8(self._strip_trailing_dot(str(val)))
-            # else:
-
-        if null_index is None:
-            return lambda encoder, row: basic_encode(encoder, row[projection_index])
-        else:
-
-            def union_encode(encoder, row):
-                val = row[projection_index]
-                if val is None:
-                    encoder.write_long(null_index)
-                else:
-                    encoder.write_long(value_index)
-                    basic_encode(encoder, val)
-
-            return union_encode
-
-    ###########################################################################
-    # PUBLIC METHODS
-    ###########################################################################
-
-    def encode_from_cursor(self, extraction_cursor, source_columns, fetch_size=None):
-        """fetch_size optional because not all frontends take a parameter to fetchmany()."""
-
-        def do_fetch(cursor):
-            if fetch_size:
-                return cursor.fetchmany(fetch_size)
+            encoding = ENCODE_UTF8
+            convert_fn = str
+
+        return {
+            "projection_index": projection_index,
+            "null_prefix": null_prefix,
+            "value_prefix": value_prefix,
+            "encoding": encoding,
+            "convert_fn": convert_fn,
+        }
+
+    def _fingerprint_columns(self, column_specs) -> list:
+        """Return fingerprint column tuples, as expected by _fingerprint_rows(), for the staging schema."""
+        fingerprint_columns = []
+        for field, spec in zip(self.schema.fields, column_specs):
+            convert_fn = None
+            if spec["encoding"] == ENCODE_LONG:
+                kind = FINGERPRINT_KIND_INTEGER
+            elif spec["encoding"] == ENCODE_DOUBLE and spec["convert_fn"] is None:
+                kind = FINGERPRINT_KIND_DOUBLE
+            elif spec["encoding"] == ENCODE_UTF8:
+                # Strings are hashed as staged.
+                kind, convert_fn = FINGERPRINT_KIND_STRING, spec["convert_fn"]
             else:
-                return cursor.fetchmany()
+                kind = FINGERPRINT_KIND_OTHER
+            fingerprint_columns.append(
+                (field.name, spec["projection_index"], kind, convert_fn)
+            )
+        return fingerprint_columns
+
+    def _numpy_column_fn(self, column_spec):
+        """Return a function for encoding a whole column with NumPy or None if the column is not eligible."""
+        if column_spec["encoding"] == ENCODE_LONG:
+            return numpy_long_column
+        elif (
+            column_spec["encoding"] == ENCODE_DOUBLE
+            and column_spec["convert_fn"] is None
+        ):
+            return numpy_double_column
+        return None
+
+    def _compile_row_encoder(self, column_specs, numpy_columns):
+        """Generate a function specialised to the staging schema which encodes a batch of rows into a bytearray.
+        numpy_columns is a tuple of column positions that have already been encoded by NumPy, these
+        are passed in to the generated function as (encoded bytes, row offsets) tuples.
+        """
+        namespace = {
+            "encode_long": encode_long,
+            "pack_double": STRUCT_DOUBLE.pack,
+            "pack_float": STRUCT_FLOAT.pack,
+            "SMALL_LONGS": SMALL_LONGS,
+        }
+        header = ["def encode_rows(rows, out, numpy_encoded):"]
+        body = []
+
+        def emit_length_prefixed(indent):
+            body.append(indent + "n = len(b)")
+            body.append(
+                indent
+                + "out += SMALL_LONGS[n] if n < %s else encode_long(n)"
+                % SMALL_LONG_CACHE_SIZE
+            )
+            body.append(indent + "out += b")
+
+        for i, spec in enumerate(column_specs):
+            if i in numpy_columns:
+                header.append(f"    c{i}, o{i} = numpy_encoded[{i}]")
+                body.append(f"        out += c{i}[o{i}[r]:o{i}[r + 1]]")
+                continue
+
+            value = "v"
+            if spec["convert_fn"] and spec["encoding"] != ENCODE_LONG:
+                namespace[f"f{i}"] = spec["convert_fn"]
+                value = f"f{i}(v)"
+
+            body.append(f"        v = row[{spec['projection_index']}]")
+            indent = " " * 8
+            if spec["null_prefix"] is not None:
+                body.append("        if v is None:")
+                body.append(f"            out += {spec['null_prefix']!r}")
+                body.append("        else:")
+                body.append(f"            out += {spec['value_prefix']!r}")
+                indent = " " * 12
+
+            if spec["encoding"] == ENCODE_BOOLEAN:
+                body.append(indent + "out += b'\\x01' if v else b'\\x00'")
+            elif spec["encoding"] == ENCODE_DOUBLE:
+                body.append(indent + f"out += pack_double({value})")
+            elif spec["encoding"] == ENCODE_FLOAT:
+                body.append(indent + f"out += pack_float({value})")
+            elif spec["encoding"] == ENCODE_LONG:
+                body.append(indent + "n = int(v)")
+                body.append(
+                    indent
+                    + "out += SMALL_LONGS[n] if 0 <= n < %s else encode_long(n)"
+                    % SMALL_LONG_CACHE_SIZE
+                )
+            elif spec["encoding"] == ENCODE_UTF8:
+                body.append(indent + f"b = {value}.encode('utf-8')")
+                emit_length_prefixed(indent)
+            elif spec["encoding"] == ENCODE_BYTES:
+                body.append(indent + f"b = {value}")
+                emit_length_prefixed(indent)
+            else:
+                raise NotImplementedError(
+                    "Unsupported Avro encoding for projection index: %s"
+                    % spec["projection_index"]
+                )
+
+        loop = (
+            ["    for r, row in enumerate(rows):"]
+            if numpy_columns
+            else ["    for row in rows:"]
+        )
+        source = "\n".join(header + loop + (body or ["        pass"]))
+        self._debug("Compiled Avro row encoder:\n%s" % source)
+        exec(compile(source, "<avro_row_encoder>", "exec"), namespace)
+        return namespace["encode_rows"]
+
+    def _encode_numpy_columns(self, rows, column_specs, numpy_column_fns) -> dict:
+        """Encode eligible columns of a batch with NumPy, returns a dict of column position: (bytes, offsets).
+        Columns that cannot be represented exactly by NumPy are omitted and will be encoded row by row.
+        """
+        if len(rows) < NUMPY_MIN_BATCH_ROWS:
+            return {}
+        numpy_encoded = {}
+        columns = list(zip(*rows))
+        for i, numpy_fn in numpy_column_fns.items():
+            spec = column_specs[i]
+            encoded = numpy_fn(
+                columns[spec["projection_index"]],
+                null_prefix=spec["null_prefix"],
+                value_prefix=spec["value_prefix"],
+            )
+            if encoded is not None:
+                numpy_encoded[i] = encoded
+        return numpy_encoded
 
-        # Encode header
+    def _encode_header(self) -> bytes:
         self._encoder.write(b"Obj" + bytes([1]))
         self._encoder.write_long(2)
         self._encoder.write_utf8("avro.schema")
@@ -183,22 +442,23 @@ class AvroEncoder(QueryImportInterface):
 
         self._encoder.write(self._sync_marker)
 
-        yield self._buffer.getvalue()
+        header = self._buffer.getvalue()
         self._buffer.truncate(0)
         self._buffer.seek(0)
+        return header
 
-        avro_conv_fns = []
-
+    def _get_batch_encode_fn(self, extraction_cursor, source_columns):
+        """Return a function which encodes a batch of rows, returning a tuple of (record count, bytearray)."""
         self._debug(
             "extraction_cursor format: {}".format(str(extraction_cursor.description))
         )
+        column_names = [col[0] for col in extraction_cursor.description]
+        column_specs = []
         for f in self.schema.fields:
-            projection_index = [col[0] for col in extraction_cursor.description].index(
-                f.name
-            )
+            projection_index = column_names.index(f.name)
             col = source_columns[projection_index]
-            avro_conv_fns.append(
-                self._column_encode_fn(
+            column_specs.append(
+                self._column_encode_spec(
                     projection_index,
                     col,
                     f.type,
@@ -207,52 +467,87 @@ class AvroEncoder(QueryImportInterface):
                     ),
                 )
             )
+        numpy_column_fns = {
+            i: self._numpy_column_fn(spec) for i, spec in enumerate(column_specs)
+        }
+        numpy_column_fns = {i: fn for i, fn in numpy_column_fns.items() if fn}
+        fingerprint_columns = self._fingerprint_columns(column_specs)
+        # Row encoders keyed on the tuple of columns NumPy managed to encode, normally there is only one.
+        row_encoders = {}
+
+        def encode_batch(rows):
+            numpy_encoded = self._encode_numpy_columns(
+                rows, column_specs, numpy_column_fns
+            )
+            numpy_columns = tuple(sorted(numpy_encoded))
+            if numpy_columns not in row_encoders:
+                row_encoders[numpy_columns] = self._compile_row_encoder(
+                    column_specs, numpy_columns
+                )
+            uncompressed_data = bytearray()
+            row_encoders[numpy_columns](rows, uncompressed_data, numpy_encoded)
+            if self.staged_fingerprint:
+                self._fingerprint_rows(rows, fingerprint_columns)
+            return len(rows), uncompressed_data
+
+        return encode_batch
+
+    def _encode_block(self, record_count, uncompressed_data) -> bytes:
+        """Compress encoded rows and frame them as an Avro data block."""
+        if self._codec == b"deflate":
+            compressed_data = zlib.compress(uncompressed_data)[2:-1]
+        else:
+            compressed_data = bytes(uncompressed_data)
+        return b"".join(
+            [
+                encode_long(record_count),
+                encode_long(len(compressed_data)),
+                compressed_data,
+                self._sync_marker,
+            ]
+        )
 
-        # encode rows
-        batch = 1
-        self._debug(f"Fetching row batch: {batch}")
-        rows = do_fetch(extraction_cursor)
-        while rows:
-            record_count = 0
-            for row in rows:
-                # write records to buffer
-                for encode_fn in avro_conv_fns:
-                    encode_fn(self._encoder, row)
-                record_count += 1
-
-            uncompressed_data = self._buffer.getvalue()
-            self._buffer.truncate(0)
-            self._buffer.seek(0)
-
-            if self._codec == b"deflate":
-                compressed_data = zlib.compress(uncompressed_data)[2:-1]
-            else:
-                compressed_data = uncompressed_data
-
-            self._encoder.write_long(record_count)
-            self._encoder.write_long(len(compressed_data))
-
-            yield self._buffer.getvalue() + compressed_data + self._sync_marker
-            self._buffer.truncate(0)
-            self._buffer.seek(0)
+    ###########################################################################
+    # PUBLIC METHODS
+    ###########################################################################
 
-            batch += 1
-            self._debug(f"Fetching row batch: {batch}")
-            rows = do_fetch(extraction_cursor)
+    def encode_from_cursor(self, extraction_cursor, source_columns, fetch_size=None):
+        """fetch_size optional because not all frontends take a parameter to fetchmany()."""
+        self._reset_fingerprint()
+        yield self._encode_header()
+        encode_batch = self._get_batch_encode_fn(extraction_cursor, source_columns)
+        for rows in self._extract_rows(extraction_cursor, fetch_size):
+            yield self._encode_block(*encode_batch(rows))
 
     def write_from_cursor(
-        self, local_output_path, extraction_cursor, source_columns, fetch_size=None
+        self, output_file, extraction_cursor, source_columns, fetch_size=None
     ):
-        """fetch_size optional because not all frontends take a parameter to fetchmany()."""
-        assert local_output_path
-        assert isinstance(local_output_path, str)
+        """output_file is either a local file path or a writable binary file object.
+        fetch_size optional because not all frontends take a parameter to fetchmany().
+        Fetching, encoding and compression/writing of blocks are overlapped by _run_pipeline().
+        """
+
+        def write_blocks(writer):
+            writer.write(self._encode_header())
+            self._run_pipeline(
+                extraction_cursor,
+                fetch_size,
+                self._get_batch_encode_fn(extraction_cursor, source_columns),
+                lambda encoded: writer.write(self._encode_block(*encoded)),
+                lob_indexes=self._lob_projection_indexes(
+                    [col[0] for col in extraction_cursor.description], source_columns
+                ),
+            )
+
+        assert output_file
         ts1 = time.time()
+        self._reset_fingerprint()
         self._log("Writing Avro(compression=%s)" % self._codec, detail=VVERBOSE)
-        with open(local_output_path, "wb") as writer:
-            for chunk in self.encode_from_cursor(
-                extraction_cursor, source_columns, fetch_size=fetch_size
-            ):
-                writer.write(chunk)
+        if isinstance(output_file, str):
+            with open(output_file, "wb") as writer:
+                write_blocks(writer)
+        else:
+            write_blocks(output_file)
         ts2 = time.time()
         self._log("Extract & write elapsed: %.1fs" % (ts2 - ts1), detail=VVERBOSE)
         return extraction_cursor.rowcount
@@ -18,12 +18,19 @@
 import time
 
 import pyarrow
+import pyarrow.compute
 from pyarrow import parquet
 
 from goe.offload.column_metadata import match_table_column
-from goe.offload.query_import_interface import QueryImportInterface
+from goe.offload.query_import_interface import QueryImportInterface, TSLTZ_SUFFIX
 from goe.offload.offload_messages import VVERBOSE
 from goe.offload.oracle.oracle_column import ORACLE_TYPE_TIMESTAMP_LOCAL_TZ
+from goe.offload.staged_data_fingerprint import (
+    FINGERPRINT_KIND_DOUBLE,
+    FINGERPRINT_KIND_INTEGER,
+    FINGERPRINT_KIND_OTHER,
+    FINGERPRINT_KIND_STRING,
+)
 from goe.offload.staging.parquet.parquet_staging_file import (
     PARQUET_TYPE_BINARY,
     PARQUET_TYPE_BOOLEAN,
@@ -35,6 +42,13 @@ from goe.offload.staging.parquet.parquet_staging_file import (
 )
 
 
+###########################################################################
+# CONSTANTS
+###########################################################################
+
+DEFAULT_ROW_GROUP_BYTES = 1024 * 1024 * 128
+
+
 ###########################################################################
 # ParquetEncoder
 ###########################################################################
@@ -43,9 +57,30 @@ from goe.offload.staging.parquet.parquet_staging_file import (
 class ParquetEncoder(QueryImportInterface):
     """This is not a general purpose Parquet encoder, but handles the schema types we use in Offload Transport."""
 
-    def __init__(self, schema, messages, compression=False, base64_columns=None):
+    def __init__(
+        self,
+        schema,
+        messages,
+        compression=False,
+        base64_columns=None,
+        row_group_size=None,
+        data_page_size=None,
+        use_dictionary=True,
+        fetch_batch_bytes=None,
+        max_fetch_batch_bytes=None,
+        fingerprint=False,
+    ):
+        """row_group_size: Target in-memory bytes of fetched data per Parquet row group.
+        data_page_size: Target bytes of an encoded data page, None leaves the PyArrow default in place.
+        """
         super(ParquetEncoder, self).__init__(
-            schema, messages, compression=compression, base64_columns=base64_columns
+            schema,
+            messages,
+            compression=compression,
+            base64_columns=base64_columns,
+            fetch_batch_bytes=fetch_batch_bytes,
+            max_fetch_batch_bytes=max_fetch_batch_bytes,
+            fingerprint=fingerprint,
         )
 
         self.schema = self._schema_to_pyarrow(schema)
@@ -56,63 +91,82 @@ class ParquetEncoder(QueryImportInterface):
         # Cloudera say: "Data using the version 2.0 of Parquet writer might not be consumable
         #                by Impala, due to use of the RLE_DICTIONARY encoding."
         self._parquet_version = "1.0"
-        self._buffer_bytes = 1024 * 1024 * 20
+        self._row_group_bytes = row_group_size or DEFAULT_ROW_GROUP_BYTES
+        self._data_page_size = data_page_size or None
+        self._use_dictionary = bool(use_dictionary)
 
     ###########################################################################
     # PRIVATE METHODS
     ###########################################################################
 
-    def _extract_rows(self, extraction_cursor, fetch_size):
-        def do_fetch(cursor):
-            if fetch_size:
-                return cursor.fetchmany(fetch_size)
-            else:
-                return cursor.fetchmany()
-
-        batch = 1
-        while True:
-            self._debug(f"Fetching row batch: {batch}")
-            rows = do_fetch(extraction_cursor)
-            if not rows:
-                break
-            batch += 1
-            yield rows
-
-    def _wrangle_data(self, columnar, source_columns):
-        """Wrangle data to fit with Offload process.
-        Binary columns: LOBs need read() applying and some binary columns need base64 encoding.
-        Timestamp columns: If being offloaded to string then we cannot tolerate a trailing '.'.
-        Populates new_columnar using labels of columnar contents for non-binary columns which minimizes overhead.
+    def _column_to_arrow_fn(self, column_name, source_columns, arrow_type):
+        """Return a function converting one column of a fetched batch to a PyArrow array.
+        Binary columns: LOBs need read() applying and some binary columns need base64 encoding, there are
+        no Arrow kernels for these so they remain per value Python calls.
+        TIMESTAMP WITH LOCAL TIME ZONE columns: The UTC suffix is appended by an Arrow compute kernel.
+        Everything else is passed straight to pyarrow.array() which builds the typed array in C.
         """
-        new_columnar = {}
-        for column_name, data in columnar.items():
-            source_column = match_table_column(column_name, source_columns)
-            if match_table_column(column_name, self._base64_columns):
-                base64_fn = self._get_base64_encode_fn(source_column.data_type)
-                new_data = [base64_fn(_) if _ is not None else _ for _ in data]
-                new_columnar[column_name] = new_data
-            elif source_column.data_type in self._source_data_types_requiring_read:
-                read_fn = self._get_encode_read_fn()
-                new_data = [read_fn(_) if _ is not None else _ for _ in data]
-                new_columnar[column_name] = new_data
-            elif source_column.data_type == ORACLE_TYPE_TIMESTAMP_LOCAL_TZ:
-                tsltz_fn = self._get_tsltz_encode_fn()
-                new_data = [tsltz_fn(_) if _ is not None else _ for _ in data]
-                new_columnar[column_name] = new_data
-            else:
-                new_columnar[column_name] = columnar[column_name]
-        return new_columnar
-
-    def _rowbased_to_columnar(self, column_names, row_batch):
-        """Convert row orientated data (list of tuples) to column orientated (dict of lists).
-        Iterates through each column and pulls out the relevant slice. This outperformed numpy.rot90 and other
-        techniques we tested.
-        Returns the columnar structure.
+        source_column = match_table_column(column_name, source_columns)
+        if match_table_column(column_name, self._base64_columns):
+            base64_fn = self._get_base64_encode_fn(source_column.data_type)
+            return lambda data: pyarrow.array(
+                [base64_fn(_) if _ is not None else _ for _ in data], type=arrow_type
+            )
+        elif source_column.data_type in self._source_data_types_requiring_read:
+            read_fn = self._get_encode_read_fn()
+            return lambda data: pyarrow.array(
+                [read_fn(_) if _ is not None else _ for _ in data], type=arrow_type
+            )
+        elif source_column.data_type == ORACLE_TYPE_TIMESTAMP_LOCAL_TZ:
+            return lambda data: pyarrow.compute.binary_join_element_wise(
+                pyarrow.array(data, type=pyarrow.string()), TSLTZ_SUFFIX, ""
+            ).cast(arrow_type)
+        else:
+            return lambda data: pyarrow.array(data, type=arrow_type)
+
+    def _get_arrow_conversion_fns(self, column_names, source_columns) -> list:
+        """Return a list of (projection index, conversion function) tuples in staging schema order."""
+        conversion_fns = []
+        for field in self.schema:
+            projection_index = column_names.index(field.name)
+            conversion_fns.append(
+                (
+                    projection_index,
+                    self._column_to_arrow_fn(field.name, source_columns, field.type),
+                )
+            )
+        return conversion_fns
+
+    def _batch_to_arrow(self, row_batch, conversion_fns) -> pyarrow.RecordBatch:
+        """Convert row orientated data (list of tuples) to a PyArrow RecordBatch.
+        zip(*row_batch) transposes the batch in C and each column is converted directly to a typed Arrow array,
+        there is no intermediate dict of lists.
         """
-        columnar = {}
-        for i, column_name in enumerate(column_names):
-            columnar[column_name] = [_[i] for _ in row_batch]
-        return columnar
+        columns = list(zip(*row_batch))
+        arrays = [
+            conversion_fn(columns[projection_index])
+            for projection_index, conversion_fn in conversion_fns
+        ]
+        record_batch = pyarrow.RecordBatch.from_arrays(arrays, schema=self.schema)
+        if self.staged_fingerprint:
+            self._fingerprint_record_batch(record_batch)
+        return record_batch
+
+    def _fingerprint_record_batch(self, record_batch):
+        """Add a RecordBatch to the staged data fingerprint."""
+        self.staged_fingerprint.add_rows(record_batch.num_rows)
+        for field, array in zip(self.schema, record_batch.columns):
+            if pyarrow.types.is_integer(field.type):
+                kind = FINGERPRINT_KIND_INTEGER
+            elif pyarrow.types.is_float64(field.type):
+                kind = FINGERPRINT_KIND_DOUBLE
+            elif pyarrow.types.is_string(field.type) or pyarrow.types.is_large_string(
+                field.type
+            ):
+                kind = FINGERPRINT_KIND_STRING
+            else:
+                kind = FINGERPRINT_KIND_OTHER
+            self.staged_fingerprint.update_array(field.name, array, kind)
 
     def _schema_to_pyarrow(self, schema):
         fields = [
@@ -141,60 +195,77 @@ class ParquetEncoder(QueryImportInterface):
     ###########################################################################
 
     def write_from_cursor(
-        self, local_output_path, extraction_cursor, source_columns, fetch_size=None
+        self, output_file, extraction_cursor, source_columns, fetch_size=None
     ):
-        """fetch_size optional because not all frontends take a parameter to fetchmany()."""
+        """output_file is either a local file path or a writable binary file object.
+        fetch_size optional because not all frontends take a parameter to fetchmany().
+        """
 
-        def write_as_parquet(writer, table):
-            writer.write_table(table=table)
+        def flush_row_group(writer, batches, batch_bytes):
+            """Write accumulated batches as a single row group."""
+            table = pyarrow.Table.from_batches(batches, schema=self.schema)
+            writer.write_table(table, row_group_size=table.num_rows)
             self._log(
-                "Writing buffered rows/MBs: %s/%.1f"
-                % (table.num_rows, float(table.nbytes) / 1024 / 1024),
+                "Writing row group rows/MBs: %s/%.1f"
+                % (table.num_rows, float(batch_bytes) / 1024 / 1024),
                 detail=VVERBOSE,
             )
 
-        assert local_output_path
-        assert isinstance(local_output_path, str)
+        def write_stage(record_batch):
+            """Runs in the pipeline writer thread."""
+            nonlocal batches, batch_bytes
+            batches.append(record_batch)
+            batch_bytes += record_batch.nbytes
+            if batch_bytes >= self._row_group_bytes:
+                flush_row_group(writer, batches, batch_bytes)
+                batches = []
+                batch_bytes = 0
+
+        assert output_file
 
         ts1 = time.time()
+        self._reset_fingerprint()
         column_names = [_[0] for _ in extraction_cursor.description]
+        conversion_fns = self._get_arrow_conversion_fns(column_names, source_columns)
 
-        # buffer_table builds up to a size threshold at which point we write to Parquet and start again
-        buffer_table = None
+        # Fetched batches are held as a list of RecordBatches until their combined size reaches
+        # the row group target, we never concatenate (and therefore copy) buffered data.
+        batches = []
+        batch_bytes = 0
         self._log(
-            "Writing Parquet(version=%s, compression=%s)"
-            % (self._parquet_version, self._codec),
+            "Writing Parquet(version=%s, compression=%s, row_group_size=%s, data_page_size=%s, use_dictionary=%s)"
+            % (
+                self._parquet_version,
+                self._codec,
+                self._row_group_bytes,
+                self._data_page_size,
+                self._use_dictionary,
+            ),
             detail=VVERBOSE,
         )
         self._debug(
             "extraction_cursor format: {}".format(str(extraction_cursor.description))
         )
         writer = parquet.ParquetWriter(
-            local_output_path,
+            output_file,
             schema=self.schema,
             version=self._parquet_version,
             compression=self._codec,
+            use_dictionary=self._use_dictionary,
+            data_page_size=self._data_page_size,
         )
+
         try:
-            for row_batch in self._extract_rows(
-                extraction_cursor, fetch_size=fetch_size
-            ):
-                columnar = self._rowbased_to_columnar(column_names, row_batch)
-                columnar = self._wrangle_data(columnar, source_columns)
-                if buffer_table is None:
-                    buffer_table = pyarrow.Table.from_pydict(
-                        columnar, schema=self.schema
-                    )
-                else:
-                    table = pyarrow.Table.from_pydict(columnar, schema=self.schema)
-                    buffer_table = pyarrow.concat_tables([buffer_table, table])
-                if buffer_table.nbytes > self._buffer_bytes:
-                    # Write full PyArrow buffer
-                    write_as_parquet(writer, buffer_table)
-                    buffer_table = None
-            if buffer_table:
-                # Write remaining contents of PyArrow buffer
-                write_as_parquet(writer, buffer_table)
+            self._run_pipeline(
+                extraction_cursor,
+                fetch_size,
+                lambda row_batch: self._batch_to_arrow(row_batch, conversion_fns),
+                write_stage,
+                lob_indexes=self._lob_projection_indexes(column_names, source_columns),
+            )
+            if batches:
+                # Write remaining buffered batches
+                flush_row_group(writer, batches, batch_bytes)
         finally:
             try:
                 writer.close()
@@ -35,6 +35,7 @@ except ModuleNotFoundError as e:
 
 from goe.filesystem.goe_dfs import (
     GOEDfsException,
+    GOEDfsStreamWriter,
     gen_fs_uri,
     uri_component_split,
     DFS_TYPE_DIRECTORY,
@@ -406,5 +407,59 @@ class TestGOEAzure(TestGOEDfs):
         self._run_all_tests()
 
 
+###############################################################################
+# TestGOEDfsStreamWriter
+###############################################################################
+
+
+class FakeStreamWriter(GOEDfsStreamWriter):
+    def __init__(self, part_size):
+        super(FakeStreamWriter, self).__init__(
+            "gs://a-bucket/a-file", part_size=part_size
+        )
+        self.parts = []
+        self.completed = False
+        self.aborted = False
+
+    def _upload_part(self, part_number, data, final):
+        self.parts.append((part_number, data, final))
+
+    def _complete(self):
+        self.completed = True
+
+    def _abort(self):
+        self.aborted = True
+
+
+class TestGOEDfsStreamWriter(TestCase):
+    def test_multiple_parts(self):
+        with FakeStreamWriter(4) as writer:
+            writer.write(b"abc")
+            writer.write(b"defghij")
+            self.assertEqual(writer.tell(), 10)
+        self.assertEqual(
+            writer.parts,
+            [(1, b"abcd", False), (2, b"efgh", False), (3, b"ij", True)],
+        )
+        self.assertTrue(writer.completed)
+        self.assertTrue(writer.closed)
+
+    def test_single_part(self):
+        with FakeStreamWriter(4) as writer:
+            writer.write(b"abcd")
+        self.assertEqual(writer.parts, [(1, b"abcd", True)])
+        self.assertTrue(writer.completed)
+
+    def test_abort(self):
+        with self.assertRaises(ValueError):
+            with FakeStreamWriter(4) as writer:
+                writer.write(b"abcdefgh")
+                raise ValueError("Abort")
+        self.assertEqual(writer.parts, [(1, b"abcd", False)])
+        self.assertTrue(writer.aborted)
+        self.assertFalse(writer.completed)
+        self.assertRaises(GOEDfsException, writer.write, b"x")
+
+
 if __name__ == "__main__":
     main()
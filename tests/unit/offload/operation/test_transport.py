@@ -0,0 +1,482 @@
+# Copyright 2024 The GOE Authors. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import threading
+from unittest import mock
+
+import pytest
+
+from goe.offload.offload_constants import OFFLOAD_STATS_METHOD_NONE
+from goe.offload.offload_messages import OffloadMessages
+from goe.offload.offload_source_data import (
+    OffloadSourcePartition,
+    OffloadSourcePartitions,
+)
+from goe.offload.offload_transport_functions import transport_offload_chunk
+from goe.offload.operation import transport as module_under_test
+from goe.offload.staged_data_fingerprint import (
+    FINGERPRINT_KIND_INTEGER,
+    StagedDataFingerprint,
+)
+from goe.orchestration import orchestration_constants
+from goe.orchestration.execution_id import ExecutionId
+
+from tests.unit.test_functions import (
+    build_fake_backend_table,
+    build_mock_offload_operation,
+    build_mock_options,
+    FAKE_ORACLE_BQ_ENV,
+)
+
+
+ROWS_PER_CHUNK = 10
+WAIT_SECONDS = 10
+
+FAILED_EXECUTION_ID = ExecutionId()
+FIRST_EXECUTION_ID = ExecutionId()
+
+
+@pytest.fixture
+def fake_operation():
+    fake_operation = build_mock_offload_operation()
+    fake_operation.execute = True
+    fake_operation.preserve_load_table = False
+    return fake_operation
+
+
+@pytest.fixture
+def chunk_events():
+    return []
+
+
+@pytest.fixture
+def pipeline_patches(chunk_events):
+    """Patch transport/load functions so the pipeline can be tested without a frontend or backend."""
+
+    def fake_transport(
+        data_transport_client, target_table, partition_chunk=None, **kwargs
+    ):
+        if partition_chunk == "fail-transport":
+            raise ValueError("Transport failure")
+        chunk_events.append(("transport", partition_chunk, target_table))
+        return ROWS_PER_CHUNK, 1024
+
+    def fake_load(data_transport_client, source_table, target_table, **kwargs):
+        chunk_events.append(("load-start", target_table))
+        load_fn = getattr(target_table, "fake_load_fn", None)
+        if load_fn:
+            load_fn()
+        chunk_events.append(("load-end", target_table))
+        return 2048
+
+    with mock.patch.object(
+        module_under_test, "start_offload_chunk", side_effect=range(1, 100)
+    ), mock.patch.object(
+        module_under_test, "transport_offload_chunk", side_effect=fake_transport
+    ), mock.patch.object(
+        module_under_test, "load_offload_chunk", side_effect=fake_load
+    ), mock.patch.object(
+        module_under_test, "offload_chunk_frontend_bytes", return_value=4096
+    ), mock.patch.object(
+        module_under_test,
+        "backend_table_factory",
+        side_effect=lambda *a, **k: mock.Mock(),
+    ) as table_factory, mock.patch.object(
+        module_under_test, "offload_transport_factory"
+    ), mock.patch.object(
+        module_under_test, "get_dfs_from_options"
+    ):
+        yield table_factory
+
+
+def build_pipeline(fake_operation, depth=2):
+    return module_under_test.OffloadChunkPipeline(
+        depth,
+        mock.Mock(),
+        mock.Mock(),
+        mock.Mock(),
+        fake_operation,
+        mock.Mock(),
+        OffloadMessages(),
+    )
+
+
+def end_chunk_statuses(fake_operation):
+    return [
+        (_.args[0], _.args[1])
+        for _ in fake_operation.repo_client.end_offload_chunk.call_args_list
+    ]
+
+
+def test_set_staging_slot():
+    config = build_mock_options(FAKE_ORACLE_BQ_ENV)
+    backend_table = build_fake_backend_table(config, OffloadMessages())
+    location = backend_table.get_staging_table_location()
+    backend_table.set_staging_slot(1)
+    assert backend_table.get_load_table_name() != backend_table.table_name
+    assert backend_table.get_staging_table_location() != location
+    backend_table.set_staging_slot(0)
+    assert backend_table.get_load_table_name() == backend_table.table_name
+    assert backend_table.get_staging_table_location() == location
+
+
+def test_offload_chunk_pipeline(fake_operation, pipeline_patches, chunk_events):
+    with build_pipeline(fake_operation, depth=2) as chunk_pipeline:
+        for i in range(4):
+            chunk_pipeline.offload_chunk("chunk-%s" % i, i, sync=bool(i == 3))
+    assert chunk_pipeline.rows_offloaded == 4 * ROWS_PER_CHUNK
+    # One extra staging slot created and reused.
+    assert pipeline_patches.call_count == 1
+    slot_table = chunk_pipeline._slots[1][1]
+    slot_table.set_staging_slot.assert_called_once_with(1)
+    slot_table.setup_staging_area_step.assert_called_once()
+    slot_table.cleanup_staging_area_step.assert_called_once()
+    # Chunks alternate between staging slots.
+    transported = [_ for _ in chunk_events if _[0] == "transport"]
+    assert [_[1] for _ in transported] == ["chunk-%s" % _ for _ in range(4)]
+    assert transported[1][2] is slot_table and transported[3][2] is slot_table
+    assert end_chunk_statuses(fake_operation) == [
+        (_, orchestration_constants.COMMAND_SUCCESS) for _ in range(1, 5)
+    ]
+
+
+def test_offload_chunk_pipeline_overlap(fake_operation, pipeline_patches, chunk_events):
+    """Transport of chunk 2 must be able to run while chunk 1 is loading."""
+    chunk_pipeline = build_pipeline(fake_operation, depth=2)
+    release_load = threading.Event()
+    chunk_pipeline._slots[0][1].fake_load_fn = lambda: release_load.wait(WAIT_SECONDS)
+    with chunk_pipeline:
+        chunk_pipeline.offload_chunk("chunk-0", 0)
+        chunk_pipeline.offload_chunk("chunk-1", 1)
+        assert ("transport", "chunk-1", chunk_pipeline._slots[1][1]) in chunk_events
+        assert ("load-end", chunk_pipeline._slots[0][1]) not in chunk_events
+        release_load.set()
+    assert chunk_pipeline.rows_offloaded == 2 * ROWS_PER_CHUNK
+
+
+def test_offload_chunk_pipeline_load_failure(
+    fake_operation, pipeline_patches, chunk_events
+):
+    chunk_pipeline = build_pipeline(fake_operation, depth=2)
+    release_load = threading.Event()
+
+    def failing_load():
+        release_load.wait(WAIT_SECONDS)
+        raise ValueError("Load failure")
+
+    chunk_pipeline._slots[0][1].fake_load_fn = failing_load
+    with pytest.raises(ValueError, match="Load failure"):
+        with chunk_pipeline:
+            chunk_pipeline.offload_chunk("chunk-0", 0)
+            chunk_pipeline.offload_chunk("chunk-1", 1)
+            release_load.set()
+    # Chunk 1 was staged but must not be loaded after the failure of chunk 0.
+    assert ("load-start", chunk_pipeline._slots[1][1]) not in chunk_events
+    assert end_chunk_statuses(fake_operation) == [
+        (1, orchestration_constants.COMMAND_ERROR),
+        (2, orchestration_constants.COMMAND_ERROR),
+    ]
+    chunk_pipeline._slots[1][1].cleanup_staging_area_step.assert_not_called()
+
+
+def test_offload_chunk_pipeline_transport_failure(
+    fake_operation, pipeline_patches, chunk_events
+):
+    with pytest.raises(ValueError, match="Transport failure"):
+        with build_pipeline(fake_operation, depth=3) as chunk_pipeline:
+            chunk_pipeline.offload_chunk("chunk-0", 0)
+            chunk_pipeline.offload_chunk("fail-transport", 1)
+    # Chunk 0 was staged before the failure and is still loaded.
+    assert ("load-end", chunk_pipeline._slots[0][1]) in chunk_events
+    assert sorted(end_chunk_statuses(fake_operation)) == [
+        (1, orchestration_constants.COMMAND_SUCCESS),
+        (2, orchestration_constants.COMMAND_ERROR),
+    ]
+    assert chunk_pipeline.rows_offloaded == ROWS_PER_CHUNK
+
+
+def test_offload_chunk_pipeline_load_messages(fake_operation, pipeline_patches):
+    """Messages from the loader thread are only applied by the calling thread."""
+    loader_threads = []
+
+    def fake_load(data_transport_client, source_table, target_table, **kwargs):
+        loader_threads.append(threading.current_thread())
+        assert kwargs["messages"].deferring()
+        kwargs["messages"].warning("load-warning")
+        return 2048
+
+    chunk_pipeline = build_pipeline(fake_operation, depth=2)
+    with mock.patch.object(module_under_test, "load_offload_chunk", fake_load):
+        with chunk_pipeline:
+            chunk_pipeline.offload_chunk("chunk-0", 0)
+            chunk_pipeline._pending_loads[0]["future"].result(WAIT_SECONDS)
+            assert not chunk_pipeline._messages.get_warnings()
+    assert loader_threads[0] is not threading.current_thread()
+    assert chunk_pipeline._messages.get_warnings() == ["load-warning"]
+
+
+def build_partitions(partition_names):
+    return OffloadSourcePartitions(
+        [
+            OffloadSourcePartition(
+                _, "'%s'" % _, (_,), ("'%s'" % _,), 1024, 10, True, []
+            )
+            for _ in partition_names
+        ]
+    )
+
+
+def build_fake_source_data_client(partition_names):
+    source_data_client = mock.Mock()
+    source_data_client.partitions_to_offload = build_partitions(partition_names)
+
+    def chunks():
+        partitions = source_data_client.partitions_to_offload.get_partitions()
+        for i, p in enumerate(partitions):
+            yield OffloadSourcePartitions([p]), OffloadSourcePartitions(
+                partitions[i + 1 :]
+            )
+
+    source_data_client.get_partitions_to_offload_chunks.side_effect = chunks
+    return source_data_client
+
+
+def build_fake_resume_repo_client(chunks_by_execution, owner="SH", table="SALES"):
+    """chunks_by_execution is a list of (execution_id, [(status, [partition names]), ...]) in resume order."""
+
+    def get_command_execution(execution_id):
+        ids = [_[0] for _ in chunks_by_execution]
+        if execution_id not in ids:
+            return None
+        i = ids.index(execution_id)
+        resumed_id = str(ids[i + 1]) if i + 1 < len(ids) else None
+        return {"COMMAND_PARAMETERS": json.dumps({"resume_execution_id": resumed_id})}
+
+    def get_offload_chunks(execution_id):
+        rows = []
+        for chunk_execution_id, chunks in chunks_by_execution:
+            if chunk_execution_id != execution_id:
+                continue
+            for chunk_number, (status, partition_names) in enumerate(chunks, 1):
+                for partition_name in partition_names or [None]:
+                    rows.append(
+                        {
+                            "CHUNK_NUMBER": chunk_number,
+                            "STATUS_CODE": status,
+                            "FRONTEND_OWNER": owner,
+                            "FRONTEND_TABLE_NAME": table,
+                            "PARTITION_NAME": partition_name,
+                        }
+                    )
+        return rows
+
+    repo_client = mock.Mock()
+    repo_client.get_command_execution.side_effect = get_command_execution
+    repo_client.get_offload_chunks.side_effect = get_offload_chunks
+    return repo_client
+
+
+def build_fake_source_table():
+    source_table = mock.Mock()
+    source_table.owner = "sh"
+    source_table.table_name = "sales"
+    return source_table
+
+
+def build_staged_manifest(
+    execution_id, chunk_number, partition_names, staged_fingerprint=None
+):
+    return {
+        "execution_id": str(execution_id),
+        "chunk_number": chunk_number,
+        "partition_names": partition_names,
+        "rows_staged": ROWS_PER_CHUNK,
+        "transport_bytes": 1024,
+        "staged_fingerprint": staged_fingerprint,
+    }
+
+
+def build_offload_resume(repo_client, source_data_client, manifest=None):
+    target_table = mock.Mock()
+    target_table.read_staged_chunk_manifest.return_value = manifest
+    return module_under_test.OffloadResume(
+        str(FAILED_EXECUTION_ID),
+        build_fake_source_table(),
+        target_table,
+        source_data_client,
+        repo_client,
+        OffloadMessages(),
+    )
+
+
+def test_offload_resume():
+    # The failed execution was itself resuming FIRST_EXECUTION_ID.
+    repo_client = build_fake_resume_repo_client(
+        [
+            (
+                FAILED_EXECUTION_ID,
+                [
+                    (orchestration_constants.COMMAND_SUCCESS, ["P3"]),
+                    (orchestration_constants.COMMAND_ERROR, ["P4"]),
+                ],
+            ),
+            (
+                FIRST_EXECUTION_ID,
+                [
+                    (orchestration_constants.COMMAND_SUCCESS, ["P1", "P2"]),
+                    (orchestration_constants.COMMAND_ERROR, ["P3"]),
+                ],
+            ),
+        ]
+    )
+    source_data_client = build_fake_source_data_client(["P1", "P2", "P3", "P4", "P5"])
+    offload_resume = build_offload_resume(
+        repo_client,
+        source_data_client,
+        manifest=build_staged_manifest(FAILED_EXECUTION_ID, 2, ["P4"]),
+    )
+    assert offload_resume.completed_partition_names == {"P1", "P2", "P3"}
+    assert offload_resume.staged_chunk["partition_names"] == ["P4"]
+    offload_resume.discard_completed_partitions(source_data_client)
+    assert source_data_client.partitions_to_offload.partition_names() == ["P4", "P5"]
+    staged_partitions = offload_resume.pop_staged_partitions(source_data_client)
+    assert staged_partitions.partition_names() == ["P4"]
+    assert source_data_client.partitions_to_offload.partition_names() == ["P5"]
+
+
+@pytest.mark.parametrize(
+    "manifest",
+    [
+        # Staged by an unrelated execution.
+        build_staged_manifest(ExecutionId(), 2, ["P2"]),
+        # Staged and then loaded successfully.
+        build_staged_manifest(FAILED_EXECUTION_ID, 1, ["P1"]),
+        # Partitions no longer in scope for offload.
+        build_staged_manifest(FAILED_EXECUTION_ID, 2, ["P9"]),
+    ],
+)
+def test_offload_resume_ignores_staged_chunk(manifest):
+    repo_client = build_fake_resume_repo_client(
+        [
+            (
+                FAILED_EXECUTION_ID,
+                [
+                    (orchestration_constants.COMMAND_SUCCESS, ["P1"]),
+                    (orchestration_constants.COMMAND_ERROR, ["P2"]),
+                ],
+            )
+        ]
+    )
+    offload_resume = build_offload_resume(
+        repo_client, build_fake_source_data_client(["P1", "P2"]), manifest=manifest
+    )
+    assert offload_resume.staged_chunk is None
+
+
+def test_offload_resume_invalid_execution():
+    source_data_client = build_fake_source_data_client(["P1"])
+    with pytest.raises(module_under_test.OffloadResumeException):
+        build_offload_resume(build_fake_resume_repo_client([]), source_data_client)
+    # Execution of a different table.
+    repo_client = build_fake_resume_repo_client(
+        [(FAILED_EXECUTION_ID, [(orchestration_constants.COMMAND_SUCCESS, ["P1"])])],
+        table="TIMES",
+    )
+    with pytest.raises(module_under_test.OffloadResumeException):
+        build_offload_resume(repo_client, source_data_client)
+
+
+def test_offload_data_to_target_resume(fake_operation):
+    fake_operation.offload_chunk_pipeline_depth = 1
+    fake_operation.offload_stats_method = OFFLOAD_STATS_METHOD_NONE
+    fake_operation.inflight_offload_predicate = None
+    fake_operation.hive_column_stats = False
+    repo_client = build_fake_resume_repo_client(
+        [
+            (
+                FAILED_EXECUTION_ID,
+                [
+                    (orchestration_constants.COMMAND_SUCCESS, ["P1"]),
+                    (orchestration_constants.COMMAND_ERROR, ["P2"]),
+                ],
+            )
+        ]
+    )
+    source_data_client = build_fake_source_data_client(["P1", "P2", "P3", "P4"])
+    offload_resume = build_offload_resume(
+        repo_client,
+        source_data_client,
+        manifest=build_staged_manifest(FAILED_EXECUTION_ID, 2, ["P2"]),
+    )
+    target_table = mock.Mock()
+    with mock.patch.object(
+        module_under_test, "start_offload_chunk", return_value=1
+    ), mock.patch.object(
+        module_under_test, "load_offload_chunk", return_value=2048
+    ) as load_chunk, mock.patch.object(
+        module_under_test, "offload_chunk_frontend_bytes", return_value=4096
+    ), mock.patch.object(
+        module_under_test,
+        "transport_and_load_offload_chunk",
+        return_value=ROWS_PER_CHUNK,
+    ) as transport_and_load:
+        rows_offloaded = module_under_test.offload_data_to_target(
+            mock.Mock(),
+            build_fake_source_table(),
+            target_table,
+            fake_operation,
+            mock.Mock(),
+            source_data_client,
+            OffloadMessages(),
+            offload_resume=offload_resume,
+        )
+    assert rows_offloaded == 3 * ROWS_PER_CHUNK
+    # The staged chunk is loaded without transport.
+    target_table.post_transport_tasks.assert_called_once()
+    assert load_chunk.call_args.args[3] == ROWS_PER_CHUNK
+    # Remaining partitions are transported, emptying the staging area first.
+    assert [
+        (
+            _.kwargs["partition_chunk"].partition_names(),
+            _.kwargs["chunk_count"],
+        )
+        for _ in transport_and_load.call_args_list
+    ] == [(["P3"], 1), (["P4"], 2)]
+
+
+def test_transport_offload_chunk_manifest():
+    data_transport_client = mock.Mock()
+    data_transport_client.transport.return_value = ROWS_PER_CHUNK
+    data_transport_client.get_transport_bytes.return_value = 1024
+    staged_fingerprint = StagedDataFingerprint()
+    staged_fingerprint.add_rows(ROWS_PER_CHUNK)
+    staged_fingerprint.update_column("ID", [1, 2, None], FINGERPRINT_KIND_INTEGER)
+    data_transport_client.get_staged_fingerprint.return_value = staged_fingerprint
+    target_table = mock.Mock()
+    transport_offload_chunk(
+        data_transport_client,
+        target_table,
+        partition_chunk=build_partitions(["P1", "P2"]),
+        execution_id=FAILED_EXECUTION_ID,
+        chunk_count=2,
+    )
+    target_table.write_staged_chunk_manifest.assert_called_once_with(
+        build_staged_manifest(
+            FAILED_EXECUTION_ID,
+            3,
+            ["P1", "P2"],
+            staged_fingerprint=staged_fingerprint.to_dict(),
+        )
+    )
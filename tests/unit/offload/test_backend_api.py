@@ -625,6 +625,14 @@ class TestBackendApi(TestCase):
                 agg_fns=["min", "max", "sum"],
             ),
         )
+        sql = self.api.gen_sql_text(
+            self.db,
+            self.table,
+            measures=["col2"],
+            agg_fns=["max"],
+            count_star=True,
+        )
+        self.assertLess(sql.index("COUNT(*)"), sql.index("MAX("))
 
     def _test_get_column_names(self):
         if self.connect_to_backend:
@@ -0,0 +1,147 @@
+# Copyright 2016 The GOE Authors. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+from unittest import mock
+
+import pytest
+
+from goe.offload.backend_table import DataValidationException
+from goe.offload.hadoop import hadoop_backend_table
+from goe.offload.offload_messages import OffloadMessages
+from goe.offload.staged_data_fingerprint import (
+    StagedDataFingerprint,
+    hash_value,
+    FINGERPRINT_KIND_INTEGER,
+    FINGERPRINT_KIND_STRING,
+)
+
+from tests.unit.test_functions import (
+    build_fake_backend_table,
+    build_mock_options,
+    FAKE_ORACLE_HIVE_ENV,
+)
+
+
+@pytest.fixture
+def config():
+    return build_mock_options(FAKE_ORACLE_HIVE_ENV)
+
+
+def build_partitions(count):
+    return [[("year", str(2000 + i))] for i in range(count)]
+
+
+def test_gather_partition_stats_parallel(config):
+    config.offload_stats_parallelism = 3
+    backend_table = build_fake_backend_table(config, OffloadMessages())
+    worker_apis = []
+    api_lock = threading.Lock()
+
+    def fake_backend_api(*args, **kwargs):
+        api = mock.Mock()
+        with api_lock:
+            worker_apis.append(api)
+        return api
+
+    with mock.patch.object(
+        hadoop_backend_table, "backend_api_factory", side_effect=fake_backend_api
+    ):
+        backend_table._gather_partition_stats(build_partitions(10), for_columns=True)
+
+    # Each worker thread has its own connection, all of which are closed.
+    assert 1 <= len(worker_apis) <= 3
+    assert all(_.close.call_count == 1 for _ in worker_apis)
+    gathered = [
+        c.kwargs["partition_tuples"]
+        for api in worker_apis
+        for c in api.compute_stats.call_args_list
+    ]
+    assert sorted(gathered) == build_partitions(10)
+    assert all(
+        c.kwargs["for_columns"]
+        for api in worker_apis
+        for c in api.compute_stats.call_args_list
+    )
+
+
+def test_gather_partition_stats_serial(config):
+    config.offload_stats_parallelism = 1
+    backend_table = build_fake_backend_table(config, OffloadMessages())
+    backend_table._db_api = mock.Mock()
+    with mock.patch.object(hadoop_backend_table, "backend_api_factory") as factory:
+        backend_table._gather_partition_stats(build_partitions(3), for_columns=False)
+        backend_table._gather_partition_stats([], for_columns=False)
+    # A single session uses the existing connection.
+    factory.assert_not_called()
+    assert backend_table._db_api.compute_stats.call_count == 3
+
+
+def test_gather_partition_stats_failure(config):
+    config.offload_stats_parallelism = 2
+    messages = mock.Mock()
+    backend_table = build_fake_backend_table(config, OffloadMessages())
+    backend_table._messages = messages
+    main_thread = threading.current_thread()
+    log_threads = []
+    messages.log.side_effect = lambda *args, **kwargs: log_threads.append(
+        threading.current_thread()
+    )
+    api = mock.Mock()
+    api.compute_stats.side_effect = [None] * 9 + [ValueError("stats failed")]
+
+    with mock.patch.object(
+        hadoop_backend_table, "backend_api_factory", return_value=api
+    ):
+        # The original exception is raised rather than a wrapper.
+        with pytest.raises(ValueError, match="stats failed"):
+            backend_table._gather_partition_stats(
+                build_partitions(10), for_columns=False
+            )
+
+    # Progress is only logged from the calling thread.
+    assert log_threads
+    assert all(_ is main_thread for _ in log_threads)
+    assert api.close.called
+
+
+def test_check_staged_fingerprint(config):
+    backend_table = build_fake_backend_table(config, OffloadMessages())
+    staged = StagedDataFingerprint()
+    staged.add_rows(3)
+    staged.update_column("ID", [1, 2, None], FINGERPRINT_KIND_INTEGER)
+    staged.update_column("DATA", ["a", "b", "c"], FINGERPRINT_KIND_STRING)
+    fingerprint_columns = [
+        ("ID", FINGERPRINT_KIND_INTEGER, "`id`"),
+        ("DATA", FINGERPRINT_KIND_STRING, "`data`"),
+    ]
+    projection = backend_table._staged_fingerprint_projection(
+        FINGERPRINT_KIND_INTEGER, "`id`"
+    )
+    assert len(projection) == 4
+    assert "MD5(CAST(`id` AS STRING))" in projection[-1]
+
+    id_values = [2, 1, 2, hash_value(1) + hash_value(2)]
+    data_hash_sum = sum(hash_value(_) for _ in "abc")
+    backend_table._check_staged_fingerprint(
+        staged, fingerprint_columns, id_values + [3, data_hash_sum], 3
+    )
+    # A changed string value is detected even though counts match.
+    with pytest.raises(DataValidationException, match="DATA value hash mismatch"):
+        backend_table._check_staged_fingerprint(
+            staged,
+            fingerprint_columns,
+            id_values + [3, data_hash_sum - hash_value("b") + hash_value("B")],
+            3,
+        )
@@ -0,0 +1,177 @@
+# Copyright 2016 The GOE Authors. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import itertools
+from unittest import mock
+
+import pytest
+
+from goe.offload.offload_messages import OffloadMessages
+from goe.offload.spark import livy_session_pool
+from goe.offload.spark.livy_session_pool import (
+    LivySessionPool,
+    LivySessionPoolException,
+)
+
+
+API_URL = "http://livy.example.com:8998"
+
+
+class FakeLivy:
+    """Minimal stand in for a Livy server, sessions are dicts as returned by GET /sessions."""
+
+    def __init__(self, sessions=None):
+        self.sessions = sessions or []
+        self.created = []
+        self.closed = []
+
+    def get(self, url):
+        resp = mock.Mock()
+        resp.ok = True
+        resp.json.return_value = {"sessions": list(self.sessions)}
+        return resp
+
+    def create(self, wait_for_idle):
+        session_id = 100 + len(self.created)
+        self.created.append(wait_for_idle)
+        self.sessions.append(
+            {
+                "id": session_id,
+                "kind": "pyspark",
+                "state": "idle" if wait_for_idle else "starting",
+            }
+        )
+        return "%s/sessions/%s" % (API_URL, session_id)
+
+    def close(self, session_url):
+        session_id = int(session_url.split("/")[-1])
+        self.closed.append(session_id)
+        self.sessions = [_ for _ in self.sessions if _["id"] != session_id]
+
+
+def idle_session(session_id):
+    return {"id": session_id, "kind": "pyspark", "state": "idle"}
+
+
+def build_pool(livy, tmp_path, **kwargs):
+    return LivySessionPool(
+        API_URL,
+        livy,
+        OffloadMessages(),
+        lambda job_dict, ignore_session_state: job_dict.get("kind") == "pyspark",
+        livy.create,
+        livy.close,
+        kwargs.pop("max_sessions", 2),
+        pool_dir=str(tmp_path),
+        **kwargs,
+    )
+
+
+def test_livy_session_pool_reuse(tmp_path):
+    livy = FakeLivy([idle_session(1)])
+    pool = build_pool(livy, tmp_path)
+    lease = pool.lease()
+    assert lease.session_id == "1"
+    assert lease.session_url == API_URL + "/sessions/1"
+    # The idle session is leased so a second client gets a new session.
+    lease2 = pool.lease()
+    assert lease2.session_id == "100"
+    assert livy.created == [True]
+    pool.release(lease)
+    # After release the session is available again.
+    lease3 = pool.lease()
+    assert lease3.session_id == "1"
+    pool.release(lease2)
+    pool.release(lease3)
+
+
+def test_livy_session_pool_full(tmp_path):
+    livy = FakeLivy([idle_session(1)])
+    pool = build_pool(livy, tmp_path, max_sessions=1)
+    lease = pool.lease()
+    with mock.patch.object(livy_session_pool.time, "sleep") as fake_sleep:
+        # By default a full pool fails immediately.
+        with pytest.raises(LivySessionPoolException):
+            pool.lease()
+        fake_sleep.assert_not_called()
+        # With a lease timeout the pool is polled until the timeout expires.
+        pool = build_pool(livy, tmp_path, max_sessions=1, lease_timeout=10)
+        with mock.patch.object(
+            livy_session_pool.time, "time", side_effect=itertools.count(0, 4)
+        ):
+            with pytest.raises(LivySessionPoolException):
+                pool.lease()
+        assert fake_sleep.call_count >= 1
+    pool.release(lease)
+
+
+def test_livy_session_pool_recycle(tmp_path):
+    livy = FakeLivy([idle_session(1)])
+    pool = build_pool(livy, tmp_path, max_session_statements=2)
+    lease = pool.lease()
+    lease.record_statement()
+    pool.release(lease)
+    assert livy.closed == []
+    lease = pool.lease()
+    assert lease.session_id == "1"
+    assert lease.statements == 1
+    lease.record_statement()
+    pool.release(lease)
+    # The session has reached the statement limit and is closed.
+    assert livy.closed == [1]
+    lease = pool.lease()
+    assert lease.session_id == "100"
+    assert lease.statements == 0
+    pool.release(lease)
+
+
+def test_livy_session_pool_warm(tmp_path):
+    livy = FakeLivy([idle_session(1)])
+    pool = build_pool(livy, tmp_path, max_sessions=5, min_sessions=3)
+    lease = pool.lease()
+    assert lease.session_id == "1"
+    # Two extra sessions requested without waiting for them to start.
+    assert livy.created == [False, False]
+    assert [_["state"] for _ in livy.sessions] == ["idle", "starting", "starting"]
+    pool.release(lease)
+
+
+def test_livy_session_pool_pending_sessions(tmp_path):
+    # Sessions that are still starting are not usable, e.g. when filtering on the queue in the session log.
+    livy = FakeLivy([idle_session(1)])
+
+    def build_pending_pool():
+        return LivySessionPool(
+            API_URL,
+            livy,
+            OffloadMessages(),
+            lambda job_dict, ignore_session_state: job_dict.get("state") == "idle",
+            livy.create,
+            livy.close,
+            3,
+            min_sessions=3,
+            pool_dir=str(tmp_path),
+        )
+
+    pool = build_pending_pool()
+    lease = pool.lease()
+    assert livy.created == [False, False]
+    # Pending sessions are not requested again.
+    pool._warm_sessions()
+    assert livy.created == [False, False]
+    # Another offload on the host counts the pending sessions against the maximum.
+    with pytest.raises(LivySessionPoolException):
+        build_pending_pool().lease()
+    assert livy.created == [False, False]
+    pool.release(lease)
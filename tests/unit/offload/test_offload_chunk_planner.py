@@ -0,0 +1,146 @@
+# Copyright 2016 The GOE Authors. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from goe.offload.offload_chunk_planner import (
+    OffloadChunkPlannerBalanced,
+    OffloadChunkPlannerException,
+    OffloadChunkPlannerGreedy,
+    estimate_partition_costs,
+    group_partitions_by_hwm,
+    offload_chunk_planner_factory,
+    COST_DENSITY_MIN_ROWS,
+)
+from goe.offload.offload_constants import (
+    OFFLOAD_CHUNK_PLANNER_BALANCED,
+    OFFLOAD_CHUNK_PLANNER_GREEDY,
+)
+from goe.offload.offload_source_data import OffloadSourcePartition
+
+
+def build_partitions(sizes, row_counts=None, hwms=None):
+    partitions = []
+    for i, size in enumerate(sizes):
+        hwm = hwms[i] if hwms else (i,)
+        partitions.append(
+            OffloadSourcePartition(
+                "P%s" % i,
+                str(hwm),
+                hwm,
+                [str(_) for _ in hwm],
+                size,
+                row_counts[i] if row_counts else None,
+                True,
+                [],
+            )
+        )
+    return partitions
+
+
+def chunk_names(chunks):
+    return [[p.partition_name for p in chunk] for chunk in chunks]
+
+
+def chunk_sizes(chunks):
+    return [sum(p.size_in_bytes for p in chunk) for chunk in chunks]
+
+
+def test_offload_chunk_planner_factory():
+    assert isinstance(
+        offload_chunk_planner_factory(OFFLOAD_CHUNK_PLANNER_GREEDY, 100, 10),
+        OffloadChunkPlannerGreedy,
+    )
+    assert isinstance(
+        offload_chunk_planner_factory(OFFLOAD_CHUNK_PLANNER_BALANCED, 100, 10),
+        OffloadChunkPlannerBalanced,
+    )
+    # A target chunk count implies the balanced planner.
+    assert isinstance(
+        offload_chunk_planner_factory(
+            OFFLOAD_CHUNK_PLANNER_GREEDY, 100, 10, target_chunk_count=2
+        ),
+        OffloadChunkPlannerBalanced,
+    )
+    with pytest.raises(OffloadChunkPlannerException):
+        offload_chunk_planner_factory("not-a-planner", 100, 10)
+
+
+def test_estimate_partition_costs():
+    # P2 has the same number of rows as P0/P1 but is 4x smaller, presumably due to compression.
+    sizes = [4000 * 100, 4000 * 100, 4000 * 25, 50]
+    row_counts = [4000, 4000, 4000, None]
+    costs = estimate_partition_costs(build_partitions(sizes, row_counts))
+    assert costs == [4000 * 100, 4000 * 100, 4000 * 100, 50]
+    # Small partitions do not influence the estimated density.
+    partitions = build_partitions([10_000_000], [COST_DENSITY_MIN_ROWS - 1])
+    assert estimate_partition_costs(partitions) == [10_000_000]
+
+
+def test_group_partitions_by_hwm():
+    partitions = build_partitions([1, 1, 1, 1], hwms=[(1,), (2,), (1,), (3,)])
+    assert chunk_names(group_partitions_by_hwm(partitions)) == [
+        ["P0", "P2"],
+        ["P1"],
+        ["P3"],
+    ]
+
+
+def test_greedy_planner():
+    partitions = build_partitions([10] * 10)
+    chunks = OffloadChunkPlannerGreedy(45, 100).plan(partitions)
+    assert chunk_sizes(chunks) == [40, 40, 20]
+
+
+def test_balanced_planner():
+    partitions = build_partitions([10] * 10)
+    chunks = OffloadChunkPlannerBalanced(45, 100).plan(partitions)
+    # Same number of chunks as the greedy planner but evenly sized.
+    assert chunk_sizes(chunks) == [30, 40, 30]
+    assert [p for chunk in chunks for p in chunk] == partitions
+
+
+def test_balanced_planner_skew():
+    # A single large partition is isolated rather than dragging neighbours into an oversized chunk.
+    partitions = build_partitions([2, 2, 400, 2, 2, 2, 2])
+    chunks = OffloadChunkPlannerBalanced(1000, 100, target_chunk_count=3).plan(
+        partitions
+    )
+    assert chunk_names(chunks) == [["P0", "P1"], ["P2"], ["P3", "P4", "P5", "P6"]]
+
+
+def test_balanced_planner_limits():
+    # Even chunks for 3 chunks would breach the max partition count so the offending chunk is split again.
+    partitions = build_partitions([10, 10, 10, 10, 10, 1, 1, 1, 1, 1, 1, 1])
+    chunks = OffloadChunkPlannerBalanced(1000, 4).plan(partitions)
+    assert all(len(_) <= 4 for _ in chunks)
+    assert chunk_names(chunks)[:2] == [["P0", "P1"], ["P2", "P3"]]
+    assert [p for chunk in chunks for p in chunk] == partitions
+
+
+def test_balanced_planner_target_count():
+    partitions = build_partitions([10] * 12)
+    chunks = OffloadChunkPlannerBalanced(15, 1, target_chunk_count=4).plan(partitions)
+    # Max chunk size/count are ignored in favour of the target chunk count.
+    assert chunk_sizes(chunks) == [30] * 4
+    # Cannot have more chunks than partitions.
+    chunks = OffloadChunkPlannerBalanced(15, 1, target_chunk_count=20).plan(partitions)
+    assert len(chunks) == 12
+
+
+def test_balanced_planner_matching_hwm():
+    # Subpartitions sharing a HWM must stay in the same chunk.
+    partitions = build_partitions([10] * 6, hwms=[(1,), (1,), (1,), (2,), (2,), (2,)])
+    chunks = OffloadChunkPlannerBalanced(15, 1, target_chunk_count=4).plan(partitions)
+    assert chunk_names(chunks) == [["P0", "P1", "P2"], ["P3", "P4", "P5"]]
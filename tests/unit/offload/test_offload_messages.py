@@ -13,6 +13,8 @@
 # limitations under the License.
 
 from datetime import timedelta
+import threading
+from unittest import mock
 
 from goe.config import orchestration_defaults
 from goe.offload.offload_messages import (
@@ -179,3 +181,34 @@ def test_offload_step():
                 do_divzero,
                 command_type=orchestration_constants.COMMAND_TEST,
             )
+
+
+def test_deferred():
+    repo_client = mock.Mock()
+    messages = OffloadMessages(
+        repo_client=repo_client, command_type=orchestration_constants.COMMAND_OFFLOAD
+    )
+    deferred = []
+
+    def background():
+        with messages.deferred() as thread_messages:
+            messages.offload_step(command_steps.STEP_MESSAGES, lambda: None)
+            messages.warning("a-warning")
+            deferred.extend(thread_messages)
+
+    thread = threading.Thread(target=background)
+    thread.start()
+    thread.join()
+    # Nothing shared is touched until the calling thread replays the messages.
+    assert not messages.deferring()
+    repo_client.start_command_step.assert_not_called()
+    assert not messages.steps and not messages.get_warnings()
+    messages.replay(deferred)
+    repo_client.start_command_step.assert_called_once()
+    repo_client.end_command_step.assert_called_once_with(
+        repo_client.start_command_step.return_value,
+        orchestration_constants.COMMAND_SUCCESS,
+        step_details=None,
+    )
+    assert command_steps.step_title(command_steps.STEP_MESSAGES) in messages.steps
+    assert "a-warning" in messages.get_warnings()
@@ -0,0 +1,244 @@
+# Copyright 2016 The GOE Authors. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Tests for OffloadSourcePartitions lookups and metadata footprint.
+    Run this module directly for a benchmark on a synthetic table with 1 million subpartitions:
+        python tests/unit/offload/test_offload_source_partitions.py
+"""
+
+import random
+import time
+from unittest import mock
+
+import pytest
+
+from goe.offload import offload_constants
+from goe.offload.offload_source_data import (
+    OffloadSourceDataException,
+    OffloadSourcePartition,
+    OffloadSourcePartitions,
+    is_default_partition,
+)
+from goe.offload.offload_source_table import (
+    PartitionHighValueDecoder,
+    RdbmsPartition,
+)
+
+
+def build_partitions(partition_count, subpartitions_per_partition, default=False):
+    """Subpartitions sorted new to old, all subpartitions of a partition share its high value."""
+    partitions = []
+    for p in range(partition_count, 0, -1):
+        for s in range(subpartitions_per_partition):
+            partitions.append(
+                OffloadSourcePartition(
+                    "P%s_SP%s" % (p, s),
+                    "%s" % (p * 10),
+                    (p * 10,),
+                    ("%s" % (p * 10),),
+                    1024,
+                    100,
+                    True,
+                    None,
+                )
+            )
+    if default:
+        partitions.insert(
+            0,
+            OffloadSourcePartition(
+                "P_DEFAULT",
+                offload_constants.PART_OUT_OF_LIST,
+                (offload_constants.PART_OUT_OF_LIST,),
+                (offload_constants.PART_OUT_OF_LIST,),
+                1024,
+                100,
+                True,
+                None,
+            ),
+        )
+    return partitions
+
+
+def scan_prior_partition(partitions, partition):
+    """The original linear scan implementation of get_prior_partition()."""
+    for p in partitions:
+        if not is_default_partition(p) and tuple(p.partition_values_python) < tuple(
+            partition.partition_values_python
+        ):
+            return p
+    return None
+
+
+def test_get_prior_partition():
+    partitions = build_partitions(20, 3, default=True)
+    random.Random(1).shuffle(partitions)
+    source_partitions = OffloadSourcePartitions(partitions)
+    for p in partitions:
+        if is_default_partition(p):
+            continue
+        assert source_partitions.get_prior_partition(
+            partition=p
+        ) is scan_prior_partition(partitions, p)
+    assert source_partitions.get_prior_partition(partition_name="P1_SP0") is None
+    with pytest.raises(OffloadSourceDataException):
+        source_partitions.get_prior_partition(partition_name="P99")
+
+
+def test_get_partition():
+    partitions = build_partitions(5, 2, default=True)
+    source_partitions = OffloadSourcePartitions(partitions)
+    assert source_partitions.get_partition("P3_SP1") is partitions[6]
+    assert source_partitions.get_partition("P9") is None
+    # First in list order when subpartitions share values, lists match tuples.
+    assert source_partitions.get_partition(partition_values_python=[30]) is (
+        partitions[5]
+    )
+    assert source_partitions.get_partition(partition_values_python=(99,)) is None
+    assert source_partitions.has_default_partition() == "P_DEFAULT"
+    partitions.append(partitions[1])
+    with pytest.raises(OffloadSourceDataException):
+        source_partitions.get_partition("P5_SP0")
+
+
+def test_index_maintenance():
+    source_partitions = OffloadSourcePartitions(build_partitions(4, 2, default=True))
+    assert source_partitions.count() == 9
+    assert source_partitions.size_in_bytes() == 9 * 1024
+    assert source_partitions.row_count() == 900
+    assert source_partitions.remove_default_partition().partition_name == "P_DEFAULT"
+    assert source_partitions.has_default_partition() is None
+    assert source_partitions.size_in_bytes() == 8 * 1024
+    source_partitions.apply_filter(lambda p: p.partition_values_python[0] > 20)
+    assert source_partitions.partition_names() == [
+        "P4_SP0",
+        "P4_SP1",
+        "P3_SP0",
+        "P3_SP1",
+    ]
+    assert source_partitions.get_partition("P1_SP0") is None
+    assert (
+        source_partitions.get_prior_partition(partition_name="P4_SP1").partition_name
+        == "P3_SP0"
+    )
+    # Changes made directly to the list from get_partitions() are also detected.
+    source_partitions.get_partitions().pop()
+    assert source_partitions.row_count() == 300
+    source_partitions.set_partitions([])
+    assert source_partitions.subpartition_names() == []
+    assert source_partitions.get_partition("P4_SP0") is None
+
+
+def test_from_source_table_shares_high_values():
+    # Subpartition high values repeat for every partition, the frontend decoder shares the decoded values.
+    decode_fn = mock.Mock(
+        side_effect=lambda hv_csvs: [((int(_),), (_,)) for _ in hv_csvs]
+    )
+    decoder = PartitionHighValueDecoder(decode_fn)
+    rdbms_partitions = [
+        RdbmsPartition.by_name(
+            partition_name="P%s" % p,
+            subpartition_name="P%s_SP%s" % (p, s),
+            high_values_csv="%s" % (s * 10),
+            partition_size=1024,
+            num_rows=100,
+            high_values_decoder=decoder,
+        )
+        for p in range(20)
+        for s in range(5)
+    ]
+    source_table = mock.Mock()
+    source_table.offload_by_subpartition = True
+    source_table.get_subpartitions.return_value = rdbms_partitions
+    source_table.get_subpartition_boundary_info.return_value = {
+        (s * 10,): {"common": True} for s in range(5)
+    }
+    source_partitions = OffloadSourcePartitions.from_source_table(source_table, True)
+    partitions = source_partitions.get_partitions()
+    # All high values were decoded in a single batch.
+    assert decode_fn.call_count == 1
+    assert len(set(id(_.partition_values_python) for _ in partitions)) == 5
+    assert len(set(id(_.partition_values_individual) for _ in partitions)) == 5
+    assert partitions[-1].partition_name == "P19_SP4"
+    with pytest.raises(AttributeError):
+        partitions[0].__dict__
+    unshared = OffloadSourcePartitions(
+        [
+            OffloadSourcePartition(
+                _.partition_name,
+                _.partition_literal,
+                tuple(list(_.partition_values_python)),
+                tuple(list(_.partition_values_individual)),
+                _.size_in_bytes,
+                _.row_count,
+                _.common_partition_literal,
+                _.subpartitions,
+            )
+            for _ in partitions
+        ]
+    )
+    assert source_partitions.memory_usage() < unshared.memory_usage()
+
+
+def benchmark(partition_count=1000, subpartitions_per_partition=1000, lookups=1000):
+    partitions = build_partitions(partition_count, subpartitions_per_partition)
+    source_partitions = OffloadSourcePartitions(partitions)
+    sample = random.Random(1).sample(partitions, lookups)
+    print(
+        "%s subpartitions, timing %s lookups of each type"
+        % (source_partitions.count(), lookups)
+    )
+
+    start = time.time()
+    source_partitions.count()
+    source_partitions.get_partition(sample[0].partition_name)
+    print("Build index: %.3fs" % (time.time() - start))
+    print("Partition metadata memory: %s bytes" % source_partitions.memory_usage())
+
+    for description, fn in [
+        ("get_partition", lambda p: source_partitions.get_partition(p.partition_name)),
+        (
+            "get_partition by value",
+            lambda p: source_partitions.get_partition(
+                partition_values_python=p.partition_values_python
+            ),
+        ),
+        (
+            "get_prior_partition",
+            lambda p: source_partitions.get_prior_partition(partition=p),
+        ),
+        ("has_default_partition", lambda p: source_partitions.has_default_partition()),
+        ("size_in_bytes", lambda p: source_partitions.size_in_bytes()),
+    ]:
+        start = time.time()
+        for p in sample:
+            fn(p)
+        print("%s: %.3fs" % (description, time.time() - start))
+
+    # The previous implementation for comparison, only a sample because it is quadratic.
+    start = time.time()
+    for p in sample[:10]:
+        scan_prior_partition(partitions, p)
+    print(
+        "get_prior_partition by scan (estimated): %.3fs"
+        % ((time.time() - start) * lookups / 10)
+    )
+
+
+def test_benchmark(capsys):
+    benchmark(partition_count=50, subpartitions_per_partition=20, lookups=100)
+    assert "get_prior_partition" in capsys.readouterr().out
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -12,8 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from unittest import TestCase
+from unittest import TestCase, mock
 
+import pytest
 from numpy import datetime64
 
 from goe.offload.factory.offload_source_table_factory import OffloadSourceTable
@@ -22,12 +23,19 @@ from goe.offload.offload_constants import (
     DBTYPE_ORACLE,
 )
 from goe.offload.offload_messages import OffloadMessages
+from goe.offload.offload_source_table import (
+    OFFLOAD_PARTITION_TYPE_LIST,
+    OFFLOAD_PARTITION_TYPE_RANGE,
+    PartitionHighValueDecoder,
+    RdbmsPartition,
+)
 from goe.offload.microsoft.mssql_column import (
     MSSQL_TYPE_BIGINT,
     MSSQL_TYPE_DATETIME,
     MSSQL_TYPE_VARCHAR,
 )
 from goe.offload.oracle.oracle_column import (
+    OracleColumn,
     ORACLE_TYPE_DATE,
     ORACLE_TYPE_NUMBER,
     ORACLE_TYPE_TIMESTAMP,
@@ -236,3 +244,144 @@ def test_oracle_version_is_smart_scan_unsafe():
     assert not oracle_offload_source_table.oracle_version_is_smart_scan_unsafe(
         oracle_offload_source_table.ORACLE_VERSION_SAFE_FOR_CELL_OFFLOAD_PROCESSING
     )
+
+
+def test_oracle_datetime_literals_to_python():
+    literals = [
+        "TO_DATE(' 2011-01-01 00:00:00', 'SYYYY-MM-DD HH24:MI:SS', 'NLS_CALENDAR=GREGORIAN')",
+        "TIMESTAMP' 2011-02-01 00:00:00'",
+        "TIMESTAMP' 2011-03-01 00:00:00.123456789'",
+        "MAXVALUE",
+        "TO_DATE(' 2011-04-01 00:00:00', 'SYYYY-MM-DD HH24:MI:SS', 'NLS_CALENDAR=GREGORIAN')",
+    ]
+    py_values = oracle_offload_source_table.oracle_datetime_literals_to_python(literals)
+    for literal, py_value in zip(literals, py_values):
+        expected = oracle_offload_source_table.oracle_datetime_literal_to_python(
+            literal
+        )
+        assert py_value == expected
+        # Same unit as the scalar function so values hash the same in high value dictionaries.
+        assert py_value.dtype == expected.dtype
+    assert oracle_offload_source_table.oracle_datetime_literals_to_python(
+        ["SYSDATE"], strict=False
+    ) == [None]
+    with pytest.raises(NotImplementedError):
+        oracle_offload_source_table.oracle_datetime_literals_to_python(["SYSDATE"])
+
+
+@pytest.mark.parametrize(
+    "partition_type,partition_columns,hv_csvs",
+    [
+        (
+            OFFLOAD_PARTITION_TYPE_RANGE,
+            [
+                OracleColumn("DT", ORACLE_TYPE_DATE),
+                OracleColumn("ID", ORACLE_TYPE_NUMBER),
+            ],
+            [
+                "TO_DATE(' 2011-01-01 00:00:00', 'SYYYY-MM-DD HH24:MI:SS', 'NLS_CALENDAR=GREGORIAN'), 100",
+                "TO_DATE(' 2011-02-01 00:00:00', 'SYYYY-MM-DD HH24:MI:SS', 'NLS_CALENDAR=GREGORIAN'), MAXVALUE",
+                "MAXVALUE, MAXVALUE",
+                None,
+            ],
+        ),
+        (
+            OFFLOAD_PARTITION_TYPE_LIST,
+            [OracleColumn("TS", ORACLE_TYPE_TIMESTAMP)],
+            [
+                "TIMESTAMP' 2011-01-01 00:00:00', TIMESTAMP' 2011-01-02 00:00:00'",
+                "TIMESTAMP' 2011-03-01 00:00:00.000000001'",
+                "DEFAULT",
+            ],
+        ),
+    ],
+)
+def test_oracle_decode_partition_high_values_batch(
+    partition_type, partition_columns, hv_csvs
+):
+    source_table = OffloadSourceTable.create(
+        "any_db",
+        "some_table",
+        build_mock_options(FAKE_ORACLE_ENV),
+        OffloadMessages(),
+        dry_run=True,
+        do_not_connect=True,
+    )
+    source_cls = type(source_table)
+    with mock.patch.object(
+        source_cls, "partition_type", new_callable=mock.PropertyMock
+    ) as mock_partition_type, mock.patch.object(
+        source_cls, "partition_columns", new_callable=mock.PropertyMock
+    ) as mock_partition_columns:
+        mock_partition_type.return_value = partition_type
+        mock_partition_columns.return_value = partition_columns
+        batch = source_table._decode_partition_high_values_batch(hv_csvs)
+        assert batch == [
+            tuple(tuple(_) for _ in source_table._decode_partition_high_values(hv))
+            for hv in hv_csvs
+        ]
+
+
+def test_rdbms_partition_lazy_high_values():
+    decode_fn = mock.Mock(
+        side_effect=lambda hv_csvs: [((int(_),), (_,)) for _ in hv_csvs]
+    )
+    decoder = PartitionHighValueDecoder(decode_fn)
+    partitions = [
+        RdbmsPartition.by_name(
+            partition_name="P%s" % i,
+            high_values_csv=str(i % 3),
+            high_values_decoder=decoder,
+        )
+        for i in range(6)
+    ]
+    decode_fn.assert_not_called()
+    assert partitions[4].high_values_python == (1,)
+    assert partitions[4].high_values_individual == ("1",)
+    # Shared with other partitions with the same high value.
+    assert partitions[1].high_values_python is partitions[4].high_values_python
+    assert decode_fn.call_count == 1
+    decoder.decode_all(_.high_values_csv for _ in partitions)
+    assert decode_fn.call_count == 2
+    assert decode_fn.call_args.args[0] == ["0", "2"]
+    assert [_.high_values_python for _ in partitions] == [
+        (0,),
+        (1,),
+        (2,),
+        (0,),
+        (1,),
+        (2,),
+    ]
+    assert decode_fn.call_count == 2
+    partitions[0].high_values_python = (99,)
+    assert partitions[0].high_values_python == (99,)
+    assert partitions[0].high_values_individual == ("0",)
+
+
+def test_rdbms_partition_decode_high_values_batch():
+    decode_fn = mock.Mock(
+        side_effect=lambda hv_csvs: [((int(_),), (_,)) for _ in hv_csvs]
+    )
+    decoder = PartitionHighValueDecoder(decode_fn)
+    partitions = [
+        RdbmsPartition.by_name(
+            partition_name="P%s" % i,
+            high_values_csv=str(i % 3),
+            high_values_decoder=decoder,
+        )
+        for i in range(6)
+    ] + [RdbmsPartition.by_name(partition_name="P6", high_values_python=(6,))]
+    RdbmsPartition.decode_high_values_batch(partitions)
+    # A single call for all distinct high values, then nothing more to decode.
+    assert decode_fn.call_count == 1
+    assert decode_fn.call_args.args[0] == ["0", "1", "2"]
+    assert [_.high_values_python for _ in partitions] == [
+        (0,),
+        (1,),
+        (2,),
+        (0,),
+        (1,),
+        (2,),
+        (6,),
+    ]
+    assert decode_fn.call_count == 1
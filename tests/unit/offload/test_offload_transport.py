@@ -15,6 +15,7 @@
 import pytest
 from unittest.mock import Mock
 
+from goe.config import orchestration_defaults
 from goe.offload.factory.offload_transport_factory import (
     offload_transport_factory,
     spark_dataproc_batches_jdbc_connectivity_checker,
@@ -28,14 +29,19 @@ from goe.offload.offload_transport import (
     OFFLOAD_TRANSPORT_METHOD_QUERY_IMPORT,
     OFFLOAD_TRANSPORT_METHOD_SPARK_BATCHES_GCLOUD,
     OFFLOAD_TRANSPORT_METHOD_SPARK_DATAPROC_GCLOUD,
+    OFFLOAD_TRANSPORT_METHOD_SPARK_LIVY,
     OFFLOAD_TRANSPORT_METHOD_SPARK_SUBMIT,
     OFFLOAD_TRANSPORT_METHOD_SQOOP,
 )
+from goe.offload.offload_transport_rdbms_api import (
+    TRANSPORT_ROW_SOURCE_QUERY_SPLIT_COLUMN,
+)
 from goe.offload.oracle.oracle_column import (
     OracleColumn,
     ORACLE_TYPE_VARCHAR2,
 )
 from goe.offload.oracle.oracle_offload_source_table import OracleSourceTable
+from goe.offload.query_import_interface import initial_fetch_rows
 
 from tests.unit.test_functions import (
     build_mock_options,
@@ -99,6 +105,40 @@ def test_query_import_construct(config, messages, oracle_table, fake_operation):
     )
 
 
+def test_query_import_fetch_size(
+    config, messages, oracle_table, fake_operation, monkeypatch
+):
+    monkeypatch.delenv("OFFLOAD_TRANSPORT_FETCH_SIZE", raising=False)
+
+    def build_transport():
+        return offload_transport_factory(
+            OFFLOAD_TRANSPORT_METHOD_QUERY_IMPORT,
+            oracle_table,
+            Mock(),
+            fake_operation,
+            config,
+            messages,
+            Mock(),
+        )
+
+    # An explicit fetch size is honoured.
+    fake_operation.offload_transport_fetch_size = 100
+    transport = build_transport()
+    assert transport._offload_transport_fetch_size == 100
+    assert not transport._adaptive_fetch
+    # A defaulted fetch size is derived from row width within the batch size ceiling.
+    fake_operation.offload_transport_fetch_size = (
+        orchestration_defaults.offload_transport_fetch_size_default()
+    )
+    transport = build_transport()
+    assert transport._adaptive_fetch
+    assert transport._offload_transport_fetch_size == initial_fetch_rows(
+        FRONTEND_COLUMNS,
+        config.offload_transport_query_import_batch_size,
+        config.offload_transport_query_import_max_batch_size,
+    )
+
+
 @pytest.mark.parametrize(
     "small_table_threshold,expected_status",
     [(0, False), (1, False), (999_999_999_999, True)],
@@ -154,6 +194,37 @@ def test_spark_submit_construct(config, messages, oracle_table, fake_operation):
     )
 
 
+@pytest.mark.parametrize(
+    "persistent_option,execute,expected_result",
+    [(False, True, False), (True, False, False), (True, True, True)],
+)
+def test_spark_submit_persistent_app_enabled(
+    config,
+    messages,
+    oracle_table,
+    fake_operation,
+    persistent_option: bool,
+    execute: bool,
+    expected_result: bool,
+):
+    fake_dfs_client = Mock()
+    fake_target_table = Mock()
+    config.offload_transport_spark_persistent_app = persistent_option
+    fake_operation.execute = execute
+    client = offload_transport_factory(
+        OFFLOAD_TRANSPORT_METHOD_SPARK_SUBMIT,
+        oracle_table,
+        fake_target_table,
+        fake_operation,
+        config,
+        messages,
+        fake_dfs_client,
+    )
+    assert client._persistent_app_enabled() == expected_result
+    # Nothing was started so close() is a no-op.
+    client.close()
+
+
 def test_spark_submit_canary_construct():
     config = build_mock_options(FAKE_ORACLE_BQ_ENV)
     messages = OffloadMessages()
@@ -481,3 +552,102 @@ def test_dataproc_batches_canary_construct():
     config = build_mock_options(FAKE_ORACLE_BQ_ENV)
     messages = OffloadMessages()
     _ = spark_dataproc_batches_jdbc_connectivity_checker(config, messages)
+
+
+@pytest.mark.parametrize(
+    "offload_parallelism,expected_query_count",
+    [(1, 1), (4, 4)],
+)
+def test_query_import_source_queries(
+    config,
+    messages,
+    oracle_table,
+    fake_operation,
+    offload_parallelism: int,
+    expected_query_count: int,
+):
+    fake_dfs_client = Mock()
+    fake_target_table = Mock()
+    fake_target_table.max_datetime_scale.return_value = 6
+    fake_target_table.transport_binary_data_in_base64.return_value = False
+    fake_target_table.get_staging_table_location.return_value = "gs://bucket/load"
+    fake_operation.offload_transport_parallelism = offload_parallelism
+    fake_operation.offload_predicate = None
+    fake_operation.inflight_offload_predicate = None
+    client = offload_transport_factory(
+        OFFLOAD_TRANSPORT_METHOD_QUERY_IMPORT,
+        oracle_table,
+        fake_target_table,
+        fake_operation,
+        config,
+        messages,
+        fake_dfs_client,
+    )
+    source_queries = client._query_import_source_queries()
+    assert len(source_queries) == expected_query_count
+    if offload_parallelism > 1:
+        for batch, source_query in enumerate(source_queries):
+            assert source_query.endswith(
+                f"WHERE {TRANSPORT_ROW_SOURCE_QUERY_SPLIT_COLUMN} = {batch}"
+            )
+        # Each worker must write to a distinct staging file.
+        local_paths = [
+            client._query_import_local_staging_path(_)
+            for _ in range(offload_parallelism)
+        ]
+        assert len(set(local_paths)) == offload_parallelism
+        assert (
+            client._query_import_dfs_load_path(3)
+            == "gs://bucket/load/part-m-00003.avro"
+        )
+    else:
+        assert TRANSPORT_ROW_SOURCE_QUERY_SPLIT_COLUMN not in source_queries[0]
+
+
+@pytest.mark.parametrize(
+    "stream_option,dfs_supports_streaming,expected_result",
+    [(False, True, False), (True, False, False), (True, True, True)],
+)
+def test_query_import_stream_to_dfs(
+    config,
+    messages,
+    oracle_table,
+    fake_operation,
+    stream_option: bool,
+    dfs_supports_streaming: bool,
+    expected_result: bool,
+):
+    fake_dfs_client = Mock()
+    fake_dfs_client.supports_open_for_write.return_value = dfs_supports_streaming
+    fake_target_table = Mock()
+    config.offload_transport_query_import_stream_to_dfs = stream_option
+    client = offload_transport_factory(
+        OFFLOAD_TRANSPORT_METHOD_QUERY_IMPORT,
+        oracle_table,
+        fake_target_table,
+        fake_operation,
+        config,
+        messages,
+        fake_dfs_client,
+    )
+    assert client._query_import_stream_to_dfs() == expected_result
+
+
+def test_spark_livy_persistent_app_not_supported(
+    config, messages, oracle_table, fake_operation
+):
+    fake_dfs_client = Mock()
+    fake_target_table = Mock()
+    config.offload_transport_spark_persistent_app = True
+    config.offload_transport_livy_api_url = "http://fake-livy:8998"
+    fake_operation.execute = True
+    client = offload_transport_factory(
+        OFFLOAD_TRANSPORT_METHOD_SPARK_LIVY,
+        oracle_table,
+        fake_target_table,
+        fake_operation,
+        config,
+        messages,
+        fake_dfs_client,
+    )
+    assert not client._persistent_app_enabled()
@@ -124,6 +124,47 @@ def test_split_ranges_for_id_range(inputs, expected_result):
         ), f"Value {i} in capturing ranges = {capturing_ranges}"
 
 
+@pytest.mark.parametrize(
+    "inputs, expected_result",
+    [
+        ((1, 100, [2, 3, 3, 50]), [(1, 2), (2, 3), (3, 50), (50, 101)]),
+        # Quantiles outside of the min/max range are ignored
+        ((10, 20, [5, 15, 25]), [(10, 15), (15, 21)]),
+        ((10, 20, [10, 20]), [(10, 20), (20, 21)]),
+        ((10, 20, []), [(10, 21)]),
+        ((10, 20, [None, 15]), [(10, 15), (15, 21)]),
+    ],
+)
+def test_split_ranges_for_id_quantiles(inputs, expected_result):
+    result = module_under_test.split_ranges_for_id_quantiles(*inputs)
+    assert result == expected_result
+    for i in range(inputs[0], inputs[1] + 1):
+        capturing_ranges = [_ for _ in result if _[0] <= i < _[1]]
+        assert len(capturing_ranges) == 1
+
+
+def test_quantiles_from_histogram():
+    # Height balanced style, 4 equal buckets
+    endpoints = [(0, 1), (1, 10), (2, 20), (3, 1000), (4, 100000)]
+    assert module_under_test.quantiles_from_histogram(endpoints, 4) == [10, 20, 1000]
+    # Frequency style, value 5 holds most of the rows
+    endpoints = [(10, 1), (90, 5), (100, 9)]
+    assert module_under_test.quantiles_from_histogram(endpoints, 4) == [5, 5, 5]
+    assert module_under_test.quantiles_from_histogram(endpoints, 1) == []
+    assert module_under_test.quantiles_from_histogram([], 4) == []
+
+
+def test_sample_percent_for_id_quantiles():
+    sample_rows = module_under_test.ID_RANGE_QUANTILE_SAMPLE_ROWS
+    assert module_under_test.sample_percent_for_id_quantiles(sample_rows) is None
+    assert module_under_test.sample_percent_for_id_quantiles(sample_rows * 10) == 10
+    assert (
+        module_under_test.sample_percent_for_id_quantiles(None)
+        == module_under_test.ID_RANGE_QUANTILE_DEFAULT_SAMPLE_PERCENT
+    )
+    assert module_under_test.sample_percent_for_id_quantiles(10**20) == 0.000001
+
+
 @pytest.mark.parametrize(
     "input_list, parallelism, round_robin, csv, expected_result",
     [
@@ -0,0 +1,614 @@
+# Copyright 2016 The GOE Authors. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from datetime import datetime, timedelta
+import json
+import math
+import sqlite3
+from unittest import mock
+
+import pytest
+
+from goe.offload.offload_messages import OffloadMessages
+from goe.offload.offload_source_table import RdbmsPartition
+from goe.offload import offload_validation
+from goe.offload.column_metadata import match_table_column
+from goe.offload.oracle.oracle_column import (
+    OracleColumn,
+    ORACLE_TYPE_NUMBER,
+    ORACLE_TYPE_VARCHAR2,
+)
+from goe.offload.offload_validation import (
+    DEFAULT_SHARD_PARALLELISM,
+    CrossDbValidator,
+    diff_buckets,
+    diff_rows,
+    partition_validation_runs,
+    partition_validation_shards,
+    partition_validation_signature,
+    DIFF_DUPLICATE_KEY,
+    DIFF_MISSING_BACKEND,
+    DIFF_MISSING_FRONTEND,
+    DIFF_VALUES,
+    ENGINE_BACK,
+    ENGINE_FRONT,
+    FINGERPRINT_MAX_AGE_DAYS,
+    FINGERPRINT_MAX_SETS,
+    FINGERPRINT_PARTITIONS,
+    FINGERPRINT_RANGES,
+    FINGERPRINT_SAMPLE,
+    FINGERPRINT_SELECTS,
+    FINGERPRINT_SETS,
+    FINGERPRINT_VALIDATED,
+)
+
+
+SELECTS = ["ID", "TIME_ID"]
+AGGS = ("min", "max", "count")
+
+
+def build_partitions(count, num_rows=100):
+    return [
+        RdbmsPartition.by_name(
+            partition_name="P%s" % i,
+            partition_position=i,
+            high_values_csv="%s" % (i * 10),
+            high_values_python=(i * 10,),
+            partition_size=1024,
+            num_rows=num_rows,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def names(partitions):
+    return [_.partition_name for _ in partitions]
+
+
+@pytest.fixture
+def validator():
+    """A CrossDbValidator with no connections, database access is mocked by each test."""
+    validator = CrossDbValidator.__new__(CrossDbValidator)
+    validator.log = validator.log_verbose = lambda *args, **kwargs: None
+    validator._backend_db = "SH_DATA"
+    validator._backend_table = "SALES"
+    validator._frontend = None
+    validator._repo_client = mock.Mock()
+    validator._repo_client.get_validation_fingerprint.return_value = None
+    validator._results = None
+    validator._select_sample = None
+    validator._frontend_table = mock.Mock()
+    validator._frontend_table.owner = "SH"
+    validator._frontend_table.table_name = "SALES"
+    return validator
+
+
+def saved_fingerprint(validator):
+    # Stored fingerprints are JSON, a round trip ensures nothing is lost.
+    return json.loads(
+        json.dumps(validator._repo_client.set_validation_fingerprint.call_args.args[4])
+    )
+
+
+def saved_set(validator):
+    # The most recently saved set is first.
+    return saved_fingerprint(validator)[FINGERPRINT_SETS][0]
+
+
+def store_saved_fingerprint(validator):
+    validator._repo_client.get_validation_fingerprint.return_value = saved_fingerprint(
+        validator
+    )
+    validator._repo_client.set_validation_fingerprint.reset_mock()
+
+
+def test_partition_validation_runs():
+    partitions = build_partitions(6)
+    assert partition_validation_runs(partitions, set()) == [(None, partitions)]
+    assert partition_validation_runs(partitions, set(names(partitions))) == []
+    runs = partition_validation_runs(partitions, {"P1", "P2", "P4"})
+    assert [(p.partition_name if p else None, names(r)) for p, r in runs] == [
+        ("P2", ["P3"]),
+        ("P4", ["P5", "P6"]),
+    ]
+
+
+def test_partition_validation_shards():
+    partitions = build_partitions(6)
+    assert partition_validation_shards(None, [], 4) == []
+    assert partition_validation_shards(None, partitions, 1) == [(None, partitions)]
+    shards = partition_validation_shards(None, partitions, 3)
+    assert [(p.partition_name if p else None, names(b)) for p, b in shards] == [
+        (None, ["P1", "P2"]),
+        ("P2", ["P3", "P4"]),
+        ("P4", ["P5", "P6"]),
+    ]
+    # Buckets are balanced by size and there are never more shards than partitions.
+    partitions[0].partition_size = 4096
+    shards = partition_validation_shards(partitions[0], partitions[1:], 2)
+    assert [(p.partition_name, names(b)) for p, b in shards] == [
+        ("P1", ["P2", "P3", "P4"]),
+        ("P4", ["P5", "P6"]),
+    ]
+    shards = partition_validation_shards(None, partitions, 3)
+    assert [names(b) for _, b in shards] == [["P1"], ["P2", "P3"], ["P4", "P5", "P6"]]
+    assert len(partition_validation_shards(None, partitions[:2], 8)) == 2
+
+
+def test_validate_sharded(validator):
+    validator._execute = True
+    validator._connection_options = mock.Mock()
+    validator._messages = None
+    validator._frontend = mock.Mock()
+    shards = partition_validation_shards(None, build_partitions(6), 3)
+    worker_apis = []
+
+    def fake_api(*args, **kwargs):
+        api = mock.Mock()
+        # The frontend returns a different result for the shard ending with P4.
+        api.execute_query_fetch_all.side_effect = lambda sql, **kwargs: [
+            (sql.split(":")[-1] if "P4" in sql and api.front else "",)
+        ]
+        api.front = not args
+        worker_apis.append(api)
+        return api
+
+    with mock.patch.object(
+        validator,
+        "_partition_range_filters",
+        side_effect=lambda prior, last, with_binds: ([last.partition_name], [], []),
+    ), mock.patch.object(
+        validator,
+        "_construct_simple_front_agg_sql",
+        side_effect=lambda selects, filters, *args: ("front:%s" % filters[-1], []),
+    ), mock.patch.object(
+        validator, "_construct_simple_back_agg_sql", return_value="back"
+    ), mock.patch.object(
+        validator,
+        "_compare_results",
+        side_effect=lambda results, *args: results[ENGINE_FRONT]
+        == results[ENGINE_BACK],
+    ), mock.patch.object(
+        validator, "_new_frontend_api", side_effect=fake_api
+    ), mock.patch.object(
+        offload_validation, "backend_api_factory", side_effect=fake_api
+    ):
+        assert not validator._validate_sharded(
+            SELECTS, [], None, AGGS, None, True, [], None, "", shards, 2, False
+        )
+        assert validator.frontend_sql.split("\n\n") == [
+            "front:P2",
+            "front:P4",
+            "front:P6",
+        ]
+        assert validator.results[ENGINE_FRONT] == [("",), ("P4",), ("",)]
+        assert len(validator.results[ENGINE_BACK]) == 3
+        # Each worker thread has its own session, all of which are closed.
+        assert 2 <= len(worker_apis) <= 4
+        assert all(_.close.call_count == 1 for _ in worker_apis)
+        # Frontend sessions for 2 workers plus the validator's own session.
+        validator._frontend.reserve_connections.assert_called_with(3)
+
+        worker_apis.clear()
+        assert validator._validate_sharded(
+            SELECTS, [], None, AGGS, None, True, [], None, "", shards[:1], 2, True
+        )
+        assert len(worker_apis) == 2
+
+        # Without shard_parallelism sessions are bounded by the default, not by the number of shards.
+        many_shards = partition_validation_shards(None, build_partitions(12), 12)
+        validator._validate_sharded(
+            SELECTS, [], None, AGGS, None, True, [], None, "", many_shards, None, False
+        )
+        validator._frontend.reserve_connections.assert_called_with(
+            DEFAULT_SHARD_PARALLELISM + 1
+        )
+
+
+def test_validate_incrementally(validator):
+    partitions = build_partitions(4)
+    validator._frontend_table.get_partitions.return_value = partitions
+    validated = []
+
+    def fake_validate(*args, **kwargs):
+        validator._results = {ENGINE_FRONT: [(1, 2, 3)]}
+        return True
+
+    with mock.patch.object(
+        validator, "_partition_range_filters", return_value=([], [], [])
+    ) as range_filters, mock.patch.object(
+        validator, "_validate_filtered", side_effect=fake_validate
+    ) as validate_filtered:
+        # Nothing fingerprinted, all partitions are validated by a single query pair.
+        assert validator._validate_incrementally(
+            SELECTS, AGGS, partitions, False, True, ""
+        )
+        assert validate_filtered.call_count == 1
+        assert range_filters.call_args.args == (None, partitions[-1])
+        fingerprint = saved_set(validator)
+        assert fingerprint["aggs"] == list(AGGS)
+        assert len(fingerprint[FINGERPRINT_RANGES]) == 1
+        assert sorted(fingerprint[FINGERPRINT_RANGES][0][FINGERPRINT_PARTITIONS]) == (
+            names(partitions)
+        )
+
+        # A new partition and a change to P2.
+        store_saved_fingerprint(validator)
+        validate_filtered.reset_mock()
+        partitions = build_partitions(5)
+        partitions[1].num_rows = 99
+        validator._frontend_table.get_partitions.return_value = partitions
+        assert validator._validate_incrementally(
+            SELECTS, AGGS, partitions, False, True, ""
+        )
+        # The stored range covered P1-P4 so a change to P2 invalidates all of it.
+        assert validate_filtered.call_count == 1
+        assert range_filters.call_args.args == (None, partitions[-1])
+
+        # No changes means no queries and no update of the fingerprint.
+        store_saved_fingerprint(validator)
+        validate_filtered.reset_mock()
+        assert validator._validate_incrementally(
+            SELECTS, AGGS, partitions, False, True, ""
+        )
+        validate_filtered.assert_not_called()
+        validator._repo_client.set_validation_fingerprint.assert_not_called()
+
+        # A new partition only validates that partition, bounded below by the prior partition.
+        partitions = build_partitions(6)
+        partitions[1].num_rows = 99
+        validator._frontend_table.get_partitions.return_value = partitions
+        assert validator._validate_incrementally(
+            SELECTS, AGGS, partitions, False, True, ""
+        )
+        assert validate_filtered.call_count == 1
+        assert range_filters.call_args.args == (partitions[4], partitions[5])
+        assert len(saved_set(validator)[FINGERPRINT_RANGES]) == 2
+
+        # Full validation ignores stored fingerprints.
+        store_saved_fingerprint(validator)
+        validate_filtered.reset_mock()
+        assert validator._validate_incrementally(
+            SELECTS, AGGS, partitions, True, True, ""
+        )
+        assert validate_filtered.call_count == 1
+        assert range_filters.call_args.args == (None, partitions[-1])
+        assert len(saved_set(validator)[FINGERPRINT_RANGES]) == 1
+
+
+def test_validate_incrementally_failure(validator):
+    partitions = build_partitions(3)
+    validator._frontend_table.get_partitions.return_value = partitions
+    with mock.patch.object(
+        validator, "_partition_range_filters", return_value=([], [], [])
+    ), mock.patch.object(validator, "_validate_filtered", return_value=False):
+        assert not validator._validate_incrementally(
+            SELECTS, AGGS, partitions, False, True, ""
+        )
+    # Failed ranges are not fingerprinted so they are validated again next time.
+    assert saved_set(validator)[FINGERPRINT_RANGES] == []
+
+
+def test_validation_fingerprint_different_aggs(validator):
+    partitions = build_partitions(2)
+    validator._frontend_table.get_partitions.return_value = partitions
+    signatures = {
+        _.partition_name: partition_validation_signature(_) for _ in partitions
+    }
+    validator._repo_client.get_validation_fingerprint.return_value = {
+        FINGERPRINT_SETS: [
+            {
+                "selects": SELECTS,
+                "aggs": ["sum"],
+                FINGERPRINT_RANGES: [
+                    {
+                        FINGERPRINT_PARTITIONS: signatures,
+                        FINGERPRINT_VALIDATED: datetime.now().isoformat(),
+                    }
+                ],
+            }
+        ]
+    }
+    assert validator._get_validated_ranges(SELECTS, AGGS, signatures) == []
+    assert validator._get_validated_ranges(SELECTS, ["SUM"], signatures)
+    # The order of columns is not significant.
+    assert validator._get_validated_ranges(list(reversed(SELECTS)), ["SUM"], signatures)
+    assert validator._get_validated_ranges(["ID"], ["SUM"], signatures) == []
+
+
+def test_validation_fingerprint_sets(validator):
+    partitions = build_partitions(2)
+    validator._frontend_table.get_partitions.return_value = partitions
+    signatures = {
+        _.partition_name: partition_validation_signature(_) for _ in partitions
+    }
+    # A fingerprint stored as a single set is still used.
+    validator._repo_client.get_validation_fingerprint.return_value = {
+        "selects": SELECTS,
+        "aggs": [_.lower() for _ in AGGS],
+        FINGERPRINT_RANGES: [
+            {
+                FINGERPRINT_PARTITIONS: signatures,
+                FINGERPRINT_VALIDATED: datetime.now().isoformat(),
+            }
+        ],
+    }
+    assert validator._get_validated_ranges(SELECTS, AGGS, signatures)
+
+    # Ranges recorded for different aggregations do not replace each other.
+    validator._record_validated_partitions(SELECTS, ["sum"], ["P2"])
+    store_saved_fingerprint(validator)
+    assert validator._get_validated_ranges(SELECTS, AGGS, signatures)
+    assert validator._get_validated_ranges(SELECTS, ["sum"], signatures)
+    validator._record_validated_partitions(list(reversed(SELECTS)), AGGS, ["P1"])
+    fingerprint = saved_fingerprint(validator)
+    assert [_["aggs"] for _ in fingerprint[FINGERPRINT_SETS]] == [
+        [_.lower() for _ in AGGS],
+        ["sum"],
+    ]
+    assert [
+        sorted(
+            name for r in _[FINGERPRINT_RANGES] for name in r[FINGERPRINT_PARTITIONS]
+        )
+        for _ in fingerprint[FINGERPRINT_SETS]
+    ] == [["P1"], ["P2"]]
+
+    # The least recently saved sets are dropped.
+    for i in range(FINGERPRINT_MAX_SETS):
+        store_saved_fingerprint(validator)
+        validator._record_validated_partitions(["COL%s" % i], ["sum"], ["P1"])
+    fingerprint = saved_fingerprint(validator)
+    assert len(fingerprint[FINGERPRINT_SETS]) == FINGERPRINT_MAX_SETS
+    assert fingerprint[FINGERPRINT_SETS][0][FINGERPRINT_SELECTS] == [
+        "COL%s" % (FINGERPRINT_MAX_SETS - 1)
+    ]
+
+
+def test_fingerprinted_sample_cols(validator):
+    validator._frontend = mock.Mock()
+    validator._db_name = "SH"
+    validator._table_name = "SALES"
+    validator._frontend.agg_validate_sample_column_names.return_value = ["ID", "AMT"]
+    validator._frontend_table.columns = []
+    validator._frontend_table.get_column.side_effect = lambda name: (
+        mock.Mock() if name in ("ID", "TIME_ID", "AMT") else None
+    )
+    validator._repo_client.get_validation_fingerprint.return_value = {
+        FINGERPRINT_SETS: [
+            {
+                "selects": ["TIME_ID", "ID"],
+                "aggs": ["sum"],
+                FINGERPRINT_SAMPLE: 2,
+                FINGERPRINT_RANGES: [],
+            }
+        ]
+    }
+    # Sampled columns are reused from a fingerprint for the same sample size and aggregations.
+    assert validator._get_select_cols(2, ["SUM"], fingerprinted=True) == [
+        "TIME_ID",
+        "ID",
+    ]
+    assert validator._select_sample == 2
+    validator._frontend.agg_validate_sample_column_names.assert_not_called()
+    assert validator._get_select_cols(2, ["SUM"]) == ["ID", "AMT"]
+    assert validator._get_select_cols(3, ["SUM"], fingerprinted=True) == ["ID", "AMT"]
+    assert validator._get_select_cols(2, AGGS, fingerprinted=True) == ["ID", "AMT"]
+    assert validator._get_select_cols(["ID"], ["SUM"], fingerprinted=True)
+    assert validator._select_sample is None
+
+    # Columns that no longer exist cause a new sample.
+    validator._repo_client.get_validation_fingerprint.return_value[FINGERPRINT_SETS][0][
+        "selects"
+    ] = ["DROPPED", "ID"]
+    assert validator._get_select_cols(2, ["SUM"], fingerprinted=True) == ["ID", "AMT"]
+
+
+def test_validation_fingerprint_expiry(validator):
+    partitions = build_partitions(2)
+    signatures = {
+        _.partition_name: partition_validation_signature(_) for _ in partitions
+    }
+    validator._repo_client.get_validation_fingerprint.return_value = {
+        "selects": SELECTS,
+        "aggs": [_.lower() for _ in AGGS],
+        FINGERPRINT_RANGES: [
+            {
+                FINGERPRINT_PARTITIONS: {"P1": signatures["P1"]},
+                FINGERPRINT_VALIDATED: (datetime.now() - timedelta(days=1)).isoformat(),
+            },
+            {
+                FINGERPRINT_PARTITIONS: {"P2": signatures["P2"]},
+                FINGERPRINT_VALIDATED: (
+                    datetime.now() - timedelta(days=FINGERPRINT_MAX_AGE_DAYS + 1)
+                ).isoformat(),
+            },
+        ],
+    }
+    # Ranges validated too long ago are validated again even if the frontend is unchanged.
+    ranges = validator._get_validated_ranges(SELECTS, AGGS, signatures)
+    assert [list(_[FINGERPRINT_PARTITIONS]) for _ in ranges] == [["P1"]]
+    assert not validator._get_validated_ranges(
+        SELECTS, AGGS, signatures, max_age_days=1
+    )
+    assert (
+        len(validator._get_validated_ranges(SELECTS, AGGS, signatures, max_age_days=0))
+        == 2
+    )
+
+
+def test_record_validated_partitions(validator):
+    partitions = build_partitions(3)
+    validator._frontend_table.get_partitions.return_value = partitions
+    validator._record_validated_partitions(SELECTS, AGGS, ["P3"])
+    fingerprint = saved_fingerprint(validator)
+    assert list(
+        fingerprint[FINGERPRINT_SETS][0][FINGERPRINT_RANGES][0][FINGERPRINT_PARTITIONS]
+    ) == ["P3"]
+
+
+def test_diff_rows_and_buckets():
+    # Numbers of different types are the same key.
+    front = [(1, 10, "a"), (2.0, 20, "b"), (3, 30, "c")]
+    back = [(1.0, 10.0, "a"), (2, 21, "b"), (4, 40, "d")]
+    assert diff_rows(front, back) == [
+        (2, DIFF_VALUES),
+        (3, DIFF_MISSING_BACKEND),
+        (4, DIFF_MISSING_FRONTEND),
+    ]
+    assert diff_buckets(front, back) == [2, 3, 4]
+    assert diff_buckets(front, front) == []
+
+
+def test_diff_rows_and_buckets_duplicate_keys():
+    front = [(1, 10), (1, 11), (2, 20), (2, 21), (3, 30)]
+    # Key 1 repeats in the same way, key 2 values differ and key 3 is repeated on one side only.
+    back = [(1, 11), (1, 10), (2, 20), (2, 20), (3, 30), (3, 30)]
+    assert diff_rows(front, back) == [(2, DIFF_VALUES), (3, DIFF_DUPLICATE_KEY)]
+    assert diff_buckets(front, back) == [2, 3]
+    assert diff_rows(front, front) == []
+
+
+@pytest.fixture
+def sqlite_validator(validator):
+    """A validator running diff SQL on a pair of SQLite schemas, SH for FRONT and SH_DATA for BACK."""
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    conn.create_function("FLOOR", 1, math.floor)
+    conn.execute("ATTACH ':memory:' AS SH")
+    conn.execute("ATTACH ':memory:' AS SH_DATA")
+    for schema in ("SH", "SH_DATA"):
+        conn.execute("CREATE TABLE %s.SALES (ID INT, AMOUNT INT, NAME TEXT)" % schema)
+        conn.executemany(
+            "INSERT INTO %s.SALES VALUES (?, ?, ?)" % schema,
+            [(i, i % 97, "N%s" % (i % 13)) for i in range(10000)],
+        )
+    columns = [
+        OracleColumn("ID", ORACLE_TYPE_NUMBER),
+        OracleColumn("AMOUNT", ORACLE_TYPE_NUMBER),
+        OracleColumn("NAME", ORACLE_TYPE_VARCHAR2),
+    ]
+    validator._frontend_table.columns = columns
+    validator._frontend_table.get_column.side_effect = lambda name: (
+        match_table_column(name, columns)
+    )
+    validator._backend_table_obj = validator._frontend_table
+    for api in ("_frontend", "_backend"):
+        setattr(validator, api, mock.Mock())
+        getattr(validator, api).enclose_identifier.side_effect = lambda _: '"%s"' % _
+        getattr(validator, api).enclose_object_reference.side_effect = (
+            lambda owner, table: "%s.%s" % (owner, table)
+        )
+        getattr(validator, api).enclosure_character.return_value = '"'
+    queries = []
+
+    def run_sqls(front_sql, back_sql, front_binds=None):
+        queries.append((front_sql, back_sql))
+        return {
+            ENGINE_FRONT: conn.execute(front_sql).fetchall(),
+            ENGINE_BACK: conn.execute(back_sql).fetchall(),
+        }
+
+    validator._run_sqls = run_sqls
+    validator._offload_metadata = None
+    yield validator, conn, queries
+    conn.close()
+
+
+def test_diff(sqlite_validator):
+    validator, conn, queries = sqlite_validator
+    conn.execute("DELETE FROM SH_DATA.SALES WHERE ID = 1234")
+    conn.execute("UPDATE SH_DATA.SALES SET NAME = 'X' WHERE ID = 7777")
+    conn.execute("INSERT INTO SH_DATA.SALES VALUES (20000, 1, 'N1')")
+    conn.execute("INSERT INTO SH_DATA.SALES VALUES (NULL, 1, 'N1')")
+    diffs = validator.diff(
+        "id", selects=["ID", "AMOUNT", "NAME"], safe=False, fan_out=4, leaf_rows=50
+    )
+    assert diffs == [
+        (1234, DIFF_MISSING_BACKEND),
+        (7777, DIFF_VALUES),
+        (20000, DIFF_MISSING_FRONTEND),
+        (None, DIFF_VALUES),
+    ]
+    # Only buckets on the path to a difference are queried, far fewer queries than leaf buckets.
+    assert len(queries) < 40
+
+    queries.clear()
+    assert validator.diff(
+        "ID", selects=["ID", "AMOUNT", "NAME"], safe=False, fan_out=4, max_keys=1
+    ) == [(1234, DIFF_MISSING_BACKEND)]
+
+
+def test_diff_partitions(sqlite_validator):
+    validator, conn, queries = sqlite_validator
+    conn.execute("DELETE FROM SH_DATA.SALES WHERE ID = 4321")
+    partitions = build_partitions(10)
+
+    def range_filters(prior, last, with_binds=True):
+        # Partition Pn holds IDs < n * 1000.
+        clauses = ['"ID" < %s' % (last.high_values_python[0] * 100)]
+        if prior:
+            clauses.append('"ID" >= %s' % (prior.high_values_python[0] * 100))
+        return clauses, [], clauses
+
+    with mock.patch.object(
+        validator, "_offloaded_range_partitions", return_value=partitions
+    ), mock.patch.object(
+        validator, "_partition_range_filters", side_effect=range_filters
+    ), mock.patch.object(
+        validator, "_get_filters", return_value=None
+    ):
+        assert validator.diff("ID", selects=["ID", "NAME"], fan_out=4) == [
+            (4321, DIFF_MISSING_BACKEND)
+        ]
+    # The partition holding the difference is located before descending by key.
+    assert all("CASE" in _[0] for _ in queries[:2])
+    assert '"ID" >= 4000' in queries[2][0]
+
+
+def test_diff_no_differences(sqlite_validator):
+    validator, _, queries = sqlite_validator
+    assert validator.diff("ID", selects=["ID", "NAME"], safe=False) == []
+    # Bounds, the top level digests and NULL keys.
+    assert len(queries) == 3
+    with pytest.raises(offload_validation.CrossDbValidatorException):
+        validator.diff("NAME", selects=["ID", "NAME"], safe=False)
+
+
+def test_validate_row_count(validator):
+    validator._db_name, validator._table_name = "SH", "SALES"
+    validator._db_table = "SH.SALES"
+    sql, select_expressions = validator._construct_simple_agg_sql(
+        SELECTS, ["TIME_ID < 10"], ["PROD_ID"], AGGS, as_of_scn=1234, count_star=True
+    )
+    # COUNT(*) follows the GROUP BY expressions so the row count is verified by the same scan.
+    assert select_expressions[:2] == ["PROD_ID", "COUNT(*)"]
+    assert "AS OF SCN 1234" in sql
+
+    def fake_validate(*args, **kwargs):
+        validator._results = {
+            ENGINE_FRONT: [("P1", 10, 1), ("P2", 5, 1)],
+            ENGINE_BACK: [("P1", 10, 1), ("P2", 4, 1)],
+        }
+        return False
+
+    with mock.patch.object(
+        validator, "_get_select_cols", return_value=SELECTS
+    ), mock.patch.object(
+        validator, "_get_group_bys", return_value=["PROD_ID"]
+    ), mock.patch.object(
+        validator, "_get_filters", return_value=[]
+    ), mock.patch.object(
+        validator, "_validate_filtered", side_effect=fake_validate
+    ):
+        assert validator.validate(safe=False, row_count=True)[0] is False
+    assert validator.row_counts == (15, 14)
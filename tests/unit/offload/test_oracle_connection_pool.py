@@ -0,0 +1,141 @@
+# Copyright 2016 The GOE Authors. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import mock
+
+import cx_Oracle as cxo
+import pytest
+
+from goe.offload.oracle import oracle_connection_pool
+from goe.offload.oracle.oracle_connection_pool import (
+    close_oracle_connection_pools,
+    drop_oracle_connection,
+    get_pooled_oracle_connection,
+    oracle_connection_pool_stats,
+    reserve_oracle_connection_pool_sessions,
+)
+
+
+NLS_ROWS = [
+    ("NLS_DATE_FORMAT", "DD-MON-RR"),
+    ("NLS_TERRITORY", "AMERICA"),
+    ("NLS_LANGUAGE", "AMERICAN"),
+    ("TIME_ZONE", "+00:00"),
+]
+
+
+def fake_connection():
+    conn = mock.Mock()
+    conn.cursor.return_value.execute.return_value.fetchall.return_value = list(NLS_ROWS)
+    return conn
+
+
+@pytest.fixture
+def session_pool():
+    pool = mock.Mock()
+    pool.acquire.side_effect = lambda: fake_connection()
+    pool.opened = 1
+    pool.busy = 0
+    with mock.patch.object(
+        oracle_connection_pool.cxo, "SessionPool", return_value=pool
+    ) as session_pool_cls:
+        yield session_pool_cls
+    close_oracle_connection_pools()
+
+
+def executed_sql(conn) -> list:
+    return [_.args[0] for _ in conn.cursor.return_value.execute.call_args_list]
+
+
+def test_pooled_connection_reset(session_pool):
+    conn = get_pooled_oracle_connection(
+        "goe_app", "pass", "db/svc", False, 4, action="Test"
+    )
+    assert conn.module == "GOE"
+    assert conn.action == "Test"
+    reset_sql = executed_sql(conn)[-1]
+    assert reset_sql.startswith('ALTER SESSION SET TRACEFILE_IDENTIFIER="GOE"')
+    # Language and territory first because they reset other NLS parameters.
+    assert reset_sql.index("NLS_LANGUAGE='AMERICAN'") < reset_sql.index(
+        "NLS_TERRITORY='AMERICA'"
+    )
+    assert reset_sql.index("NLS_TERRITORY") < reset_sql.index("NLS_DATE_FORMAT")
+    assert "TIME_ZONE='+00:00'" in reset_sql
+
+    # Same user/DSN shares a single pool and the NLS baseline is only queried once.
+    conn2 = get_pooled_oracle_connection("GOE_APP", "pass", "db/svc", False, 4)
+    assert session_pool.call_count == 1
+    assert len(executed_sql(conn2)) == 1
+    stats = oracle_connection_pool_stats()
+    assert len(stats) == 1
+    assert stats[0]["acquires"] == 2
+    assert stats[0]["overflow_connections"] == 0
+
+
+def test_pooled_connection_wallet(session_pool):
+    get_pooled_oracle_connection(None, None, "wallet_dsn", True, 2)
+    kwargs = session_pool.call_args.kwargs
+    assert kwargs["externalauth"] is True
+    assert kwargs["homogeneous"] is False
+    assert "user" not in kwargs
+
+
+def test_pooled_connection_overflow(session_pool):
+    session_pool.return_value.acquire.side_effect = cxo.DatabaseError(
+        "ORA-24459: OCISessionGet() timed out waiting for pool to create new connections"
+    )
+    with mock.patch.object(
+        oracle_connection_pool.cxo, "connect", return_value=fake_connection()
+    ) as connect:
+        get_pooled_oracle_connection("goe_app", "pass", "db/svc", False, 1)
+        assert connect.call_count == 1
+    assert oracle_connection_pool_stats()[0]["overflow_connections"] == 1
+
+
+def test_drop_oracle_connection(session_pool):
+    conn = get_pooled_oracle_connection("goe_app", "pass", "db/svc", False, 4)
+    drop_oracle_connection(conn)
+    session_pool.return_value.drop.assert_called_once_with(conn)
+    conn.close.assert_not_called()
+    # Connections from outside a pool are simply closed.
+    session_pool.return_value.drop.side_effect = cxo.ProgrammingError("not pooled")
+    standalone = mock.Mock()
+    drop_oracle_connection(standalone)
+    standalone.close.assert_called_once()
+
+
+def test_reserve_oracle_connection_pool_sessions(session_pool):
+    get_pooled_oracle_connection("goe_app", "pass", "db/svc", False, 4)
+    assert session_pool.call_args.kwargs["max"] == 4
+    assert session_pool.call_args.kwargs["getmode"] == cxo.SPOOL_ATTRVAL_NOWAIT
+    # Existing pools grow to the reserved size, never shrink.
+    reserve_oracle_connection_pool_sessions(9)
+    session_pool.return_value.reconfigure.assert_called_once_with(max=9)
+    reserve_oracle_connection_pool_sessions(2)
+    session_pool.return_value.reconfigure.assert_called_once()
+    assert oracle_connection_pool_stats()[0]["max_sessions"] == 9
+    # New pools are created with at least the reserved size.
+    get_pooled_oracle_connection("goe_adm", "pass", "db/svc", False, 4)
+    assert session_pool.call_args.kwargs["max"] == 9
+
+
+def test_close_oracle_connection_pools_at_exit(session_pool):
+    with mock.patch.object(oracle_connection_pool, "atexit") as fake_atexit:
+        get_pooled_oracle_connection("goe_app", "pass", "db/svc", False, 4)
+        get_pooled_oracle_connection("goe_adm", "pass", "db/svc", False, 4)
+        fake_atexit.register.assert_called_once_with(close_oracle_connection_pools)
+        close_oracle_connection_pools()
+        fake_atexit.unregister.assert_called_once_with(close_oracle_connection_pools)
+    session_pool.return_value.close.assert_called_with(force=True)
+    assert oracle_connection_pool_stats() == []
@@ -0,0 +1,159 @@
+# Copyright 2016 The GOE Authors. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import mock
+
+import pytest
+
+from goe.offload.oracle import oracle_partition_cache
+from goe.offload.oracle.oracle_offload_source_table import OracleSourceTable
+from goe.offload.oracle.oracle_partition_cache import (
+    OraclePartitionMetadataCache,
+    PARTITION_CACHE_NUM_ROWS_SQL,
+    PARTITION_CACHE_SEGMENT_BYTES_SQL,
+    PARTITION_CACHE_STATS_SQL,
+    clear_oracle_partition_cache,
+)
+
+
+# Composite partitioned table, P1 has no partition level stats.
+PARTITION_ROWS = [
+    [1, "P2", 2, 2, "P2_SP1", 1, "20", 300, 30, 30, 10],
+    [2, "P2", 2, 2, "P2_SP2", 2, "20", 300, 30, 30, 20],
+    [1, "P1", 1, 2, "P1_SP1", 1, "10", 200, 20, None, 10],
+    [2, "P1", 1, 2, "P1_SP2", 2, "10", 200, 20, None, 10],
+]
+SUBPARTITION_ROWS = [
+    [2, "P1", 1, 2, "P1_SP1", 1, "1", 100, 10],
+    [2, "P1", 1, 2, "P1_SP2", 2, "2", 100, 10],
+    [2, "P2", 2, 2, "P2_SP1", 1, "1", 100, 10],
+    [2, "P2", 2, 2, "P2_SP2", 2, "2", 200, 20],
+]
+
+
+@pytest.fixture
+def db_api():
+    api = mock.Mock()
+    api.version = ["2024-01-01 00:00:00", 7]
+    api.stats_version = [["P", 1, 30, "19700"], ["S", 4, 50, "78800"]]
+    api.segment_bytes = [
+        ("P1_SP1", 100),
+        ("P1_SP2", 100),
+        ("P2_SP1", 100),
+        ("P2_SP2", 200),
+    ]
+    api.num_rows = [
+        ("P", "P1", None),
+        ("P", "P2", 30),
+        ("S", "P1_SP1", 10),
+        ("S", "P1_SP2", 10),
+        ("S", "P2_SP1", 10),
+        ("S", "P2_SP2", 20),
+    ]
+    api.execute_query_fetch_one.side_effect = lambda sql, query_params=None: tuple(
+        api.version
+    )
+
+    def fetch_all(sql, query_params=None):
+        if sql == PARTITION_CACHE_STATS_SQL:
+            return api.stats_version
+        if sql == PARTITION_CACHE_SEGMENT_BYTES_SQL:
+            return api.segment_bytes
+        assert sql == PARTITION_CACHE_NUM_ROWS_SQL
+        return api.num_rows
+
+    api.execute_query_fetch_all.side_effect = fetch_all
+    with mock.patch.object(
+        oracle_partition_cache.orchestration_defaults,
+        "cache_enabled",
+        return_value=False,
+    ):
+        yield api
+    clear_oracle_partition_cache()
+
+
+def get_rows(db_api, fetch_type, fetch_rows):
+    cache = OraclePartitionMetadataCache(db_api, "db/svc", "SH", "SALES")
+    fetch_fn = mock.Mock(return_value=fetch_rows)
+    if fetch_type == "partitions":
+        refresh_fn = OracleSourceTable._refresh_partition_rows
+        num_rows_fn = OracleSourceTable._partition_rows_num_rows
+    else:
+        refresh_fn = OracleSourceTable._refresh_subpartition_rows
+        num_rows_fn = OracleSourceTable._subpartition_rows_num_rows
+    rows = cache.get_rows(fetch_type, fetch_fn, refresh_fn, num_rows_fn)
+    return cache.hit, fetch_fn.called, rows
+
+
+def num_rows_queries(db_api):
+    return [
+        _
+        for _ in db_api.execute_query_fetch_all.call_args_list
+        if _.args[0] == PARTITION_CACHE_NUM_ROWS_SQL
+    ]
+
+
+def test_partition_cache_refresh(db_api):
+    assert get_rows(db_api, "partitions", PARTITION_ROWS) == (
+        False,
+        True,
+        PARTITION_ROWS,
+    )
+    # Unchanged table structure, rows are rebuilt from current sizes and stats to match the query.
+    assert get_rows(db_api, "partitions", []) == (True, False, PARTITION_ROWS)
+    # Row counts came from the fetched rows and stats have not changed.
+    assert not num_rows_queries(db_api)
+
+    # Changed stats are picked up.
+    db_api.segment_bytes = db_api.segment_bytes[:-1] + [("P2_SP2", 1000)]
+    db_api.num_rows = db_api.num_rows[:-1] + [("S", "P2_SP2", 60)]
+    db_api.stats_version = [["P", 1, 30, "19700"], ["S", 4, 90, "78810"]]
+    _, _, rows = get_rows(db_api, "partitions", [])
+    assert [_[7:9] for _ in rows] == [[1100, 30], [1100, 30], [200, 20], [200, 20]]
+    assert len(num_rows_queries(db_api)) == 1
+
+    # Subpartitions are a separate fetch type in the same entry.
+    assert get_rows(db_api, "subpartitions", SUBPARTITION_ROWS)[:2] == (False, True)
+    hit, fetched, rows = get_rows(db_api, "subpartitions", [])
+    assert (hit, fetched) == (True, False)
+    assert [_[7:] for _ in rows] == [[100, 10], [100, 10], [100, 10], [1000, 20]]
+    assert len(num_rows_queries(db_api)) == 1
+
+
+def test_partition_cache_deleted_stats(db_api):
+    get_rows(db_api, "partitions", PARTITION_ROWS)
+    # Deleting partition stats on P2 falls back to the sum of subpartition row counts.
+    db_api.num_rows = [("P", "P2", None)] + db_api.num_rows[2:]
+    db_api.stats_version = [["P", 0, None, None], ["S", 4, 50, "78800"]]
+    _, fetched, rows = get_rows(db_api, "partitions", [])
+    assert not fetched
+    assert [_[8] for _ in rows] == [30, 30, 20, 20]
+    assert [_[9] for _ in rows] == [None, None, None, None]
+
+
+def test_partition_cache_invalidation(db_api):
+    get_rows(db_api, "partitions", PARTITION_ROWS)
+    # A new partition changes the object count.
+    db_api.version = ["2024-01-01 00:00:00", 8]
+    assert get_rows(db_api, "partitions", PARTITION_ROWS[:2]) == (
+        False,
+        True,
+        PARTITION_ROWS[:2],
+    )
+    # DDL on an existing partition changes the last DDL time.
+    db_api.version = ["2024-03-01 00:00:00", 8]
+    assert get_rows(db_api, "partitions", PARTITION_ROWS)[:2] == (False, True)
+    clear_oracle_partition_cache()
+    assert get_rows(db_api, "partitions", PARTITION_ROWS)[:2] == (False, True)
+    assert not num_rows_queries(db_api)
@@ -0,0 +1,194 @@
+# Copyright 2016 The GOE Authors. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+
+import pytest
+
+from goe.offload.offload_messages import OffloadMessages
+from goe.offload.oracle.oracle_column import (
+    OracleColumn,
+    ORACLE_TYPE_CLOB,
+    ORACLE_TYPE_NUMBER,
+    ORACLE_TYPE_VARCHAR2,
+)
+from goe.offload.query_import_interface import (
+    AdaptiveFetchSize,
+    QueryImportInterface,
+    estimate_row_bytes,
+    initial_fetch_rows,
+    DEFINE_BYTES_PER_CHAR,
+    DEFINE_CONVERTED_STRING_CHARS,
+    ESTIMATE_LOB_BYTES,
+    FETCH_MAX_GROWTH_FACTOR,
+    FETCH_MIN_ROWS,
+)
+
+
+FETCH_SIZE = 3
+
+
+class FakeEncoder(QueryImportInterface):
+    def write_from_cursor(
+        self, local_output_path, extraction_cursor, source_columns, fetch_size=None
+    ):
+        pass
+
+
+class FakeLob:
+    def __init__(self, value):
+        self._value = value
+
+    def read(self):
+        return self._value
+
+
+class FakeCursor:
+    def __init__(self, rows, fail_on_batch=None):
+        self._rows = rows
+        self._fail_on_batch = fail_on_batch
+        self._batch = 0
+        self.description = [("ID",), ("DATA",)]
+        self.rowcount = 0
+
+    def fetchmany(self, fetch_size):
+        self._batch += 1
+        if self._batch == self._fail_on_batch:
+            raise ValueError("Fetch failure")
+        rows, self._rows = self._rows[:fetch_size], self._rows[fetch_size:]
+        self.rowcount += len(rows)
+        return rows
+
+
+def pipeline_threads():
+    return [_ for _ in threading.enumerate() if _.name.startswith("query_import_")]
+
+
+@pytest.fixture
+def encoder():
+    return FakeEncoder("schema", OffloadMessages())
+
+
+@pytest.fixture
+def rows():
+    return [(_, "data-%s" % _) for _ in range(10)]
+
+
+def test_run_pipeline(encoder, rows):
+    written = []
+    encoder._run_pipeline(
+        FakeCursor(rows),
+        FETCH_SIZE,
+        lambda batch: [_[0] for _ in batch],
+        written.append,
+    )
+    assert written == [[0, 1, 2], [3, 4, 5], [6, 7, 8], [9]]
+    assert not pipeline_threads()
+
+
+@pytest.mark.parametrize("failing_stage", ["fetch", "encode", "write"])
+def test_run_pipeline_exception(encoder, rows, failing_stage):
+    def encode_fn(batch):
+        if failing_stage == "encode":
+            raise ValueError("Encode failure")
+        return batch
+
+    def write_fn(batch):
+        if failing_stage == "write":
+            raise ValueError("Write failure")
+
+    cursor = FakeCursor(rows, fail_on_batch=2 if failing_stage == "fetch" else None)
+    with pytest.raises(ValueError, match="%s failure" % failing_stage.capitalize()):
+        encoder._run_pipeline(cursor, FETCH_SIZE, encode_fn, write_fn)
+    assert not pipeline_threads()
+
+
+def test_run_pipeline_lobs(encoder):
+    source_columns = [
+        OracleColumn("ID", ORACLE_TYPE_NUMBER),
+        OracleColumn("DATA", ORACLE_TYPE_CLOB),
+    ]
+    rows = [(1, FakeLob("a")), (2, None), (3, FakeLob("c"))]
+    cursor = FakeCursor(rows)
+    lob_indexes = encoder._lob_projection_indexes(
+        [_[0] for _ in cursor.description], source_columns
+    )
+    assert lob_indexes == [1]
+    written = []
+    encoder._run_pipeline(
+        cursor, FETCH_SIZE, lambda batch: batch, written.extend, lob_indexes=lob_indexes
+    )
+    assert written == [(1, "a"), (2, None), (3, "c")]
+    # Encode functions must cope with values already read by the fetch stage.
+    read_fn = encoder._get_encode_read_fn()
+    assert read_fn(FakeLob("x")) == read_fn("x") == "x"
+
+
+def test_estimate_row_bytes():
+    columns = [
+        OracleColumn("ID", ORACLE_TYPE_NUMBER),
+        OracleColumn("NAME", ORACLE_TYPE_VARCHAR2, data_length=100),
+    ]
+    # Define buffers are sized in characters, numbers are fetched as strings.
+    row_bytes = (DEFINE_CONVERTED_STRING_CHARS + 100) * DEFINE_BYTES_PER_CHAR
+    assert estimate_row_bytes(columns) == row_bytes
+    assert estimate_row_bytes(columns + [OracleColumn("DOC", ORACLE_TYPE_CLOB)]) > (
+        ESTIMATE_LOB_BYTES
+    )
+    # Narrow rows should start with a large fetch size and LOB rows with a small one.
+    assert initial_fetch_rows(columns, 1024 * 1024) > initial_fetch_rows(
+        columns + [OracleColumn("DOC", ORACLE_TYPE_CLOB)], 1024 * 1024
+    )
+    # The fetch size never exceeds the memory ceiling.
+    assert initial_fetch_rows(columns, 1024 * 1024 * 1024, 1024 * 1024) == (
+        1024 * 1024 // row_bytes
+    )
+
+
+def test_adaptive_fetch_size_grows():
+    fetch_size = AdaptiveFetchSize(100, 1024 * 1024, 2 * 1024 * 1024)
+    narrow_rows = [(1, "a")] * 100
+    fetch_size.record_fetch(narrow_rows, 0.01)
+    # Growth is limited per fetch.
+    assert fetch_size.rows == 100 * FETCH_MAX_GROWTH_FACTOR
+    for _ in range(20):
+        fetch_size.record_fetch(narrow_rows, 0.01)
+    assert fetch_size.rows > 10000
+    # A slow fetch stops further growth.
+    rows_before = fetch_size.rows
+    fetch_size.record_fetch(narrow_rows, 60)
+    assert fetch_size.rows == rows_before
+
+
+def test_adaptive_fetch_size_shrinks():
+    max_batch_bytes = 1024 * 1024
+    fetch_size = AdaptiveFetchSize(1000, max_batch_bytes // 2, max_batch_bytes)
+    wide_rows = [(1, "x" * 100000)] * 50
+    fetch_size.record_fetch(wide_rows, 0.01)
+    assert fetch_size.rows * 100000 <= max_batch_bytes
+    assert fetch_size.rows >= FETCH_MIN_ROWS
+    assert "resizes=1" in fetch_size.stats_message()
+
+
+def test_extract_rows_adaptive(rows):
+    encoder = FakeEncoder(
+        "schema",
+        OffloadMessages(),
+        fetch_batch_bytes=1024 * 1024,
+        max_fetch_batch_bytes=1024 * 1024,
+    )
+    cursor = FakeCursor(rows)
+    batches = list(encoder._extract_rows(cursor, FETCH_SIZE))
+    # The requested fetch size is raised to FETCH_MIN_ROWS, enough for all rows in one batch.
+    assert batches == [rows]
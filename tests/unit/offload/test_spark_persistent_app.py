@@ -0,0 +1,125 @@
+# Copyright 2016 The GOE Authors. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+from unittest import mock
+
+import pytest
+
+from goe.offload.offload_messages import OffloadMessages
+from goe.offload.spark import spark_persistent_app as module_under_test
+from goe.offload.spark.spark_persistent_app import (
+    SparkPersistentApp,
+    SparkPersistentAppException,
+    persistent_app_control_dir,
+    persistent_app_driver_pyspark_body,
+    PERSISTENT_APP_STATUS_OK,
+)
+
+
+CONTROL_DIR = "gs://bucket/path/db_load/table_goe_control"
+# A stand-in for a persistent driver that prints something and then waits.
+FAKE_DRIVER_CMD = [
+    sys.executable,
+    "-c",
+    "import time; print('GOE fake driver', flush=True); time.sleep(60)",
+]
+
+
+def test_persistent_app_control_dir():
+    assert (
+        persistent_app_control_dir("gs://bucket/path/db_load/table/")
+        == "gs://bucket/path/db_load/table_goe_control"
+    )
+
+
+def test_persistent_app_driver_pyspark_body():
+    body = persistent_app_driver_pyspark_body("GOE.app", CONTROL_DIR, hive_support=True)
+    # Must be valid Python.
+    compile(body, "driver.py", "exec")
+    assert CONTROL_DIR in body
+    assert ".enableHiveSupport()" in body
+    assert "chunk_%s.ready" in body
+    assert ".enableHiveSupport()" not in persistent_app_driver_pyspark_body(
+        "GOE.app", CONTROL_DIR
+    )
+
+
+def build_fake_dfs_client(status):
+    fake_dfs_client = mock.Mock()
+    fake_dfs_client.stat.side_effect = lambda path: path.endswith(".done")
+    fake_dfs_client.read.return_value = status
+    return fake_dfs_client
+
+
+def test_spark_persistent_app():
+    fake_dfs_client = build_fake_dfs_client(PERSISTENT_APP_STATUS_OK)
+    app = SparkPersistentApp(
+        CONTROL_DIR, fake_dfs_client, OffloadMessages(), poll_seconds=0
+    )
+    assert not app.is_running()
+    app.start(FAKE_DRIVER_CMD)
+    try:
+        assert app.is_running()
+        app.run_work_item("print('chunk 0')")
+        app.run_work_item("print('chunk 1')")
+        work_paths = [_.args[0] for _ in fake_dfs_client.write.call_args_list]
+        # Each work file is followed by its ready marker.
+        assert work_paths == [
+            CONTROL_DIR + "/chunk_0.py",
+            CONTROL_DIR + "/chunk_0.ready",
+            CONTROL_DIR + "/chunk_1.py",
+            CONTROL_DIR + "/chunk_1.ready",
+        ]
+    finally:
+        with mock.patch.object(
+            module_under_test, "PERSISTENT_APP_STOP_TIMEOUT_SECONDS", 0.1
+        ):
+            app.stop()
+    assert not app.is_running()
+    # The stop file was written before the process was killed.
+    assert fake_dfs_client.write.call_args.args[0] == CONTROL_DIR + "/stop"
+
+
+def test_spark_persistent_app_failed_work_item():
+    fake_dfs_client = build_fake_dfs_client("Traceback: something went wrong")
+    app = SparkPersistentApp(
+        CONTROL_DIR, fake_dfs_client, OffloadMessages(), poll_seconds=0
+    )
+    with pytest.raises(SparkPersistentAppException):
+        # Not started.
+        app.run_work_item("print('chunk 0')")
+    app.start(FAKE_DRIVER_CMD)
+    try:
+        with pytest.raises(SparkPersistentAppException, match="went wrong"):
+            app.run_work_item("print('chunk 0')")
+    finally:
+        with mock.patch.object(
+            module_under_test, "PERSISTENT_APP_STOP_TIMEOUT_SECONDS", 0.1
+        ):
+            app.stop()
+
+
+def test_spark_persistent_app_driver_exit():
+    fake_dfs_client = mock.Mock()
+    fake_dfs_client.stat.return_value = None
+    app = SparkPersistentApp(
+        CONTROL_DIR, fake_dfs_client, OffloadMessages(), poll_seconds=0
+    )
+    app.start([sys.executable, "-c", "print('GOE fake driver failed')"])
+    try:
+        with pytest.raises(SparkPersistentAppException, match="fake driver failed"):
+            app.run_work_item("print('chunk 0')")
+    finally:
+        app.stop()
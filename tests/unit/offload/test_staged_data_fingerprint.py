@@ -0,0 +1,200 @@
+# Copyright 2016 The GOE Authors. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from decimal import Decimal
+import json
+
+import pyarrow
+
+from goe.offload.staged_data_fingerprint import (
+    StagedDataFingerprint,
+    hash_value,
+    staged_data_fingerprint_from_log,
+    FINGERPRINT_KIND_DOUBLE,
+    FINGERPRINT_KIND_INTEGER,
+    FINGERPRINT_KIND_OTHER,
+    FINGERPRINT_KIND_STRING,
+    FINGERPRINT_LOG_MARKER,
+)
+
+
+ROWS = [
+    (1, 1.5, "a"),
+    (None, -0.0, "b"),
+    (2**40, None, None),
+    (-3, float("nan"), "d"),
+    (7, 2.25, "e"),
+]
+KINDS = [FINGERPRINT_KIND_INTEGER, FINGERPRINT_KIND_DOUBLE, FINGERPRINT_KIND_STRING]
+
+
+def build_fingerprint(rows, batch_size=2) -> StagedDataFingerprint:
+    fingerprint = StagedDataFingerprint()
+    for i in range(0, len(rows), batch_size):
+        batch = rows[i : i + batch_size]
+        fingerprint.add_rows(len(batch))
+        for column_index, kind in enumerate(KINDS):
+            fingerprint.update_column(
+                "COL%s" % column_index, [_[column_index] for _ in batch], kind
+            )
+    return fingerprint
+
+
+def test_fingerprint_order_independent():
+    fingerprint = build_fingerprint(ROWS)
+    assert fingerprint.rows == len(ROWS)
+    assert fingerprint.columns["COL0"]["nulls"] == 1
+    assert fingerprint.columns["COL0"]["min"] == -3
+    assert fingerprint.columns["COL0"]["max"] == 2**40
+    assert fingerprint.columns["COL1"]["min"] == 0.0
+    assert fingerprint.columns["COL1"]["max"] == 2.25
+    assert fingerprint.columns["COL2"]["nulls"] == 1
+    assert fingerprint.columns["COL1"]["hash_sum"] is None
+    assert fingerprint.columns["COL2"]["hash_sum"] == sum(hash_value(_) for _ in "abde")
+    # Different row order and batching give the same fingerprint.
+    assert build_fingerprint(list(reversed(ROWS)), batch_size=3) == fingerprint
+    assert not fingerprint.compare(build_fingerprint(ROWS[::-1], batch_size=1))
+
+
+def test_fingerprint_arrow_and_python_paths_match():
+    """Values Arrow cannot hold fall back to Python which must agree with the Arrow path."""
+    values = [1, -1, 0, 2**62, None]
+    arrow_path = StagedDataFingerprint()
+    arrow_path.update_column("ID", values, FINGERPRINT_KIND_INTEGER)
+    python_path = StagedDataFingerprint()
+    python_path.update_column(
+        "ID",
+        [None if _ is None else Decimal(_) for _ in values],
+        FINGERPRINT_KIND_INTEGER,
+    )
+    assert arrow_path == python_path
+    # An integer outside of 64 bits forces the Python path for the whole batch.
+    big = StagedDataFingerprint()
+    big.update_column("ID", values + [2**70], FINGERPRINT_KIND_INTEGER)
+    assert big.columns["ID"]["max"] == 2**70
+    doubles = StagedDataFingerprint()
+    doubles.update_column("D", [Decimal("1.5"), float("nan")], FINGERPRINT_KIND_DOUBLE)
+    assert (doubles.columns["D"]["min"], doubles.columns["D"]["max"]) == (1.5, 1.5)
+
+
+def test_fingerprint_hash_value():
+    # The first 15 hex digits of MD5, as calculated by backend SQL.
+    assert hash_value("abc") == 0x900150983CD24FB
+    assert hash_value(-12) == hash_value("-12")
+    assert hash_value(b"abc") is None
+    fingerprint = StagedDataFingerprint()
+    fingerprint.update_column("S", ["a", b"b"], FINGERPRINT_KIND_STRING)
+    fingerprint.update_column("S", ["c"], FINGERPRINT_KIND_STRING)
+    # Values that cannot be hashed leave the column without a hash sum.
+    assert fingerprint.columns["S"]["hash_sum"] is None
+
+
+def test_fingerprint_merge():
+    merged = build_fingerprint(ROWS[:2]).merge(build_fingerprint(ROWS[2:]))
+    assert merged == build_fingerprint(ROWS)
+
+
+def test_fingerprint_compare():
+    fingerprint = build_fingerprint(ROWS)
+    missing = build_fingerprint(ROWS[:-1])
+    differences = fingerprint.compare(missing)
+    assert "row count 5 != 4" in differences
+    assert "COL2 NULL count 1 != 1" not in differences
+    # A backend fingerprint only needs the columns it can aggregate.
+    load = StagedDataFingerprint()
+    load.add_rows(len(ROWS))
+    load.set_column("COL0", FINGERPRINT_KIND_INTEGER, 1, -3, 2**40)
+    load.set_column("COL2", FINGERPRINT_KIND_OTHER, 1)
+    assert fingerprint.compare(load) == []
+    load.set_column("COL0", FINGERPRINT_KIND_INTEGER, 1, -3, 8)
+    assert fingerprint.compare(load) == ["COL0 MAX %s != 8" % 2**40]
+    # A changed value that is neither the MIN nor MAX is detected by the hash sum.
+    changed = build_fingerprint(ROWS[:-1] + [(6, 2.25, "E")])
+    assert fingerprint.compare(changed) == [
+        "COL0 value hash mismatch",
+        "COL2 value hash mismatch",
+    ]
+    load.set_column(
+        "COL2",
+        FINGERPRINT_KIND_STRING,
+        1,
+        column_hash_sum=changed.columns["COL2"]["hash_sum"],
+    )
+    assert "COL2 value hash mismatch" in fingerprint.compare(load)
+
+
+def test_fingerprint_dict_round_trip():
+    fingerprint = build_fingerprint(ROWS)
+    as_json = json.dumps(fingerprint.to_dict())
+    assert StagedDataFingerprint.from_dict(json.loads(as_json)) == fingerprint
+    # Hash sums from another hash function are discarded.
+    other_hash_fn = dict(json.loads(as_json), hash_fn="xxhash64")
+    loaded = StagedDataFingerprint.from_dict(other_hash_fn)
+    assert loaded.columns["COL2"]["hash_sum"] is None
+    assert not fingerprint.compare(loaded)
+
+
+def test_fingerprint_from_log():
+    assert staged_data_fingerprint_from_log("") is None
+    assert staged_data_fingerprint_from_log("no fingerprint here") is None
+    part1 = StagedDataFingerprint()
+    part1.add_rows(2)
+    part1.set_column("ID", FINGERPRINT_KIND_INTEGER, 0, 1, 5, column_hash_sum=10)
+    part2 = StagedDataFingerprint()
+    part2.add_rows(1)
+    part2.set_column("ID", FINGERPRINT_KIND_INTEGER, 1, None, None, column_hash_sum=0)
+    # Spark logs decimal hash sums as strings.
+    part2_dict = part2.to_dict()
+    part2_dict["columns"]["ID"]["hash_sum"] = "0"
+    log_text = "\n".join(
+        [
+            "INFO some spark output",
+            FINGERPRINT_LOG_MARKER + json.dumps(part1.to_dict()),
+            "Rows: 3",
+            FINGERPRINT_LOG_MARKER + json.dumps(part2_dict),
+        ]
+    )
+    fingerprint = staged_data_fingerprint_from_log(log_text)
+    assert fingerprint.rows == 3
+    assert fingerprint.columns["ID"] == {
+        "kind": FINGERPRINT_KIND_INTEGER,
+        "nulls": 1,
+        "min": 1,
+        "max": 5,
+        "hash_sum": 10,
+    }
+
+
+def test_fingerprint_update_array():
+    fingerprint = StagedDataFingerprint()
+    fingerprint.update_array(
+        "D", pyarrow.array([float("nan"), None]), FINGERPRINT_KIND_DOUBLE
+    )
+    # NaN only batches have no bounds and do not prevent later batches recording them.
+    assert fingerprint.columns["D"]["min"] is None
+    fingerprint.update_array(
+        "D", pyarrow.array([2.5, float("nan"), -1.0]), FINGERPRINT_KIND_DOUBLE
+    )
+    fingerprint.update_array(
+        "S", pyarrow.array(["a", None, None]), FINGERPRINT_KIND_STRING
+    )
+    assert fingerprint.columns["D"] == {
+        "kind": FINGERPRINT_KIND_DOUBLE,
+        "nulls": 1,
+        "min": -1.0,
+        "max": 2.5,
+        "hash_sum": None,
+    }
+    assert fingerprint.columns["S"]["nulls"] == 2
+    assert fingerprint.columns["S"]["hash_sum"] == hash_value("a")
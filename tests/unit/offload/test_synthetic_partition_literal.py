@@ -17,9 +17,16 @@
 from datetime import datetime
 import decimal
 from numpy import datetime64
-from unittest import TestCase, main
+from unittest import TestCase, main, mock
 
+from goe.offload.backend_table import PartitionFunctionLiteral
+from goe.offload.offload_messages import OffloadMessages
 from goe.offload.synthetic_partition_literal import SyntheticPartitionLiteral
+from tests.unit.test_functions import (
+    build_fake_backend_table,
+    build_mock_options,
+    FAKE_ORACLE_BQ_ENV,
+)
 
 
 class TestSyntheticPartitionLiteral(TestCase):
@@ -249,6 +256,52 @@ class TestSyntheticPartitionLiteral(TestCase):
             SyntheticPartitionLiteral._gen_string_literal("S1234", 6), "S1234"
         )
 
+    def test_partition_function_literal(self):
+        evaluate_fn = mock.Mock(
+            side_effect=lambda sql_literals: [_ + "!" for _ in sql_literals]
+        )
+        partition_fn = PartitionFunctionLiteral(
+            str, evaluate_fn, batch_size=2, memo_size=3
+        )
+        self.assertEqual(partition_fn(1), "1!")
+        # Duplicates and memoized values are not sent to the backend, the rest in batches.
+        self.assertEqual(
+            SyntheticPartitionLiteral.gen_synthetic_literals(
+                partition_fn, [1, 2, 3, 2, 4]
+            ),
+            ["1!", "2!", "3!", "2!", "4!"],
+        )
+        self.assertEqual(
+            [_.args[0] for _ in evaluate_fn.call_args_list], [["1"], ["2", "3"], ["4"]]
+        )
+        # Least recently used value 1 has been discarded from the memo.
+        partition_fn.convert_values([4, 1])
+        self.assertEqual(evaluate_fn.call_args.args[0], ["1"])
+        self.assertEqual(
+            SyntheticPartitionLiteral.gen_synthetic_literals(lambda x: x * 2, [1, 2]),
+            [2, 4],
+        )
+
+    def test_bigquery_partition_function_literals_sql(self):
+        backend_table = build_fake_backend_table(
+            build_mock_options(FAKE_ORACLE_BQ_ENV), OffloadMessages()
+        )
+        backend_table._db_api = mock.Mock()
+        backend_table._db_api.enclose_object_reference.return_value = "`ds.udf`"
+        backend_table._db_api.execute_query_fetch_all.return_value = [
+            (1, "B"),
+            (0, "A"),
+        ]
+        partition_info = mock.Mock(function="ds.udf")
+        self.assertEqual(
+            backend_table._evaluate_partition_function(partition_info, ["'a'", "'b'"]),
+            ["A", "B"],
+        )
+        self.assertEqual(
+            backend_table._db_api.execute_query_fetch_all.call_args.args[0],
+            "SELECT pos, `ds.udf`(source_value) AS synthetic_value FROM UNNEST(['a', 'b']) AS source_value WITH OFFSET AS pos",
+        )
+
 
 if __name__ == "__main__":
     main()
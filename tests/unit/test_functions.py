@@ -21,6 +21,7 @@ import numpy
 from goe.config.orchestration_config import OrchestrationConfig
 from goe.offload.column_metadata import ColumnPartitionInfo
 from goe.offload.factory.backend_table_factory import backend_table_factory
+from goe.offload.offload_constants import OFFLOAD_CHUNK_PLANNER_GREEDY
 from goe.offload.offload_source_table import RdbmsPartition
 from goe.offload.oracle.oracle_column import (
     OracleColumn,
@@ -329,6 +330,8 @@ def build_mock_offload_operation():
     fake_operation.unicode_string_columns_csv = None
     fake_operation.max_offload_chunk_size = 100 * 1024 * 1024
     fake_operation.max_offload_chunk_count = 100
+    fake_operation.offload_chunk_planner = OFFLOAD_CHUNK_PLANNER_GREEDY
+    fake_operation.offload_chunk_target_count = None
     return fake_operation
 
 
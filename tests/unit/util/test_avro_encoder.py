@@ -14,6 +14,7 @@
 
 """ TestAvroEncoder: Unit test library to test avro_encoder module.
 """
+from decimal import Decimal
 from unittest import TestCase, main
 import os.path
 from textwrap import dedent
@@ -22,8 +23,14 @@ from avro.datafile import DataFileReader
 from avro.io import DatumReader
 
 from goe.offload.offload_messages import OffloadMessages
-from goe.offload.oracle.oracle_column import OracleColumn, ORACLE_TYPE_VARCHAR2
-from goe.util.avro_encoder import AvroEncoder
+from goe.offload.oracle.oracle_column import (
+    OracleColumn,
+    ORACLE_TYPE_BINARY_DOUBLE,
+    ORACLE_TYPE_NUMBER,
+    ORACLE_TYPE_RAW,
+    ORACLE_TYPE_VARCHAR2,
+)
+from goe.util.avro_encoder import AvroEncoder, NUMPY_MIN_BATCH_ROWS
 from goe.util.misc_functions import get_temp_path
 
 
@@ -67,6 +74,20 @@ class FakeDb(object):
             return []
 
 
+class FakeTypedDb(object):
+    """Pretends to be a cx_Oracle cursor over a table of mixed types returning a single batch"""
+
+    def __init__(self, column_names, rows):
+        self._rows = rows
+        self.description = [(_,) for _ in column_names]
+        self.rowcount = 0
+
+    def fetchmany(self):
+        rows, self._rows = self._rows, []
+        self.rowcount += len(rows)
+        return rows
+
+
 class TestAvroEncoder(TestCase):
     def test_avro_encoder(self):
         source_columns = [OracleColumn("COLUMN_NAME", ORACLE_TYPE_VARCHAR2)]
@@ -87,6 +108,93 @@ class TestAvroEncoder(TestCase):
             rows_read = len([_ for _ in reader])
             self.assertEqual(rows_read, ROW_COUNT)
 
+    def test_avro_encoder_types(self):
+        """Values must round trip through both the NumPy and row by row encoding paths."""
+        source_columns = [
+            OracleColumn("ID", ORACLE_TYPE_NUMBER, data_precision=18, data_scale=0),
+            OracleColumn("NUM", ORACLE_TYPE_NUMBER, data_precision=18, data_scale=0),
+            OracleColumn("DBL", ORACLE_TYPE_BINARY_DOUBLE),
+            OracleColumn("STR", ORACLE_TYPE_VARCHAR2),
+            OracleColumn("BIN", ORACLE_TYPE_RAW),
+        ]
+        schema_json = dedent(
+            """\
+            { "type" : "record",
+              "name" : "no_table",
+              "namespace" : "sh_test",
+              "fields" : [{"name":"ID","type":"long"},
+                          {"name":"NUM","type":["null","long"]},
+                          {"name":"DBL","type":["null","double"]},
+                          {"name":"STR","type":["null","string"]},
+                          {"name":"BIN","type":["null","bytes"]}],
+              "tableName" : "sh_test.no_table"
+            }"""
+        )
+        row_count = NUMPY_MIN_BATCH_ROWS * 2
+        rows = [
+            (
+                _ * 1000 - 5000,
+                None if _ % 3 == 0 else -(2**62) + _,
+                None if _ % 4 == 0 else _ / 7,
+                None if _ % 5 == 0 else "row-%s-é" % _,
+                None if _ % 6 == 0 else bytes([_ % 256]) * 3,
+            )
+            for _ in range(row_count)
+        ]
+        # Decimal values are not eligible for NumPy and must be encoded row by row.
+        decimal_rows = [(Decimal(5), Decimal(-5), 1.5, "dec", b"dec")] + rows[1:]
+        for test_rows in (rows, decimal_rows):
+            for compression in (False, True):
+                encoder = AvroEncoder(
+                    schema_json, OffloadMessages(), compression=compression
+                )
+                extraction_cursor = FakeTypedDb(
+                    [_.name for _ in source_columns], test_rows
+                )
+                local_staging_path = get_temp_path(
+                    prefix="goe-unittest", suffix=".avro"
+                )
+                rows_imported = encoder.write_from_cursor(
+                    local_staging_path, extraction_cursor, source_columns
+                )
+                self.assertEqual(rows_imported, row_count)
+                with DataFileReader(
+                    open(local_staging_path, "rb"), DatumReader()
+                ) as reader:
+                    rows_read = [
+                        (r["ID"], r["NUM"], r["DBL"], r["STR"], r["BIN"])
+                        for r in reader
+                    ]
+                self.assertEqual(rows_read, test_rows)
+
+    def test_avro_encoder_boolean(self):
+        source_columns = [
+            OracleColumn("FLAG", ORACLE_TYPE_NUMBER, data_precision=1, data_scale=0),
+            OracleColumn("NFLAG", ORACLE_TYPE_NUMBER, data_precision=1, data_scale=0),
+        ]
+        schema_json = dedent(
+            """\
+            { "type" : "record",
+              "name" : "no_table",
+              "namespace" : "sh_test",
+              "fields" : [{"name":"FLAG","type":"boolean"},
+                          {"name":"NFLAG","type":["null","boolean"]}],
+              "tableName" : "sh_test.no_table"
+            }"""
+        )
+        rows = [(_ % 2 == 0, None if _ % 3 == 0 else _ % 2 == 1) for _ in range(10)]
+        encoder = AvroEncoder(schema_json, OffloadMessages())
+        local_staging_path = get_temp_path(prefix="goe-unittest", suffix=".avro")
+        rows_imported = encoder.write_from_cursor(
+            local_staging_path,
+            FakeTypedDb([_.name for _ in source_columns], rows),
+            source_columns,
+        )
+        self.assertEqual(rows_imported, len(rows))
+        with DataFileReader(open(local_staging_path, "rb"), DatumReader()) as reader:
+            rows_read = [(r["FLAG"], r["NFLAG"]) for r in reader]
+        self.assertEqual(rows_read, rows)
+
 
 if __name__ == "__main__":
     main()
@@ -15,15 +15,36 @@
 """ TestParquetEncoder: Unit test library to test parquet_encoder module.
 """
 from unittest import TestCase, main
+import math
 import os.path
 from pyarrow import parquet
 
 from goe.offload.offload_messages import OffloadMessages
-from goe.offload.oracle.oracle_column import OracleColumn, ORACLE_TYPE_VARCHAR2
-from goe.util.parquet_encoder import ParquetEncoder, PARQUET_TYPE_STRING
+from goe.offload.oracle.oracle_column import (
+    OracleColumn,
+    ORACLE_TYPE_NUMBER,
+    ORACLE_TYPE_RAW,
+    ORACLE_TYPE_TIMESTAMP_LOCAL_TZ,
+    ORACLE_TYPE_VARCHAR2,
+)
+from goe.offload.staged_data_fingerprint import (
+    FINGERPRINT_KIND_INTEGER,
+    FINGERPRINT_KIND_STRING,
+    StagedDataFingerprint,
+)
+from goe.util.parquet_encoder import (
+    ParquetEncoder,
+    PARQUET_TYPE_INT64,
+    PARQUET_TYPE_STRING,
+)
 from goe.util.misc_functions import get_temp_path
 
-from tests.unit.util.test_avro_encoder import FakeDb, ROW_COUNT
+from tests.unit.util.test_avro_encoder import (
+    FakeDb,
+    FakeTypedDb,
+    FETCH_SIZE,
+    ROW_COUNT,
+)
 
 
 class TestParquetEncoder(TestCase):
@@ -50,6 +71,92 @@ class TestParquetEncoder(TestCase):
         metadata = parquet_file.metadata.to_dict()
         self.assertEqual(metadata["row_groups"][0]["num_rows"], ROW_COUNT)
 
+    def test_parquet_encoder_row_groups(self):
+        source_columns = [
+            OracleColumn("COLUMN_NAME", ORACLE_TYPE_VARCHAR2, data_length=5)
+        ]
+        parquet_schema = [
+            (_.name, PARQUET_TYPE_STRING, _.nullable) for _ in source_columns
+        ]
+        messages = OffloadMessages()
+        # A tiny row group target should give us one row group per fetched batch.
+        encoder = ParquetEncoder(
+            parquet_schema, messages, row_group_size=1, use_dictionary=False
+        )
+        extraction_cursor = FakeDb(ROW_COUNT)
+        local_staging_path = get_temp_path(prefix="goe-unittest", suffix=".parquet")
+        rows_imported = encoder.write_from_cursor(
+            local_staging_path, extraction_cursor, source_columns
+        )
+        self.assertEqual(rows_imported, ROW_COUNT)
+        parquet_file = parquet.ParquetFile(local_staging_path)
+        metadata = parquet_file.metadata
+        self.assertEqual(metadata.num_rows, ROW_COUNT)
+        self.assertEqual(metadata.num_row_groups, math.ceil(ROW_COUNT / FETCH_SIZE))
+        self.assertNotIn("PLAIN_DICTIONARY", metadata.row_group(0).column(0).encodings)
+        self.assertEqual(
+            parquet_file.read().column("COLUMN_NAME").to_pylist(),
+            [str(_) for _ in range(ROW_COUNT)],
+        )
+
+    def test_parquet_encoder_batch_to_arrow(self):
+        source_columns = [
+            OracleColumn("ID", ORACLE_TYPE_NUMBER, data_precision=10, data_scale=0),
+            OracleColumn("TS_LTZ", ORACLE_TYPE_TIMESTAMP_LOCAL_TZ),
+            OracleColumn("RAW_COL", ORACLE_TYPE_RAW, data_length=4),
+        ]
+        parquet_schema = [
+            ("ID", PARQUET_TYPE_INT64, True),
+            ("TS_LTZ", PARQUET_TYPE_STRING, True),
+            ("RAW_COL", PARQUET_TYPE_STRING, True),
+        ]
+        messages = OffloadMessages()
+        encoder = ParquetEncoder(
+            parquet_schema, messages, base64_columns=[source_columns[2]]
+        )
+        # Cursor projection order deliberately differs from the schema order.
+        column_names = ["RAW_COL", "ID", "TS_LTZ"]
+        row_batch = [
+            (b"abc", 1, "2024-01-01 00:00:00.000000"),
+            (None, None, None),
+        ]
+        conversion_fns = encoder._get_arrow_conversion_fns(column_names, source_columns)
+        record_batch = encoder._batch_to_arrow(row_batch, conversion_fns)
+        self.assertEqual(record_batch.schema, encoder.schema)
+        self.assertEqual(
+            record_batch.to_pydict(),
+            {
+                "ID": [1, None],
+                "TS_LTZ": ["2024-01-01 00:00:00.000000 UTC", None],
+                "RAW_COL": ["YWJj", None],
+            },
+        )
+
+    def test_parquet_encoder_fingerprint(self):
+        source_columns = [
+            OracleColumn("ID", ORACLE_TYPE_NUMBER, data_precision=10, data_scale=0),
+            OracleColumn("DATA", ORACLE_TYPE_VARCHAR2, data_length=5),
+        ]
+        parquet_schema = [
+            ("ID", PARQUET_TYPE_INT64, True),
+            ("DATA", PARQUET_TYPE_STRING, True),
+        ]
+        rows = [(1, "a"), (None, "b"), (3, None), (-7, "d")]
+        encoder = ParquetEncoder(parquet_schema, OffloadMessages(), fingerprint=True)
+        local_staging_path = get_temp_path(prefix="goe-unittest", suffix=".parquet")
+        rows_imported = encoder.write_from_cursor(
+            local_staging_path, FakeTypedDb(["ID", "DATA"], rows), source_columns
+        )
+        self.assertEqual(rows_imported, len(rows))
+        expected = StagedDataFingerprint()
+        expected.add_rows(len(rows))
+        expected.update_column("ID", [_[0] for _ in rows], FINGERPRINT_KIND_INTEGER)
+        expected.update_column("DATA", [_[1] for _ in rows], FINGERPRINT_KIND_STRING)
+        self.assertEqual(encoder.staged_fingerprint, expected)
+        self.assertEqual(encoder.staged_fingerprint.columns["ID"]["min"], -7)
+        self.assertEqual(encoder.staged_fingerprint.columns["DATA"]["nulls"], 1)
+        self.assertIsNotNone(encoder.staged_fingerprint.columns["DATA"]["hash_sum"])
+
 
 if __name__ == "__main__":
     main()